@@ -0,0 +1,147 @@
+"""
+Shared helpers for the scripts in this folder.
+
+Every benchmark runs against a throwaway SQLite database in a temp folder, never
+against data/db.sqlite3, so it is safe to run on a real install.
+"""
+import os
+import sys
+import random
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+def setup_django(db_path=None):
+    """Point Django at a temporary database and return its path."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "media_journal.settings")
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="mj_bench_"), "bench.sqlite3")
+
+    from django.conf import settings
+    settings.DATABASES["default"]["NAME"] = db_path
+    settings.DEBUG = False
+    # Pages render without running collectstatic first
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+
+    import django
+    django.setup()
+    return db_path
+
+
+def migrate(target=None):
+    """Migrate core to `target` (a migration name) or to the latest migration."""
+    from django.core.management import call_command
+    if target:
+        call_command("migrate", "core", target, verbosity=0)
+    else:
+        call_command("migrate", verbosity=0)
+
+
+STATUSES = ["ongoing", "completed", "planned", "dropped", "on_hold"]
+MEDIA_TYPES = ["movie", "tv", "anime", "manga", "game", "book", "music"]
+
+
+def seed_items(count, logs_per_item=1, events_per_item=0, seed=42):
+    """
+    Bulk insert `count` MediaItems spread over every media type, with journal logs
+    and optional calendar events. Returns the number of items created.
+    """
+    from django.utils import timezone
+    from core.models import MediaItem, MediaItemLog, CalendarEvent
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    batch_size = 2000
+
+    created = 0
+    while created < count:
+        batch = []
+        for i in range(created, min(created + batch_size, count)):
+            media_type = MEDIA_TYPES[i % len(MEDIA_TYPES)]
+            item = MediaItem(
+                title=f"Benchmark Title {i} {rng.choice(['Alpha', 'Émile', 'Zeta', 'Björk', 'Night'])}",
+                media_type=media_type,
+                source="tmdb",
+                provider_ids={"tmdb": str(100000 + i)},
+                cover_url=f"/media/posters/bench_{i}.jpg",
+                banner_url=f"/media/banners/bench_{i}.jpg",
+                overview="Lorem ipsum dolor sit amet. " * 10,
+                release_date=f"{rng.randint(1960, 2026)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                cast=[{"name": f"Actor {j}", "character": f"Role {j}"} for j in range(8)],
+                genres=rng.sample(["Action", "Drama", "Comedy", "Horror", "Sci-Fi", "Romance"], 2),
+                creators=[f"Creator {i % 500}"],
+                progress_main=rng.randint(0, 24),
+                total_main=rng.choice([None, 12, 24, 120, 300]),
+                status=rng.choice(STATUSES),
+                personal_rating=rng.choice([None, 20, 40, 60, 80, 100]),
+                favorite=rng.random() < 0.02,
+                favorite_position=i,
+                notification=rng.random() < 0.01,
+            )
+            item.search_title = item.build_search_title()
+            batch.append(item)
+        MediaItem.objects.bulk_create(batch)
+        created += len(batch)
+
+    # date_added is auto_now_add, spread it out afterwards so date sorts/filters are realistic
+    ids = list(MediaItem.objects.values_list("id", flat=True))
+    updates = []
+    for item_id in ids:
+        updates.append(MediaItem(id=item_id, date_added=now - timedelta(minutes=rng.randint(0, 60 * 24 * 900))))
+        if len(updates) >= batch_size:
+            MediaItem.objects.bulk_update(updates, ["date_added"])
+            updates = []
+    if updates:
+        MediaItem.objects.bulk_update(updates, ["date_added"])
+
+    if logs_per_item:
+        logs = []
+        for item_id in ids:
+            for n in range(logs_per_item):
+                logs.append(MediaItemLog(item_id=item_id, content=f"Journal entry {n + 1}", activity_date=now - timedelta(days=n * 30)))
+            if len(logs) >= batch_size:
+                MediaItemLog.objects.bulk_create(logs)
+                logs = []
+        if logs:
+            MediaItemLog.objects.bulk_create(logs)
+
+    if events_per_item:
+        events = []
+        for item_id in ids:
+            for n in range(events_per_item):
+                events.append(CalendarEvent(item_id=item_id, date=now + timedelta(days=rng.randint(-60, 60)), title=f"Episode {n + 1}"))
+            if len(events) >= batch_size:
+                CalendarEvent.objects.bulk_create(events)
+                events = []
+        if events:
+            CalendarEvent.objects.bulk_create(events)
+
+    return created
+
+
+def time_call(func, repeat=5):
+    """Run `func` `repeat` times and return the median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def explain(sql, params=()):
+    """Return SQLite's EXPLAIN QUERY PLAN for a statement as a list of lines."""
+    from django.db import connection
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
@@ -0,0 +1,106 @@
+"""
+Benchmark the backup export's database phase against library size.
+
+The library is seeded once in a temporary database, then every export runs in its
+own subprocess so peak RSS isn't skewed by the seeding or by the previous run:
+
+- legacy: every row in one list and serialize("json", ...) into one string, like
+  the exporter did before it streamed
+- stream: BackupTask.do_export(), JSON-lines per model from .iterator()
+
+Peak RSS is the growth of the process' max RSS over its size right before the
+export (Linux/macOS only). Media files aren't seeded, only the database is timed.
+
+    python benchmarks/bench_backup_export.py --items 50000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import warnings
+
+from _bench_utils import setup_django, migrate, seed_items
+
+
+def max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(mode, db_path):
+    """Runs one export against an already seeded database and prints the result as JSON."""
+    warnings.filterwarnings("ignore")
+    setup_django(db_path)
+
+    import zipfile
+    import tempfile
+    from django.core.serializers import serialize
+    from django.conf import settings
+    from core.services.p_settings import BackupTask, backup_querysets
+
+    settings.MEDIA_ROOT = tempfile.mkdtemp(prefix="mj_bench_media_")
+    rows = sum(qs.count() for _, qs in backup_querysets())
+    baseline = max_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "legacy":
+        all_objects = []
+        for _, qs in backup_querysets():
+            all_objects.extend(list(qs))
+        json_data = serialize("json", all_objects)
+        zip_path = os.path.join(tempfile.gettempdir(), "mj_bench_legacy.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zipf:
+            zipf.writestr("backup_data.json", json_data)
+    else:
+        task = BackupTask("bench", "export")
+        task.do_export()
+        zip_path = task.result_path
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "rows": rows,
+        "seconds": elapsed,
+        "peak_mb": max_rss_mb() - baseline,
+        "zip_mb": os.path.getsize(zip_path) / (1024 * 1024),
+    }))
+    os.remove(zip_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--logs-per-item", type=int, default=1)
+    parser.add_argument("--events-per-item", type=int, default=1)
+    parser.add_argument("--measure", choices=["legacy", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.db)
+        return
+
+    warnings.filterwarnings("ignore")
+    db_path = setup_django()
+    print(f"Database: {db_path}")
+    migrate()
+    seed_items(args.items, logs_per_item=args.logs_per_item, events_per_item=args.events_per_item)
+
+    print(f"\n{'mode':>8} {'rows':>8} {'seconds':>8} {'rows/s':>8} {'peak MB':>8} {'zip MB':>8}")
+    for mode in ["legacy", "stream"]:
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", mode, "--db", db_path],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:>8} {result['rows']:>8} {result['seconds']:>8.2f} {result['rows'] / result['seconds']:>8.0f} "
+            f"{result['peak_mb']:>8.1f} {result['zip_mb']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark the home page against library size.
+
+For each size the library is grown in a temporary database and the home page is
+timed twice: with the stats cache dropped before every request (every load
+recomputes the aggregates, like before the stats cache) and with a warm cache.
+
+    python benchmarks/bench_home.py --sizes 1000 10000 50000
+"""
+import argparse
+import warnings
+
+from _bench_utils import setup_django, migrate, seed_items, time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    db_path = setup_django()
+    print(f"Database: {db_path}")
+    migrate()
+
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from core.models import MediaItem
+    from core.services.p_home import invalidate_home_stats
+
+    client = Client()
+
+    def uncached():
+        invalidate_home_stats()
+        client.get("/")
+
+    def cached():
+        client.get("/")
+
+    print(f"\n{'items':>8} {'uncached ms':>12} {'cached ms':>10} {'queries':>8}")
+    for size in sorted(args.sizes):
+        missing = size - MediaItem.objects.count()
+        if missing > 0:
+            seed_items(missing, logs_per_item=1)
+
+        cold = time_call(uncached, args.repeat)
+        client.get("/")
+        warm = time_call(cached, args.repeat)
+        with CaptureQueriesContext(connection) as ctx:
+            client.get("/")
+
+        print(f"{size:>8} {cold:>12.2f} {warm:>10.2f} {len(ctx.captured_queries):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark the list/sort hot paths before and after the list query indexes (0037).
+
+Seeds a fully migrated temporary database, drops the indexes 0037 added, measures
+every scenario, then adds them back and measures again. Migrating back to 0036 instead
+would leave the views querying columns later migrations added. For each scenario it
+prints the median latency and the EXPLAIN QUERY PLAN of the heaviest query.
+
+    python benchmarks/bench_list_queries.py --items 50000
+"""
+import argparse
+import json
+import warnings
+from datetime import date, datetime, time, timedelta
+
+from _bench_utils import setup_django, migrate, seed_items, time_call, explain
+
+INDEX_MIGRATION = "0037_list_query_indexes"
+
+
+def set_list_indexes(enabled):
+    """Adds or drops the indexes of INDEX_MIGRATION, leaving the rest of the schema as it is."""
+    from django.apps import apps
+    from django.db import connection
+    from django.db.migrations.loader import MigrationLoader
+
+    migration = MigrationLoader(None, ignore_no_migrations=True).get_migration("core", INDEX_MIGRATION)
+    with connection.schema_editor() as editor:
+        for operation in migration.operations:
+            model = apps.get_model("core", operation.model_name)
+            if enabled:
+                editor.add_index(model, operation.index)
+            else:
+                editor.remove_index(model, operation.index)
+
+
+def build_scenarios():
+    from django.test import Client
+    from core.models import MediaItem, CalendarEvent
+
+    client = Client()
+
+    def get(url):
+        return lambda: client.get(url)
+
+    def run_query(qs):
+        return lambda: list(qs.all())
+
+    heatmap_start = date.today() - timedelta(days=161)
+    now = datetime.now()
+
+    return [
+        ("anime list (all, rating)", get("/api/anime/?status=all&sort_by=rating&sort_order=desc")),
+        ("movie list (completed, title)", get("/api/movies/?status=completed&sort_by=title&sort_order=asc")),
+        ("tv list (planned, release)", get("/api/tvshows/?status=planned&sort_by=release_date&sort_order=desc")),
+        ("history (activity desc)", get("/api/history/?sort_by=activity_date&sort_order=desc")),
+        ("history (release desc)", get("/api/history/?sort_by=release_date&sort_order=desc")),
+        ("favorites (anime)", get("/api/favorites/?category=anime")),
+        ("search (anime)", get("/api/anime/?search=bjork")),
+        ("status count (manga)", lambda: MediaItem.objects.filter(media_type="manga", status="ongoing").count()),
+        ("home heatmap", run_query(
+            MediaItem.objects.filter(date_added__gte=datetime.combine(heatmap_start, time.min)).values_list("date_added", flat=True)
+        )),
+        ("home notifications", run_query(MediaItem.objects.filter(notification=True).order_by("-last_updated")[:20])),
+        ("calendar window", run_query(
+            CalendarEvent.objects.filter(date__gte=now - timedelta(days=7), date__lt=now + timedelta(days=8)).select_related("item").order_by("date")
+        )),
+    ]
+
+
+def measure(scenarios, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    results = {}
+    for name, func in scenarios:
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        heaviest = max(ctx.captured_queries, key=lambda q: float(q["time"]), default=None)
+        plan = explain(heaviest["sql"]) if heaviest else []
+        results[name] = {
+            "ms": round(time_call(func, repeat), 2),
+            "queries": len(ctx.captured_queries),
+            "plan": plan,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Optional path to write the raw results as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    db_path = setup_django()
+    print(f"Database: {db_path}")
+
+    migrate()
+    print(f"Seeding {args.items} items...")
+    seed_items(args.items, logs_per_item=1, events_per_item=1)
+    set_list_indexes(False)
+
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    scenarios = build_scenarios()
+
+    before = measure(scenarios, args.repeat)
+    set_list_indexes(True)
+    after = measure(scenarios, args.repeat)
+
+    print(f"\n{'scenario':32} {'before ms':>10} {'after ms':>10}")
+    for name, _ in scenarios:
+        print(f"{name:32} {before[name]['ms']:>10} {after[name]['ms']:>10}")
+
+    print("\nQuery plans (heaviest query per scenario):")
+    for name, _ in scenarios:
+        print(f"\n== {name}")
+        print("  before: " + " | ".join(before[name]["plan"]))
+        print("  after:  " + " | ".join(after[name]["plan"]))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"items": args.items, "before": before, "after": after}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
-from .models import NavItem
+from .services.g_settings import get_nav_items
 
 
 def nav_items(request):
-    items = NavItem.objects.filter(visible=True).order_by("position")
+    items = [item for item in get_nav_items(request) if item.visible]
 
     # Add display name to each item (from choices)
     for item in items:
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.g_images import backfill_image_variants
+
+
+class Command(BaseCommand):
+    help = "Generates the missing thumbnail, detail and banner variants of existing covers and banners."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many images, run again to continue.")
+
+    def handle(self, *args, **options):
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            raise CommandError("Pillow is not installed, run pip install -r requirements.txt first.")
+
+        images, written = backfill_image_variants(limit=options["limit"])
+        self.stdout.write(f"Checked {images} images without variants, wrote {written} variants.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.g_media import clean_orphaned_media, rebuild_media_references
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the media reference table the orphaned media cleanup uses and shows what the cleanup would delete."
+
+    def handle(self, *args, **options):
+        total = rebuild_media_references()
+        self.stdout.write(f"Indexed {total} media references.")
+
+        report = clean_orphaned_media(dry_run=True)
+        self.stdout.write(f"{report['count']} orphaned files ({report['bytes'] // 1024} KB) would be deleted by the next cleanup.")
@@ -1,6 +1,15 @@
 from django.conf import settings
 from django.shortcuts import redirect
-from django.urls import reverse
+from django.urls import Resolver404, resolve, reverse
+
+# Urls that check their own secret instead of the login (calendar apps can't log in)
+LOGIN_EXEMPT_URL_NAMES = {"calendar_feed_token"}
+
+def is_login_exempt(path):
+    try:
+        return resolve(path).url_name in LOGIN_EXEMPT_URL_NAMES
+    except Resolver404:
+        return False
 
 class GlobalLoginRequiredMiddleware:
     def __init__(self, get_response):
@@ -18,10 +27,14 @@ class GlobalLoginRequiredMiddleware:
         if request.path_info == reverse('login'):
             return self.get_response(request)
 
-        # 3. If the user is logged in, let them access the requested file/page.
+        # 3. The tokenized calendar feed checks its token itself.
+        if is_login_exempt(request.path_info):
+            return self.get_response(request)
+
+        # 4. If the user is logged in, let them access the requested file/page.
         if request.user.is_authenticated:
             return self.get_response(request)
 
-        # 4. If we reach here: Toggle is ON, user is NOT logged in, 
+        # 5. If we reach here: Toggle is ON, user is NOT logged in, 
         # and they are trying to view an image/page. Bounce them!
         return redirect('login')
\ No newline at end of file
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:10
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalize(text):
+    # Same rules as core.services.g_utils.normalize_search_text (copied so the migration stays frozen)
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFD', str(text).casefold())
+    return ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+
+
+def populate_search_title(apps, schema_editor):
+    MediaItem = apps.get_model('core', 'MediaItem')
+
+    batch = []
+    for item in MediaItem.objects.only('id', 'title', 'media_type', 'creators').iterator(chunk_size=2000):
+        text = _normalize(item.title)
+        if item.media_type == 'music' and item.creators:
+            if isinstance(item.creators, list):
+                text += " " + _normalize(" ".join(item.creators))
+            elif isinstance(item.creators, str):
+                text += " " + _normalize(item.creators)
+        item.search_title = text
+        batch.append(item)
+
+        if len(batch) >= 2000:
+            MediaItem.objects.bulk_update(batch, ['search_title'])
+            batch = []
+
+    if batch:
+        MediaItem.objects.bulk_update(batch, ['search_title'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_auto_20260725_2044'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaitem',
+            name='search_title',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(populate_search_title, reverse_code=migrations.RunPython.noop),
+    ]
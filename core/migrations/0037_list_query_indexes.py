@@ -0,0 +1,54 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:11
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_mediaitem_search_title'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['date'], name='calendarevent_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['item', 'is_custom'], name='calendarevent_item_custom_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(fields=['media_type', 'status'], name='mediaitem_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(fields=['media_type', 'date_added'], name='mediaitem_type_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(fields=['media_type', 'release_date'], name='mediaitem_type_release_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(models.F('media_type'), django.db.models.functions.text.Lower('title'), name='mediaitem_type_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(fields=['date_added'], name='mediaitem_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(fields=['release_date'], name='mediaitem_release_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(condition=models.Q(('favorite', True)), fields=['media_type', 'favorite_position', 'date_added'], name='mediaitem_favorite_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(condition=models.Q(('notification', True)), fields=['last_updated'], name='mediaitem_notification_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:39
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_list_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AddJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source', models.CharField(max_length=50)),
+                ('source_id', models.CharField(max_length=100)),
+                ('media_type', models.CharField(max_length=20)),
+                ('season_number', models.PositiveIntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('error', 'Error')], default='pending', max_length=20)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('date_added', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                ('item', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='add_jobs', to='core.mediaitem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'source', 'date_added'], name='addjob_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+MEDIA_FIELDS = ['cover_url', 'banner_url', 'seasons', 'episodes', 'related_titles', 'cast']
+
+
+def _media_paths(value, paths):
+    # Same rules as core.services.g_media.media_paths (copied so the migration stays frozen)
+    if isinstance(value, dict):
+        for v in value.values():
+            _media_paths(v, paths)
+    elif isinstance(value, list):
+        for v in value:
+            _media_paths(v, paths)
+    elif isinstance(value, str) and value.startswith('/media/'):
+        path = value.replace('/media/', '', 1).strip('/')
+        if path:
+            paths.add(path)
+    return paths
+
+
+def populate_media_files(apps, schema_editor):
+    MediaItem = apps.get_model('core', 'MediaItem')
+    Screenshot = apps.get_model('core', 'Screenshot')
+    MediaFile = apps.get_model('core', 'MediaFile')
+
+    batch = []
+    for item in MediaItem.objects.only('id', *MEDIA_FIELDS).iterator(chunk_size=2000):
+        for field in MEDIA_FIELDS:
+            for path in _media_paths(getattr(item, field), set()):
+                batch.append(MediaFile(item_id=item.id, field=field, path=path))
+        if len(batch) >= 2000:
+            MediaFile.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    for item_id, url in Screenshot.objects.values_list('item_id', 'url').iterator(chunk_size=2000):
+        for path in _media_paths(url, set()):
+            batch.append(MediaFile(item_id=item_id, field='screenshots', path=path))
+        if len(batch) >= 2000:
+            MediaFile.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    if batch:
+        MediaFile.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_scheduler'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500)),
+                ('field', models.CharField(max_length=30)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media_files', to='core.mediaitem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['path'], name='mediafile_path_idx')],
+                'constraints': [models.UniqueConstraint(fields=('item', 'field', 'path'), name='mediafile_unique_ref')],
+            },
+        ),
+        migrations.RunPython(populate_media_files, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_mediafile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaitem',
+            name='image_sources',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_storedimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=500)),
+                ('name', models.CharField(max_length=20)),
+                ('path', models.CharField(max_length=500)),
+                ('width', models.PositiveIntegerField()),
+                ('source_width', models.PositiveIntegerField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source', 'name'), name='imagevariant_unique_name')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+def _has_sequel(related_titles):
+    # Same rule as MediaItem.build_has_sequel (copied so the migration stays frozen)
+    return any(
+        isinstance(related, dict) and str(related.get('relation') or '').lower() == 'sequel'
+        for related in related_titles or []
+    )
+
+
+def populate_has_sequel(apps, schema_editor):
+    MediaItem = apps.get_model('core', 'MediaItem')
+
+    ids = []
+    items = MediaItem.objects.filter(related_titles__isnull=False).only('id', 'related_titles')
+    for item in items.iterator(chunk_size=2000):
+        if _has_sequel(item.related_titles):
+            ids.append(item.id)
+
+    for i in range(0, len(ids), 500):
+        MediaItem.objects.filter(id__in=ids[i:i + 500]).update(has_sequel=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_imagevariant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaitem',
+            name='has_sequel',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(populate_has_sequel, reverse_code=migrations.RunPython.noop),
+    ]
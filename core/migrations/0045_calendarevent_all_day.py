@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:00
+
+import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_all_day(apps, schema_editor):
+    """
+    Marks the date-only events. Synced ones (TMDB dates, AniList start dates) were stored as
+    midnight UTC converted to TIME_ZONE, they're moved to midnight of that day. Custom events
+    at midnight were added without a time.
+    """
+    CalendarEvent = apps.get_model('core', 'CalendarEvent')
+    tz = timezone.get_default_timezone()
+
+    CalendarEvent.objects.filter(is_custom=True, date__hour=0, date__minute=0, date__second=0).update(all_day=True)
+
+    synced = CalendarEvent.objects.filter(is_custom=False).exclude(title='__API_SYNC__').filter(
+        models.Q(item__source='tmdb') | models.Q(title='Release Date')
+    )
+    to_update = []
+    for event in synced.only('id', 'date').iterator(chunk_size=2000):
+        date = event.date
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date, tz)
+        utc = date.astimezone(datetime.timezone.utc)
+        if utc.time() != datetime.time.min:
+            continue
+        start = datetime.datetime.combine(utc.date(), datetime.time.min)
+        event.date = timezone.make_aware(start, tz) if timezone.is_aware(event.date) else start
+        event.all_day = True
+        to_update.append(event)
+    CalendarEvent.objects.bulk_update(to_update, ['date', 'all_day'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0044_mediaitem_has_sequel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarevent',
+            name='all_day',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(populate_all_day, reverse_code=migrations.RunPython.noop),
+    ]
@@ -2,7 +2,8 @@ import uuid
 
 from django.db import models
 from django.utils import timezone
-from django.db.models import Max
+from django.db.models import Max, F, Q
+from django.db.models.functions import Lower
 
 
 class APIKey(models.Model):
@@ -40,6 +41,7 @@ class MediaItem(models.Model):
     ]
 
     title = models.CharField(max_length=300)
+    search_title = models.TextField(blank=True, default="") # Normalized title (+ artists for music) used by the search boxes, kept in sync by save(). Not indexed, a LIKE '%...%' search scans the table either way
     media_type = models.CharField(max_length=20, choices=MEDIA_TYPES)
 
     source = models.CharField(max_length=50) # old              
@@ -55,9 +57,11 @@ class MediaItem(models.Model):
     seasons = models.JSONField(blank=True, null=True)     # TV - Seasons
     episodes = models.JSONField(blank=True, null=True)    # Seasons - Episode details
     related_titles = models.JSONField(blank=True, null=True)  # Anime, Manga - Prequels, Sequels
+    has_sequel = models.BooleanField(default=False)  # related_titles lists a sequel, kept in sync by save(). The AniList update check skips these
     screenshots = models.JSONField(blank=True, null=True) # Games - Screenshots / Music - Youtube Links + Position # Deprecated, will remove after 3 releases.
     genres = models.JSONField(default=list, blank=True)
     creators = models.JSONField(default=list, blank=True) # Movies, TV - Directors / Anime - Studio / Games - Devs / Manga, Books - Authors / Music - Artists
+    image_sources = models.JSONField(default=dict, blank=True) # Local image url -> the remote url it was downloaded from, refreshes only download images whose remote url changed
 
     progress_main = models.PositiveIntegerField(default=0) # User progress out of the total
     progress_secondary = models.PositiveIntegerField(null=True, blank=True)
@@ -76,8 +80,64 @@ class MediaItem(models.Model):
     notification = models.BooleanField(default=False)
     calendar_last_sync = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Category pages: status counts/filters and the per-type sort keys
+            models.Index(fields=["media_type", "status"], name="mediaitem_type_status_idx"),
+            models.Index(fields=["media_type", "date_added"], name="mediaitem_type_added_idx"),
+            models.Index(fields=["media_type", "release_date"], name="mediaitem_type_release_idx"),
+            models.Index(F("media_type"), Lower("title"), name="mediaitem_type_title_idx"),
+            # History page, home heatmap and recent activity (no type filter)
+            models.Index(fields=["date_added"], name="mediaitem_added_idx"),
+            models.Index(fields=["release_date"], name="mediaitem_release_idx"),
+            # Favorites and notifications only ever read the flagged rows
+            models.Index(
+                fields=["media_type", "favorite_position", "date_added"],
+                condition=Q(favorite=True),
+                name="mediaitem_favorite_idx",
+            ),
+            models.Index(fields=["last_updated"], condition=Q(notification=True), name="mediaitem_notification_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.media_type})"
+
+    def save(self, *args, **kwargs):
+        self.search_title = self.build_search_title()
+        if "related_titles" not in self.get_deferred_fields():
+            self.has_sequel = self.build_has_sequel()
+
+        # Partial saves must also write the columns derived from the fields they touch
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            derived = set()
+            if {"title", "creators"} & set(update_fields):
+                derived.add("search_title")
+            if "related_titles" in update_fields:
+                derived.add("has_sequel")
+            if derived:
+                kwargs["update_fields"] = set(update_fields) | derived
+
+        super().save(*args, **kwargs)
+
+    def build_search_title(self):
+        """Casefolded, accent-free title used for searching. Music also includes the artists."""
+        from core.services.g_utils import normalize_search_text
+
+        text = normalize_search_text(self.title)
+        if self.media_type == "music" and self.creators:
+            if isinstance(self.creators, list):
+                text += " " + normalize_search_text(" ".join(self.creators))
+            elif isinstance(self.creators, str):
+                text += " " + normalize_search_text(self.creators)
+        return text
+
+    def build_has_sequel(self):
+        """True if related_titles lists a sequel (relations are stored capitalized, "Sequel")."""
+        return any(
+            isinstance(related, dict) and str(related.get("relation") or "").lower() == "sequel"
+            for related in self.related_titles or []
+        )
     
     @property
     def source_id(self):
@@ -152,6 +212,8 @@ class CalendarEvent(models.Model):
     )
 
     date = models.DateTimeField() 
+    # Date-only releases, stored at midnight of their day in TIME_ZONE and shown without a time
+    all_day = models.BooleanField(default=False)
     title = models.CharField(max_length=255, blank=True, null=True) 
     is_custom = models.BooleanField(default=False)
     notes = models.TextField(blank=True, null=True)
@@ -163,6 +225,12 @@ class CalendarEvent(models.Model):
     
     date_added = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date"], name="calendarevent_date_idx"),
+            models.Index(fields=["item", "is_custom"], name="calendarevent_item_custom_idx"),
+        ]
+
     def __str__(self):
         return f"{self.item.title} - {self.title or 'Event'} on {self.date}"
 
@@ -309,4 +377,118 @@ class MusicVideo(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"Music Video {self.position} for {self.item.title}"
\ No newline at end of file
+        return f"Music Video {self.position} for {self.item.title}"
+
+class AddJob(models.Model):
+    # Queued add-to-list request. core/services/g_add_queue.py fills in its placeholder item
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("error", "Error"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    item = models.ForeignKey(MediaItem, on_delete=models.SET_NULL, null=True, blank=True, related_name='add_jobs')
+
+    source = models.CharField(max_length=50)
+    source_id = models.CharField(max_length=100)
+    media_type = models.CharField(max_length=20)
+    season_number = models.PositiveIntegerField(null=True, blank=True) # Only for TMDB seasons
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    error = models.TextField(blank=True, null=True)
+
+    date_added = models.DateTimeField(default=timezone.now)
+    last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "source", "date_added"], name="addjob_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.media_type} {self.source_id} ({self.status})"
+
+
+class ScheduledJob(models.Model):
+    # Schedule and last result of a recurring background job from core/services/g_scheduler.py
+    STATUS_CHOICES = [
+        ("idle", "Idle"),
+        ("running", "Running"),
+        ("ok", "OK"),
+        ("error", "Error"),
+    ]
+
+    name = models.CharField(max_length=50, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="idle")
+    next_run = models.DateTimeField(null=True, blank=True)
+    last_started = models.DateTimeField(null=True, blank=True)
+    last_finished = models.DateTimeField(null=True, blank=True)
+    last_message = models.TextField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.status}, next run {self.next_run})"
+
+
+class SchedulerLease(models.Model):
+    # Only the process holding an unexpired lease runs the scheduled jobs
+    name = models.CharField(max_length=50, unique=True)
+    owner = models.CharField(max_length=200)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} held by {self.owner} until {self.expires_at}"
+
+
+class MediaFile(models.Model):
+    # A file under MEDIA_ROOT and the item field that uses it, kept in sync by core/signals.py.
+    # The orphaned media cleanup compares the media folders against this table.
+    path = models.CharField(max_length=500) # Relative to MEDIA_ROOT, e.g. "posters/e4/tmdb_movie_1.jpg"
+    item = models.ForeignKey(MediaItem, on_delete=models.CASCADE, related_name='media_files')
+    field = models.CharField(max_length=30) # cover_url, banner_url, seasons, episodes, related_titles, cast or screenshots
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["item", "field", "path"], name="mediafile_unique_ref"),
+        ]
+        indexes = [
+            models.Index(fields=["path"], name="mediafile_path_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.path} ({self.field} of item {self.item_id})"
+
+
+class StoredImage(models.Model):
+    # A downloaded image and the remote url it came from (see download_images in core/services/g_utils.py).
+    # Files are named by the sha256 of their content, so every url is downloaded once and the
+    # same image behind two urls is stored once. Whether a file is still used is counted from
+    # MediaFile and FavoritePerson, unused ones are deleted by delete_unused_media.
+    url = models.CharField(max_length=1000, unique=True)
+    path = models.CharField(max_length=500, db_index=True) # Relative to MEDIA_ROOT, e.g. "cast/3f/3f9c...e1.jpg"
+    sha256 = models.CharField(max_length=64)
+    size = models.PositiveIntegerField(default=0)
+    date_added = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.url} -> {self.path}"
+
+
+class ImageVariant(models.Model):
+    # A downscaled copy of a cover or banner (see core/services/g_images.py), listed in the srcset
+    # the list APIs return. Generated in the background after the original is saved, files live
+    # under "variants/<name>/" and go away with their original in delete_unused_media.
+    source = models.CharField(max_length=500) # The original, relative to MEDIA_ROOT
+    name = models.CharField(max_length=20) # A key of IMAGE_VARIANTS: thumb, detail or banner
+    path = models.CharField(max_length=500) # e.g. "variants/thumb/posters/3f/3f9c...e1.webp"
+    width = models.PositiveIntegerField()
+    source_width = models.PositiveIntegerField() # So the original can be listed in the srcset too
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source", "name"], name="imagevariant_unique_name"),
+        ]
+
+    def __str__(self):
+        return f"{self.source} ({self.name}, {self.width}px)"
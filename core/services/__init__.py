@@ -1,6 +1,16 @@
 # General (g_) - Repetitive functions for multiple pages or functions that aren't specific for one page or media
 from .g_utils import *  # noqa: F403
+from .g_settings import *  # noqa: F403
+from .g_images import *  # noqa: F403
+from .g_media import *  # noqa: F403
+from .g_http_cache import *  # noqa: F403
+from .g_http import *  # noqa: F403
+from .g_pagination import *  # noqa: F403
+from .g_lists import *  # noqa: F403
 from .g_api import *  # noqa: F403
+from .g_add_queue import *  # noqa: F403
+from .g_refresh import *  # noqa: F403
+from .g_scheduler import *  # noqa: F403
 
 # Media (m_) - Logic for API integration, media data fetching and processing
 from .m_anime_manga import *  # noqa: F403
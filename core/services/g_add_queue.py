@@ -0,0 +1,178 @@
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import AddJob, MediaItem
+from core.services.m_books import save_openlib_item
+from core.services.m_games import save_igdb_item
+from core.services.m_music import save_musicbrainz_item
+from core.services.m_anime_manga import save_anilist_item
+from core.services.m_movies_tvshows import save_tmdb_item, save_tmdb_season
+
+logger = logging.getLogger(__name__)
+
+# One queue per provider. Adds are saved by the queue's worker threads instead of the
+# web server's threads, so a bulk add from Discover can't starve the other pages, and
+# each provider works through its jobs at its own pace (requests still go through the
+# rate limits in g_http).
+ADD_QUEUES = {
+    "tmdb": {"sources": ["tmdb"], "workers": 2},
+    "anilist": {"sources": ["anilist", "mal"], "workers": 1},
+    "igdb": {"sources": ["igdb"], "workers": 2},
+    "openlib": {"sources": ["openlib"], "workers": 1},
+    "musicbrainz": {"sources": ["musicbrainz"], "workers": 1},
+}
+
+# Finished jobs are only needed while the page that queued them polls the status
+FINISHED_JOB_RETENTION = timedelta(days=1)
+IDLE_WAIT = 60
+
+_events = {queue: threading.Event() for queue in ADD_QUEUES}
+_start_lock = threading.Lock()
+_started_workers = False
+
+
+def queue_for_source(source):
+    for queue, config in ADD_QUEUES.items():
+        if source in config["sources"]:
+            return queue
+    return None
+
+
+def enqueue_add(source, source_id, media_type, title="", cover_url="", season_number=None):
+    """
+    Creates the placeholder MediaItem and its AddJob, then wakes the provider's workers.
+    The placeholder already carries the provider id, so the item counts as in the list
+    (and can't be added twice) while its metadata and images are still being fetched.
+    """
+    start_add_workers()
+    AddJob.objects.filter(
+        status__in=["completed", "error"],
+        last_updated__lt=timezone.now() - FINISHED_JOB_RETENTION,
+    ).delete()
+
+    provider_id = f"{source_id}_s{season_number}" if season_number is not None else str(source_id)
+    # Show the search result's poster until the real one is downloaded
+    if not (cover_url or "").startswith(("http://", "https://")):
+        cover_url = ""
+
+    with transaction.atomic():
+        item = MediaItem.objects.create(
+            title=title or "Loading...",
+            media_type=media_type,
+            source=source,
+            provider_ids={source: provider_id},
+            cover_url=cover_url,
+            banner_url="",
+        )
+        job = AddJob.objects.create(
+            item=item,
+            source=source,
+            source_id=str(source_id),
+            media_type=media_type,
+            season_number=season_number,
+        )
+        queue = queue_for_source(source)
+        transaction.on_commit(lambda: _events[queue].set())
+    return job
+
+
+def start_add_workers():
+    """Starts the worker threads once per process and resumes jobs a restart interrupted."""
+    global _started_workers
+    if _started_workers:
+        return
+    with _start_lock:
+        if _started_workers:
+            return
+        _started_workers = True
+
+        AddJob.objects.filter(status="running").update(status="pending")
+        for queue, config in ADD_QUEUES.items():
+            for n in range(config["workers"]):
+                t = threading.Thread(target=_worker, args=(queue,), name=f"add-{queue}-{n + 1}", daemon=True)
+                t.start()
+            _events[queue].set()
+
+
+def _worker(queue):
+    event = _events[queue]
+    sources = ADD_QUEUES[queue]["sources"]
+    while True:
+        event.clear()
+        try:
+            job = _claim_next(sources)
+        except Exception as e:
+            logger.error(f"[ADD QUEUE] Could not read the {queue} queue: {e}")
+            job = None
+
+        if job is None:
+            event.wait(IDLE_WAIT)
+            continue
+        run_add_job(job)
+
+
+def _claim_next(sources):
+    pending = AddJob.objects.filter(status="pending", source__in=sources).order_by("date_added")
+    for job in pending[:5]:
+        # Another worker of the same queue may have taken it since the select
+        if AddJob.objects.filter(pk=job.pk, status="pending").update(status="running"):
+            job.status = "running"
+            return job
+    return None
+
+
+def run_add_job(job):
+    """Fetches the metadata and images of a queued add into its placeholder item."""
+    item = MediaItem.objects.filter(pk=job.item_id).first() if job.item_id else None
+    if item is None:
+        _finish(job, "error", "The item was deleted before it finished loading.")
+        return
+
+    try:
+        response = _save(job, item)
+        result = json.loads(response.content) if response is not None else {}
+        if "error" in result:
+            raise Exception(result["error"])
+    except Exception as e:
+        logger.error(f"[ADD QUEUE] Failed to add {job}: {e}")
+        _finish(job, "error", str(e))
+        # Drop the placeholder so the item can be added again
+        MediaItem.objects.filter(pk=item.pk).delete()
+        return
+
+    _finish(job, "completed")
+
+
+def _save(job, item):
+    source = job.source
+    source_id = job.source_id
+
+    if source == "tmdb":
+        if job.season_number is not None:
+            return save_tmdb_season(source_id, job.season_number, item=item)
+        return save_tmdb_item(job.media_type, source_id, item=item)
+    if source in ["anilist", "mal"]:
+        return save_anilist_item(
+            job.media_type,
+            anilist_id=source_id if source == "anilist" else None,
+            mal_id=source_id if source == "mal" else None,
+            item=item,
+        )
+    if source == "igdb":
+        return save_igdb_item(source_id, item=item)
+    if source == "openlib":
+        return save_openlib_item(source_id, item=item)
+    if source == "musicbrainz":
+        return save_musicbrainz_item(source_id, item=item)
+    raise Exception("Unsupported source")
+
+
+def _finish(job, status, error=None):
+    job.status = status
+    job.error = error
+    job.save(update_fields=["status", "error", "last_updated"])
@@ -1,7 +1,7 @@
-import requests
 
 from core.models import APIKey, MediaItem
 from core.services.m_games import get_igdb_token
+from core.services.g_http import http_post
 
 IGDB_ACCESS_TOKEN = None
 IGDB_TOKEN_EXPIRY = 0
@@ -40,7 +40,7 @@ def get_game_screenshots_data(igdb_id):
     # Fetch only screenshots
     query = f"fields screenshots.url; where id = {igdb_id};"
     try:
-        response = requests.post(
+        response = http_post("igdb",
             "https://api.igdb.com/v4/games", headers=headers, data=query
         )
         if response.status_code == 200:
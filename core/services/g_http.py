@@ -0,0 +1,275 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.services.g_http_cache import cache_rule, cache_key, lookup, store
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "MediaJournal/1.0 (https://github.com/mihail-pop/media-journal)"
+
+# Per provider limits, sized to each API's published rate limit:
+# - rate: requests per second refilled into the bucket (None = not limited)
+# - burst: how many requests can go out back to back before the rate kicks in
+# - concurrency: max requests in flight at the same time (None = not limited)
+# - timeout: default (connect, read) timeout when the caller doesn't pass one
+PROVIDERS = {
+    # ~50 requests/second per IP
+    "tmdb": {"rate": 40, "burst": 20, "concurrency": None, "timeout": 10},
+    # 90 requests/minute, currently degraded to 30/minute (burst + rate stay under 30 in any minute)
+    "anilist": {"rate": 25 / 60, "burst": 5, "concurrency": None, "timeout": 15},
+    # 4 requests/second and at most 8 open requests
+    "igdb": {"rate": 4, "burst": 4, "concurrency": 8, "timeout": 15},
+    "twitch": {"rate": 1, "burst": 2, "concurrency": None, "timeout": 10},
+    # 1 request/second on average per IP
+    "musicbrainz": {"rate": 1, "burst": 1, "concurrency": None, "timeout": 10},
+    "listenbrainz": {"rate": 2, "burst": 2, "concurrency": None, "timeout": 10},
+    # Identified clients (User-Agent) are allowed up to 3 requests/second
+    "openlibrary": {"rate": 1, "burst": 3, "concurrency": None, "timeout": 60},
+    # YouTube search pages and thumbnails are scraped, keep it polite
+    "youtube": {"rate": 5, "burst": 5, "concurrency": None, "timeout": 10},
+    # Cover, banner and cast image CDNs
+    "images": {"rate": None, "burst": None, "concurrency": 16, "timeout": 10},
+    "default": {"rate": None, "burst": None, "concurrency": None, "timeout": 10},
+}
+
+# 429 handling: how many times a request is retried and the longest Retry-After we wait for.
+# Longer waits return the 429 to the caller right away (background tasks stop on it).
+MAX_429_RETRIES = 2
+MAX_RETRY_AFTER = 60
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every thread talking to one provider.
+    A 429 (or an exhausted rate limit header) pauses the whole bucket, not just the
+    thread that got it, so parallel workers back off together.
+    """
+
+    def __init__(self, rate, burst, concurrency=None):
+        self.rate = rate
+        self.capacity = burst or 1
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.rate is None:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + max(0, now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            # Start refilling from empty once the pause is over
+            self.tokens = 0
+            self.updated = self.paused_until
+
+
+_sessions = {}
+_buckets = {}
+_registry_lock = threading.Lock()
+
+_local = threading.local()
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    # Connection errors and 502/503/504 are retried with backoff here, 429 is handled in provider_request
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD", "POST"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(provider):
+    """The pooled keep-alive session of a provider, created on first use."""
+    session = _sessions.get(provider)
+    if session is None:
+        with _registry_lock:
+            session = _sessions.get(provider)
+            if session is None:
+                session = _sessions[provider] = _build_session()
+    return session
+
+
+def get_bucket(provider):
+    bucket = _buckets.get(provider)
+    if bucket is None:
+        with _registry_lock:
+            bucket = _buckets.get(provider)
+            if bucket is None:
+                config = PROVIDERS.get(provider, PROVIDERS["default"])
+                bucket = _buckets[provider] = TokenBucket(config["rate"], config["burst"], config["concurrency"])
+    return bucket
+
+
+def _retry_after_seconds(response):
+    """Seconds to wait from a Retry-After (seconds or HTTP date) or X-RateLimit-Reset header."""
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return None
+
+
+def provider_request(provider, method, url, **kwargs):
+    """
+    Sends a request through the provider's shared session.
+
+    Waits for the provider's rate limit, applies its default timeout and retries 429s
+    after their Retry-After (pausing every thread using the provider meanwhile).
+    Returns the requests.Response like requests.request() would, including the final
+    429 when the retries run out, so callers keep their own status code handling.
+    Pass retry_rate_limited=False to get a 429 back immediately (status checks).
+
+    Endpoints listed in g_http_cache.CACHE_RULES are answered from the on-disk response
+    cache when possible. use_cache=False (or a fresh_responses() block) skips the cached
+    copy but still stores the new response.
+    """
+    max_retries = MAX_429_RETRIES if kwargs.pop("retry_rate_limited", True) else 0
+    use_cache = kwargs.pop("use_cache", True) and not getattr(_local, "fresh", False)
+
+    rule = cache_rule(provider, method, url)
+    if rule is None:
+        return _send(provider, method, url, kwargs, max_retries)
+
+    key = cache_key(provider, method, url, kwargs)
+    if use_cache:
+        cached, state = lookup(provider, key)
+        if state == "fresh":
+            return cached
+        if state == "stale":
+            _revalidate(provider, method, url, kwargs, key, rule)
+            return cached
+
+    response = _send(provider, method, url, kwargs, max_retries)
+    store(provider, key, response, *rule)
+    return response
+
+
+def _send(provider, method, url, kwargs, max_retries):
+    config = PROVIDERS.get(provider, PROVIDERS["default"])
+    kwargs.setdefault("timeout", config["timeout"])
+    session = get_session(provider)
+    bucket = get_bucket(provider)
+
+    attempt = 0
+    while True:
+        bucket.acquire()
+        if bucket.slots is not None:
+            with bucket.slots:
+                response = session.request(method, url, **kwargs)
+        else:
+            response = session.request(method, url, **kwargs)
+
+        if response.status_code != 429:
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                # AniList style headers: the budget is used up until the reset time
+                wait = _retry_after_seconds(response)
+                if wait:
+                    bucket.pause(min(wait, MAX_RETRY_AFTER))
+            return response
+
+        wait = _retry_after_seconds(response)
+        if wait is None:
+            wait = 2 ** attempt
+        bucket.pause(min(wait, MAX_RETRY_AFTER))
+
+        if attempt >= max_retries or wait > MAX_RETRY_AFTER:
+            logger.warning("[HTTP] %s rate limited (429) on %s", provider, url)
+            return response
+        attempt += 1
+        logger.info("[HTTP] %s rate limited, retrying in %.1fs", provider, wait)
+
+
+def _revalidate(provider, method, url, kwargs, key, rule):
+    """Refreshes a stale cache entry in the background, once per key at a time."""
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def run():
+        try:
+            response = _send(provider, method, url, dict(kwargs), MAX_429_RETRIES)
+            store(provider, key, response, *rule)
+        except Exception as e:
+            logger.info("[HTTP CACHE] Revalidating %s failed: %s", url, e)
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+@contextmanager
+def fresh_responses():
+    """
+    Provider calls made by this thread inside the block skip cached responses.
+    For background jobs that exist to pick up changes (refreshes, update loops).
+    Threads started inside the block don't inherit it, they enter their own.
+    """
+    previous = getattr(_local, "fresh", False)
+    _local.fresh = True
+    try:
+        yield
+    finally:
+        _local.fresh = previous
+
+
+def http_get(provider, url, **kwargs):
+    return provider_request(provider, "GET", url, **kwargs)
+
+
+def http_post(provider, url, **kwargs):
+    return provider_request(provider, "POST", url, **kwargs)
+
+
+def http_head(provider, url, **kwargs):
+    kwargs.setdefault("allow_redirects", False)  # Same default as requests.head()
+    return provider_request(provider, "HEAD", url, **kwargs)
@@ -0,0 +1,224 @@
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path(settings.BASE_DIR) / "data" / "http_cache.sqlite3"
+
+# Size bound for the stored (compressed) bodies, least recently used entries go first
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Cacheable endpoints per provider: (url regex, ttl, stale window) in seconds.
+# Within ttl the cached response is served as is. During the stale window after it the
+# cached response is still served right away and refreshed in the background.
+# Anything not listed here (images, tokens, status checks) always goes to the network.
+CACHE_RULES = {
+    "tmdb": [
+        (r"/3/(search|discover|trending)/", HOUR, HOUR),
+        (r"/3/(movie|tv)/[^/]+/(credits|aggregate_credits)$", DAY, 6 * DAY),
+        (r"/3/(movie|tv)/[^/]+(/season/\d+)?$", 6 * HOUR, DAY),
+        (r"/3/(person|collection)/", DAY, 6 * DAY),
+    ],
+    "anilist": [(r"graphql\.anilist\.co", HOUR, DAY)],
+    "igdb": [(r"/v4/(games|game_time_to_beats)$", 6 * HOUR, DAY)],
+    "openlibrary": [
+        (r"/search\.json", HOUR, DAY),
+        (r"/(works|books|authors)/[^/]+\.json$", DAY, 6 * DAY),
+    ],
+    "musicbrainz": [(r"/ws/2/", DAY, 6 * DAY)],
+    "listenbrainz": [(r"/stats/", DAY, DAY)],
+    "youtube": [
+        (r"www\.youtube\.com/results", DAY, 6 * DAY),
+        (r"img\.youtube\.com/vi/", DAY, 6 * DAY),  # HEAD checks for the best thumbnail size
+    ],
+}
+_compiled_rules = {
+    provider: [(re.compile(pattern), ttl, stale) for pattern, ttl, stale in rules]
+    for provider, rules in CACHE_RULES.items()
+}
+
+_lock = threading.Lock()
+_connection = None
+_total_bytes = 0
+_stats = {}
+
+
+def cache_rule(provider, method, url):
+    """(ttl, stale window) for a request, or None if it isn't cacheable."""
+    if method not in ("GET", "POST", "HEAD"):
+        return None
+    for pattern, ttl, stale in _compiled_rules.get(provider, []):
+        if pattern.search(url):
+            return ttl, stale
+    return None
+
+
+def cache_key(provider, method, url, kwargs):
+    """Provider + endpoint + params + body. Headers are left out (tokens rotate)."""
+    params = kwargs.get("params") or {}
+    if isinstance(params, dict):
+        params = sorted((str(k), str(v)) for k, v in params.items())
+    body = kwargs.get("json")
+    if body is None:
+        body = kwargs.get("data")
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    raw = json.dumps([provider, method, url, params, body], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _get_connection():
+    global _connection, _total_bytes
+    if _connection is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(CACHE_PATH), check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fresh_until REAL NOT NULL,
+                stale_until REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_stale_until ON responses (stale_until)")
+        _total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        _connection = conn
+    return _connection
+
+
+def _count(provider, name):
+    counters = _stats.setdefault(provider, {"hits": 0, "stale_hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+    counters[name] += 1
+
+
+def lookup(provider, key):
+    """
+    Returns (response, state) where state is "fresh", "stale" or None (miss/expired).
+    Counts the hit or miss for the provider.
+    """
+    now = time.time()
+    with _lock:
+        try:
+            conn = _get_connection()
+            row = conn.execute(
+                "SELECT url, status, headers, encoding, body, fresh_until, stale_until FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[6] < now:
+                _count(provider, "misses")
+                return None, None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("[HTTP CACHE] Lookup failed: %s", e)
+            return None, None
+
+        state = "fresh" if row[5] >= now else "stale"
+        _count(provider, "hits" if state == "fresh" else "stale_hits")
+
+    url, status, headers, encoding, body, _, _ = row
+    response = Response()
+    response.status_code = status
+    response.url = url
+    response.headers = CaseInsensitiveDict(json.loads(headers))
+    response.encoding = encoding
+    response._content = zlib.decompress(body)
+    response.from_cache = True
+    return response, state
+
+
+def store(provider, key, response, ttl, stale):
+    """Saves a successful response and evicts the least recently used entries over the size bound."""
+    global _total_bytes
+    if response.status_code != 200:
+        return
+
+    body = zlib.compress(response.content)
+    headers = {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "content-length", "etag", "last-modified")}
+    now = time.time()
+    with _lock:
+        try:
+            conn = _get_connection()
+            old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, response.url, response.status_code, json.dumps(headers), response.encoding,
+                 body, len(body), now + ttl, now + ttl + stale, now),
+            )
+            _total_bytes += len(body) - (old[0] if old else 0)
+            _count(provider, "stores")
+
+            if _total_bytes > MAX_CACHE_BYTES:
+                _evict(conn, now)
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("[HTTP CACHE] Store failed: %s", e)
+
+
+def _evict(conn, now):
+    """Drops expired entries, then the least recently used ones until 90% of the bound."""
+    global _total_bytes
+    conn.execute("DELETE FROM responses WHERE stale_until < ?", (now,))
+    _total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    target = MAX_CACHE_BYTES * 0.9
+    rows = conn.execute("SELECT key, provider, size FROM responses ORDER BY last_access").fetchall()
+    doomed = []
+    for key, provider, size in rows:
+        if _total_bytes <= target:
+            break
+        doomed.append((key,))
+        _total_bytes -= size
+        _count(provider, "evictions")
+    conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+
+def clear_response_cache():
+    global _total_bytes
+    with _lock:
+        conn = _get_connection()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
+        _total_bytes = 0
+
+
+def response_cache_stats():
+    """Hit/miss counters per provider since startup plus the current size of the cache."""
+    with _lock:
+        try:
+            conn = _get_connection()
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        return {
+            "entries": entries,
+            "bytes": _total_bytes,
+            "max_bytes": MAX_CACHE_BYTES,
+            "providers": {provider: dict(counters) for provider, counters in _stats.items()},
+        }
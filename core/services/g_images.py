@@ -0,0 +1,246 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from core.models import ImageVariant, MediaItem
+
+logger = logging.getLogger(__name__)
+
+# Downscaled copies of covers and banners. The grid cards are 150px wide (293px in portrait),
+# so a card never needs more than the 2x "detail" copy instead of the full TMDB/upload size.
+# Originals narrower than a variant don't get it, the srcset falls back to the original.
+IMAGE_VARIANTS = {
+    "thumb": {"width": 300, "fields": ["cover_url"]},
+    "detail": {"width": 600, "fields": ["cover_url"]},
+    "banner": {"width": 1280, "fields": ["banner_url"]},
+}
+VARIANT_FIELDS = {field for variant in IMAGE_VARIANTS.values() for field in variant["fields"]}
+VARIANTS_FOLDER = "variants"
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+# Resizing is CPU bound, a small pool keeps it from starving the requests
+IMAGE_VARIANT_WORKERS = 2
+BATCH_SIZE = 500
+
+_pool = None
+_pool_lock = threading.Lock()
+_queued = set()  # Sources waiting in or being handled by the pool
+_missing_pillow = False
+
+
+def variant_names(field):
+    return [name for name, variant in IMAGE_VARIANTS.items() if field in variant["fields"]]
+
+
+def variant_path(source, name, ext=".webp"):
+    """'posters/3f/3f9c...e1.jpg' -> 'variants/thumb/posters/3f/3f9c...e1.webp'"""
+    return f"{VARIANTS_FOLDER}/{name}/{os.path.splitext(source)[0]}{ext}"
+
+
+def _load_pillow():
+    """Pillow is imported on first use, without it the originals are served as they are."""
+    global _missing_pillow
+    try:
+        from PIL import Image, ImageOps, features
+    except ImportError:
+        if not _missing_pillow:
+            logger.warning("Pillow is not installed, no image variants will be generated.")
+            _missing_pillow = True
+        return None
+    return Image, ImageOps, features
+
+
+def generate_variants(source, names):
+    """
+    Writes the given variants of one image (relative to MEDIA_ROOT) and records them.
+    WebP if Pillow supports it, JPEG otherwise. Returns the number of variants written.
+    """
+    pillow = _load_pillow()
+    if pillow is None:
+        return 0
+    Image, ImageOps, features = pillow
+    webp = features.check("webp")
+
+    try:
+        with Image.open(os.path.join(settings.MEDIA_ROOT, source)) as image:
+            image = ImageOps.exif_transpose(image)
+            source_width, source_height = image.size
+            if image.mode not in ("RGB", "RGBA") or not webp:
+                image = image.convert("RGBA" if webp and "A" in image.getbands() else "RGB")
+
+            variants = []
+            for name in names:
+                width = IMAGE_VARIANTS[name]["width"]
+                if width >= source_width:
+                    continue
+                height = max(1, round(source_height * width / source_width))
+                path = variant_path(source, name, ".webp" if webp else ".jpg")
+                local_path = os.path.join(settings.MEDIA_ROOT, path)
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                temp_path = f"{local_path}.{threading.get_ident()}.tmp"
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                if webp:
+                    resized.save(temp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+                else:
+                    resized.save(temp_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+                os.replace(temp_path, local_path)
+                variants.append(ImageVariant(
+                    source=source, name=name, path=path, width=width, source_width=source_width,
+                ))
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning(f"Could not generate variants of {source}: {e}")
+        return 0
+
+    if variants:
+        ImageVariant.objects.bulk_create(
+            variants,
+            update_conflicts=True,
+            unique_fields=["source", "name"],
+            update_fields=["path", "width", "source_width"],
+        )
+    return len(variants)
+
+
+def _run(source, names):
+    try:
+        # Shared store files already have them
+        names = missing_variants({source: names}).get(source)
+        if names:
+            generate_variants(source, names)
+    except Exception as e:
+        logger.error(f"Image variants of {source} failed: {e}")
+    finally:
+        with _pool_lock:
+            _queued.discard(source)
+        connection.close()
+
+
+def _submit(jobs):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variants")
+        for source, names in jobs.items():
+            if source not in _queued:
+                _queued.add(source)
+                _pool.submit(_run, source, names)
+
+
+def queue_image_variants(paths_by_field):
+    """
+    Generates the variants of newly referenced images in the background pool, after the
+    transaction that references them commits. Takes {field: relative paths}.
+    """
+    jobs = {}
+    for field, paths in paths_by_field.items():
+        names = variant_names(field)
+        for path in paths:
+            if names and not path.startswith(f"{VARIANTS_FOLDER}/"):
+                jobs.setdefault(path, set()).update(names)
+    if jobs:
+        transaction.on_commit(lambda: _submit(jobs))
+
+
+def image_srcsets(urls):
+    """
+    {url: srcset} of the given /media/ urls that have variants, one query per batch. Urls
+    without variants are left out, their <img> just uses the original.
+    """
+    prefix = settings.MEDIA_URL
+    sources = {url[len(prefix):]: url for url in urls if url and url.startswith(prefix)}
+    candidates = {}
+    keys = list(sources)
+    for i in range(0, len(keys), BATCH_SIZE):
+        rows = ImageVariant.objects.filter(source__in=keys[i:i + BATCH_SIZE]).values_list(
+            "source", "path", "width", "source_width"
+        )
+        for source, path, width, source_width in rows:
+            entry = candidates.setdefault(source, {source_width: sources[source]})
+            entry[width] = prefix + path
+
+    return {
+        sources[source]: ", ".join(f"{url} {width}w" for width, url in sorted(entry.items()))
+        for source, entry in candidates.items()
+    }
+
+
+def add_srcsets(rows, url_key="cover_url", srcset_key="cover_srcset"):
+    """Sets rows[i][srcset_key] for a page of serialized items, "" for images without variants."""
+    srcsets = image_srcsets({row[url_key] for row in rows})
+    for row in rows:
+        row[srcset_key] = srcsets.get(row[url_key], "")
+    return rows
+
+
+def delete_image_variants(sources):
+    """Deletes the variant files and rows of deleted originals."""
+    sources = list(sources)
+    for i in range(0, len(sources), BATCH_SIZE):
+        variants = ImageVariant.objects.filter(source__in=sources[i:i + BATCH_SIZE])
+        for path in variants.values_list("path", flat=True):
+            try:
+                os.remove(os.path.join(settings.MEDIA_ROOT, path))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete {path}: {e}")
+        variants.delete()
+
+
+def missing_variants(jobs):
+    """The part of {source: variant names} that was never generated (paths are never reused)."""
+    jobs = {source: set(names) for source, names in jobs.items()}
+    keys = list(jobs)
+    for i in range(0, len(keys), BATCH_SIZE):
+        rows = ImageVariant.objects.filter(source__in=keys[i:i + BATCH_SIZE]).values_list("source", "name")
+        for source, name in rows:
+            jobs[source].discard(name)
+    return {source: names for source, names in jobs.items() if names}
+
+
+def _generate_batch(jobs):
+    with ThreadPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS) as pool:
+        futures = [pool.submit(generate_variants, source, names) for source, names in jobs.items()]
+    return sum(future.result() for future in futures)
+
+
+def backfill_image_variants(limit=None):
+    """
+    Generates the variants the existing covers and banners are missing: media saved before
+    variants existed, while Pillow wasn't installed, or through a bulk import. Safe to stop
+    and rerun, images that have their variants are skipped (originals narrower than a variant
+    are opened again each run). Returns (images handled, variants written).
+    """
+    if _load_pillow() is None:
+        return 0, 0
+    prefix = settings.MEDIA_URL
+    fields = sorted(VARIANT_FIELDS)
+    images = written = 0
+    pending = {}
+
+    def flush():
+        nonlocal images, written
+        jobs = missing_variants(pending)
+        pending.clear()
+        if limit is not None:
+            jobs = dict(list(jobs.items())[:limit - images])
+        images += len(jobs)
+        written += _generate_batch(jobs)
+
+    rows = MediaItem.objects.values_list(*fields).order_by("pk").iterator(chunk_size=BATCH_SIZE)
+    for row in rows:
+        for field, url in zip(fields, row):
+            if url and url.startswith(prefix):
+                pending.setdefault(url[len(prefix):], set()).update(variant_names(field))
+        if len(pending) >= BATCH_SIZE:
+            flush()
+            if limit is not None and images >= limit:
+                return images, written
+    if pending:
+        flush()
+    return images, written
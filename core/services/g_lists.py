@@ -0,0 +1,262 @@
+from datetime import datetime
+
+from django.db.models import F, Case, When, Value, IntegerField, Count, OuterRef, Subquery, Prefetch
+from django.db.models.functions import Coalesce, Lower
+
+from core.models import MediaItem, MediaItemLog
+from core.services.g_utils import normalize_search_text
+
+
+def _total_or_progress(total, progress):
+    # Sort by the total when the API gave one, otherwise by how far the user got
+    return Case(
+        When(**{f"{total}__isnull": True}, then=F(progress)),
+        When(**{total: 0}, then=F(progress)),
+        default=F(total),
+        output_field=IntegerField(),
+    )
+
+
+STATUS_ORDERING = Case(
+    When(status="ongoing", then=Value(1)),
+    When(status="completed", then=Value(2)),
+    When(status="on_hold", then=Value(3)),
+    When(status="planned", then=Value(4)),
+    When(status="dropped", then=Value(5)),
+    default=Value(6),
+    output_field=IntegerField(),
+)
+
+# Sorts every list page supports
+COMMON_SORTS = {
+    "rating": Case(
+        When(personal_rating=None, then=Value(0)),
+        default=F("personal_rating"),
+        output_field=IntegerField(),
+    ),
+    "activity_date": F("date_added"),
+    "date": F("date_added"),  # Older music pages saved this name
+    "release_date": F("release_date"),
+}
+
+# Columns every list row needs (source + provider_ids back the source_id property)
+BASE_FIELDS = [
+    "id", "title", "media_type", "status", "personal_rating", "cover_url", "banner_url",
+    "notes", "source", "provider_ids", "repeats", "date_added", "release_date", "favorite",
+]
+
+# Per list page configuration, keyed by the slug used in /api/<slug>/
+# - sorts: extra sort keys on top of COMMON_SORTS
+# - fields: extra columns loaded and serialized under their own name
+# - extra_output: extra keys only some pages send, mapped to the item attribute
+LIST_TYPES = {
+    "movies": {
+        "media_type": "movie",
+        "sorts": {
+            "length": Case(
+                When(total_main__isnull=True, then=Value(0)),
+                default=F("total_main"),
+                output_field=IntegerField(),
+            ),
+        },
+        "fields": ["total_main"],
+    },
+    "tvshows": {
+        "media_type": "tv",
+        "sorts": {
+            "episodes": _total_or_progress("total_main", "progress_main"),
+            "seasons": _total_or_progress("total_secondary", "progress_secondary"),
+        },
+        "fields": ["progress_main", "total_main", "progress_secondary", "total_secondary"],
+        "type_filter": True,
+    },
+    "anime": {
+        "media_type": "anime",
+        "sorts": {"episodes": _total_or_progress("total_main", "progress_main")},
+        "fields": ["progress_main", "total_main"],
+        "extra_output": {"source": "source", "provider_ids": "provider_ids"},
+    },
+    "manga": {
+        "media_type": "manga",
+        "sorts": {
+            "chapters": _total_or_progress("total_main", "progress_main"),
+            "volumes": _total_or_progress("total_secondary", "progress_secondary"),
+        },
+        "fields": ["progress_main", "total_main", "progress_secondary", "total_secondary"],
+        "extra_output": {"source": "source", "provider_ids": "provider_ids"},
+    },
+    "games": {
+        "media_type": "game",
+        "sorts": {"hours": F("progress_main")},
+        "fields": ["progress_main", "total_main"],
+    },
+    "books": {
+        "media_type": "book",
+        "sorts": {"pages": _total_or_progress("total_main", "progress_main")},
+        "fields": ["progress_main", "total_main"],
+    },
+    "music": {
+        "media_type": "music",
+        "sorts": {},
+        "fields": [],
+        "extra_output": {"provider_ids": "provider_ids", "is_favorite": "favorite"},
+        "music_videos": True,
+    },
+}
+
+LOG_FIELDS = [
+    "id", "item_id", "title", "content", "activity_date", "score",
+    "is_spoiler", "progress_unit", "progress_start", "progress_end",
+]
+
+
+def build_list_queryset(config, params, include_logs=False):
+    """
+    Builds the filtered, sorted queryset for one list page.
+    Returns (queryset, order_fields) so the caller can paginate by page or cursor.
+    """
+    status = params.get("status", "all")
+    search = params.get("search", "").strip()
+    genres_param = params.get("genres", "")
+    collections_param = params.get("collections", "")
+    filter_mode = params.get("filter_mode", "include")
+    sort_by = params.get("sort_by", "rating")
+    sort_order = params.get("sort_order", "desc")
+
+    queryset = MediaItem.objects.filter(media_type=config["media_type"])
+
+    if status != "all":
+        queryset = queryset.filter(status=status)
+
+    if search:
+        # search_title also holds the artists for music items
+        queryset = queryset.filter(search_title__contains=normalize_search_text(search))
+
+    if genres_param:
+        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
+        for g in selected_genres:
+            if filter_mode == "exclude":
+                queryset = queryset.exclude(genres__icontains=g)
+            else:
+                queryset = queryset.filter(genres__icontains=g)
+
+    if collections_param:
+        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
+        if filter_mode == "exclude":
+            # Exclude items that are in ANY of the selected collections
+            queryset = queryset.exclude(collections__id__in=selected_collections)
+        else:
+            # Include items that are in AT LEAST ONE of the selected collections
+            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
+
+    if config.get("type_filter"):
+        # TV shows vs seasons ('both' shows everything)
+        type_filter = params.get("type", "both")
+        if type_filter == "shows":
+            queryset = queryset.exclude(provider_ids__tmdb__icontains="_s")
+        elif type_filter == "seasons":
+            queryset = queryset.filter(provider_ids__tmdb__icontains="_s")
+
+    # Only the columns the grid needs, the heavy JSON metadata stays in the database
+    queryset = queryset.only(*BASE_FIELDS, *config["fields"]).annotate(
+        status_order=STATUS_ORDERING,
+        log_count=Coalesce(
+            Subquery(
+                MediaItemLog.objects.filter(item=OuterRef("pk"))
+                .order_by().values("item").annotate(c=Count("id")).values("c")
+            ),
+            0,
+        ),
+    )
+
+    order_fields = ["status_order"]
+    sort_expression = config["sorts"].get(sort_by, COMMON_SORTS.get(sort_by))
+    if sort_by == "title":
+        if sort_order == "asc":
+            order_fields.extend([Lower("title"), "title"])
+        else:
+            order_fields.extend([Lower("title").desc(), "-title"])
+    elif sort_expression is not None:
+        queryset = queryset.annotate(sort_value=sort_expression)
+        order_fields.append("-sort_value" if sort_order == "desc" else "sort_value")
+        order_fields.extend([Lower("title"), "title"])  # Secondary sort
+
+    if include_logs:
+        queryset = queryset.prefetch_related(
+            Prefetch("logs", queryset=MediaItemLog.objects.only(*LOG_FIELDS))
+        )
+    if config.get("music_videos"):
+        queryset = queryset.prefetch_related("music_videos")
+
+    return queryset.order_by(*order_fields), order_fields
+
+
+def serialize_log(log):
+    return {
+        "id": log.id,
+        "title": log.title or "Log",
+        "content": log.content,
+        "activity_date": log.activity_date.strftime("%d %b %Y"),
+        "score": log.score,
+        "is_spoiler": log.is_spoiler,
+        "progress_unit": log.progress_unit,
+        "progress_start": log.progress_start,
+        "progress_end": log.progress_end
+    }
+
+
+def serialize_list_item(item, config, include_logs=False):
+    data = {
+        "id": item.id,
+        "title": item.title,
+        "log_count": item.log_count,
+        "media_type": item.media_type,
+        "status": item.status,
+        "personal_rating": item.personal_rating,
+        "cover_url": item.cover_url or "/static/core/img/placeholder.png",
+        "banner_url": item.banner_url,
+        "notes": item.notes or "",
+        "source_id": item.source_id,
+        "get_status_display": item.get_status_display(),
+        "repeats": item.repeats,
+        "date_added": item.date_added.isoformat() if item.date_added else "",
+        "release_date": (
+            datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
+            if item.release_date else ""
+        ),
+    }
+    if include_logs:
+        data["logs"] = [serialize_log(log) for log in item.logs.all()]
+
+    for field in config["fields"]:
+        data[field] = getattr(item, field)
+    for key, attr in config.get("extra_output", {}).items():
+        data[key] = getattr(item, attr)
+
+    if config.get("music_videos"):
+        data["youtube_links"] = [
+            {"url": v.url, "position": v.position, "is_favorite": v.is_favorite}
+            for v in item.music_videos.all()
+        ]
+    return data
+
+
+def get_logs_for_items(item_ids):
+    """Journal logs grouped by item id, for list views that load them on demand."""
+    logs = {str(item_id): [] for item_id in item_ids}
+    for log in MediaItemLog.objects.filter(item_id__in=item_ids).only(*LOG_FIELDS):
+        logs[str(log.item_id)].append(serialize_log(log))
+    return logs
+
+
+def get_list_banners(config):
+    """All banners of one media type for the list page rotator."""
+    banners = []
+    for row in MediaItem.objects.filter(media_type=config["media_type"]).values("banner_url", "notes"):
+        banner_url = row["banner_url"]
+        notes = row["notes"] or ""
+        if banner_url and "placeholder" not in banner_url:
+            banners.append(
+                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
+            )
+    return banners
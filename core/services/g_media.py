@@ -0,0 +1,235 @@
+import os
+import time
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from core.models import FavoritePerson, MediaFile, MediaItem, Screenshot, StoredImage
+from core.services.g_images import VARIANT_FIELDS, delete_image_variants, queue_image_variants
+
+logger = logging.getLogger(__name__)
+
+# Store images reused by a download are touched. delete_unused_media() leaves recently touched
+# ones alone, so an item being saved with one can't lose it to a concurrent delete.
+STORE_REUSE_GRACE_SECONDS = 10 * 60
+
+# MediaItem fields that can hold /media/ paths (the JSON ones at any depth)
+MEDIA_FIELDS = ["cover_url", "banner_url", "seasons", "episodes", "related_titles", "cast"]
+
+# Folders the orphaned media cleanup works on
+CLEANUP_FOLDERS = ["posters", "banners", "screenshots", "seasons", "episodes", "related", "cast"]
+
+# Files are downloaded before the item that uses them is saved, so recent files are left
+# alone even if nothing references them yet
+CLEANUP_GRACE_SECONDS = 24 * 60 * 60
+
+BATCH_SIZE = 500
+
+
+def media_paths(value, paths=None):
+    """Every /media/ path inside a field value (strings, lists, dicts), relative to MEDIA_ROOT."""
+    if paths is None:
+        paths = set()
+    if isinstance(value, dict):
+        for v in value.values():
+            media_paths(v, paths)
+    elif isinstance(value, list):
+        for v in value:
+            media_paths(v, paths)
+    elif isinstance(value, str) and value.startswith("/media/"):
+        path = value.replace("/media/", "", 1).strip("/")
+        if path:
+            paths.add(path)
+    return paths
+
+
+def _sync_refs(item_id, field, paths, created=False):
+    existing = set() if created else set(
+        MediaFile.objects.filter(item_id=item_id, field=field).values_list("path", flat=True)
+    )
+    removed = existing - paths
+    if removed:
+        MediaFile.objects.filter(item_id=item_id, field=field, path__in=removed).delete()
+    added = paths - existing
+    if added:
+        MediaFile.objects.bulk_create(
+            [MediaFile(item_id=item_id, field=field, path=path) for path in added],
+            ignore_conflicts=True,
+        )
+    return added
+
+
+def sync_item_media(item, fields=None, created=False):
+    """
+    Updates the references of the given (loaded) MediaItem fields after a save, and queues
+    the image variants of new covers and banners.
+    """
+    added = {}
+    for field in fields or MEDIA_FIELDS:
+        added[field] = _sync_refs(item.pk, field, media_paths(getattr(item, field)), created)
+    queue_image_variants({field: paths for field, paths in added.items() if field in VARIANT_FIELDS})
+
+
+def sync_screenshot_media(item_id):
+    """Updates the screenshot references of an item, for writes that skip the signals (bulk_create)."""
+    urls = Screenshot.objects.filter(item_id=item_id).values_list("url", flat=True)
+    _sync_refs(item_id, "screenshots", media_paths(list(urls)))
+
+
+def rebuild_media_references():
+    """Rebuilds the whole table from the items and screenshots. Returns the number of references."""
+    total = 0
+    batch = []
+
+    def flush():
+        nonlocal total
+        MediaFile.objects.bulk_create(batch, ignore_conflicts=True)
+        total += len(batch)
+        batch.clear()
+
+    with transaction.atomic():
+        MediaFile.objects.all().delete()
+        for item in MediaItem.objects.only("id", *MEDIA_FIELDS).iterator(chunk_size=BATCH_SIZE):
+            for field in MEDIA_FIELDS:
+                for path in media_paths(getattr(item, field)):
+                    batch.append(MediaFile(item_id=item.id, field=field, path=path))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        for item_id, url in Screenshot.objects.values_list("item_id", "url").iterator(chunk_size=BATCH_SIZE):
+            for path in media_paths(url):
+                batch.append(MediaFile(item_id=item_id, field="screenshots", path=path))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+    return total
+
+
+def media_reference_counts(paths):
+    """
+    {path: number of references} of the given files: the item fields and screenshots that
+    use them (MediaFile) and the favorite people whose image they are. Unused paths are left out.
+    """
+    counts = {}
+    paths = list(paths)
+    for i in range(0, len(paths), BATCH_SIZE):
+        batch = paths[i:i + BATCH_SIZE]
+        for path in MediaFile.objects.filter(path__in=batch).values_list("path", flat=True):
+            counts[path] = counts.get(path, 0) + 1
+        urls = [settings.MEDIA_URL + path for path in batch]
+        for url in FavoritePerson.objects.filter(image_url__in=urls).values_list("image_url", flat=True):
+            path = url[len(settings.MEDIA_URL):]
+            counts[path] = counts.get(path, 0) + 1
+    return counts
+
+
+def _referenced(paths):
+    return set(media_reference_counts(paths))
+
+
+def forget_stored_images(paths):
+    """Drops the StoredImage rows of deleted files, so their urls are downloaded again."""
+    paths = list(paths)
+    for i in range(0, len(paths), BATCH_SIZE):
+        StoredImage.objects.filter(path__in=paths[i:i + BATCH_SIZE]).delete()
+
+
+def delete_unused_media(paths):
+    """
+    Deletes the given files (relative to MEDIA_ROOT) once nothing references them anymore.
+    Downloaded images can be shared by many items (see StoredImage), so anything that
+    replaces or removes an image goes through here instead of deleting the file itself.
+    """
+    paths = set(paths)
+    if not paths:
+        return
+    unused = paths - _referenced(paths)
+    if not unused:
+        return
+
+    # Store files reused in the last minutes may be about to be referenced by an item being saved
+    cutoff = time.time() - STORE_REUSE_GRACE_SECONDS
+    stored = set(StoredImage.objects.filter(path__in=unused).values_list("path", flat=True))
+    deleted = []
+    for rel_path in unused:
+        abs_path = os.path.join(settings.MEDIA_ROOT, rel_path)
+        try:
+            if rel_path in stored and os.path.getmtime(abs_path) > cutoff:
+                continue
+            os.remove(abs_path)
+            deleted.append(rel_path)
+        except FileNotFoundError:
+            deleted.append(rel_path)
+        except OSError as e:
+            logger.warning(f"Could not delete {abs_path}: {e}")
+    forget_stored_images(deleted)
+    delete_image_variants(deleted)
+
+
+def find_orphaned_media(remove_empty_folders=False):
+    """
+    Yields (relative path, absolute path, size) for every file in the cleanup folders
+    that no MediaFile references. Works one folder at a time with os.scandir, so only
+    one shard folder's names are held in memory.
+    """
+    media_root = settings.MEDIA_ROOT
+    cutoff = time.time() - CLEANUP_GRACE_SECONDS
+
+    for folder_name in CLEANUP_FOLDERS:
+        stack = [os.path.join(media_root, folder_name)]
+        while stack:
+            folder = stack.pop()
+            files = {}
+            has_entries = False
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        has_entries = True
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and not entry.name.startswith("."):
+                            stat = entry.stat(follow_symlinks=False)
+                            if stat.st_mtime < cutoff:
+                                rel_path = os.path.relpath(entry.path, media_root).replace("\\", "/")
+                                files[rel_path] = (entry.path, stat.st_size)
+            except FileNotFoundError:
+                continue
+
+            # Clean empty shard folders along the way
+            if not has_entries and remove_empty_folders and os.path.basename(folder) != folder_name:
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    pass
+                continue
+
+            referenced = _referenced(files)
+            for rel_path, (abs_path, size) in files.items():
+                if rel_path not in referenced:
+                    yield rel_path, abs_path, size
+
+
+def clean_orphaned_media(dry_run=False, sample_size=50):
+    """
+    Deletes the files find_orphaned_media() yields, or with dry_run=True only counts them.
+    Returns a report with the count, total size and the first sample_size paths.
+    """
+    report = {"dry_run": dry_run, "count": 0, "bytes": 0, "deleted": 0, "files": []}
+    deleted = []
+    for rel_path, abs_path, size in find_orphaned_media(remove_empty_folders=not dry_run):
+        report["count"] += 1
+        report["bytes"] += size
+        if len(report["files"]) < sample_size:
+            report["files"].append(rel_path)
+        if dry_run:
+            continue
+        try:
+            os.remove(abs_path)
+            report["deleted"] += 1
+            deleted.append(rel_path)
+        except OSError as e:
+            logger.warning(f"Could not delete {abs_path}: {e}")
+    forget_stored_images(deleted)
+    delete_image_variants(deleted)
+    return report
@@ -0,0 +1,124 @@
+import json
+import base64
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+
+
+def paginate_queryset(request, queryset, order_fields, page_size):
+    """
+    Returns (items, has_more, next_cursor) for the infinite-scroll list APIs.
+
+    Default mode slices with OFFSET and runs a COUNT for has_more (next_cursor is None).
+    Passing ?cursor= (empty for the first page) switches to keyset mode: rows are fetched
+    after the sort key of the previous page's last row, page_size + 1 rows tell us if
+    there's more and no COUNT is ever issued.
+    """
+    cursor = request.GET.get("cursor")
+    if cursor is None:
+        page = int(request.GET.get("page", 1))
+        start = (page - 1) * page_size
+        end = start + page_size
+        items = list(queryset[start:end])
+        return items, queryset.count() > end, None
+
+    return keyset_page(queryset, order_fields, cursor, page_size)
+
+
+def keyset_page(queryset, order_fields, cursor, page_size):
+    """
+    Keyset pagination over any list of order_by() arguments ("-field", "field",
+    expressions or OrderBy). The primary key is appended as a tie-breaker so the
+    cursor always points at exactly one row.
+    """
+    keys = _normalize_order(order_fields)
+    keys.append((F("pk"), False))
+
+    annotations = {f"_cursor_{i}": expr for i, (expr, _) in enumerate(keys)}
+    queryset = queryset.annotate(**annotations).order_by(
+        *[F(name).desc() if desc else F(name).asc() for name, (_, desc) in zip(annotations, keys)]
+    )
+
+    items = None
+    values = _decode_cursor(cursor, len(keys))
+    if values is not None:
+        try:
+            items = list(queryset.filter(_after_filter(list(annotations), keys, values))[:page_size + 1])
+        except (TypeError, ValueError, ValidationError):
+            # Values the sort fields can't take (an edited or outdated cursor): start over
+            items = None
+    if items is None:
+        items = list(queryset[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = _encode_cursor([getattr(last, name) for name in annotations])
+
+    return items, has_more, next_cursor
+
+
+def _normalize_order(order_fields):
+    keys = []
+    for field in order_fields:
+        if isinstance(field, str):
+            if field.startswith("-"):
+                keys.append((F(field[1:]), True))
+            else:
+                keys.append((F(field), False))
+        elif isinstance(field, OrderBy):
+            keys.append((field.expression, field.descending))
+        else:
+            keys.append((field, False))
+    return keys
+
+
+def _after_filter(names, keys, values):
+    """
+    Builds (k0 > v0) OR (k0 = v0 AND k1 > v1) OR ... honoring each key's direction.
+    SQLite sorts NULL first ascending and last descending, so NULLs are handled explicitly.
+    """
+    condition = Q(pk__in=[])
+    equal_so_far = Q()
+    for name, (_, desc), value in zip(names, keys, values):
+        if value is None:
+            # NULLs sort first ascending: every non-null value comes after. Descending: nothing does.
+            after = Q(**{f"{name}__isnull": False}) if not desc else Q(pk__in=[])
+            equal = Q(**{f"{name}__isnull": True})
+        else:
+            lookup = "lt" if desc else "gt"
+            after = Q(**{f"{name}__{lookup}": value})
+            if desc:
+                after |= Q(**{f"{name}__isnull": True})
+            equal = Q(**{name: value})
+        condition |= equal_so_far & after
+        equal_so_far &= equal
+    return condition
+
+
+def _encode_cursor(values):
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return str(o)
+    raw = json.dumps(values, default=default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor, size):
+    """The sort key values of a cursor, None if it isn't a list of `size` plain values."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values):
+        return None
+    return values
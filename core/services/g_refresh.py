@@ -0,0 +1,139 @@
+import os
+
+from django.conf import settings
+
+from core.services.g_media import MEDIA_FIELDS, media_paths
+from core.services.g_utils import METADATA_IMAGE_SLOTS, download_metadata_images, metadata_entry_id
+from core.services.m_books import fetch_openlib_metadata
+from core.services.m_games import fetch_igdb_metadata
+from core.services.m_music import fetch_musicbrainz_metadata
+from core.services.m_anime_manga import fetch_anilist_metadata
+from core.services.m_movies_tvshows import fetch_tmdb_metadata, fetch_tmdb_season_metadata
+
+# A refresh fetches an item's metadata with the fetch_*_metadata() functions of the m_
+# modules (nothing is saved or downloaded), compares it to the item and only writes and
+# downloads what changed. Fetched metadata is a dict of MediaItem field values with
+# remote image urls, plus "image_prefix" for the names of the files it downloads.
+
+# The purely API-driven fields, what refreshing an item's data rewrites
+REFRESH_METADATA_FIELDS = [
+    "title", "overview", "release_date", "cast", "seasons", "episodes",
+    "related_titles", "genres", "creators", "total_main", "total_secondary",
+]
+
+
+def fetch_item_metadata(item, images=False):
+    """
+    Fetches the current metadata of an item from its provider. `images` is only needed
+    for music, whose cover is looked up on YouTube.
+    """
+    source = item.source
+    source_id = str(item.source_id)
+    media_type = item.media_type
+
+    if source == "tmdb":
+        if "_s" in source_id:  # It's a season
+            tmdb_id, season_number = source_id.split("_s")
+            return fetch_tmdb_season_metadata(tmdb_id, season_number)
+        return fetch_tmdb_metadata(media_type, source_id)
+    if source in ["mal", "anilist"]:
+        return fetch_anilist_metadata(
+            media_type, anilist_id=item.provider_ids.get("anilist"), mal_id=item.provider_ids.get("mal")
+        )
+    if source == "igdb":
+        return fetch_igdb_metadata(source_id)
+    if source == "openlib":
+        return fetch_openlib_metadata(source_id)
+    if source == "musicbrainz":
+        metadata = fetch_musicbrainz_metadata(source_id, include_cover=images)
+        metadata.pop("video_id", None)
+        return metadata
+    raise Exception("Unsupported source.")
+
+
+def has_new_release(item, metadata):
+    """True if the metadata lists a season (TV) or a sequel (anime/manga) the item doesn't have yet."""
+    if item.media_type == "tv" and "seasons" in metadata:
+        existing = {s.get("season_number") for s in (item.seasons or [])}
+        return any(
+            s.get("season_number") != 0 and s.get("season_number") not in existing
+            for s in (metadata["seasons"] or [])
+        )
+    if item.media_type in ["anime", "manga"] and "related_titles" in metadata:
+        existing = set()
+        for r in item.related_titles or []:
+            if r.get("anilist_id"):
+                existing.add(("anilist", str(r["anilist_id"])))
+            if r.get("mal_id"):
+                existing.add(("mal", str(r["mal_id"])))
+        for r in metadata["related_titles"] or []:
+            if (r.get("relation") or "").lower() != "sequel":
+                continue
+            keys = {("anilist", str(r["anilist_id"])) if r.get("anilist_id") else None,
+                    ("mal", str(r["mal_id"])) if r.get("mal_id") else None} - {None}
+            if not keys & existing:
+                return True
+    return False
+
+
+def _local_file(local_url):
+    """The relative path of a /media/ url if the file is still on disk."""
+    paths = media_paths(local_url)
+    if not paths:
+        return None
+    path = paths.pop()
+    return path if os.path.exists(os.path.join(settings.MEDIA_ROOT, path)) else None
+
+
+def apply_metadata(item, metadata, fields):
+    """
+    Sets the given fields of `item` to fetched metadata, in memory (the caller saves).
+
+    An image is only downloaded if its remote url isn't one the item already has a local
+    file for (MediaItem.image_sources). Items saved before sources were recorded keep the
+    image of the same cast member, season, episode or related title instead, like refreshes
+    always did. Returns (changed fields, relative paths of the files no longer used).
+    """
+    values = {field: metadata[field] for field in fields if field in metadata}
+    sources = dict(item.image_sources or {})
+    by_remote = {remote: local for local, remote in sources.items()}
+
+    # Legacy items: (field, entry id) -> the local image of the entry
+    legacy = {}
+    for field, (key, _, _) in METADATA_IMAGE_SLOTS.items():
+        entries = getattr(item, field, None)
+        if field not in values or not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get(key) and entry[key] not in sources:
+                legacy[(field, metadata_entry_id(field, entry))] = entry[key]
+
+    def reuse(field, url, entry):
+        local = by_remote.get(url)
+        if local is None and entry is not None:
+            local = legacy.get((field, metadata_entry_id(field, entry)))
+        if local and _local_file(local):
+            return local
+        return None
+
+    new_sources = download_metadata_images(values, metadata.get("image_prefix") or item.media_type, reuse)
+
+    old_paths = set()
+    changed = []
+    for field, value in values.items():
+        if getattr(item, field) != value:
+            media_paths(getattr(item, field), old_paths)
+            setattr(item, field, value)
+            changed.append(field)
+
+    # Sources of the images the item still uses
+    used = set()
+    for field in MEDIA_FIELDS:
+        media_paths(getattr(item, field), used)
+    sources.update(new_sources)
+    sources = {local: remote for local, remote in sources.items() if media_paths(local) & used}
+    if sources != (item.image_sources or {}):
+        item.image_sources = sources
+        changed.append("image_sources")
+
+    return changed, old_paths - used
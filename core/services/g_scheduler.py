@@ -0,0 +1,212 @@
+import os
+import sys
+import uuid
+import atexit
+import socket
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ScheduledJob, SchedulerLease
+from core.services.p_home import run_tmdb_updates, run_anilist_updates, run_media_cleanup, media_cleanup_first_run
+
+logger = logging.getLogger(__name__)
+
+# Recurring background jobs. `first_run` sets next_run when a job is first registered,
+# after that each run schedules the next one `interval` after it started.
+SCHEDULE = {
+    "tmdb_updates": {
+        "label": "TMDB new seasons",
+        "run": run_tmdb_updates,
+        "interval": timedelta(minutes=30),
+        "first_run": lambda: timezone.now() + timedelta(minutes=1),
+    },
+    "anilist_updates": {
+        "label": "AniList new sequels",
+        "run": run_anilist_updates,
+        "interval": timedelta(minutes=30),
+        "first_run": lambda: timezone.now() + timedelta(minutes=1),
+    },
+    "media_cleanup": {
+        "label": "Orphaned media cleanup",
+        "run": run_media_cleanup,
+        "interval": timedelta(days=30),
+        "first_run": media_cleanup_first_run,
+    },
+}
+
+# Every process can run a scheduler, only the one holding the lease runs jobs. The holder
+# renews it every tick, if it dies another process takes over once it expires.
+LEASE_NAME = "scheduler"
+LEASE_DURATION = timedelta(seconds=90)
+TICK_SECONDS = 30
+
+_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def acquire_lease():
+    """Takes or renews the scheduler lease. Returns True if this process holds it."""
+    now = timezone.now()
+    expires_at = now + LEASE_DURATION
+    renewed = SchedulerLease.objects.filter(name=LEASE_NAME).filter(
+        Q(owner=_owner) | Q(expires_at__lt=now)
+    ).update(owner=_owner, expires_at=expires_at)
+    if renewed:
+        return True
+    try:
+        with transaction.atomic():
+            SchedulerLease.objects.create(name=LEASE_NAME, owner=_owner, expires_at=expires_at)
+        return True
+    except IntegrityError:
+        return False
+
+
+def release_lease():
+    """Gives the lease up if this process holds it, so another one can take over right away."""
+    return SchedulerLease.objects.filter(name=LEASE_NAME, owner=_owner).delete()[0] > 0
+
+
+class Scheduler(threading.Thread):
+    def __init__(self, resume_add_queue=False):
+        super().__init__(name="scheduler", daemon=True)
+        self.resume_add_queue = resume_add_queue
+        self.has_lease = False
+        self._running = {}
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        logger.info(f"[SCHEDULER] Started ({_owner})")
+        if self.resume_add_queue:
+            # Picks up adds a restart interrupted without waiting for the next add
+            from core.services.g_add_queue import start_add_workers
+            try:
+                start_add_workers()
+            except Exception as e:
+                logger.error(f"[SCHEDULER] Could not start the add queue: {e}")
+
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"[SCHEDULER] Tick failed: {e}")
+            self._stop_event.wait(TICK_SECONDS)
+
+        if self.has_lease:
+            release_lease()
+            self.has_lease = False
+
+    def tick(self):
+        had_lease = self.has_lease
+        self.has_lease = acquire_lease()
+        if not self.has_lease:
+            return
+
+        now = timezone.now()
+        jobs = {job.name: job for job in ScheduledJob.objects.all()}
+        for name, config in SCHEDULE.items():
+            job = jobs.get(name)
+            if job is None:
+                job = ScheduledJob.objects.create(name=name, next_run=config["first_run"]())
+
+            thread = self._running.get(name)
+            if thread is not None and thread.is_alive():
+                continue
+            if job.status == "running" and not had_lease:
+                # Left running by a process that stopped while it held the lease
+                job.status = "error"
+                job.last_message = "Interrupted by a restart"
+                job.save(update_fields=["status", "last_message"])
+
+            if job.next_run and job.next_run > now:
+                continue
+
+            # Schedule the next run before starting, so a crash can't rerun it in a loop
+            job.status = "running"
+            job.last_started = now
+            job.next_run = now + config["interval"]
+            job.save(update_fields=["status", "last_started", "next_run"])
+
+            thread = threading.Thread(target=self._run_job, args=(job, config), name=f"job-{name}", daemon=True)
+            self._running[name] = thread
+            thread.start()
+
+    def _run_job(self, job, config):
+        logger.info(f"[SCHEDULER] Running {job.name}")
+        try:
+            message = config["run"]() or ""
+            job.status = "ok"
+        except Exception as e:
+            logger.error(f"[SCHEDULER] {job.name} failed: {e}")
+            message = str(e)
+            job.status = "error"
+
+        job.last_finished = timezone.now()
+        job.last_message = message
+        job.save(update_fields=["status", "last_finished", "last_message"])
+
+
+def should_autostart():
+    """
+    True in the process that serves `manage.py runserver`. Production servers start the
+    scheduler from media_journal/wsgi.py instead, so scripts, tests and other commands
+    that only load the apps never run jobs.
+    """
+    if not settings.SCHEDULER_AUTOSTART:
+        return False
+    argv = sys.argv
+    if not argv or os.path.basename(argv[0]) not in ("manage.py", "django-admin"):
+        return False
+    if len(argv) < 2 or argv[1] != "runserver":
+        return False
+    # Only the reloader's child process serves requests
+    return os.environ.get("RUN_MAIN") == "true" or "--noreload" in argv
+
+
+def start_scheduler():
+    """Starts the in-process scheduler once per process (see CoreConfig.ready and wsgi.py)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler(resume_add_queue=True)
+            _scheduler.start()
+            atexit.register(stop_scheduler)
+    return _scheduler
+
+
+def stop_scheduler():
+    """Stops the scheduler and gives up its lease, so a restarted server doesn't wait for it to expire."""
+    if _scheduler is None:
+        return
+    _scheduler.stop()
+    try:
+        release_lease()
+    except Exception as e:
+        logger.warning(f"[SCHEDULER] Could not release the lease: {e}")
+
+
+def scheduled_jobs_status():
+    """Rows for the settings page, in SCHEDULE order."""
+    jobs = {job.name: job for job in ScheduledJob.objects.all()}
+    rows = []
+    for name, config in SCHEDULE.items():
+        job = jobs.get(name)
+        rows.append({
+            "name": name,
+            "label": config["label"],
+            "status": job.get_status_display() if job else "Not scheduled yet",
+            "last_started": job.last_started if job else None,
+            "last_finished": job.last_finished if job else None,
+            "next_run": job.next_run if job else None,
+            "message": job.last_message if job else "",
+        })
+    return rows
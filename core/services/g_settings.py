@@ -0,0 +1,65 @@
+import threading
+
+from django.core.cache import cache
+
+from core.models import AppSettings, NavItem
+
+APP_SETTINGS_CACHE_KEY = "app_settings"
+NAV_ITEMS_CACHE_KEY = "nav_items"
+
+# Loading and invalidating under one lock keeps a slow reader from caching a row
+# that was changed (and invalidated) while it was being read
+_settings_lock = threading.Lock()
+
+
+def get_app_settings(request=None, create=False):
+    """
+    The AppSettings row, read from the process cache instead of the database.
+
+    Passing the request also memoizes it on the request, so one page asking for the
+    settings several times (views, helpers, context processors) still reads it once.
+    Returns None when the row doesn't exist yet, unless create=True.
+    """
+    settings = getattr(request, "_app_settings", None)
+    if settings is None:
+        settings = cache.get(APP_SETTINGS_CACHE_KEY)
+    if settings is None:
+        with _settings_lock:
+            settings = cache.get(APP_SETTINGS_CACHE_KEY)
+            if settings is None:
+                settings = AppSettings.objects.first()
+                if settings is not None:
+                    cache.set(APP_SETTINGS_CACHE_KEY, settings, None)
+    if settings is None and create:
+        settings = AppSettings.objects.create()
+
+    if request is not None and settings is not None:
+        request._app_settings = settings
+    return settings
+
+
+def get_nav_items(request=None):
+    """Every NavItem ordered by position, cached like get_app_settings()."""
+    items = getattr(request, "_nav_items", None)
+    if items is None:
+        items = cache.get(NAV_ITEMS_CACHE_KEY)
+    if items is None:
+        with _settings_lock:
+            items = cache.get(NAV_ITEMS_CACHE_KEY)
+            if items is None:
+                items = list(NavItem.objects.order_by("position"))
+                cache.set(NAV_ITEMS_CACHE_KEY, items, None)
+
+    if request is not None:
+        request._nav_items = items
+    return items
+
+
+def invalidate_app_settings():
+    with _settings_lock:
+        cache.delete(APP_SETTINGS_CACHE_KEY)
+
+
+def invalidate_nav_items():
+    with _settings_lock:
+        cache.delete(NAV_ITEMS_CACHE_KEY)
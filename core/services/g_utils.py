@@ -1,12 +1,15 @@
 import os
 import hashlib
+import threading
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
 from django.conf import settings
 
-from core.models import NavItem
+from core.models import MediaItem, StoredImage
+from core.services.g_settings import get_nav_items
+from core.services.g_http import http_get
 
 
 def normalize_search_text(text):
@@ -39,22 +42,193 @@ def get_sharded_path(original_path):
     return os.path.join(directory, shard_folder, filename).replace('\\', '/')
 
 
-def download_image(url, relative_path):
-    sharded_relative_path = get_sharded_path(relative_path)
-    
-    local_path = Path(settings.MEDIA_ROOT) / sharded_relative_path
-    local_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure folder exists
+STORE_LOOKUP_BATCH_SIZE = 500
+
+
+def stored_image_path(relative_path, digest):
+    """
+    Content-addressed path of an image in the folder of relative_path:
+    'cast/tmdb_movie_1_5_1700000000000.jpg' -> 'cast/3f/3f9c...e1.jpg'
+    """
+    folder = os.path.dirname(relative_path)
+    ext = os.path.splitext(relative_path)[1] or ".jpg"
+    return f"{folder}/{digest[:2]}/{digest}{ext}"
 
+
+def known_images(urls):
+    """{remote url: local url} of the urls already in the store whose file is still on disk."""
+    urls = list(urls)
+    found = {}
+    for i in range(0, len(urls), STORE_LOOKUP_BATCH_SIZE):
+        rows = StoredImage.objects.filter(url__in=urls[i:i + STORE_LOOKUP_BATCH_SIZE]).values_list("url", "path")
+        for url, path in rows:
+            local_path = os.path.join(settings.MEDIA_ROOT, path)
+            try:
+                # Touched, see STORE_REUSE_GRACE_SECONDS in g_media
+                os.utime(local_path)
+            except OSError:
+                continue  # Deleted since, downloaded again
+            found[url] = settings.MEDIA_URL + path
+    return found
+
+
+def _fetch_image(url, relative_path):
+    """Downloads one image into the store. Returns (path, sha256, size) or None if it failed."""
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            with open(local_path, "wb") as f:
-                f.write(response.content)
-            return settings.MEDIA_URL + sharded_relative_path
+        response = http_get("images", url, timeout=10)
+        if response.status_code != 200 or not response.content:
+            return None
     except Exception as e:
         print("Image download failed:", e)
+        return None
+
+    content = response.content
+    digest = hashlib.sha256(content).hexdigest()
+    path = stored_image_path(relative_path, digest)
+    local_path = Path(settings.MEDIA_ROOT) / path
+    if local_path.exists():
+        # The same image behind another url
+        os.utime(local_path)
+    else:
+        local_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure folder exists
+        # Written under a temporary name, another thread may be storing the same image
+        temp_path = local_path.with_name(f".{local_path.name}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, local_path)
+    return path, digest, len(content)
+
+
+def download_image(url, relative_path):
+    """Downloads one image, see download_images(). Returns its local url or "" if it failed."""
+    return download_images([(url, relative_path)])[relative_path]
+
+
+# Parallel downloads per batch. The "images" provider in g_http caps the total across batches.
+IMAGE_DOWNLOAD_WORKERS = 8
+
+
+def download_images(jobs):
+    """
+    Downloads a batch of (url, relative_path) jobs in parallel over the pooled image session.
+    Returns {relative_path: local url} for every job, "" for jobs without a url or failed
+    downloads, so a save takes as long as its slowest image instead of the sum of them.
+
+    Images go through the StoredImage store: a url that was downloaded before isn't
+    downloaded again, and a file is named by the hash of its content in the folder of its
+    relative_path (the file name itself is only a hint for the extension).
+    """
+    results = {}
+    pending = {}  # url -> the relative paths that want it
+    for url, relative_path in jobs:
+        if url:
+            pending.setdefault(url, []).append(relative_path)
+        else:
+            results[relative_path] = ""
 
-    return ""
+    for url, local_url in known_images(pending).items():
+        for relative_path in pending.pop(url):
+            results[relative_path] = local_url
+
+    if len(pending) <= 1:
+        fetched = {url: _fetch_image(url, paths[0]) for url, paths in pending.items()}
+    else:
+        with ThreadPoolExecutor(max_workers=min(IMAGE_DOWNLOAD_WORKERS, len(pending))) as pool:
+            futures = {url: pool.submit(_fetch_image, url, paths[0]) for url, paths in pending.items()}
+        fetched = {url: future.result() for url, future in futures.items()}
+
+    stored = {url: result for url, result in fetched.items() if result}
+    if stored:
+        StoredImage.objects.bulk_create(
+            [StoredImage(url=url, path=path, sha256=digest, size=size) for url, (path, digest, size) in stored.items()],
+            update_conflicts=True,
+            unique_fields=["url"],
+            update_fields=["path", "sha256", "size"],
+        )
+    for url, paths in pending.items():
+        local_url = settings.MEDIA_URL + stored[url][0] if url in stored else ""
+        for relative_path in paths:
+            results[relative_path] = local_url
+    return results
+
+
+def image_sources(jobs, images):
+    """
+    {local url: remote url} of a download_images() batch, stored in MediaItem.image_sources
+    so a refresh can tell which images changed.
+    """
+    return {images[relative_path]: url for url, relative_path in jobs if url and images.get(relative_path)}
+
+
+# Images inside the entries of MediaItem's JSON fields: field -> (entry key, folder, the
+# entry keys that identify the same entry between two fetches)
+METADATA_IMAGE_SLOTS = {
+    "cast": ("profile_path", "cast", ("id",)),
+    "seasons": ("poster_path", "seasons", ("season_number",)),
+    "episodes": ("still_path", "episodes", ("episode_number",)),
+    "related_titles": ("poster_path", "related", ("anilist_id", "mal_id")),
+}
+METADATA_IMAGE_FIELDS = {"cover_url": "posters", "banner_url": "banners"}
+
+
+def metadata_entry_id(field, entry):
+    keys = METADATA_IMAGE_SLOTS[field][2]
+    return next((str(entry[k]) for k in keys if entry.get(k) is not None), "")
+
+
+def download_metadata_images(values, prefix, reuse=None):
+    """
+    Swaps the remote image urls of fetched metadata (cover_url, banner_url and the images
+    of the METADATA_IMAGE_SLOTS entries) for local ones, in place. `reuse(field, url, entry)`
+    can return a local url that already holds that image, the rest go to download_images()
+    in one batch (as `<folder>/<prefix>_<entry id>.jpg`). Returns {local url: remote url}.
+    """
+    jobs = []
+    sources = {}
+    targets = []  # (container, key, relative path) filled in once the batch is downloaded
+
+    def localize(container, key, field, folder, name, entry=None):
+        url = container.get(key)
+        if not url or not str(url).startswith(("http://", "https://")):
+            return
+        local = reuse(field, url, entry) if reuse else None
+        if local:
+            container[key] = local
+            sources[local] = url
+            return
+        relative_path = f"{folder}/{prefix}{name}.jpg"
+        jobs.append((url, relative_path))
+        targets.append((container, key, relative_path))
+
+    for field, folder in METADATA_IMAGE_FIELDS.items():
+        localize(values, field, field, folder, "")
+    for field, (key, folder, _) in METADATA_IMAGE_SLOTS.items():
+        for i, entry in enumerate(values.get(field) or []):
+            if isinstance(entry, dict):
+                entry_id = metadata_entry_id(field, entry) or str(i)
+                name = f"_s{entry_id}" if field == "seasons" else f"_e{entry_id}" if field == "episodes" else f"_{entry_id}"
+                localize(entry, key, field, folder, name, entry)
+
+    images = download_images(jobs)
+    for container, key, relative_path in targets:
+        container[key] = images[relative_path]
+    sources.update(image_sources(jobs, images))
+    return sources
+
+
+def save_media_item(item=None, **fields):
+    """
+    Creates a MediaItem from fetched metadata, or fills in `item` (the placeholder of a
+    queued add) with it. Only the fetched fields are written, so a status, rating or notes
+    the user set on the placeholder while it loaded are kept. A placeholder deleted in the
+    meantime raises instead of coming back.
+    """
+    if item is None:
+        return MediaItem.objects.create(**fields)
+    for field, value in fields.items():
+        setattr(item, field, value)
+    item.save(update_fields=list(fields))
+    return item
 
 
 def rating_to_display(rating_value: int | None, rating_mode: str) -> int | None:
@@ -124,8 +298,8 @@ def display_to_rating(display_value: int | None, rating_mode: str) -> int | None
 
     return None
 
-def get_ordered_types():
-    nav_items = NavItem.objects.all().order_by("position")
+def get_ordered_types(request=None):
+    nav_items = get_nav_items(request)
     
     mapping = {
         'movies': {'data_type': 'movie', 'label': 'Movies'},
@@ -6,95 +6,30 @@ from django.http import JsonResponse
 from django.utils import timezone
 
 from core.models import MediaItem
-from core.services.g_utils import download_image
+from core.services.g_utils import download_images, download_metadata_images, save_media_item
+from core.services.g_http import http_post
 
 
-def save_anilist_item(media_type, anilist_id=None, mal_id=None):
+def save_anilist_item(media_type, anilist_id=None, mal_id=None, item=None):
     try:
         data = fetch_anilist_data(media_type, anilist_id=anilist_id, mal_id=mal_id)
-
-        canonical_id = data["anilist_id"]
-        cache_bust = int(time.time() * 1000)
-        # --- Download images
-        local_poster = (
-            download_image(
-                data["poster_url"],
-                f"posters/anilist_{media_type}_{canonical_id}_{cache_bust}.jpg",
-            )
-            if data["poster_url"]
-            else ""
-        )
-
-        local_banner = (
-            download_image(
-                data["banner_url"],
-                f"banners/anilist_{media_type}_{canonical_id}_{cache_bust}.jpg",
-            )
-            if data["banner_url"]
-            else ""
-        )
-
-        cast = []
-        for member in data["cast"][:8]:
-            profile_url = member.get("profile_path")
-            character_id = member.get("id", "unknown")
-            local_path = ""
-            if profile_url:
-                # Use character ID instead of index to prevent mismatches
-                filename = f"cast/anilist_{media_type}_{canonical_id}_{character_id}_{cache_bust}.jpg"
-                local_path = download_image(profile_url, filename)
-
-            cast.append(
-                {
-                    "name": member["name"],
-                    "character": member["character"],
-                    "profile_path": local_path,
-                    "id": character_id,
-                }
-            )
-
-        related_titles = []
-        for related in data["related_titles"]:
-            r_ref_id = related.get("anilist_id") or related.get("mal_id")
-            poster_path = related["poster_path"]
-            local_related_poster = (
-                download_image(poster_path, f"related/anilist_{media_type}_{r_ref_id}_{cache_bust}.jpg")
-                if poster_path
-                else ""
-            )
-
-            related_titles.append(
-                {
-                    "anilist_id": related.get("anilist_id"),
-                    "mal_id": related.get("mal_id"),
-                    "title": related["title"],
-                    "poster_path": local_related_poster,
-                    "relation": related["relation"],
-                    "media_type": related.get("media_type"),
-                }
-            )
+        values = anilist_metadata(data, media_type)
+        # Poster, banner, cast and related posters download in one parallel batch
+        sources = download_metadata_images(values, values.pop("image_prefix"))
 
         new_provider_ids = {"anilist": str(data["anilist_id"])}
         if data["mal_id"]:
             new_provider_ids["mal"] = str(data["mal_id"])
 
         # --- Save to DB
-        MediaItem.objects.create(
-            title=data["title"],
+        save_media_item(
+            item,
             media_type=media_type,
             source="anilist",
             provider_ids=new_provider_ids,
-            cover_url=local_poster,
-            banner_url=local_banner,
-            overview=data["overview"],
-            release_date=data["release_date"],
-            cast=cast,
             seasons=None,
-            related_titles=related_titles,
-            total_main=data.get("total_main"),
-            total_secondary=data.get("total_secondary"),
-            genres=data["genres"],
-            creators=data["creators"],
+            image_sources=sources,
+            **values,
         )
 
         return JsonResponse({"message": "Saved to your list."})
@@ -103,6 +38,193 @@ def save_anilist_item(media_type, anilist_id=None, mal_id=None):
         return JsonResponse({"error": f"Save failed: {str(e)}"})
 
 
+def anilist_metadata(data, media_type):
+    """
+    The MediaItem fields of fetch_anilist_data() output, with remote image urls (see
+    core/services/g_refresh.py).
+    """
+    cast = []
+    for member in data["cast"][:8]:
+        cast.append(
+            {
+                "name": member["name"],
+                "character": member["character"],
+                "profile_path": member.get("profile_path") or "",
+                "id": member.get("id", "unknown"),
+            }
+        )
+
+    related_titles = []
+    for related in data["related_titles"]:
+        related_titles.append(
+            {
+                "anilist_id": related.get("anilist_id"),
+                "mal_id": related.get("mal_id"),
+                "title": related["title"],
+                "poster_path": related.get("poster_path") or "",
+                "relation": related["relation"],
+                "media_type": related.get("media_type"),
+            }
+        )
+
+    return {
+        "image_prefix": f"anilist_{media_type}_{data['anilist_id']}",
+        "title": data["title"],
+        "cover_url": data["poster_url"] or "",
+        "banner_url": data["banner_url"] or "",
+        "overview": data["overview"],
+        "release_date": data["release_date"],
+        "cast": cast,
+        "related_titles": related_titles,
+        "total_main": data.get("total_main"),
+        "total_secondary": data.get("total_secondary"),
+        "genres": data["genres"],
+        "creators": data["creators"],
+    }
+
+
+def fetch_anilist_metadata(media_type, anilist_id=None, mal_id=None):
+    """Fetches an anime or manga without saving or downloading anything."""
+    return anilist_metadata(fetch_anilist_data(media_type, anilist_id=anilist_id, mal_id=mal_id), media_type)
+
+
+def fetch_anilist_metadata_batch(media_type, ids, id_field="id"):
+    """fetch_anilist_metadata() for a batch, see fetch_anilist_data_batch()."""
+    return {
+        key: anilist_metadata(data, media_type)
+        for key, data in fetch_anilist_data_batch(media_type, ids, id_field=id_field).items()
+    }
+
+
+def parse_anilist_relations(media, media_type):
+    """Prequels and sequels of an AniList Media object, in the related_titles format."""
+    related_titles = []
+    for rel in media.get("relations", {}).get("edges", []):
+        relation_type = rel.get("relationType", "").lower()
+        if relation_type in ("prequel", "sequel"):
+            node = rel["node"]
+            r_anilist_id = node.get("id")
+            r_mal_id = node.get("idMal")
+
+            if not r_anilist_id and not r_mal_id:
+                continue
+
+            r_title = (
+                node["title"].get("english")
+                or node["title"].get("romaji")
+                or "Unknown Title"
+            )
+            r_poster = node["coverImage"].get("large") or ""
+
+            related_titles.append(
+                {
+                    "anilist_id": r_anilist_id,
+                    "mal_id": r_mal_id,
+                    "title": r_title,
+                    "poster_path": r_poster,
+                    "relation": relation_type.capitalize(),
+                    "is_full_url": True,
+                    "media_type": node.get("type", "").lower() if node.get("type") else media_type.lower(),
+                }
+            )
+    return related_titles
+
+
+# Fields of an AniList Media object that fetch_anilist_data() parses. Recommendations are
+# only fetched for single items, batches stay under AniList's query complexity limit.
+ANILIST_MEDIA_FIELDS = """
+id
+idMal
+title {
+  romaji
+  english
+}
+description(asHtml: false)
+startDate {
+  year
+  month
+  day
+}
+episodes
+chapters
+volumes
+bannerImage
+coverImage {
+  extraLarge
+}
+genres
+studios(isMain: true) {
+  nodes {
+    name
+  }
+}
+staff {
+  edges {
+    role
+    node {
+      name {
+        full
+      }
+    }
+  }
+}
+characters(sort: [ROLE, RELEVANCE], perPage: 8) {
+  edges {
+    role
+    node {
+      id
+      name {
+        full
+      }
+      image {
+        medium
+      }
+    }
+  }
+}
+relations {
+  edges {
+    relationType
+    node {
+      id
+      idMal
+      title {
+        english
+        romaji
+      }
+      coverImage {
+        large
+      }
+      type
+    }
+  }
+}
+"""
+ANILIST_RECOMMENDATIONS_FIELD = """
+recommendations(sort: RATING_DESC, perPage: 16) {
+  edges {
+    node {
+      mediaRecommendation {
+        id
+        idMal
+        title {
+          romaji
+          english
+        }
+        coverImage {
+          large
+        }
+        type
+      }
+    }
+  }
+}
+"""
+
+# Items per batched metadata request (Page.media with id_in/idMal_in)
+ANILIST_DATA_BATCH_SIZE = 20
+
+
 def fetch_anilist_data(media_type, anilist_id=None, mal_id=None):
     # Determine which ID to use for the query
     if anilist_id:
@@ -117,90 +239,7 @@ def fetch_anilist_data(media_type, anilist_id=None, mal_id=None):
     query = """
     query ($id: Int, $type: MediaType) {
       Media(""" + id_field + """: $id, type: $type) {
-        id
-        idMal
-        title {
-          romaji
-          english
-        }
-        description(asHtml: false)
-        startDate {
-          year
-          month
-          day
-        }
-        episodes
-        chapters
-        volumes
-        bannerImage
-        coverImage {
-          extraLarge
-        }
-        genres
-        studios(isMain: true) {
-          nodes {
-            name
-          }
-        }
-        staff {
-          edges {
-            role
-            node {
-              name {
-                full
-              }
-            }
-          }
-        }
-        characters(sort: [ROLE, RELEVANCE], perPage: 8) {
-          edges {
-            role
-            node {
-              id
-              name {
-                full
-              }
-              image {
-                medium
-              }
-            }
-          }
-        }
-        relations {
-          edges {
-            relationType
-            node {
-              id
-              idMal
-              title {
-                english
-                romaji
-              }
-              coverImage {
-                large
-              }
-              type
-            }
-          }
-        }
-        recommendations(sort: RATING_DESC, perPage: 16) {
-          edges {
-            node {
-              mediaRecommendation {
-                id
-                idMal
-                title {
-                  romaji
-                  english
-                }
-                coverImage {
-                  large
-                }
-                type
-              }
-            }
-          }
-        }
+""" + ANILIST_MEDIA_FIELDS + ANILIST_RECOMMENDATIONS_FIELD + """
       }
     }
     """
@@ -209,7 +248,7 @@ def fetch_anilist_data(media_type, anilist_id=None, mal_id=None):
 
     headers = {"Content-Type": "application/json"}
 
-    response = requests.post(
+    response = http_post("anilist",
         "https://graphql.anilist.co",
         json={"query": query, "variables": variables},
         headers=headers,
@@ -224,6 +263,49 @@ def fetch_anilist_data(media_type, anilist_id=None, mal_id=None):
     if not media:
         raise Exception(f"AniList: No entry found for {id_field} {search_id}")
 
+    return parse_anilist_media(media, media_type)
+
+
+def fetch_anilist_data_batch(media_type, ids, id_field="id"):
+    """
+    fetch_anilist_data() for up to ANILIST_DATA_BATCH_SIZE items in one request, by AniList
+    ids or by MAL ids (id_field="idMal"). Returns {str(requested id): data}, ids AniList
+    doesn't know are left out. Recommendations aren't included.
+    """
+    if not ids:
+        return {}
+    list_arg = "id_in" if id_field == "id" else "idMal_in"
+    query = """
+    query ($ids: [Int], $type: MediaType, $perPage: Int) {
+      Page(perPage: $perPage) {
+        media(""" + list_arg + """: $ids, type: $type) {
+""" + ANILIST_MEDIA_FIELDS + """
+        }
+      }
+    }
+    """
+    variables = {"ids": [int(i) for i in ids], "type": media_type.upper(), "perPage": len(ids)}
+
+    response = http_post("anilist",
+        "https://graphql.anilist.co",
+        json={"query": query, "variables": variables},
+        headers={"Content-Type": "application/json"},
+    )
+    if response.status_code == 429:
+        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
+    elif response.status_code != 200:
+        raise Exception(f"AniList API request failed with status {response.status_code}.")
+
+    results = {}
+    for media in ((response.json().get("data") or {}).get("Page") or {}).get("media") or []:
+        key = media.get("id") if id_field == "id" else media.get("idMal")
+        if key is not None:
+            results[str(key)] = parse_anilist_media(media, media_type)
+    return results
+
+
+def parse_anilist_media(media, media_type):
+    """The normalized metadata of an AniList Media object (see ANILIST_MEDIA_FIELDS)."""
     # Title
     title = (
         media["title"].get("english") or media["title"].get("romaji") or "Unknown Title"
@@ -260,35 +342,7 @@ def fetch_anilist_data(media_type, anilist_id=None, mal_id=None):
         )
 
 # Related Titles
-    related_titles = []
-    for rel in media.get("relations", {}).get("edges", []):
-        relation_type = rel.get("relationType", "").lower()
-        if relation_type in ("prequel", "sequel"):
-            node = rel["node"]
-            r_anilist_id = node.get("id")
-            r_mal_id = node.get("idMal")
-
-            if not r_anilist_id and not r_mal_id:
-                continue
-
-            r_title = (
-                node["title"].get("english")
-                or node["title"].get("romaji")
-                or "Unknown Title"
-            )
-            r_poster = node["coverImage"].get("large") or ""
-
-            related_titles.append(
-                {
-                    "anilist_id": r_anilist_id,
-                    "mal_id": r_mal_id,
-                    "title": r_title,
-                    "poster_path": r_poster,
-                    "relation": relation_type.capitalize(),
-                    "is_full_url": True,
-                    "media_type": node.get("type", "").lower() if node.get("type") else media_type.lower(),
-                }
-            )
+    related_titles = parse_anilist_relations(media, media_type)
 
     # Recommendations
     recommendations = []
@@ -485,7 +539,7 @@ def get_anime_extra_info(media_type, anilist_id=None, mal_id=None):
     headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(
+        response = http_post("anilist",
             "https://graphql.anilist.co",
             json={"query": query, "variables": variables},
             headers=headers,
@@ -701,7 +755,7 @@ def get_manga_extra_info(media_type, anilist_id=None, mal_id=None):
     headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(
+        response = http_post("anilist",
             "https://graphql.anilist.co",
             json={"query": query, "variables": variables},
             headers=headers,
@@ -876,7 +930,7 @@ def get_anilist_discover(
     headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(
+        response = http_post("anilist",
             "https://graphql.anilist.co",
             json={"query": query_text, "variables": variables},
             headers=headers,
@@ -959,7 +1013,77 @@ def get_anilist_discover(
         return {"results": [], "hasMore": False}
 
 
-def update_anilist_anime_manga(item: MediaItem):
+# AniList returns at most 50 entries per page
+ANILIST_BATCH_SIZE = 50
+
+
+def fetch_anilist_relations(media_type, ids, id_field="id"):
+    """
+    Relations of up to ANILIST_BATCH_SIZE entries in one request, for the update loop.
+    id_field is "id" (AniList ids) or "idMal" (MAL ids). Returns {str(id): data} in the
+    fetch_anilist_data() format (ids and related_titles only), missing ids are left out.
+    """
+    query = """
+    query ($ids: [Int], $type: MediaType, $perPage: Int) {
+      Page(perPage: $perPage) {
+        media(""" + id_field + """_in: $ids, type: $type) {
+          id
+          idMal
+          relations {
+            edges {
+              relationType
+              node {
+                id
+                idMal
+                title {
+                  english
+                  romaji
+                }
+                coverImage {
+                  large
+                }
+                type
+              }
+            }
+          }
+        }
+      }
+    }
+    """
+
+    variables = {"ids": [int(i) for i in ids], "type": media_type.upper(), "perPage": ANILIST_BATCH_SIZE}
+
+    response = http_post("anilist",
+        "https://graphql.anilist.co",
+        json={"query": query, "variables": variables},
+        headers={"Content-Type": "application/json"},
+    )
+
+    if response.status_code == 429:
+        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
+    elif response.status_code != 200:
+        raise Exception(f"AniList API request failed with status {response.status_code}.")
+
+    page = (response.json().get("data") or {}).get("Page") or {}
+    results = {}
+    for media in page.get("media") or []:
+        key = media.get("id") if id_field == "id" else media.get("idMal")
+        if key is None:
+            continue
+        results[str(key)] = {
+            "anilist_id": media.get("id"),
+            "mal_id": media.get("idMal"),
+            "related_titles": parse_anilist_relations(media, media_type),
+        }
+    return results
+
+
+def update_anilist_anime_manga(item: MediaItem, anilist_data=None):
+    """
+    Adds new sequels of an anime/manga to its related titles and sets a notification.
+    anilist_data can be passed in from a fetch_anilist_relations() batch, otherwise the
+    entry is fetched on its own. Only the fields the check changes are saved.
+    """
     if item.media_type not in ["anime", "manga"]:
         return  # Not an anime/manga, skip
 
@@ -968,11 +1092,12 @@ def update_anilist_anime_manga(item: MediaItem):
     
     if (a_id and str(a_id).startswith("custom_")) or (m_id and str(m_id).startswith("custom_")):
         item.last_updated = timezone.now()
-        item.save()
+        item.save(update_fields=["last_updated"])
         return
 
     try:
-        anilist_data = fetch_anilist_data(item.media_type, anilist_id=a_id, mal_id=m_id)
+        if anilist_data is None:
+            anilist_data = fetch_anilist_data(item.media_type, anilist_id=a_id, mal_id=m_id)
         
         # Heal IDs and source if they were missing/old
         item.provider_ids["anilist"] = str(anilist_data["anilist_id"])
@@ -983,12 +1108,12 @@ def update_anilist_anime_manga(item: MediaItem):
     except requests.exceptions.RequestException as e:
         print(f"[AniList Update] Network error for {item.title}: {e}")
         item.last_updated = timezone.now()  # Prevent retry storm
-        item.save()
+        item.save(update_fields=["last_updated"])
         return
     except Exception as e:
         print(f"[AniList Update] Unexpected error for {item.title}: {e}")
         item.last_updated = timezone.now()
-        item.save()
+        item.save(update_fields=["last_updated"])
         return
 
     existing = item.related_titles or []
@@ -996,6 +1121,7 @@ def update_anilist_anime_manga(item: MediaItem):
     existing_mal_ids = {str(r["mal_id"]) for r in existing if r.get("mal_id")}
 
     new_sequels = []
+    image_jobs = []
     cache_bust = int(time.time() * 1000)
 
     for rel in anilist_data.get("related_titles", []):
@@ -1011,25 +1137,25 @@ def update_anilist_anime_manga(item: MediaItem):
             continue  
 
         # Download image using anilist ID as preference for filename
-        poster_path = rel.get("poster_path")
         ref_id = r_anilist_id or r_mal_id
-        local_path = (
-            download_image(poster_path, f"related/anilist_{item.media_type}_{ref_id}_{cache_bust}.jpg")
-            if poster_path
-            else ""
-        )
+        related_file = f"related/anilist_{item.media_type}_{ref_id}_{cache_bust}.jpg"
+        image_jobs.append((rel.get("poster_path"), related_file))
 
         new_sequels.append(
             {
                 "anilist_id": r_anilist_id,
                 "mal_id": r_mal_id,
                 "title": rel["title"],
-                "poster_path": local_path,
+                "poster_path": related_file,
                 "relation": "Sequel",
                 "media_type": rel.get("media_type"),
             }
         )
 
+    images = download_images(image_jobs)
+    for sequel in new_sequels:
+        sequel["poster_path"] = images[sequel["poster_path"]]
+
     if new_sequels:
         print(
             f"[AniList Update] Found {len(new_sequels)} new sequel(s) for {item.title}"
@@ -1038,4 +1164,4 @@ def update_anilist_anime_manga(item: MediaItem):
         item.notification = True
 
     item.last_updated = timezone.now()
-    item.save()
\ No newline at end of file
+    item.save(update_fields=["provider_ids", "source", "related_titles", "notification", "last_updated"])
\ No newline at end of file
@@ -1,18 +1,20 @@
 import re
-import time
 import datetime
 
-import requests
 from django.http import JsonResponse
 
-from core.models import MediaItem
-from core.services.g_utils import download_image
+from core.services.g_utils import download_metadata_images, save_media_item
+from core.services.g_http import http_get
 
 
-def save_openlib_item(work_id):
+def fetch_openlib_metadata(work_id):
+    """
+    Fetches a book without saving or downloading anything. Returns its MediaItem fields
+    with remote image urls (see core/services/g_refresh.py).
+    """
     # Fetch main Work details (Title, Description, Covers)
     detail_url = f"https://openlibrary.org/works/{work_id}.json"
-    detail_response = requests.get(detail_url, timeout=60)
+    detail_response = http_get("openlibrary", detail_url, timeout=60)
 
     if detail_response.status_code == 429:
         raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
@@ -27,7 +29,7 @@ def save_openlib_item(work_id):
     search_url = f"https://openlibrary.org/search.json?q=key:/works/{work_id}&fields=author_name,number_of_pages_median"
     
     try:
-        search_response = requests.get(search_url, timeout=60)
+        search_response = http_get("openlibrary", search_url, timeout=60)
         
         # Catch the 429 Rate Limit here
         if search_response.status_code == 429:
@@ -68,17 +70,7 @@ def save_openlib_item(work_id):
     # Cover logic
     cover_ids = detail_data.get("covers", [])
     cover_id = cover_ids[0] if cover_ids else None
-    poster_url = f"https://covers.openlibrary.org/b/id/{cover_id}-L.jpg" if cover_id else None
-
-    cache_bust = int(time.time() * 1000)
-    local_poster = (
-        download_image(poster_url, f"posters/openlib_{work_id}_{cache_bust}.jpg")
-        if poster_url
-        else ""
-    )
-
-    if local_poster.startswith("media/"):
-        local_poster = local_poster[len("media/") :]
+    poster_url = f"https://covers.openlibrary.org/b/id/{cover_id}-L.jpg" if cover_id else ""
 
     genres = detail_data.get("subjects",[])
     if isinstance(genres, list):
@@ -97,29 +89,40 @@ def save_openlib_item(work_id):
     except ValueError:
         release_date = None
 
+    return {
+        "image_prefix": f"openlib_{work_id}",
+        "title": title,
+        "cover_url": poster_url,
+        "banner_url": "",
+        "overview": description,
+        "release_date": release_date,
+        "cast": [{"name": name, "character": ""} for name in author_names],
+        "related_titles": [],
+        "total_main": total_pages,
+        "genres": genres,
+        "creators": author_names,
+    }
+
+
+def save_openlib_item(work_id, item=None):
+    values = fetch_openlib_metadata(work_id)
+    sources = download_metadata_images(values, values.pop("image_prefix"))
+
     # Save to DB
-    MediaItem.objects.create(
-        title=title,
+    save_media_item(
+        item,
         media_type="book",
         source="openlib",
         provider_ids={"openlib": str(work_id)},
-        cover_url=local_poster,
-        banner_url="",
-        overview=description,
-        release_date=release_date,
-        cast=[{"name": name, "character": ""} for name in author_names],
         seasons=None,
-        related_titles=[],
-        total_main=total_pages,
-        genres=genres,
-        creators=author_names,
+        image_sources=sources,
+        **values,
     )
 
     return JsonResponse({"success": True, "message": "Book added to list"})
 
 
 def get_openlib_discover(page=1, query="", sort="trending", genre="", year=""):
-    import requests
     
     limit = 20
     offset = (page - 1) * limit
@@ -167,7 +170,7 @@ def get_openlib_discover(page=1, query="", sort="trending", genre="", year=""):
         params["sort"] = ol_sort
         
     try:
-        resp = requests.get(url, params=params, timeout=100)
+        resp = http_get("openlibrary", url, params=params, timeout=100)
         if resp.status_code == 200:
             data = resp.json()
             results = []
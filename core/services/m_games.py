@@ -1,17 +1,23 @@
 import time
 from datetime import datetime
 
-import requests
 from django.http import JsonResponse
 
-from core.models import APIKey, MediaItem
-from core.services.g_utils import download_image
+from core.models import APIKey
+from core.services.g_utils import download_images, image_sources, save_media_item
+from core.services.g_http import http_post
+from core.services.g_media import sync_screenshot_media
 
 IGDB_ACCESS_TOKEN = None
 IGDB_TOKEN_EXPIRY = 0
 
 
-def save_igdb_item(igdb_id):
+# Games per request (IGDB returns at most 500)
+IGDB_GAMES_BATCH_SIZE = 100
+
+
+def fetch_igdb_games(igdb_ids):
+    """The games save_igdb_item() and igdb_metadata() need, up to IGDB_GAMES_BATCH_SIZE per request. Returns {str(id): game}."""
     token = get_igdb_token()
     if not token:
         raise Exception("Failed to get IGDB access token.")
@@ -32,46 +38,37 @@ def save_igdb_item(igdb_id):
       cover.url, genres.name, platforms.name, 
       involved_companies.company.name, involved_companies.developer,
       first_release_date, screenshots.url, artworks.url;
-    where id = {igdb_id};
+    where id = ({",".join(str(int(i)) for i in igdb_ids)});
+    limit {len(igdb_ids)};
     """
 
-    response = requests.post(
+    response = http_post("igdb",
         "https://api.igdb.com/v4/games", headers=headers, data=query
     )
-    if response.status_code != 200:
+    if response.status_code == 429:
+        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
+    elif response.status_code != 200:
         raise Exception("Failed to fetch details from IGDB.")
 
-    data = response.json()
-    if not data:
-        raise Exception("Game not found.")
-
-    game = data[0]
+    return {str(game["id"]): game for game in response.json() if game.get("id")}
 
-    title = game.get("name") or "Unknown Title"
-    overview = game.get("summary") or game.get("storyline") or ""
 
-    # Poster
-    cache_bust = int(time.time() * 1000)
-    poster_url = None
+def igdb_images(game):
+    """
+    (poster url, banner url, [(index, screenshot url)]) of a game. The banner is the first
+    artwork, or the first screenshot (then left out of the screenshots) if there's none.
+    """
+    poster_url = ""
     if "cover" in game and game["cover"]:
         poster_url = "https:" + game["cover"]["url"].replace(
             "t_thumb", "t_cover_big_2x"
         )
-    local_poster = (
-        download_image(poster_url, f"posters/igdb_{igdb_id}_{cache_bust}.jpg")
-        if poster_url
-        else ""
-    )
-
-    # Strip media/ prefix
-    if local_poster.startswith("media/"):
-        local_poster = local_poster[len("media/") :]
 
     # Get artworks and screenshots
     artworks = game.get("artworks", [])
     screenshots = game.get("screenshots", [])
 
-    banner_url = None
+    banner_url = ""
 
     # 1. Try artwork banner first
     if artworks:
@@ -87,36 +84,23 @@ def save_igdb_item(igdb_id):
             banner_url = "https:" + banner_raw.replace("t_thumb", "t_1080p")
             used_screenshot_for_banner = True
 
-    # Save banner
-    local_banner = (
-        download_image(banner_url, f"banners/igdb_{igdb_id}_{cache_bust}.jpg")
-        if banner_url
-        else ""
-    )
-    if local_banner.startswith("media/"):
-        local_banner = local_banner[len("media/") :]
-
-    # 3. Save screenshots
-    local_screenshots = []
-
+    # 3. Screenshots
     # If screenshot was used as banner → skip the first screenshot
     start_index = 1 if used_screenshot_for_banner else 0
+    screenshot_urls = [
+        (i, "https:" + ss["url"].replace("t_thumb", "t_1080p"))
+        for i, ss in enumerate(screenshots[start_index:], start=start_index)
+        if ss and "url" in ss
+    ]
+    return poster_url, banner_url, screenshot_urls
 
-    for i, ss in enumerate(screenshots[start_index:], start=start_index):
-        if ss and "url" in ss:
-            url = "https:" + ss["url"].replace("t_thumb", "t_1080p")
-            local_path = download_image(
-                url, f"screenshots/igdb_{igdb_id}_{i}_{cache_bust}.jpg"
-            )
-            if local_path.startswith("media/"):
-                local_path = local_path[len("media/") :]
-            if local_path:
-                local_screenshots.append(
-                    {
-                        "url": local_path,
-                        "is_full_url": False,
-                    }
-                )
+
+def igdb_metadata(game):
+    """
+    The MediaItem fields of a fetch_igdb_games() game, with remote image urls (see
+    core/services/g_refresh.py). Screenshots are the user's to manage and aren't included.
+    """
+    poster_url, banner_url, _ = igdb_images(game)
 
     # Release date
     release_date = None
@@ -132,21 +116,84 @@ def save_igdb_item(igdb_id):
         if c.get("developer") and c.get("company", {}).get("name")
     ]
 
+    return {
+        "image_prefix": f"igdb_{game['id']}",
+        "title": game.get("name") or "Unknown Title",
+        "cover_url": poster_url,
+        "banner_url": banner_url,
+        "overview": game.get("summary") or game.get("storyline") or "",
+        "release_date": release_date,
+        "cast": [],
+        "related_titles": [],
+        "genres": genres,
+        "creators": creators,
+    }
+
+
+def fetch_igdb_metadata(igdb_id):
+    """Fetches a game without saving or downloading anything."""
+    game = fetch_igdb_games([igdb_id]).get(str(igdb_id))
+    if not game:
+        raise Exception("Game not found.")
+    return igdb_metadata(game)
+
+
+def save_igdb_item(igdb_id, item=None):
+    game = fetch_igdb_games([igdb_id]).get(str(igdb_id))
+    if not game:
+        raise Exception("Game not found.")
+
+    values = igdb_metadata(game)
+    values.pop("image_prefix")
+    poster_url, banner_url, screenshot_urls = igdb_images(game)
+
+    cache_bust = int(time.time() * 1000)
+    poster_file = f"posters/igdb_{igdb_id}_{cache_bust}.jpg"
+    banner_file = f"banners/igdb_{igdb_id}_{cache_bust}.jpg"
+    image_jobs = [(poster_url, poster_file), (banner_url, banner_file)]
+
+    screenshot_files = []
+    for i, url in screenshot_urls:
+        screenshot_file = f"screenshots/igdb_{igdb_id}_{i}_{cache_bust}.jpg"
+        image_jobs.append((url, screenshot_file))
+        screenshot_files.append(screenshot_file)
+
+    # Poster, banner and screenshots download in one parallel batch
+    images = download_images(image_jobs)
+
+    # Strip media/ prefix
+    local_poster = images[poster_file]
+    if local_poster.startswith("media/"):
+        local_poster = local_poster[len("media/") :]
+    local_banner = images[banner_file]
+    if local_banner.startswith("media/"):
+        local_banner = local_banner[len("media/") :]
+
+    local_screenshots = []
+    for screenshot_file in screenshot_files:
+        local_path = images[screenshot_file]
+        if local_path.startswith("media/"):
+            local_path = local_path[len("media/") :]
+        if local_path:
+            local_screenshots.append(
+                {
+                    "url": local_path,
+                    "is_full_url": False,
+                }
+            )
+
+    values["cover_url"] = local_poster
+    values["banner_url"] = local_banner
+
     # Save to DB
-    item = MediaItem.objects.create(
-        title=title,
+    item = save_media_item(
+        item,
         media_type="game",
         source="igdb",
         provider_ids={"igdb": str(igdb_id)},
-        cover_url=local_poster,
-        banner_url=local_banner,
-        overview=overview,
-        release_date=release_date,
-        cast=[],
         seasons=None,
-        related_titles=[],
-        genres=genres,
-        creators=creators,
+        image_sources=image_sources(image_jobs[:2], images),
+        **values,
     )
 
     from core.models import Screenshot
@@ -159,6 +206,7 @@ def save_igdb_item(igdb_id):
         )
         for i, s in enumerate(local_screenshots)
     ])
+    sync_screenshot_media(item.id)
 
     return JsonResponse({"success": True, "message": "Game added to list"})
 
@@ -181,7 +229,7 @@ def get_igdb_token():
         "grant_type": "client_credentials",
     }
 
-    resp = requests.post(url, params=params)
+    resp = http_post("twitch", url, params=params)
     if resp.status_code != 200:
         return None
 
@@ -231,7 +279,7 @@ def get_game_extra_info(game_id):
     """
 
     try:
-        response = requests.post(
+        response = http_post("igdb",
             "https://api.igdb.com/v4/games", headers=headers, data=body
         )
         if response.status_code == 429:
@@ -303,7 +351,7 @@ def get_game_extra_info(game_id):
         time_to_beat = {}
         ttb_body = f"fields hastily, normally, completely; where game_id = {game_id};"
         try:
-            ttb_response = requests.post(
+            ttb_response = http_post("igdb",
                 "https://api.igdb.com/v4/game_time_to_beats", headers=headers, data=ttb_body
             )
             if ttb_response.status_code == 200:
@@ -463,7 +511,7 @@ def get_igdb_discover(
         data = f"fields {fields_to_request}; where {where_clause}; {sort_clause}; limit 20; offset {offset};"
 
     try:
-        response = requests.post(
+        response = http_post("igdb",
             "https://api.igdb.com/v4/games", headers=headers, data=data.encode('utf-8')
         )
         if response.status_code == 429:
@@ -1,14 +1,14 @@
 import time
 
 import concurrent.futures
-import requests
 from django.http import JsonResponse
 from django.utils import timezone
 from requests.exceptions import RequestException
 from datetime import datetime
 
-from core.models import APIKey, MediaItem
-from core.services.g_utils import download_image
+from core.models import APIKey
+from core.services.g_utils import download_images, download_metadata_images, save_media_item
+from core.services.g_http import http_get
 
 TMDB_MOVIE_GENRES = {
     28: "Action",
@@ -52,157 +52,19 @@ TMDB_TV_GENRES = {
 }
 
 
-def save_tmdb_item(media_type, tmdb_id):
+def save_tmdb_item(media_type, tmdb_id, item=None):
     try:
-        api_key = APIKey.objects.get(name="tmdb").key_1
-        url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}"
-        if media_type == "tv":
-            params = {"api_key": api_key, "append_to_response": "aggregate_credits"}
-        else:
-            params = {"api_key": api_key, "append_to_response": "credits"}
-        response = requests.get(url, params=params)
-
-        if response.status_code != 200:
-            return JsonResponse({"error": "Failed to fetch TMDB details."})
-
-        data = response.json()
-
-        # Poster and banner
-        poster_url = (
-            f"https://image.tmdb.org/t/p/w500{data.get('poster_path')}"
-            if data.get("poster_path")
-            else ""
-        )
-        banner_url = (
-            f"https://image.tmdb.org/t/p/original{data.get('backdrop_path')}"
-            if data.get("backdrop_path")
-            else ""
-        )
+        values = fetch_tmdb_metadata(media_type, tmdb_id)
+        # Poster, banner, cast and season posters download in one parallel batch
+        sources = download_metadata_images(values, values.pop("image_prefix"))
 
-        cache_bust = int(time.time() * 1000)
-        local_poster = (
-            download_image(
-                poster_url, f"posters/tmdb_{media_type}_{tmdb_id}_{cache_bust}.jpg"
-            )
-            if poster_url
-            else ""
-        )
-        local_banner = (
-            download_image(
-                banner_url, f"banners/tmdb_{media_type}_{tmdb_id}_{cache_bust}.jpg"
-            )
-            if banner_url
-            else ""
-        )
-
-        # Cast
-        cast_data = []
-        if media_type == "tv":
-            cast_list = data.get("aggregate_credits", {}).get("cast", [])[:8]
-        else:
-            cast_list = data.get("credits", {}).get("cast", [])[:8]
-
-        for actor in cast_list:
-            if media_type == "tv":
-                character_name = (
-                    actor.get("roles", [{}])[0].get("character")
-                    if actor.get("roles")
-                    else ""
-                )
-            else:
-                character_name = actor.get("character")
-
-            actor_id = actor.get("id", "unknown")
-            profile_url = (
-                f"https://image.tmdb.org/t/p/w185{actor.get('profile_path')}"
-                if actor.get("profile_path")
-                else ""
-            )
-            local_profile = ""
-            if profile_url:
-                # Use actor ID instead of index to prevent mismatches
-                filename = f"cast/tmdb_{media_type}_{tmdb_id}_{actor_id}_{cache_bust}.jpg"
-                local_profile = download_image(profile_url, filename)
-
-            cast_data.append(
-                {
-                    "name": actor.get("name"),
-                    "character": character_name,
-                    "profile_path": local_profile,
-                    "id": actor_id,
-                }
-            )
-
-        # Seasons (only for TV shows)
-        seasons = []
-        total_episodes = 0
-        total_seasons = 0
-        if media_type == "tv":
-            today = datetime.now().date()
-            one_year_ahead = datetime(today.year + 1, today.month, today.day).date()
-            for i, season in enumerate(data.get("seasons", [])):
-                season_number = season.get("season_number")
-                episode_count = season.get("episode_count", 0)
-                
-                # Count episodes and seasons (excluding specials, within one year)
-                if season_number != 0:
-                    air_date_str = season.get("air_date")
-                    if air_date_str:
-                        try:
-                            air_date = datetime.strptime(air_date_str, "%Y-%m-%d").date()
-                            if air_date <= one_year_ahead:
-                                total_episodes += episode_count
-                                total_seasons += 1
-                        except Exception:
-                            pass
-                
-                season_poster_url = (
-                    f"https://image.tmdb.org/t/p/w300{season.get('poster_path')}"
-                    if season.get("poster_path")
-                    else ""
-                )
-                local_season_poster = (
-                    download_image(
-                        season_poster_url, f"seasons/tmdb_tv_{tmdb_id}_s{i}_{cache_bust}.jpg"
-                    )
-                    if season_poster_url
-                    else ""
-                )
-
-                seasons.append(
-                    {
-                        "season_number": season_number,
-                        "name": season.get("name"),
-                        "episode_count": episode_count,
-                        "poster_path": local_season_poster,
-                        "air_date": season.get("air_date"),
-                    }
-                )
-
-        genres =[g.get("name") for g in data.get("genres", []) if g.get("name")]
-
-        creators =[]
-        if media_type == "tv":
-            creators =[c.get("name") for c in data.get("created_by", []) if c.get("name")]
-        else:
-            crew = data.get("credits", {}).get("crew", [])
-            creators =[c.get("name") for c in crew if c.get("job") == "Director" and c.get("name")]
-
-        MediaItem.objects.create(
-            title=data.get("title") or data.get("name"),
+        save_media_item(
+            item,
             media_type=media_type,
             source="tmdb",
             provider_ids={"tmdb": str(tmdb_id)},
-            cover_url=local_poster,
-            banner_url=local_banner,
-            overview=data.get("overview", ""),
-            release_date=data.get("release_date") or data.get("first_air_date") or "",
-            cast=cast_data,
-            seasons=seasons,
-            total_main=total_episodes if media_type == "tv" else data.get("runtime"),
-            total_secondary=total_seasons if media_type == "tv" else None,
-            genres=genres,
-            creators=creators,
+            image_sources=sources,
+            **values,
         )
 
         return JsonResponse({"message": "Added to your list."})
@@ -211,137 +73,160 @@ def save_tmdb_item(media_type, tmdb_id):
         return JsonResponse({"error": f"Failed to save: {str(e)}"})
 
 
-def save_tmdb_season(tmdb_id, season_number):
-    try:
-        api_key = APIKey.objects.get(name="tmdb").key_1
+def fetch_tmdb_metadata(media_type, tmdb_id):
+    """
+    Fetches a movie or show without saving or downloading anything. Returns its MediaItem
+    fields with remote image urls (see core/services/g_refresh.py).
+    """
+    api_key = APIKey.objects.get(name="tmdb").key_1
+    url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}"
+    params = {"api_key": api_key, "append_to_response": "aggregate_credits" if media_type == "tv" else "credits"}
+    response = http_get("tmdb", url, params=params)
 
-        # Get season details
-        season_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/season/{season_number}"
-        season_params = {"api_key": api_key, "append_to_response": "aggregate_credits"}
-        season_response = requests.get(season_url, params=season_params)
-
-        if season_response.status_code == 429:
-            raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
-        elif season_response.status_code != 200:
-            return JsonResponse({"error": "Failed to fetch season details."})
-        season_data = season_response.json()
-
-        # Get main show details
-        show_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
-        show_params = {"api_key": api_key}
-        show_response = requests.get(show_url, params=show_params)
-        show_data = show_response.json() if show_response.status_code == 200 else {}
-
-        # Download images
-        poster_url = (
-            f"https://image.tmdb.org/t/p/w500{season_data.get('poster_path')}"
-            if season_data.get("poster_path")
-            else ""
-        )
-        banner_url = (
-            f"https://image.tmdb.org/t/p/original{show_data.get('backdrop_path')}"
-            if show_data.get("backdrop_path")
-            else ""
-        )
+    if response.status_code == 429:
+        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
+    elif response.status_code != 200:
+        raise Exception(f"Failed to fetch TMDB details. Status: {response.status_code}")
 
-        season_source_id = f"{tmdb_id}_s{season_number}"
-        cache_bust = int(time.time() * 1000)
-        local_poster = (
-            download_image(
-                poster_url, f"posters/tmdb_tv_{season_source_id}_{cache_bust}.jpg"
-            )
-            if poster_url
-            else ""
-        )
-        local_banner = (
-            download_image(
-                banner_url, f"banners/tmdb_tv_{season_source_id}_{cache_bust}.jpg"
-            )
-            if banner_url
-            else ""
-        )
+    data = response.json()
+
+    cast_data = []
+    cast_list = data.get("aggregate_credits", {}).get("cast", [])[:8] if media_type == "tv" else data.get("credits", {}).get("cast", [])[:8]
+    for actor in cast_list:
+        if media_type == "tv":
+            character_name = actor.get("roles", [{}])[0].get("character") if actor.get("roles") else ""
+        else:
+            character_name = actor.get("character")
+        cast_data.append({
+            "name": actor.get("name"),
+            "character": character_name,
+            "profile_path": f"https://image.tmdb.org/t/p/w185{actor.get('profile_path')}" if actor.get("profile_path") else "",
+            "id": str(actor.get("id", "unknown")),
+        })
+
+    seasons = []
+    total_episodes = 0
+    total_seasons = 0
+    if media_type == "tv":
+        today = datetime.now().date()
+        one_year_ahead = datetime(today.year + 1, today.month, today.day).date()
+        for season in data.get("seasons", []):
+            season_number = season.get("season_number")
+            episode_count = season.get("episode_count", 0)
+
+            # Count episodes and seasons (excluding specials, within one year)
+            if season_number != 0 and season.get("air_date"):
+                try:
+                    if datetime.strptime(season["air_date"], "%Y-%m-%d").date() <= one_year_ahead:
+                        total_episodes += episode_count
+                        total_seasons += 1
+                except Exception:
+                    pass
+
+            seasons.append({
+                "season_number": season_number,
+                "name": season.get("name"),
+                "episode_count": episode_count,
+                "poster_path": f"https://image.tmdb.org/t/p/w300{season.get('poster_path')}" if season.get("poster_path") else "",
+                "air_date": season.get("air_date"),
+            })
+
+    if media_type == "tv":
+        creators = [c.get("name") for c in data.get("created_by", []) if c.get("name")]
+    else:
+        creators = [c.get("name") for c in data.get("credits", {}).get("crew", []) if c.get("job") == "Director" and c.get("name")]
+
+    return {
+        "image_prefix": f"tmdb_{media_type}_{tmdb_id}",
+        "title": data.get("title") or data.get("name"),
+        "cover_url": f"https://image.tmdb.org/t/p/w500{data.get('poster_path')}" if data.get("poster_path") else "",
+        "banner_url": f"https://image.tmdb.org/t/p/original{data.get('backdrop_path')}" if data.get("backdrop_path") else "",
+        "overview": data.get("overview", ""),
+        "release_date": data.get("release_date") or data.get("first_air_date") or "",
+        "cast": cast_data,
+        "seasons": seasons,
+        "total_main": total_episodes if media_type == "tv" else data.get("runtime"),
+        "total_secondary": total_seasons if media_type == "tv" else None,
+        "genres": [g.get("name") for g in data.get("genres", []) if g.get("name")],
+        "creators": creators,
+    }
+
+
+def fetch_tmdb_season_metadata(tmdb_id, season_number):
+    """fetch_tmdb_metadata() for a season saved as its own item."""
+    api_key = APIKey.objects.get(name="tmdb").key_1
+
+    # Get season details
+    season_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/season/{season_number}"
+    season_params = {"api_key": api_key, "append_to_response": "aggregate_credits"}
+    season_response = http_get("tmdb", season_url, params=season_params)
+
+    if season_response.status_code == 429:
+        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
+    elif season_response.status_code != 200:
+        raise Exception("Failed to fetch season details.")
+    season_data = season_response.json()
+
+    # Get main show details
+    show_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
+    show_response = http_get("tmdb", show_url, params={"api_key": api_key})
+    show_data = show_response.json() if show_response.status_code == 200 else {}
+
+    cast_data = []
+    for actor in season_data.get("aggregate_credits", {}).get("cast", [])[:8]:
+        cast_data.append({
+            "name": actor.get("name"),
+            "character": actor.get("roles", [{}])[0].get("character") if actor.get("roles") else "",
+            "profile_path": f"https://image.tmdb.org/t/p/w185{actor.get('profile_path')}" if actor.get("profile_path") else "",
+            "id": actor.get("id", "unknown"),
+        })
+
+    episodes_data = []
+    for episode in season_data.get("episodes", []):
+        episodes_data.append({
+            "episode_number": episode.get("episode_number"),
+            "name": episode.get("name"),
+            "overview": episode.get("overview", ""),
+            "air_date": episode.get("air_date", ""),
+            "still_path": f"https://image.tmdb.org/t/p/w1280{episode.get('still_path')}" if episode.get("still_path") else "",
+        })
+
+    return {
+        "image_prefix": f"tmdb_tv_{tmdb_id}_s{season_number}",
+        "title": f"{show_data.get('name', 'Unknown Show')} {season_data.get('name', f'Season {season_number}')}",
+        "cover_url": f"https://image.tmdb.org/t/p/w500{season_data.get('poster_path')}" if season_data.get("poster_path") else "",
+        "banner_url": f"https://image.tmdb.org/t/p/original{show_data.get('backdrop_path')}" if show_data.get("backdrop_path") else "",
+        "overview": season_data.get("overview", ""),
+        "release_date": season_data.get("air_date", ""),
+        "cast": cast_data,
+        "episodes": episodes_data,
+        "total_main": len(episodes_data),
+        "total_secondary": 1,
+        "genres": [g.get("name") for g in show_data.get("genres", []) if g.get("name")],
+        "creators": [c.get("name") for c in show_data.get("created_by", []) if c.get("name")],
+    }
+
+
+def save_tmdb_season(tmdb_id, season_number, item=None):
+    try:
+        values = fetch_tmdb_season_metadata(tmdb_id, season_number)
+        # Cover, banner, cast and episode stills download in one parallel batch
+        sources = download_metadata_images(values, values.pop("image_prefix"))
 
-        # Cast data
-        cast_data = []
-        for actor in season_data.get("aggregate_credits", {}).get("cast", [])[:8]:
-            character_name = (
-                actor.get("roles", [{}])[0].get("character")
-                if actor.get("roles")
-                else ""
-            )
-            actor_id = actor.get("id", "unknown")
-            profile_url = (
-                f"https://image.tmdb.org/t/p/w185{actor.get('profile_path')}"
-                if actor.get("profile_path")
-                else ""
-            )
-            local_profile = ""
-            if profile_url:
-                # Use actor ID instead of index to prevent mismatches
-                filename = f"cast/tmdb_{season_source_id}_{actor_id}_{cache_bust}.jpg"
-                local_profile = download_image(profile_url, filename)
-
-            cast_data.append(
-                {
-                    "name": actor.get("name"),
-                    "character": character_name,
-                    "profile_path": local_profile,
-                    "id": actor_id,
-                }
-            )
-
-        # Episodes data
-        episodes_data = []
-        for episode in season_data.get("episodes", []):
-            still_url = (
-                f"https://image.tmdb.org/t/p/w1280{episode.get('still_path')}"
-                if episode.get("still_path")
-                else ""
-            )
-            local_still = (
-                download_image(
-                    still_url,
-                    f"episodes/tmdb_{season_source_id}_e{episode.get('episode_number', 0)}_{cache_bust}.jpg",
-                )
-                if still_url
-                else ""
-            )
-
-            episodes_data.append(
-                {
-                    "episode_number": episode.get("episode_number"),
-                    "name": episode.get("name"),
-                    "overview": episode.get("overview", ""),
-                    "air_date": episode.get("air_date", ""),
-                    "still_path": local_still,
-                }
-            )
-
-        season_title = f"{show_data.get('name', 'Unknown Show')} {season_data.get('name', f'Season {season_number}')}"
-
-        genres =[g.get("name") for g in show_data.get("genres", []) if g.get("name")]
-        creators =[c.get("name") for c in show_data.get("created_by", []) if c.get("name")]
-
-        MediaItem.objects.create(
-            title=season_title,
+        save_media_item(
+            item,
             media_type="tv",
             source="tmdb",
-            provider_ids={"tmdb": str(season_source_id)},
-            cover_url=local_poster,
-            banner_url=local_banner,
-            overview=season_data.get("overview", ""),
-            release_date=season_data.get("air_date", ""),
-            cast=cast_data,
-            episodes=episodes_data,
-            total_main=len(episodes_data),
-            total_secondary=1,
-            genres=genres,
-            creators=creators,
+            provider_ids={"tmdb": f"{tmdb_id}_s{season_number}"},
+            image_sources=sources,
+            **values,
         )
 
         return JsonResponse({"message": "Season added to your list."})
 
     except Exception as e:
+        if "429" in str(e):
+            raise
         return JsonResponse({"error": f"Failed to save season: {str(e)}"})
 
 
@@ -359,7 +244,7 @@ def get_movie_extra_info(tmdb_id):
 
     try:
         # Single API call with all data
-        response = requests.get(base_url, params=params)
+        response = http_get("tmdb", base_url, params=params)
         if response.status_code != 200:
             return {}
 
@@ -403,7 +288,7 @@ def get_movie_extra_info(tmdb_id):
         if collection:
             collection_id = collection.get("id")
             collection_url = f"https://api.themoviedb.org/3/collection/{collection_id}"
-            collection_resp = requests.get(collection_url, params=params)
+            collection_resp = http_get("tmdb", collection_url, params=params)
             if collection_resp.status_code == 200:
                 items = collection_resp.json().get("parts", [])
                 # Sort by release date
@@ -462,7 +347,7 @@ def get_tv_extra_info(tmdb_id):
 
     try:
         # Single API call with all data
-        response = requests.get(base_url, params=params)
+        response = http_get("tmdb", base_url, params=params)
         if response.status_code != 200:
             return {}
 
@@ -628,7 +513,7 @@ def get_tmdb_discover(media_type, page, query="", sort="popularity.desc", year="
             params["with_genres"] = genre
 
     try:
-        response = requests.get(url, params=params)
+        response = http_get("tmdb", url, params=params)
         if response.status_code != 200:
             return []
 
@@ -648,7 +533,7 @@ def get_tmdb_discover(media_type, page, query="", sort="popularity.desc", year="
                 try:
                     detail_url = f"https://api.themoviedb.org/3/tv/{tv_id}"
                     # We only need basic details, no append_to_response needed to keep it lightning fast
-                    resp = requests.get(detail_url, params={"api_key": api_key}, timeout=3)
+                    resp = http_get("tmdb", detail_url, params={"api_key": api_key}, timeout=3)
                     if resp.status_code == 200:
                         return tv_id, resp.json().get("next_episode_to_air")
                 except Exception:
@@ -734,6 +619,43 @@ def get_tmdb_discover(media_type, page, query="", sort="popularity.desc", year="
         return []
 
 
+def fetch_tmdb_tv_changes(start_date):
+    """
+    Ids of the TV shows changed on TMDB since start_date (TMDB keeps at most 14 days of
+    changes), read from every page of /tv/changes. Returns None if the feed can't be read,
+    so callers fall back to checking every show.
+    """
+    try:
+        api_key = APIKey.objects.get(name="tmdb").key_1
+    except APIKey.DoesNotExist:
+        print("TMDB API key not found.")
+        return None
+
+    url = "https://api.themoviedb.org/3/tv/changes"
+    params = {
+        "api_key": api_key,
+        "start_date": start_date.isoformat(),
+        "end_date": timezone.now().date().isoformat(),
+        "page": 1,
+    }
+
+    changed = set()
+    try:
+        while True:
+            response = http_get("tmdb", url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            changed.update(str(r["id"]) for r in data.get("results", []) if r.get("id"))
+            if params["page"] >= data.get("total_pages", 1):
+                break
+            params["page"] += 1
+    except Exception as e:
+        print(f"TMDB changes feed unavailable: {e}")
+        return None
+
+    return changed
+
+
 def update_tmdb_seasons(media_item):
     """
     Check if the TMDB TV series has new seasons.
@@ -745,7 +667,7 @@ def update_tmdb_seasons(media_item):
     tmdb_id = str(media_item.provider_ids.get("tmdb", ""))
     if tmdb_id.startswith("custom_"):
         media_item.last_updated = timezone.now()
-        media_item.save()
+        media_item.save(update_fields=["last_updated"])
         return False
 
     try:
@@ -758,18 +680,18 @@ def update_tmdb_seasons(media_item):
     params = {"api_key": api_key}
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get("tmdb", url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
     except RequestException as e:
         print(f"TMDB update skipped for {media_item.title} — no connection or error: {e}")
         media_item.last_updated = timezone.now()
-        media_item.save()
+        media_item.save(update_fields=["last_updated"])
         return False
     except Exception as e:
         print(f"Unexpected error while updating {media_item.title}: {e}")
         media_item.last_updated = timezone.now()
-        media_item.save()
+        media_item.save(update_fields=["last_updated"])
         return False
 
     fetched_seasons = data.get("seasons", [])
@@ -779,6 +701,7 @@ def update_tmdb_seasons(media_item):
     existing_numbers = {s["season_number"] for s in existing_seasons}
 
     new_seasons = []
+    image_jobs = []
     cache_bust = int(time.time() * 1000)
     
     for i, season in enumerate(fetched_seasons):
@@ -788,32 +711,33 @@ def update_tmdb_seasons(media_item):
 
         # New season found
         poster_path = season.get("poster_path")
-        local_poster = ""
-        if poster_path:
-            full_url = f"https://image.tmdb.org/t/p/w300{poster_path}"
-            local_poster = download_image(
-                full_url, f"seasons/tmdb_tv_{media_item.source_id}_s{season_number}_{cache_bust}.jpg"
-            )
+        full_url = f"https://image.tmdb.org/t/p/w300{poster_path}" if poster_path else ""
+        season_file = f"seasons/tmdb_tv_{media_item.source_id}_s{season_number}_{cache_bust}.jpg"
+        image_jobs.append((full_url, season_file))
 
         new_seasons.append(
             {
                 "season_number": season_number,
                 "name": season.get("name"),
                 "episode_count": season.get("episode_count"),
-                "poster_path": local_poster,
+                "poster_path": season_file,
                 "air_date": season.get("air_date"),
             }
         )
 
+    images = download_images(image_jobs)
+    for season in new_seasons:
+        season["poster_path"] = images[season["poster_path"]]
+
     if new_seasons:
         media_item.seasons = existing_seasons + new_seasons
         media_item.notification = True
         media_item.last_updated = timezone.now()
-        media_item.save()
+        media_item.save(update_fields=["seasons", "notification", "last_updated"])
         print(f"[TMDB] Updated: {media_item.title} – {len(new_seasons)} new season(s).")
         return True
 
     # No new seasons
     media_item.last_updated = timezone.now()
-    media_item.save()
+    media_item.save(update_fields=["last_updated"])
     return False
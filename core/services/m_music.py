@@ -1,31 +1,26 @@
-import time
+import re
 import logging
 import datetime
+import unicodedata
+import urllib.parse
 
 import requests
 from django.http import JsonResponse
 
 from core.models import MediaItem
-from core.services.g_utils import download_image
+from core.services.g_utils import download_metadata_images, save_media_item
+from core.services.g_http import http_get, http_head
 
 logger = logging.getLogger(__name__)
 
-last_request_time = 0
 
-
-def wait_for_rate_limit():
+def fetch_musicbrainz_metadata(recording_id, include_cover=False):
     """
-    Ensures that at least one second has passed since the last API call for all the musicbrainz functions.
+    Fetches a recording without saving or downloading anything. Returns its MediaItem
+    fields (see core/services/g_refresh.py). The cover is the thumbnail of the recording's
+    YouTube video, only looked up with include_cover=True ("video_id" is then set too).
+    Raises requests' HTTPError for failed MusicBrainz requests.
     """
-    global last_request_time
-    elapsed = time.time() - last_request_time
-    if elapsed < 1:
-        time.sleep(1 - elapsed)
-    last_request_time = time.time()
-
-
-def save_musicbrainz_item(recording_id):
-    wait_for_rate_limit()
     headers = {
         "User-Agent": "MediaJournal/1.0 (https://github.com/mihail-pop/media-journal)"
     }
@@ -37,35 +32,12 @@ def save_musicbrainz_item(recording_id):
         "fmt": "json",
     }
 
-    try:
-        recording_response = requests.get(
-            recording_url, params=recording_params, headers=headers, timeout=10
-        )
-        recording_response.raise_for_status()
-
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 503:
-            return JsonResponse(
-                {
-                    "error": "Most likely MusicBrainz api rate limit error. Please try again in a moment."
-                },
-                status=503,
-            )
-        else:
-            return JsonResponse(
-                {
-                    "error": f"Failed to fetch details from MusicBrainz (Error {e.response.status_code})."
-                },
-                status=e.response.status_code,
-            )
-
-    except requests.exceptions.RequestException:
-        return JsonResponse(
-            {
-                "error": "Failed to connect to MusicBrainz. Please check your network connection."
-            },
-            status=500,
-        )
+    recording_response = http_get("musicbrainz",
+        recording_url, params=recording_params, headers=headers, timeout=10
+    )
+    if recording_response.status_code == 429:
+        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
+    recording_response.raise_for_status()
 
     recording_data = recording_response.json()
 
@@ -131,192 +103,10 @@ def save_musicbrainz_item(recording_id):
         "isrc": isrc,
     }
 
-    # Search YouTube
-    youtube_links = []
-    local_poster = ""
-    if isrc:
-        search_query = isrc
-    else:
-        search_query = f"{artists} {title}"
-
-    # Simple YouTube search
-    try:
-        import unicodedata
-        import urllib.parse
-
-        def normalize_text(text):
-            # Remove accents and convert to lowercase
-            text = "".join(
-                c
-                for c in unicodedata.normalize("NFD", text)
-                if unicodedata.category(c) != "Mn"
-            ).lower()
-            # Keep only letters, numbers and spaces
-            text = "".join(c for c in text if c.isalnum() or c.isspace())
-            # Normalize all whitespace to single spaces
-            return " ".join(text.split())
-
-        yt_search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(search_query)}"
-
-        yt_headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        }
-        yt_response = requests.get(yt_search_url, headers=yt_headers, timeout=10)
-
-        if yt_response.status_code == 200:
-            import re
-
-            # Find video entries
-            video_ids = re.findall(r'"videoId":"([^"]+)"', yt_response.text)
-
-            # Get unique videos
-            videos = []
-            seen = set()
-            for vid in video_ids:
-                if vid not in seen and len(videos) < 10:
-                    videos.append(vid)
-                    seen.add(vid)
-
-            # Match videos by title
-            best_video = None
-            title_normalized = normalize_text(title)
-
-            video_titles = []
-            for video_id in videos:
-                video_pos = yt_response.text.find(f'"videoId":"{video_id}"')
-                if video_pos == -1:
-                    continue
-                search_window = yt_response.text[video_pos : video_pos + 2000]
-                title_pattern = r'"title":{"runs":\[{"text":"([^"]+)"}'
-                title_match = re.search(title_pattern, search_window)
-
-                if title_match:
-                    video_title = title_match.group(1)
-                    video_title_normalized = normalize_text(video_title)
-                    video_titles.append((video_id, video_title, video_title_normalized))
-
-                    if (
-                        title_normalized in video_title_normalized
-                        or video_title_normalized in title_normalized
-                    ):
-                        best_video = video_id
-                        break
-
-            # Fallback: try matching by artist names
-            if not best_video and artists:
-                artist_list = [normalize_text(a.strip()) for a in artists.split(",")]
-
-                for artist_name in artist_list:
-                    for video_id, video_title, video_title_normalized in video_titles:
-                        if artist_name in video_title_normalized:
-                            best_video = video_id
-                            break
-                    if best_video:
-                        break
-
-            if not best_video and isrc:
-                # Retry search by title + artist
-                search_query = f"{artists} {title}"
-                yt_search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(search_query)}"
-                yt_response = requests.get(
-                    yt_search_url, headers=yt_headers, timeout=10
-                )
-
-                video_ids = re.findall(r'"videoId":"([^"]+)"', yt_response.text)
-                videos = []
-                seen = set()
-                for vid in video_ids:
-                    if vid not in seen and len(videos) < 10:
-                        videos.append(vid)
-                        seen.add(vid)
-
-                video_titles = []
-                for video_id in videos:
-                    video_pos = yt_response.text.find(f'"videoId":"{video_id}"')
-                    if video_pos == -1:
-                        continue
-                    search_window = yt_response.text[video_pos : video_pos + 2000]
-                    title_pattern = r'"title":{"runs":\[{"text":"([^"]+)"}'
-                    title_match = re.search(title_pattern, search_window)
-                    if title_match:
-                        video_title = title_match.group(1)
-                        video_title_normalized = normalize_text(video_title)
-                        video_titles.append(
-                            (video_id, video_title, video_title_normalized)
-                        )
-                        if (
-                            normalize_text(title) in video_title_normalized
-                            or video_title_normalized in normalize_text(title)
-                        ):
-                            best_video = video_id
-                            break
-
-                # fallback by artist again
-                if not best_video and artists:
-                    artist_list = [
-                        normalize_text(a.strip()) for a in artists.split(",")
-                    ]
-                    for artist_name in artist_list:
-                        for (
-                            video_id,
-                            video_title,
-                            video_title_normalized,
-                        ) in video_titles:
-                            if artist_name in video_title_normalized:
-                                best_video = video_id
-                                break
-                        if best_video:
-                            break
-
-            if best_video:
-                youtube_links.append(
-                    {
-                        "url": f"https://www.youtube.com/watch?v={best_video}",
-                        "position": 1,
-                    }
-                )
-                # Try maxresdefault first, fallback to hqdefault if not available
-                max_res_url = (
-                    f"https://img.youtube.com/vi/{best_video}/maxresdefault.jpg"
-                )
-                try:
-                    img_check = requests.head(max_res_url, timeout=3)
-                    if (
-                        img_check.status_code == 200
-                        and int(img_check.headers.get("content-length", 0)) > 5000
-                    ):
-                        thumbnail_url = max_res_url
-                    else:
-                        thumbnail_url = (
-                            f"https://img.youtube.com/vi/{best_video}/hqdefault.jpg"
-                        )
-                except Exception:
-                    thumbnail_url = (
-                        f"https://img.youtube.com/vi/{best_video}/hqdefault.jpg"
-                    )
-                cache_bust = int(time.time() * 1000)
-                local_poster = download_image(
-                    thumbnail_url,
-                    f"posters/musicbrainz_{recording_id}_{cache_bust}.jpg",
-                )
-                local_banner = download_image(
-                    thumbnail_url,
-                    f"banners/musicbrainz_{recording_id}_{cache_bust}.jpg",
-                )
-            else:
-                print("[SAVE] No match found, saving without YouTube link")
-    except Exception as e:
-        print(f"[SAVE] YouTube search error: {str(e)}")
-        pass
-
     # Get release date
     release_date = None
-    releases = recording_data.get("releases", [])
     if releases:
-        first_release = releases[0]
-        release_date_str = first_release.get("date", "")
+        release_date_str = releases[0].get("date", "")
 
         # Format release date
         if release_date_str:
@@ -331,21 +121,173 @@ def save_musicbrainz_item(recording_id):
             except ValueError:
                 pass
 
+    values = {
+        "image_prefix": f"musicbrainz_{recording_id}",
+        "title": title,
+        "overview": overview,
+        "release_date": release_date,
+        "cast": cast_data,
+        "related_titles": [],
+        "genres": genres,
+        "creators": creators,
+    }
+
+    if include_cover:
+        video_id = None
+        try:
+            video_id = find_youtube_video(title, artists, isrc)
+        except Exception as e:
+            print(f"[SAVE] YouTube search error: {str(e)}")
+        thumbnail_url = youtube_thumbnail(video_id) if video_id else ""
+        values.update(video_id=video_id, cover_url=thumbnail_url, banner_url=thumbnail_url)
+
+    return values
+
+
+def _normalize_video_text(text):
+    # Remove accents and convert to lowercase
+    text = "".join(
+        c
+        for c in unicodedata.normalize("NFD", text)
+        if unicodedata.category(c) != "Mn"
+    ).lower()
+    # Keep only letters, numbers and spaces
+    text = "".join(c for c in text if c.isalnum() or c.isspace())
+    # Normalize all whitespace to single spaces
+    return " ".join(text.split())
+
+
+def _search_youtube(search_query, title, artists):
+    """The first of the top 10 results whose title matches, else the first by an artist."""
+    yt_search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(search_query)}"
+
+    yt_headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    }
+    yt_response = http_get("youtube", yt_search_url, headers=yt_headers, timeout=10)
+    if yt_response.status_code != 200:
+        return None
+
+    # Find video entries
+    video_ids = re.findall(r'"videoId":"([^"]+)"', yt_response.text)
+
+    # Get unique videos
+    videos = []
+    seen = set()
+    for vid in video_ids:
+        if vid not in seen and len(videos) < 10:
+            videos.append(vid)
+            seen.add(vid)
+
+    # Match videos by title
+    title_normalized = _normalize_video_text(title)
+
+    video_titles = []
+    for video_id in videos:
+        video_pos = yt_response.text.find(f'"videoId":"{video_id}"')
+        if video_pos == -1:
+            continue
+        search_window = yt_response.text[video_pos : video_pos + 2000]
+        title_pattern = r'"title":{"runs":\[{"text":"([^"]+)"}'
+        title_match = re.search(title_pattern, search_window)
+
+        if title_match:
+            video_title_normalized = _normalize_video_text(title_match.group(1))
+            video_titles.append((video_id, video_title_normalized))
+
+            if (
+                title_normalized in video_title_normalized
+                or video_title_normalized in title_normalized
+            ):
+                return video_id
+
+    # Fallback: try matching by artist names
+    if artists:
+        for artist_name in [_normalize_video_text(a.strip()) for a in artists.split(",")]:
+            for video_id, video_title_normalized in video_titles:
+                if artist_name in video_title_normalized:
+                    return video_id
+    return None
+
+
+def find_youtube_video(title, artists, isrc=""):
+    """The YouTube video id of a recording, searched by ISRC first, then by artist and title."""
+    if isrc:
+        video_id = _search_youtube(isrc, title, artists)
+        if video_id:
+            return video_id
+    return _search_youtube(f"{artists} {title}", title, artists)
+
+
+def youtube_thumbnail(video_id):
+    # Try maxresdefault first, fallback to hqdefault if not available
+    max_res_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+    try:
+        img_check = http_head("youtube", max_res_url, timeout=3)
+        if (
+            img_check.status_code == 200
+            and int(img_check.headers.get("content-length", 0)) > 5000
+        ):
+            return max_res_url
+    except Exception:
+        pass
+    return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+
+
+def save_musicbrainz_item(recording_id, item=None):
+    try:
+        values = fetch_musicbrainz_metadata(recording_id, include_cover=True)
+
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 503:
+            return JsonResponse(
+                {
+                    "error": "Most likely MusicBrainz api rate limit error. Please try again in a moment."
+                },
+                status=503,
+            )
+        else:
+            return JsonResponse(
+                {
+                    "error": f"Failed to fetch details from MusicBrainz (Error {e.response.status_code})."
+                },
+                status=e.response.status_code,
+            )
+
+    except requests.exceptions.RequestException:
+        return JsonResponse(
+            {
+                "error": "Failed to connect to MusicBrainz. Please check your network connection."
+            },
+            status=500,
+        )
+
+    video_id = values.pop("video_id")
+    youtube_links = []
+    if video_id:
+        youtube_links.append(
+            {
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "position": 1,
+            }
+        )
+    else:
+        print("[SAVE] No match found, saving without YouTube link")
+
+    # Poster and banner are both the video thumbnail
+    sources = download_metadata_images(values, values.pop("image_prefix"))
+
     # Save to database
-    item = MediaItem.objects.create(
-        title=title,
+    item = save_media_item(
+        item,
         media_type="music",
         source="musicbrainz",
         provider_ids={"musicbrainz": str(recording_id)},
-        cover_url=local_poster,
-        banner_url=local_banner if "local_banner" in locals() else "",
-        overview=overview,
-        release_date=release_date,
-        cast=cast_data,
         seasons=None,
-        related_titles=[],
-        genres=genres,
-        creators=creators,
+        image_sources=sources,
+        **values,
     )
 
     from core.models import MusicVideo
@@ -395,11 +337,10 @@ def get_music_extra_info(recording_id, artist_id=None, album_id=None):
 
     # Fetch album tracks
     if album_id:
-        time.sleep(1)
         album_url = f"https://musicbrainz.org/ws/2/release/{album_id}"
         album_params = {"inc": "recordings", "fmt": "json"}
         try:
-            album_response = requests.get(
+            album_response = http_get("musicbrainz",
                 album_url, params=album_params, headers=headers, timeout=10
             )
             if album_response.status_code == 429:
@@ -421,7 +362,6 @@ def get_music_extra_info(recording_id, artist_id=None, album_id=None):
 
     # Fetch artist singles via release-groups (no IDs)
     if artist_id:
-        time.sleep(1)
         rg_url = "https://musicbrainz.org/ws/2/release-group"
         rg_params = {
             "artist": artist_id,
@@ -433,7 +373,7 @@ def get_music_extra_info(recording_id, artist_id=None, album_id=None):
 
         try:
             while True:
-                rg_response = requests.get(
+                rg_response = http_get("musicbrainz",
                     rg_url, params=rg_params, headers=headers, timeout=10
                 )
                 if rg_response.status_code == 429:
@@ -474,7 +414,6 @@ def get_music_extra_info(recording_id, artist_id=None, album_id=None):
     return {"album_tracks": album_tracks, "artist_singles": artist_singles}
 
 def get_musicbrainz_discover(page=1, query="", sort="trending", genre="", year=""):
-    import requests
     results = []
     
     # 1. If pure trending/popular (no search/genre/year), hit ListenBrainz for Sitewide Stats
@@ -488,7 +427,7 @@ def get_musicbrainz_discover(page=1, query="", sort="trending", genre="", year="
             lb_range = "this_month" if sort == "trending" else "all_time"
             
             url = "https://api.listenbrainz.org/1/stats/sitewide/recordings"
-            resp = requests.get(url, params={"count": 100, "range": lb_range}, timeout=10)
+            resp = http_get("listenbrainz", url, params={"count": 100, "range": lb_range}, timeout=10)
             
             if resp.status_code == 200:
                 recordings = resp.json().get("payload", {}).get("recordings", [])
@@ -535,10 +474,7 @@ def get_musicbrainz_discover(page=1, query="", sort="trending", genre="", year="
             "offset": offset,
         }
         
-        # Call wait_for_rate_limit() to guarantee Page 2 doesn't trigger a 503 on MusicBrainz
-        wait_for_rate_limit() 
-        
-        resp = requests.get(url, params=params, timeout=10, headers={"User-Agent": "MediaJournal/1.0"})
+        resp = http_get("musicbrainz", url, params=params, timeout=10, headers={"User-Agent": "MediaJournal/1.0"})
         if resp.status_code == 200:
             for rec in resp.json().get("recordings", []):
                 artist = ", ".join([a.get("name", "") for a in rec.get("artist-credit", [])])
@@ -1,15 +1,14 @@
-import os
 import re
 import logging
 import datetime
 import time
 
-import requests
-from django.conf import settings
 from django.utils.text import slugify
 
 from core.models import APIKey, FavoritePerson
 from core.services.g_utils import download_image
+from core.services.g_media import delete_unused_media, media_paths
+from core.services.g_http import http_get, http_post
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +23,7 @@ def actor_search(query):
         "page": 1,
     }
 
-    response = requests.get(url, params=params)
+    response = http_get("tmdb", url, params=params)
 
     if response.status_code == 200:
         data = response.json()
@@ -66,7 +65,7 @@ def character_search(query):
 
     variables = {"search": query}
 
-    response = requests.post(
+    response = http_post("anilist",
         url, json={"query": graphql_query, "variables": variables}, headers=headers
     )
 
@@ -146,7 +145,7 @@ def fetch_actor_data(actor_id):
 
         # Get person details
         person_url = f"https://api.themoviedb.org/3/person/{actor_id}"
-        person_response = requests.get(person_url, params={"api_key": api_key})
+        person_response = http_get("tmdb", person_url, params={"api_key": api_key})
 
         if person_response.status_code != 200:
             return None
@@ -155,7 +154,7 @@ def fetch_actor_data(actor_id):
 
         # Get combined credits
         credits_url = f"https://api.themoviedb.org/3/person/{actor_id}/combined_credits"
-        credits_response = requests.get(credits_url, params={"api_key": api_key})
+        credits_response = http_get("tmdb", credits_url, params={"api_key": api_key})
 
         related_media = []
         if credits_response.status_code == 200:
@@ -388,7 +387,7 @@ def fetch_character_data(character_id):
             f"Making AniList request for character {character_id} with variables: {variables}"
         )
 
-        response = requests.post(
+        response = http_post("anilist",
             "https://graphql.anilist.co",
             json={"query": query, "variables": variables},
             headers={"Content-Type": "application/json"},
@@ -573,21 +572,9 @@ def delete_favorite_person_and_reorder(person_id):
         person = FavoritePerson.objects.get(id=person_id)
         person_type = person.type
 
-        # Only delete image files that are in the favorites directory
-        if person.image_url and person.image_url.startswith(settings.MEDIA_URL):
-            # Convert URL to file system path
-            relative_path = person.image_url.replace(settings.MEDIA_URL, "").lstrip("/")
-            # Only delete if it's in the favorites directory
-            if relative_path.startswith("favorites/"):
-                local_path = os.path.join(settings.MEDIA_ROOT, relative_path)
-                if os.path.isfile(local_path):
-                    try:
-                        os.remove(local_path)
-                    except Exception as e:
-                        print(f"Failed to delete image file {local_path}: {e}")
-
-        # Delete the person record from DB
+        # Delete the person record from DB, then its image unless something else uses it
         person.delete()
+        delete_unused_media(media_paths(person.image_url))
 
         # Reorder remaining people of the same type
         favorites = FavoritePerson.objects.filter(type=person_type).order_by("position")
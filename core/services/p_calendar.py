@@ -1,11 +1,20 @@
+import time
+import uuid
 import datetime
+import logging
+import threading
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.utils import timezone
-import requests
+from django.utils.crypto import salted_hmac
 import concurrent.futures
 
-from core.models import APIKey, CalendarEvent
+from core.models import APIKey, CalendarEvent, MediaItem
 from core.services.m_games import get_igdb_token
+from core.services.g_http import http_get, http_post
+
+logger = logging.getLogger(__name__)
 
 def _normalize_dt(dt_obj):
     """Helper to convert timezone-aware datetimes to naive if USE_TZ is False."""
@@ -13,6 +22,13 @@ def _normalize_dt(dt_obj):
         return timezone.make_naive(dt_obj)
     return dt_obj
 
+def _day_start(day):
+    """Midnight of a date-only release in TIME_ZONE, so it's shown on its own day (all_day events)."""
+    start = datetime.datetime.combine(day, datetime.time.min)
+    if settings.USE_TZ:
+        return timezone.make_aware(start, timezone.get_default_timezone())
+    return start
+
 def cleanup_old_events():
     """Deletes all events (API and Custom) older than 90 days, except the tracker."""
     current_utc = datetime.datetime.now(datetime.timezone.utc)
@@ -20,7 +36,289 @@ def cleanup_old_events():
     db_cutoff = _normalize_dt(cutoff)
     CalendarEvent.objects.filter(date__lt=db_cutoff).exclude(title="__API_SYNC__").delete()
 
-def sync_items_with_apis(items):
+# --- Month view ---
+# The calendar page loads a month (plus the padding weeks around it) grouped by day. Every
+# CalendarEvent write bumps the calendar version, which keys the cached months and is the
+# ETag of the month API, so unchanged months are answered with a 304.
+
+CALENDAR_VERSION_CACHE_KEY = "calendar_version"
+CALENDAR_MONTH_TIMEOUT = 60 * 60
+CALENDAR_MONTH_PADDING = datetime.timedelta(days=7)
+# The MediaItem fields the month events show
+CALENDAR_ITEM_FIELDS = {"title", "media_type", "cover_url", "source", "provider_ids"}
+
+def calendar_version():
+    # Starts from the clock, so a restart never hands out a version an old ETag already has
+    return cache.get_or_set(CALENDAR_VERSION_CACHE_KEY, lambda: int(time.time() * 1000), None)
+
+def bump_calendar_version():
+    """Marks every cached month stale. Signals call it on save/delete, bulk writes call it themselves."""
+    try:
+        cache.incr(CALENDAR_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(CALENDAR_VERSION_CACHE_KEY, int(time.time() * 1000), None)
+
+def item_calendar_key(item):
+    """The values of an item its events show, or None if some of them weren't loaded."""
+    if item.get_deferred_fields() & CALENDAR_ITEM_FIELDS:
+        return None
+    return (item.title, item.media_type, item.cover_url, item.source, dict(item.provider_ids or {}))
+
+def shift_month(year, month, offset):
+    index = year * 12 + month - 1 + offset
+    return index // 12, index % 12 + 1
+
+def build_calendar_month(year, month):
+    """{"YYYY-MM-DD": [event]} of a month and the week before and after it, in one query."""
+    start_date = datetime.date(year, month, 1) - CALENDAR_MONTH_PADDING
+    end_date = datetime.date(*shift_month(year, month, 1), 1) + CALENDAR_MONTH_PADDING
+    rows = CalendarEvent.objects.filter(date__gte=start_date, date__lt=end_date).exclude(
+        title="__API_SYNC__"
+    ).order_by("date", "pk").values_list(
+        "id", "title", "date", "all_day", "is_custom", "notify", "notes", "recurring_group",
+        "item__title", "item__media_type", "item__cover_url", "item__source", "item__provider_ids",
+    )
+
+    days = {}
+    for (pk, title, date, all_day, is_custom, notify, notes, group,
+         item_title, media_type, cover_url, source, provider_ids) in rows:
+        # The page falls back to the placeholder cover itself
+        days.setdefault(date.date().isoformat(), []).append({
+            "id": pk,
+            "title": item_title,
+            "event_title": title,
+            "media_type": media_type,
+            "date": date.isoformat(),
+            "all_day": all_day,
+            "is_custom": is_custom,
+            "notify": notify,
+            "notes": notes,
+            "recurring_group": str(group) if group else None,
+            "cover_url": cover_url,
+            "source_id": (provider_ids or {}).get(source),
+            "source": source,
+        })
+    return days
+
+def calendar_month_days(year, month, version=None):
+    """The cached build_calendar_month() of the given calendar version."""
+    if version is None:
+        version = calendar_version()
+    key = f"calendar_month:{version}:{year}-{month:02d}"
+    days = cache.get(key)
+    if days is None:
+        days = build_calendar_month(year, month)
+        cache.set(key, days, CALENDAR_MONTH_TIMEOUT)
+    return days
+
+# --- iCalendar feed ---
+# /calendar.ics for calendar apps. The body is cached per calendar version and media type
+# filter, so a poll while nothing changed costs a cache lookup (or a 304), not a query.
+
+CALENDAR_FEED_TIMEOUT = 24 * 60 * 60
+ICS_LINE_LIMIT = 75  # Octets, longer lines are folded
+
+def _ics_text(value):
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+def _ics_fold(line):
+    """Splits a content line into 75 octet lines (RFC 5545 3.1), without cutting a character."""
+    if len(line.encode()) <= ICS_LINE_LIMIT:
+        return line
+    lines = []
+    current, size = "", 0
+    for char in line:
+        length = len(char.encode())
+        if size + length > ICS_LINE_LIMIT:
+            lines.append(current)
+            current, size = " ", 1
+        current += char
+        size += length
+    lines.append(current)
+    return "\r\n".join(lines)
+
+def _ics_local(date):
+    """Event dates are naive TIME_ZONE times (USE_TZ=False), aware ones are converted to it."""
+    if timezone.is_aware(date):
+        return timezone.make_naive(date, timezone.get_default_timezone())
+    return date
+
+def _ics_tzid():
+    """The TZID timed events are written in, None for UTC (written with a Z instead)."""
+    name = str(timezone.get_default_timezone())
+    return None if name in ("UTC", "Etc/UTC") else name
+
+def _ics_start(date, all_day, tzid):
+    """
+    DTSTART/DTEND of an event: a date for all_day events (date-only releases), else a time in
+    TIME_ZONE, so the RRULE of a recurring group keeps its local time across DST changes.
+    """
+    date = _ics_local(date)
+    if all_day:
+        day = date.date()
+        return [f"DTSTART;VALUE=DATE:{day:%Y%m%d}", f"DTEND;VALUE=DATE:{day + datetime.timedelta(days=1):%Y%m%d}"]
+    end = date + datetime.timedelta(hours=1)
+    if tzid is None:
+        return [f"DTSTART:{date:%Y%m%dT%H%M%SZ}", f"DTEND:{end:%Y%m%dT%H%M%SZ}"]
+    return [f"DTSTART;TZID={tzid}:{date:%Y%m%dT%H%M%S}", f"DTEND;TZID={tzid}:{end:%Y%m%dT%H%M%S}"]
+
+def _ics_offset(delta):
+    minutes = int(delta.total_seconds()) // 60
+    sign = "+" if minutes >= 0 else "-"
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+def _tz_transitions(tz, start, end):
+    """The UTC instants between start and end where the offset of tz changes, to the minute."""
+    transitions = []
+    day = datetime.timedelta(days=1)
+    current = start
+    while current < end:
+        following = current + day
+        if current.astimezone(tz).utcoffset() != following.astimezone(tz).utcoffset():
+            low, high = current, following
+            while high - low > datetime.timedelta(minutes=1):
+                middle = low + (high - low) / 2
+                if middle.astimezone(tz).utcoffset() == low.astimezone(tz).utcoffset():
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high.replace(second=0, microsecond=0))
+        current = following
+    return transitions
+
+def _ics_vtimezone(tzid, years):
+    """
+    The VTIMEZONE of TIME_ZONE for the given years: one observance from the first of
+    January, then one per offset change (RFC 5545 3.6.5).
+    """
+    tz = timezone.get_default_timezone()
+    start = datetime.datetime(min(years), 1, 1, tzinfo=datetime.timezone.utc)
+    end = datetime.datetime(max(years) + 1, 1, 1, tzinfo=datetime.timezone.utc)
+
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tzid}"]
+
+    def observance(instant, offset_from):
+        local = instant.astimezone(tz)
+        kind = "DAYLIGHT" if local.dst() else "STANDARD"
+        lines.extend([
+            f"BEGIN:{kind}",
+            f"DTSTART:{(instant + offset_from).replace(tzinfo=None):%Y%m%dT%H%M%S}",
+            f"TZOFFSETFROM:{_ics_offset(offset_from)}",
+            f"TZOFFSETTO:{_ics_offset(local.utcoffset())}",
+            f"TZNAME:{_ics_text(local.tzname())}",
+            f"END:{kind}",
+        ])
+
+    observance(start, start.astimezone(tz).utcoffset())
+    for instant in _tz_transitions(tz, start, end):
+        observance(instant, (instant - datetime.timedelta(minutes=1)).astimezone(tz).utcoffset())
+    lines.append("END:VTIMEZONE")
+    return lines
+
+def _ics_rrule(events):
+    """
+    The RRULE of a recurring group, if one rule describes it: same summary and notes, same
+    time of day (or all day) and a fixed number of days between them. Groups whose titles
+    count up ("Episode 1", "Episode 2"...) can't be one event and are written one by one.
+    """
+    if len(events) < 2:
+        return None
+    first = events[0]
+    shared = ("summary", "notes", "all_day")
+    if any(ev[key] != first[key] for ev in events for key in shared):
+        return None
+    gaps = {later["date"] - earlier["date"] for earlier, later in zip(events, events[1:])}
+    if len(gaps) != 1:
+        return None
+    gap = gaps.pop()
+    if gap.seconds or gap.microseconds or gap.days < 1:
+        return None
+    if gap.days % 7 == 0:
+        return f"RRULE:FREQ=WEEKLY;INTERVAL={gap.days // 7};COUNT={len(events)}"
+    return f"RRULE:FREQ=DAILY;INTERVAL={gap.days};COUNT={len(events)}"
+
+def _ics_event(uid, ev, stamp, tzid, rrule=None):
+    lines = ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{stamp}", *_ics_start(ev["date"], ev["all_day"], tzid)]
+    if rrule:
+        lines.append(rrule)
+    lines.append(f"SUMMARY:{_ics_text(ev['summary'])}")
+    if ev["notes"]:
+        lines.append(f"DESCRIPTION:{_ics_text(ev['notes'])}")
+    lines.append(f"CATEGORIES:{_ics_text(ev['category'])}")
+    lines.append("END:VEVENT")
+    return lines
+
+def build_calendar_feed(media_types=None):
+    """The iCalendar document of every event (of the given media types), in one query."""
+    labels = dict(MediaItem.MEDIA_TYPES)
+    rows = CalendarEvent.objects.exclude(title="__API_SYNC__").order_by("date", "pk")
+    if media_types:
+        rows = rows.filter(item__media_type__in=media_types)
+    rows = rows.values_list("id", "date", "all_day", "title", "notes", "recurring_group", "item__title", "item__media_type")
+
+    groups = {}
+    for pk, date, all_day, title, notes, group, item_title, media_type in rows:
+        event = {
+            "pk": pk,
+            "date": _ics_local(date),
+            "all_day": all_day,
+            "summary": f"{item_title} - {title}" if title else item_title,
+            "notes": notes,
+            "category": labels.get(media_type, media_type),
+        }
+        # Events without a group (and API events, whose group is their own) are groups of one
+        groups.setdefault(group or f"event-{pk}", []).append(event)
+
+    stamp = timezone.now()
+    if not timezone.is_aware(stamp):
+        stamp = timezone.make_aware(stamp, timezone.get_default_timezone())
+    stamp = f"{stamp.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Media Journal//Calendar//EN",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:Media Journal",
+    ]
+    tzid = _ics_tzid()
+    timed_years = {ev["date"].year for events in groups.values() for ev in events if not ev["all_day"]}
+    if tzid and timed_years:
+        lines += _ics_vtimezone(tzid, timed_years)
+    for group, events in groups.items():
+        rrule = _ics_rrule(events)
+        if rrule:
+            lines += _ics_event(f"group-{group}@media-journal", events[0], stamp, tzid, rrule)
+        else:
+            for ev in events:
+                lines += _ics_event(f"event-{ev['pk']}@media-journal", ev, stamp, tzid)
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_ics_fold(line) for line in lines) + "\r\n"
+
+def calendar_feed_token():
+    """
+    The secret in the feed url calendar apps subscribe to, which works without logging in.
+    Derived from SECRET_KEY, changing the key changes the url.
+    """
+    return salted_hmac("core.calendar_feed", "calendar.ics").hexdigest()[:32]
+
+def calendar_feed_body(media_types=None, version=None):
+    """The cached build_calendar_feed() of the given calendar version."""
+    if version is None:
+        version = calendar_version()
+    media_types = sorted(set(media_types or []))
+    key = f"calendar_feed:{version}:{','.join(media_types)}"
+    body = cache.get(key)
+    if body is None:
+        body = build_calendar_feed(media_types)
+        cache.set(key, body, CALENDAR_FEED_TIMEOUT)
+    return body
+
+def sync_items_with_apis(items, on_group_done=None):
+    """
+    Syncs the calendar events of the given items. The provider groups are fetched in
+    parallel, on_group_done(label, item count) is called as each one finishes.
+    """
     # Run the 3-month cleanup every time a sync happens
     cleanup_old_events()
 
@@ -47,14 +345,107 @@ def sync_items_with_apis(items):
         elif source == "igdb":
             igdb_items.append(item)
     
-    _sync_tmdb_movies(tmdb_movies)
-    _sync_tmdb_tv(tmdb_tv)
-    _sync_anilist(anilist_items)
-    _sync_igdb(igdb_items)
+    groups = [
+        ("TMDB movies", _sync_tmdb_movies, tmdb_movies),
+        ("TMDB TV", _sync_tmdb_tv, tmdb_tv),
+        ("AniList", _sync_anilist, anilist_items),
+        ("IGDB", _sync_igdb, igdb_items),
+    ]
+    groups = [group for group in groups if group[2]]
+    if not groups:
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        futures = {executor.submit(_run_sync_group, sync, group_items): (label, group_items) for label, sync, group_items in groups}
+        for future in concurrent.futures.as_completed(futures):
+            label, group_items = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Calendar sync of {label} failed: {e}")
+            if on_group_done:
+                on_group_done(label, len(group_items))
+
+def _run_sync_group(sync, items):
+    try:
+        sync(items)
+    finally:
+        connection.close()
+
+# Items whose events are written per query batch (keeps the IN lists under SQLite's limits)
+CALENDAR_WRITE_BATCH_SIZE = 500
+_write_lock = threading.Lock()
+
+def _save_synced_events(synced, events):
+    """
+    Writes the API events of one provider's sync and marks the items synced, in one transaction.
 
-def _mark_as_synced(item):
-    item.calendar_last_sync = timezone.now()
-    item.save(update_fields=['calendar_last_sync'])
+    `synced` are the ids of the items that were looked up, `events` is {item_id: [(match, date,
+    title, inherit_notify, all_day)]}. `match` says what identifies an existing event: its "title"
+    ("Game Release", "Episode 5") or its "date" (TV episodes, whose title grows as more
+    episodes of the day are announced). An existing match gets the new date and title,
+    duplicates of it are deleted and missing events are created. New events with
+    inherit_notify take the notify state of the item's latest event.
+
+    Every batch is one select, one bulk_create, one bulk_update, one delete and one update.
+    """
+    synced = list(synced)
+    now = timezone.now()
+    # The provider groups sync in parallel, SQLite takes one writer at a time
+    with _write_lock, transaction.atomic():
+        changed = False
+        for i in range(0, len(synced), CALENDAR_WRITE_BATCH_SIZE):
+            batch = synced[i:i + CALENDAR_WRITE_BATCH_SIZE]
+            changed |= _apply_event_batch({item_id: events[item_id] for item_id in batch if events.get(item_id)})
+            MediaItem.objects.filter(pk__in=batch).update(calendar_last_sync=now)
+        if changed:
+            # bulk_create and bulk_update skip the signals
+            transaction.on_commit(bump_calendar_version)
+
+def _apply_event_batch(events):
+    """Writes one batch, returns whether any event was created or updated."""
+    if not events:
+        return False
+    existing = {}
+    rows = CalendarEvent.objects.filter(
+        item_id__in=list(events), is_custom=False
+    ).exclude(title="__API_SYNC__").order_by("pk")
+    for ev in rows:
+        existing.setdefault(ev.item_id, []).append(ev)
+
+    to_create = []
+    to_update = []
+    to_delete = []
+    for item_id, specs in events.items():
+        current = existing.get(item_id, [])
+        # Smart Notifications: inherit the notify state of the most recent event
+        latest = max(current, key=lambda ev: ev.date, default=None)
+        auto_notify = latest.notify if latest else False
+
+        for match, date, title, inherit_notify, all_day in specs:
+            matches = [ev for ev in current if (ev.title == title if match == "title" else ev.date == date)]
+            if not matches:
+                to_create.append(CalendarEvent(
+                    item_id=item_id, date=date, all_day=all_day, title=title, is_custom=False,
+                    notify=auto_notify if inherit_notify else False,
+                ))
+                continue
+            ev = matches[0]
+            if ev.date != date or ev.title != title or ev.all_day != all_day:
+                ev.date = date
+                ev.title = title
+                ev.all_day = all_day
+                to_update.append(ev)
+            # Left by older syncs
+            to_delete.extend(dup.pk for dup in matches[1:])
+
+    if to_create:
+        CalendarEvent.objects.bulk_create(to_create)
+    if to_update:
+        CalendarEvent.objects.bulk_update(to_update, ["date", "title", "all_day"])
+    if to_delete:
+        CalendarEvent.objects.filter(pk__in=to_delete).delete()
+    return bool(to_create or to_update)
 
 def _sync_tmdb_movies(items):
     if not items: 
@@ -67,13 +458,12 @@ def _sync_tmdb_movies(items):
     # 1. Only do network requests in the fast threads
     def fetch_movie(item):
         try:
-            resp = requests.get(f"https://api.themoviedb.org/3/movie/{item.source_id}", params={"api_key": api_key}, timeout=5)
+            resp = http_get("tmdb", f"https://api.themoviedb.org/3/movie/{item.source_id}", params={"api_key": api_key}, timeout=5, use_cache=False)
             if resp.status_code == 200:
                 data = resp.json()
                 release_date_str = data.get("release_date")
                 if release_date_str:
-                    release_dt = datetime.datetime.strptime(release_date_str, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
-                    return (item, release_dt)
+                    return (item, datetime.datetime.strptime(release_date_str, "%Y-%m-%d").date())
         except Exception as e:
             print(f"Error fetching TMDB movie {item.title}: {e}")
         return (item, None)
@@ -82,20 +472,15 @@ def _sync_tmdb_movies(items):
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
         results = list(executor.map(fetch_movie, items))
 
-    # 2. Save to database sequentially on the main thread to prevent SQLite locking
+    # 2. Save to database on the main thread to prevent SQLite locking
     current_utc = datetime.datetime.now(datetime.timezone.utc)
     three_months_ago = current_utc - datetime.timedelta(days=90)
 
-    for item, release_dt in results:
-        if release_dt and release_dt >= three_months_ago:
-            db_date = _normalize_dt(release_dt)
-            CalendarEvent.objects.update_or_create(
-                item=item, 
-                title="Global Release", 
-                is_custom=False,
-                defaults={'date': db_date}
-            )
-        _mark_as_synced(item)
+    events = {}
+    for item, release_day in results:
+        if release_day and release_day >= three_months_ago.date():
+            events[item.id] = [("title", _day_start(release_day), "Global Release", False, True)]
+    _save_synced_events([item.id for item in items], events)
 
 def _sync_tmdb_tv(items):
     if not items: 
@@ -111,7 +496,7 @@ def _sync_tmdb_tv(items):
             is_season = "_s" in str(item.source_id)
             base_id = str(item.source_id).split("_s")[0] if is_season else item.source_id
                 
-            resp = requests.get(f"https://api.themoviedb.org/3/tv/{base_id}", params={"api_key": api_key}, timeout=5)
+            resp = http_get("tmdb", f"https://api.themoviedb.org/3/tv/{base_id}", params={"api_key": api_key}, timeout=5, use_cache=False)
             if resp.status_code != 200:
                 return (item, None)
                 
@@ -127,7 +512,7 @@ def _sync_tmdb_tv(items):
             # Fetch full episode lists for those seasons and group by date
             episodes_by_date_season = {}
             for s_num in seasons_to_fetch:
-                s_resp = requests.get(f"https://api.themoviedb.org/3/tv/{base_id}/season/{s_num}", params={"api_key": api_key}, timeout=5)
+                s_resp = http_get("tmdb", f"https://api.themoviedb.org/3/tv/{base_id}/season/{s_num}", params={"api_key": api_key}, timeout=5, use_cache=False)
                 if s_resp.status_code == 200:
                     s_data = s_resp.json()
                     for ep in s_data.get("episodes", []):
@@ -147,132 +532,178 @@ def _sync_tmdb_tv(items):
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
         results = list(executor.map(fetch_tv, items))
 
-    # 2. Save to database sequentially on the main thread
+    # 2. Save to database on the main thread
     current_utc = datetime.datetime.now(datetime.timezone.utc)
     three_months_ago = current_utc - datetime.timedelta(days=90)
 
+    events = {}
     for item, episodes_by_date_season in results:
-        if episodes_by_date_season:
-            # Smart Notifications: Inherit notify state from the most recent episode
-            latest_event = CalendarEvent.objects.filter(item=item, is_custom=False).exclude(title="__API_SYNC__").order_by('-date').first()
-            auto_notify = latest_event.notify if latest_event else False
+        if not episodes_by_date_season:
+            continue
+        by_date = {}
+        for (air_date_str, s_num), eps in episodes_by_date_season.items():
+            air_day = datetime.datetime.strptime(air_date_str, "%Y-%m-%d").date()
+            if air_day < three_months_ago.date():
+                continue
 
-            for (air_date_str, s_num), eps in episodes_by_date_season.items():
-                air_dt = datetime.datetime.strptime(air_date_str, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
-                
-                if air_dt >= three_months_ago:
-                    db_date = _normalize_dt(air_dt)
-                    
-                    # Sort the episodes for this specific date by episode number
-                    eps = sorted(eps, key=lambda x: x.get("episode_number", 0))
-                    
-                    # Create a consolidated title (e.g. "Episode 4" OR "Episodes 4-6")
-                    if len(eps) == 1:
-                        title_str = f"Episode {eps[0].get('episode_number')} (S{s_num})"
-                    else:
-                        first_ep = eps[0]
-                        last_ep = eps[-1]
-                        title_str = f"Episodes {first_ep.get('episode_number')}-{last_ep.get('episode_number')} (S{s_num})"
-                        
-                    # Find any existing events for this exact item and date
-                    existing_events = list(CalendarEvent.objects.filter(
-                        item=item, date=db_date, is_custom=False
-                    ).exclude(title="__API_SYNC__"))
-                    
-                    if existing_events:
-                        # Update the title of the primary event if it changed
-                        ev = existing_events[0]
-                        if ev.title != title_str:
-                            ev.title = title_str
-                            ev.save(update_fields=['title'])
-                        
-                        # If the old logic created duplicates on this exact date, delete them
-                        if len(existing_events) > 1:
-                            for dup in existing_events[1:]:
-                                dup.delete()
-                    else:
-                        CalendarEvent.objects.create(
-                            item=item,
-                            date=db_date,
-                            title=title_str,
-                            is_custom=False,
-                            notify=auto_notify
-                        )
-        _mark_as_synced(item)
+            # Sort the episodes for this specific date by episode number
+            eps = sorted(eps, key=lambda x: x.get("episode_number", 0))
 
-def _sync_anilist(items):
-    if not items: 
-        return
-    
-    item_map = {}
-    ids_to_fetch = []
-    for item in items:
-        a_id = item.provider_ids.get("anilist")
-        if a_id:
-            ids_to_fetch.append(int(a_id))
-            item_map[int(a_id)] = item
-    
-    if not ids_to_fetch:
-        return
+            # Create a consolidated title (e.g. "Episode 4" OR "Episodes 4-6")
+            if len(eps) == 1:
+                title_str = f"Episode {eps[0].get('episode_number')} (S{s_num})"
+            else:
+                first_ep = eps[0]
+                last_ep = eps[-1]
+                title_str = f"Episodes {first_ep.get('episode_number')}-{last_ep.get('episode_number')} (S{s_num})"
+
+            # One event per day
+            by_date[_day_start(air_day)] = title_str
+        events[item.id] = [("date", db_date, title_str, True, True) for db_date, title_str in by_date.items()]
+    _save_synced_events([item.id for item in items], events)
+
+# Calendar syncs only need a release date, so they're fetched in wider batches than the
+# metadata. An AniList page holds at most 50 entries, one request carries several of them
+# as aliased Page queries. IGDB returns up to 500 games per query.
+ANILIST_CALENDAR_PAGE_SIZE = 50
+ANILIST_CALENDAR_PAGES_PER_REQUEST = 4
+IGDB_CALENDAR_BATCH_SIZE = 500
 
-    query = """
-    query ($ids: [Int]) {
-      Page(perPage: 50) {
-        media(id_in: $ids) {
+# Requests in flight at once per provider, the rate limiters in g_http space them out
+CALENDAR_SYNC_WORKERS = 4
+
+ANILIST_CALENDAR_FIELDS = """
           id
+          idMal
           nextAiringEpisode { airingAt episode }
           startDate { year month day }
-        }
-      }
-    }
+"""
+
+def _chunks(values, size):
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+def _fetch_chunks(fetch, chunks):
+    """Runs fetch(chunk) for every chunk in parallel. Returns [(chunk, result)], None for chunks that failed."""
+    if not chunks:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(CALENDAR_SYNC_WORKERS, len(chunks))) as executor:
+        futures = [(chunk, executor.submit(fetch, chunk)) for chunk in chunks]
+
+    results = []
+    for chunk, future in futures:
+        try:
+            results.append((chunk, future.result()))
+        except Exception as e:
+            print(f"Error syncing calendar batch: {e}")
+            results.append((chunk, None))
+    return results
+
+def _anilist_calendar_key(item):
+    """(id field, id) AniList knows an item by: its AniList id, or the MAL id of older entries."""
+    anilist_id = str(item.provider_ids.get("anilist") or "")
+    if anilist_id.isdigit():
+        return ("id", int(anilist_id))
+    mal_id = str(item.provider_ids.get("mal") or "")
+    if mal_id.isdigit():
+        return ("idMal", int(mal_id))
+    return None
+
+def _fetch_anilist_calendar(pages):
     """
-    
-    try:
-        resp = requests.post("https://graphql.anilist.co", json={"query": query, "variables": {"ids": ids_to_fetch}}, timeout=10)
-        if resp.status_code == 200:
-            media_list = resp.json().get("data", {}).get("Page", {}).get("media", [])
-            for m in media_list:
-                item = item_map.get(m["id"])
-                if not item: 
-                    continue
-                
-                current_utc = datetime.datetime.now(datetime.timezone.utc)
-                three_months_ago = current_utc - datetime.timedelta(days=90)
-                
-                # Smart Notifications
-                latest_event = CalendarEvent.objects.filter(item=item, is_custom=False).exclude(title="__API_SYNC__").order_by('-date').first()
-                auto_notify = latest_event.notify if latest_event else False
-                
-                next_ep = m.get("nextAiringEpisode")
-                if next_ep:
-                    air_dt = datetime.datetime.fromtimestamp(next_ep["airingAt"], tz=datetime.timezone.utc)
-                    db_date = _normalize_dt(air_dt)
-                    
-                    ev, created = CalendarEvent.objects.get_or_create(
-                        item=item, 
-                        title=f"Episode {next_ep['episode']}", 
-                        is_custom=False,
-                        defaults={'date': db_date, 'notify': auto_notify}
-                    )
-                    if not created and ev.date != db_date:
-                        ev.date = db_date
-                        ev.save(update_fields=['date'])
-                else:
-                    start = m.get("startDate")
-                    if start and start.get("year") and start.get("month") and start.get("day"):
-                        start_dt = datetime.datetime(start["year"], start["month"], start["day"], tzinfo=datetime.timezone.utc)
-                        if start_dt >= three_months_ago:
-                            db_date = _normalize_dt(start_dt)
-                            CalendarEvent.objects.update_or_create(
-                                item=item, 
-                                title="Release Date", 
-                                is_custom=False,
-                                defaults={'date': db_date}
-                            )
-                
-                _mark_as_synced(item)
-    except Exception as e:
-        print(f"Error syncing AniList: {e}")
+    Release dates of several (media_type, id_field, ids) pages in one request.
+    Returns {(media_type, id_field, id): media}, ids AniList doesn't know are left out.
+    """
+    params = []
+    selections = []
+    variables = {}
+    for n, (media_type, id_field, ids) in enumerate(pages):
+        list_arg = "id_in" if id_field == "id" else "idMal_in"
+        params.append(f"$ids{n}: [Int], $type{n}: MediaType")
+        selections.append(
+            f"p{n}: Page(perPage: {ANILIST_CALENDAR_PAGE_SIZE}) {{\n"
+            f"        media({list_arg}: $ids{n}, type: $type{n}) {{{ANILIST_CALENDAR_FIELDS}        }}\n"
+            f"      }}"
+        )
+        variables[f"ids{n}"] = ids
+        variables[f"type{n}"] = media_type.upper()
+    query = f"query ({', '.join(params)}) {{\n      " + "\n      ".join(selections) + "\n    }"
+
+    resp = http_post("anilist", "https://graphql.anilist.co", json={"query": query, "variables": variables}, timeout=10, use_cache=False)
+    if resp.status_code == 400 and len(pages) > 1:
+        # Over AniList's query complexity limit, fall back to one page per request
+        results = {}
+        for page in pages:
+            results.update(_fetch_anilist_calendar([page]))
+        return results
+    if resp.status_code != 200:
+        raise Exception(f"AniList request failed with status {resp.status_code}.")
+
+    data = resp.json().get("data") or {}
+    results = {}
+    for n, (media_type, id_field, _) in enumerate(pages):
+        for m in (data.get(f"p{n}") or {}).get("media") or []:
+            key = m.get("id") if id_field == "id" else m.get("idMal")
+            if key is not None:
+                results[(media_type, id_field, key)] = m
+    return results
+
+def _sync_anilist(items):
+    if not items: 
+        return
+
+    # 1. Group the ids into pages per media type (MAL ids are only unique within one)
+    keys = {}
+    groups = {}
+    for item in items:
+        key = _anilist_calendar_key(item)
+        if key is None:
+            # Nothing to look up, marked synced below so it isn't retried on every sync
+            continue
+        keys[item.id] = (item.media_type, *key)
+        groups.setdefault((item.media_type, key[0]), []).append(key[1])
+
+    pages = []
+    for (media_type, id_field), ids in groups.items():
+        for chunk in _chunks(sorted(set(ids)), ANILIST_CALENDAR_PAGE_SIZE):
+            pages.append((media_type, id_field, chunk))
+
+    # 2. Fetch the requests in parallel
+    fetched = {}
+    failed = set()
+    for chunk, results in _fetch_chunks(_fetch_anilist_calendar, _chunks(pages, ANILIST_CALENDAR_PAGES_PER_REQUEST)):
+        if results is None:
+            failed.update((media_type, id_field, i) for media_type, id_field, ids in chunk for i in ids)
+        else:
+            fetched.update(results)
+
+    # 3. Save on this thread, items of failed requests are left for the next sync
+    current_utc = datetime.datetime.now(datetime.timezone.utc)
+    three_months_ago = current_utc - datetime.timedelta(days=90)
+
+    synced = []
+    events = {}
+    for item in items:
+        key = keys.get(item.id)
+        if key in failed:
+            continue
+        synced.append(item.id)
+        m = fetched.get(key) if key else None
+        if m:
+            events[item.id] = _anilist_events(m, three_months_ago)
+    _save_synced_events(synced, events)
+
+def _anilist_events(m, three_months_ago):
+    next_ep = m.get("nextAiringEpisode")
+    if next_ep:
+        air_dt = datetime.datetime.fromtimestamp(next_ep["airingAt"], tz=datetime.timezone.utc)
+        return [("title", _normalize_dt(air_dt), f"Episode {next_ep['episode']}", True, False)]
+
+    start = m.get("startDate")
+    if start and start.get("year") and start.get("month") and start.get("day"):
+        start_day = datetime.date(start["year"], start["month"], start["day"])
+        if start_day >= three_months_ago.date():
+            return [("title", _day_start(start_day), "Release Date", False, True)]
+    return []
 
 def _sync_igdb(items):
     if not items: 
@@ -286,51 +717,174 @@ def _sync_igdb(items):
     except APIKey.DoesNotExist:
         return
 
-    item_map = {}
-    ids_to_fetch = []
+    ids = {}
     for item in items:
         try:
-            igdb_id = int(item.source_id)
-            ids_to_fetch.append(str(igdb_id))
-            item_map[igdb_id] = item
-        except Exception:
+            ids[item.id] = int(item.source_id)
+        except (TypeError, ValueError):
+            # Not an IGDB id, marked synced below so it isn't retried on every sync
             pass
 
-    if not ids_to_fetch: 
-        return
-
-    id_str = ",".join(ids_to_fetch)
-    query = f"fields id, first_release_date; where id = ({id_str}); limit 50;"
-
     headers = {
         "Client-ID": igdb_keys.key_1,
         "Authorization": f"Bearer {token}",
     }
 
-    try:
-        resp = requests.post("https://api.igdb.com/v4/games", headers=headers, data=query, timeout=10)
-        if resp.status_code == 200:
-            games = resp.json()
-            for g in games:
-                item = item_map.get(g["id"])
-                if not item: 
-                    continue
-                
-                release_ts = g.get("first_release_date")
-                if release_ts:
-                    release_dt = datetime.datetime.fromtimestamp(release_ts, tz=datetime.timezone.utc)
-                    current_utc = datetime.datetime.now(datetime.timezone.utc)
-                    three_months_ago = current_utc - datetime.timedelta(days=90)
-                    
-                    if release_dt >= three_months_ago:
-                        db_date = _normalize_dt(release_dt)
-                        CalendarEvent.objects.update_or_create(
-                            item=item, 
-                            title="Game Release", 
-                            is_custom=False,
-                            defaults={'date': db_date}
-                        )
-                
-                _mark_as_synced(item)
-    except Exception as e:
-        print(f"Error syncing IGDB: {e}")
\ No newline at end of file
+    def fetch_games(chunk):
+        query = f"fields id, first_release_date; where id = ({','.join(str(i) for i in chunk)}); limit {len(chunk)};"
+        resp = http_post("igdb", "https://api.igdb.com/v4/games", headers=headers, data=query, timeout=10, use_cache=False)
+        if resp.status_code != 200:
+            raise Exception(f"IGDB request failed with status {resp.status_code}.")
+        return {g["id"]: g for g in resp.json()}
+
+    # 1. Fetch the chunks in parallel
+    fetched = {}
+    failed = set()
+    for chunk, games in _fetch_chunks(fetch_games, _chunks(sorted(set(ids.values())), IGDB_CALENDAR_BATCH_SIZE)):
+        if games is None:
+            failed.update(chunk)
+        else:
+            fetched.update(games)
+
+    # 2. Save on this thread, items of failed requests are left for the next sync
+    current_utc = datetime.datetime.now(datetime.timezone.utc)
+    three_months_ago = current_utc - datetime.timedelta(days=90)
+
+    synced = []
+    events = {}
+    for item in items:
+        igdb_id = ids.get(item.id)
+        if igdb_id in failed:
+            continue
+        synced.append(item.id)
+        release_ts = (fetched.get(igdb_id) or {}).get("first_release_date")
+        if release_ts:
+            release_dt = datetime.datetime.fromtimestamp(release_ts, tz=datetime.timezone.utc)
+            if release_dt >= three_months_ago:
+                events[item.id] = [("title", _normalize_dt(release_dt), "Game Release", False, False)]
+    _save_synced_events(synced, events)
+
+
+# --- Background sync ---
+# The calendar and home pages start a sync and poll its status, the request returns right
+# away. One sync runs at a time. Starting one while another runs returns the running one if
+# it covers the request, else a queued task that starts once it finishes. Requests made
+# meanwhile are merged into that queued task.
+
+CALENDAR_SYNC_TASKS = {}
+SYNC_TASK_RETENTION = 60 * 60
+_start_lock = threading.Lock()
+_queued_task = None
+
+def calendar_items_to_sync(statuses, force=False):
+    """Items of the given statuses to sync: all of them if forced, else the ones without a known future event not synced today."""
+    items = MediaItem.objects.filter(status__in=statuses)
+    if force:
+        return list(items)
+
+    now = timezone.now()
+    # Items that currently have a future API event are skipped to save an API call
+    items_with_future_events = set(
+        CalendarEvent.objects.filter(
+            item__in=items,
+            date__gt=now,
+            is_custom=False
+        ).exclude(title="__API_SYNC__").values_list('item_id', flat=True)
+    )
+    return [
+        item for item in items
+        if item.id not in items_with_future_events
+        and (not item.calendar_last_sync or (now - item.calendar_last_sync).days >= 1)
+    ]
+
+class CalendarSyncTask(threading.Thread):
+    def __init__(self, task_id, statuses, force=False):
+        super().__init__(name="calendar-sync", daemon=True)
+        self.task_id = task_id
+        self.statuses = statuses
+        self.force = force
+        self.status = "pending"  # pending, running, completed, error
+        self.progress = 0
+        self.message = "Waiting..."
+        self.synced_count = 0
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._done = 0
+
+    def run(self):
+        self.status = "running"
+        try:
+            items = calendar_items_to_sync(self.statuses, self.force)
+            self.synced_count = len(items)
+            self.message = f"Syncing {len(items)} items..."
+            if items:
+                sync_items_with_apis(items, on_group_done=self._group_done)
+            self.status = "completed"
+            self.progress = 100
+            self.message = "Sync Complete!"
+        except Exception as e:
+            logger.error(f"Calendar sync failed: {e}")
+            self.status = "error"
+            self.error = str(e)
+        finally:
+            connection.close()
+            _finish_sync(self)
+
+    def covers(self, statuses, force=False):
+        """True if this sync does what a request for statuses/force would."""
+        return set(statuses) <= set(self.statuses) and (self.force or not force)
+
+    def _group_done(self, label, count):
+        self._done += count
+        self.progress = int(self._done * 100 / self.synced_count) if self.synced_count else 100
+        self.message = f"{label} synced"
+
+    def as_dict(self):
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "synced_count": self.synced_count,
+            "error": self.error,
+        }
+
+def start_calendar_sync(statuses, force=False):
+    """
+    Starts a background sync and returns its task. While one runs, returns it if it covers
+    the request, else the queued task that runs next.
+    """
+    global _queued_task
+    with _start_lock:
+        now = time.time()
+        for task_id, task in list(CALENDAR_SYNC_TASKS.items()):
+            if task.finished_at and now - task.finished_at > SYNC_TASK_RETENTION:
+                del CALENDAR_SYNC_TASKS[task_id]
+
+        running = next((t for t in CALENDAR_SYNC_TASKS.values() if t.is_alive() and t.finished_at is None), None)
+        if running is None:
+            task = CalendarSyncTask(uuid.uuid4().hex, statuses, force)
+            CALENDAR_SYNC_TASKS[task.task_id] = task
+            task.start()
+            return task
+        if running.covers(statuses, force):
+            return running
+
+        if _queued_task is None:
+            _queued_task = CalendarSyncTask(uuid.uuid4().hex, list(statuses), force)
+            _queued_task.message = "Waiting for the running sync to finish..."
+            CALENDAR_SYNC_TASKS[_queued_task.task_id] = _queued_task
+        else:
+            _queued_task.statuses = sorted(set(_queued_task.statuses) | set(statuses))
+            _queued_task.force = _queued_task.force or force
+        return _queued_task
+
+def _finish_sync(finished):
+    """Marks a sync finished and starts the queued one, under the lock so no request slips in between."""
+    global _queued_task
+    with _start_lock:
+        finished.finished_at = time.time()
+        task, _queued_task = _queued_task, None
+        if task is not None:
+            task.start()
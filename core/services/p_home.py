@@ -4,15 +4,22 @@ import threading
 from datetime import timedelta, datetime
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Q, Sum, When
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 
 from core.models import MediaItem
-from core.services.m_anime_manga import update_anilist_anime_manga
-from core.services.m_movies_tvshows import update_tmdb_seasons
+from core.services.m_anime_manga import ANILIST_BATCH_SIZE, fetch_anilist_relations, update_anilist_anime_manga
+from core.services.m_movies_tvshows import fetch_tmdb_tv_changes, update_tmdb_seasons
+from core.services.g_http import fresh_responses
+from core.services.g_media import clean_orphaned_media
 
-_started_tmdb = False
-_started_anilist = False
-_started_cleanup = False
+HOME_STATS_CACHE_KEY = "home_stats"
+# Signals keep the stats current, the timeout only catches writes that bypass them (queryset.update, raw SQL)
+HOME_STATS_TIMEOUT = 60 * 60 * 6
+_home_stats_lock = threading.Lock()
+STATS_FIELDS = {"media_type", "status", "progress_main", "favorite", "date_added"}
 
 
 def acquire_media_lock():
@@ -44,214 +51,240 @@ def release_media_lock():
         except OSError:
             pass
 
-def start_media_cleanup_loop():
-    global _started_cleanup
-    if _started_cleanup:
-        return
-    _started_cleanup = True
 
-    # --- Monthly Run Logic ---
-    # Use a text file to track the last run date
-    counter_file = os.path.join(settings.BASE_DIR, '.cleanup_runs')
-    last_run_date = None
-    
-    if os.path.exists(counter_file):
-        try:
-            with open(counter_file, 'r') as f:
-                content = f.read().strip()
-                if content.isdigit():
-                    last_run_date = None
-                else:
-                    last_run_date = datetime.strptime(content, '%Y-%m-%d').date()
-        except (ValueError, Exception):
-            last_run_date = None
+# --- Scheduled jobs ---
+# Run by core/services/g_scheduler.py, which decides when (SCHEDULE) and records the
+# returned summary on the settings page. The providers' rate limits in g_http pace the
+# update passes, so there are no sleeps between items.
 
-    today = datetime.now().date()
-    if last_run_date:
-        days_since_last_run = (today - last_run_date).days
-        if days_since_last_run < 30:
-            print(f"Cleanup already ran {days_since_last_run} days ago. Skipping (runs monthly).")
-            return
+def run_media_cleanup():
+    """Deletes downloaded images that no item references anymore (see g_media.find_orphaned_media)."""
+    # Wait gracefully if migration holds the lock
+    while not acquire_media_lock():
+        print("Media operation in progress. Cleanup waiting 60 seconds...")
+        time.sleep(60)
 
     try:
-        with open(counter_file, 'w') as f:
-            f.write(today.strftime('%Y-%m-%d'))
-    except Exception as e:
-        print(f"Failed to write cleanup date: {e}")
-
-    # --- The Cleanup Thread ---
-    def loop():
-        print("Media cleanup task scheduled (runs monthly). Starting in 30 seconds...")
-        time.sleep(30)
-
-        # 1. Wait gracefully if migration holds the lock
-        while not acquire_media_lock():
-            print("Media operation in progress. Cleanup waiting 60 seconds...")
-            time.sleep(60)
-
-        try:
-            print("Running orphan media cleanup...")
-            
-            # Helper function to recursively find all media URLs inside JSON fields
-            def extract_valid_media(data, valid_set):
-                if isinstance(data, dict):
-                    for value in data.values():
-                        extract_valid_media(value, valid_set)
-                elif isinstance(data, list):
-                    for item in data:
-                        extract_valid_media(item, valid_set)
-                elif isinstance(data, str):
-                    if data.startswith("/media/"):
-                        valid_set.add(data.replace("/media/", "", 1).strip('/'))
-
-            # Gather all VALID images currently in use by the database
-            valid_files = set()
-            for item in MediaItem.objects.all():
-                # Add Cover
-                if item.cover_url and item.cover_url.startswith("/media/"):
-                    valid_files.add(item.cover_url.replace("/media/", "", 1).strip('/'))
-                
-                # Add Banner
-                if item.banner_url and item.banner_url.startswith("/media/"):
-                    valid_files.add(item.banner_url.replace("/media/", "", 1).strip('/'))
-                
-                # Smart scan all JSON fields for any image paths
-                extract_valid_media(item.seasons, valid_files)
-                extract_valid_media(item.episodes, valid_files)
-                extract_valid_media(item.related_titles, valid_files)
-                extract_valid_media(item.cast, valid_files)
-
-            # Add Game Screenshots from the new relational table
-            from core.models import Screenshot
-            for shot in Screenshot.objects.all():
-                if shot.url and shot.url.startswith("/media/"):
-                    valid_files.add(shot.url.replace("/media/", "", 1).strip('/'))
-
-            # Define the specific folders we want to clean
-            folders_to_clean =[
-                "posters", 
-                "banners", 
-                "screenshots", 
-                "seasons", 
-                "episodes", 
-                "related", 
-                "cast"
-            ]
-            deleted_count = 0
-
-            # Scan the folders and delete files NOT in the valid list
-            for folder_name in folders_to_clean:
-                folder_path = os.path.join(settings.MEDIA_ROOT, folder_name)
-                
-                if not os.path.exists(folder_path):
-                    continue
-                
-                for root_dir, dirs, files in os.walk(folder_path):
-                    # Clean empty shard folders while walking
-                    if not dirs and not files and root_dir != folder_path:
-                        try:
-                            os.rmdir(root_dir)
-                        except OSError:
-                            pass
-                        continue
-
-                    for filename in files:
-                        if filename.startswith('.'):
-                            continue
-                        
-                        file_to_delete = os.path.join(root_dir, filename)
-                        # Calculate accurate relative path (e.g., "posters/e4/image.jpg")
-                        rel_path = os.path.relpath(file_to_delete, settings.MEDIA_ROOT).replace('\\', '/')
-                        
-                        if rel_path not in valid_files:
-                            try:
-                                os.remove(file_to_delete)
-                                deleted_count += 1
-                            except OSError as e:
-                                print(f"Could not delete {file_to_delete}: {e}")
-
-            print(f"Media cleanup finished successfully. Deleted {deleted_count} orphaned files.")
-
-        except Exception as e:
-            print(f"Error during media cleanup: {e}")
-        finally:
-            # 2. Always release the lock when finished!
-            release_media_lock()
-
-    t = threading.Thread(target=loop, daemon=True)
-    t.start()
-
-def start_tmdb_background_loop():
-    global _started_tmdb
-    if _started_tmdb:
-        return
-    _started_tmdb = True
-
-    def loop():
-        print("TMDB background update loop started")
-        while True:
-            now = timezone.now()
-            cutoff = now - timedelta(days=7)
-
-            items = MediaItem.objects.filter(media_type="tv", source="tmdb").exclude(
-                provider_ids__tmdb__icontains='_s'
-            ).exclude(
-                provider_ids__tmdb__startswith='custom_'
-            )
-            eligible = [item for item in items if item.last_updated < cutoff]
-
-            for item in eligible[:60]:
-                update_tmdb_seasons(item)
-                time.sleep(30)
-
-            print("TMDB check loop finished batch. Pausing for 1 hour...")
-            time.sleep(1800)
-
-    t = threading.Thread(target=loop, daemon=True)
-    t.start()
-
-
-def start_anilist_background_loop():
-    global _started_anilist
-    if _started_anilist:
+        print("Running orphan media cleanup...")
+        report = clean_orphaned_media()
+        print(f"Media cleanup finished successfully. Deleted {report['deleted']} orphaned files.")
+        return f"Deleted {report['deleted']} orphaned files ({report['bytes'] // 1024} KB)"
+    finally:
+        # Always release the lock when finished!
+        release_media_lock()
+
+
+def media_cleanup_first_run():
+    """
+    When the cleanup job is first registered, carry over the monthly schedule the old
+    home page loop kept in .cleanup_runs (so upgrading doesn't trigger an extra run).
+    """
+    counter_file = os.path.join(settings.BASE_DIR, '.cleanup_runs')
+    try:
+        with open(counter_file, 'r') as f:
+            last_run_date = datetime.strptime(f.read().strip(), '%Y-%m-%d')
+        return timezone.make_aware(last_run_date) + timedelta(days=30)
+    except (OSError, ValueError):
+        return timezone.now() + timedelta(seconds=30)
+
+
+# The update loops only load what the checks read and write. The stats fields are loaded
+# too so the partial saves keep the home stats up to date instead of dropping them.
+UPDATE_CHECK_FIELDS = [
+    "id", "title", "media_type", "creators", "source", "provider_ids", "seasons",
+    "related_titles", "notification", "last_updated", *STATS_FIELDS,
+]
+UPDATE_INTERVAL = timedelta(days=7)
+# TMDB keeps 14 days of changes, leave a day of margin for time zones
+TMDB_CHANGES_WINDOW = timedelta(days=13)
+
+
+def update_priority():
+    """Shows and series the user is following first, then the longest unchecked."""
+    return Case(
+        When(status="ongoing", then=0),
+        When(status="planned", then=1),
+        When(status="on_hold", then=2),
+        default=3,
+        output_field=IntegerField(),
+    )
+
+
+def run_tmdb_updates():
+    """
+    Checks TV shows that weren't updated for a week for new seasons.
+    Shows checked within the TMDB changes window that don't appear in /tv/changes
+    since then can't have new seasons, those are only marked as checked.
+    """
+    now = timezone.now()
+    items = list(
+        MediaItem.objects.filter(media_type="tv", source="tmdb", last_updated__lt=now - UPDATE_INTERVAL)
+        .exclude(provider_ids__tmdb__icontains='_s')
+        .exclude(provider_ids__tmdb__startswith='custom_')
+        .only(*UPDATE_CHECK_FIELDS)
+        .order_by(update_priority(), "last_updated")
+    )
+    if not items:
+        return "No TV shows due"
+
+    window_start = now - TMDB_CHANGES_WINDOW
+    # These checks exist to pick up new episodes, skip the response cache
+    with fresh_responses():
+        changed = None
+        if any(item.last_updated >= window_start for item in items):
+            changed = fetch_tmdb_tv_changes(window_start.date())
+
+        unchanged = []
+        eligible = []
+        for item in items:
+            if changed is not None and item.last_updated >= window_start and str(item.source_id) not in changed:
+                unchanged.append(item.id)
+            else:
+                eligible.append(item)
+
+        for i in range(0, len(unchanged), 500):
+            MediaItem.objects.filter(id__in=unchanged[i:i + 500]).update(last_updated=now)
+
+        for item in eligible:
+            update_tmdb_seasons(item)
+
+    return f"Checked {len(eligible)} TV shows, {len(unchanged)} unchanged on TMDB"
+
+
+def run_anilist_updates():
+    """
+    Checks anime and manga that weren't updated for a week for new sequels.
+    Entries that already have a sequel are skipped, the rest are fetched 50 at a time.
+    """
+    items = list(
+        MediaItem.objects.filter(
+            media_type__in=["anime", "manga"],
+            last_updated__lt=timezone.now() - UPDATE_INTERVAL,
+        ).exclude(
+            # has_key first, a missing id compares as NULL and would exclude the row
+            Q(provider_ids__has_key="anilist") & Q(provider_ids__anilist__startswith='custom_')
+        ).exclude(
+            Q(provider_ids__has_key="mal") & Q(provider_ids__mal__startswith='custom_')
+        ).exclude(
+            has_sequel=True  # Kept in sync with related_titles by MediaItem.save()
+        ).only(*UPDATE_CHECK_FIELDS).order_by("last_updated")
+    )
+
+    # Items with an AniList id are looked up by it, older MAL only items by their MAL id
+    batches = []
+    for media_type in ["anime", "manga"]:
+        typed = [item for item in items if item.media_type == media_type]
+        by_anilist = [item for item in typed if str(item.provider_ids.get("anilist") or "").isdigit()]
+        by_mal = [
+            item for item in typed
+            if not item.provider_ids.get("anilist") and str(item.provider_ids.get("mal") or "").isdigit()
+        ]
+        for id_field, provider, group in [("id", "anilist", by_anilist), ("idMal", "mal", by_mal)]:
+            for i in range(0, len(group), ANILIST_BATCH_SIZE):
+                batches.append((media_type, id_field, provider, group[i:i + ANILIST_BATCH_SIZE]))
+
+    checked = 0
+    # These checks exist to pick up new episodes, skip the response cache
+    with fresh_responses():
+        for media_type, id_field, provider, group in batches:
+            ids = [item.provider_ids[provider] for item in group]
+            try:
+                results = fetch_anilist_relations(media_type, ids, id_field)
+            except Exception as e:
+                # Stop here, the next run continues with the items left unchecked
+                print(f"[AniList Update] Batch failed: {e}")
+                break
+
+            for item in group:
+                data = results.get(str(item.provider_ids[provider]))
+                if data is None:
+                    # No longer on AniList, check again next week
+                    item.last_updated = timezone.now()
+                    item.save(update_fields=["last_updated"])
+                else:
+                    update_anilist_anime_manga(item, data)
+                checked += 1
+
+    return f"Checked {checked} anime and manga"
+
+
+# --- Home page stats ---
+# Per type/status counts, progress sums, favorites and per-day activity for the heatmap.
+# Built once with two grouped queries, then kept current by the MediaItem signals in core/signals.py.
+
+def build_home_stats():
+    groups = {}
+    favorites = 0
+    rows = MediaItem.objects.order_by().values("media_type", "status").annotate(
+        count=Count("id"),
+        progress=Sum("progress_main"),
+        favorites=Count("id", filter=Q(favorite=True)),
+    )
+    for row in rows:
+        groups[f"{row['media_type']}|{row['status']}"] = {
+            "count": row["count"],
+            "progress": row["progress"] or 0,
+        }
+        favorites += row["favorites"]
+
+    activity = {}
+    days = MediaItem.objects.order_by().annotate(day=TruncDate("date_added")).values("day").annotate(count=Count("id"))
+    for row in days:
+        if row["day"]:
+            activity[row["day"].isoformat()] = row["count"]
+
+    return {"groups": groups, "favorites": favorites, "activity": activity}
+
+
+def get_home_stats():
+    stats = cache.get(HOME_STATS_CACHE_KEY)
+    if stats is None:
+        with _home_stats_lock:
+            stats = cache.get(HOME_STATS_CACHE_KEY)
+            if stats is None:
+                stats = build_home_stats()
+                cache.set(HOME_STATS_CACHE_KEY, stats, HOME_STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_home_stats():
+    """Drops the cached stats so the next home page load rebuilds them."""
+    with _home_stats_lock:
+        cache.delete(HOME_STATS_CACHE_KEY)
+
+
+def item_stats_key(item):
+    """The values of an item the home stats depend on, or None if some of them weren't loaded."""
+    if item.get_deferred_fields() & STATS_FIELDS:
+        return None
+    return (item.media_type, item.status, item.progress_main or 0, item.favorite, item.date_added)
+
+
+def update_home_stats(old_key, new_key):
+    """Moves one item's contribution from old_key to new_key (either can be None for create/delete)."""
+    if old_key == new_key:
         return
-    _started_anilist = True
-
-    def loop():
-        print("AniList background update loop started")
-        while True:
-            now = timezone.now()
-            cutoff = now - timedelta(days=7)
-
-            items = MediaItem.objects.filter(
-                media_type__in=["anime", "manga"]
-            ).exclude(
-                provider_ids__anilist__startswith='custom_'
-            ).exclude(
-                provider_ids__mal__startswith='custom_'
-            )
-            eligible = [
-                item
-                for item in items
-                if item.last_updated < cutoff and not has_sequel(item)
-            ]
-
-            for item in eligible[:60]:
-                update_anilist_anime_manga(item)
-                time.sleep(30)
-
-            print("AniList check loop finished batch. Pausing for 1 hour...")
-            time.sleep(1800)
-
-    t = threading.Thread(target=loop, daemon=True)
-    t.start()
-
-
-def has_sequel(item):
-    """Check if item.related_titles includes a sequel"""
-    if not item.related_titles:
-        return False
-    for rel in item.related_titles:
-        if rel.get("relation", "").lower() == "sequel":
-            return True
-    return False
+    with _home_stats_lock:
+        stats = cache.get(HOME_STATS_CACHE_KEY)
+        if stats is None:
+            return  # Nothing cached yet, the next read builds fresh stats
+
+        for key, sign in ((old_key, -1), (new_key, 1)):
+            if key is None:
+                continue
+            media_type, status, progress, favorite, date_added = key
+
+            group = stats["groups"].setdefault(f"{media_type}|{status}", {"count": 0, "progress": 0})
+            group["count"] += sign
+            group["progress"] += sign * progress
+
+            if favorite:
+                stats["favorites"] += sign
+
+            if date_added:
+                day = date_added.date().isoformat()
+                stats["activity"][day] = stats["activity"].get(day, 0) + sign
+                if stats["activity"][day] <= 0:
+                    del stats["activity"][day]
+
+        cache.set(HOME_STATS_CACHE_KEY, stats, HOME_STATS_TIMEOUT)
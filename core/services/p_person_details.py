@@ -1,12 +1,11 @@
-import os
 import logging
 import time
 
-from django.conf import settings
 from django.utils.text import slugify
 
 from core.models import FavoritePerson
 from core.services.g_utils import download_image
+from core.services.g_media import delete_unused_media, media_paths
 from core.services.m_people import fetch_actor_data, fetch_character_data
 
 logger = logging.getLogger(__name__)
@@ -21,17 +20,6 @@ def refresh_favorite_person(person_id, refresh_mode="data"):
         api_person_id = person.person_id  # The actual API ID (TMDB/AniList)
         old_image_url = person.image_url  # Save the existing image URL
 
-        # Delete old image if it's in favorites directory ONLY if refreshing all
-        if refresh_mode == "all" and person.image_url and person.image_url.startswith(settings.MEDIA_URL):
-            relative_path = person.image_url.replace(settings.MEDIA_URL, "").lstrip("/")
-            if relative_path.startswith("favorites/"):
-                old_path = os.path.join(settings.MEDIA_ROOT, relative_path)
-                if os.path.exists(old_path):
-                    try:
-                        os.remove(old_path)
-                    except Exception as e:
-                        print(f"Failed to delete image file {old_path}: {e}")
-
         # Delete person without reordering
         person.delete()
 
@@ -83,6 +71,10 @@ def refresh_favorite_person(person_id, refresh_mode="data"):
             person_id=api_person_id,
             **additional_data,
         )
+
+        # Delete the old image ONLY if refreshing all, and only once nothing uses it
+        if refresh_mode == "all":
+            delete_unused_media(media_paths(old_image_url))
         return True
     except FavoritePerson.DoesNotExist:
         return False
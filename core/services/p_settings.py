@@ -1,7 +1,12 @@
+import io
 import os
 import glob
+import json
+import hashlib
+import shutil
 import time
 import uuid
+import queue
 import logging
 import zipfile
 import tempfile
@@ -10,12 +15,21 @@ from datetime import datetime
 
 from django.conf import settings
 from django.utils import timezone
-from django.core.serializers import serialize, deserialize
+from django.core.serializers import deserialize, jsonl
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
 
 from core.models import APIKey, NavItem, MediaItem, AppSettings, FavoritePerson, Collection, CollectionItem, CalendarEvent, MediaItemLog, Screenshot, MusicVideo
-from core.services.m_books import save_openlib_item
-from core.services.m_movies_tvshows import save_tmdb_season
+from core.services.m_games import IGDB_GAMES_BATCH_SIZE, fetch_igdb_games, igdb_metadata
+from core.services.m_anime_manga import ANILIST_DATA_BATCH_SIZE, fetch_anilist_metadata_batch
+from core.services.g_http import fresh_responses
+from core.services.g_media import MEDIA_FIELDS, delete_unused_media, rebuild_media_references, sync_item_media
+from core.services.g_refresh import apply_metadata, fetch_item_metadata, has_new_release
+from core.services.g_settings import invalidate_app_settings, invalidate_nav_items
+from core.services.p_home import invalidate_home_stats
+from core.services.p_calendar import CALENDAR_ITEM_FIELDS, bump_calendar_version
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +37,461 @@ logger = logging.getLogger(__name__)
 BACKUP_TASKS = {}
 
 
+# Backup archives hold one JSON-lines file per model (data/<app>.<model>.jsonl, in restore
+# order) plus a manifest. Older backups have a single backup_data.json (or media_items.json).
+BACKUP_FORMAT = 2
+BACKUP_MANIFEST = "backup_manifest.json"
+EXPORT_CHUNK_SIZE = 1000
+
+# Media folders included in backups
+BACKUP_MEDIA_FOLDERS = [
+    "posters",
+    "banners",
+    "cast",
+    "related",
+    "screenshots",
+    "seasons",
+    "episodes",
+    "favorites",
+]
+
+
+def backup_querysets():
+    """(name, queryset) of every model in a backup, parents before the rows that point to them."""
+    models = [
+        get_user_model(),
+        MediaItem,
+        FavoritePerson,
+        APIKey,
+        NavItem,
+        AppSettings,
+        Collection,
+        CollectionItem,
+        CalendarEvent,
+        MediaItemLog,
+        Screenshot,
+        MusicVideo,
+    ]
+    return [(model._meta.label_lower, model.objects.order_by("pk")) for model in models]
+
+
+class JSONLinesSerializer(jsonl.Serializer):
+    """
+    Django's JSON-lines serializer writing each row with json.dumps. Django's uses
+    json.dump, which always runs the pure Python encoder and writes token by token.
+    """
+
+    def __init__(self, row_filter=None):
+        # row_filter(obj, line) -> False leaves the row out (see RowDiff)
+        self.row_filter = row_filter
+
+    def end_object(self, obj):
+        line = json.dumps(self.get_dump_object(obj), **self.json_kwargs)
+        if self.row_filter is None or self.row_filter(obj, line):
+            self.stream.write(line + "\n")
+        self._current = None
+
+
+def backup_data_file(name):
+    return f"data/{name}.jsonl"
+
+
+def iter_backup_files(media_root):
+    """(absolute path, path inside the archive) of every media file a backup includes."""
+    for folder in BACKUP_MEDIA_FOLDERS:
+        stack = [os.path.join(media_root, folder)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, os.path.relpath(entry.path, media_root).replace("\\", "/")
+            except FileNotFoundError:
+                continue
+
+
+# --- Backup import ---
+# Rows are matched to existing ones by a natural key instead of their primary key (the
+# backup may come from another install), then written with bulk_create/bulk_update in one
+# transaction per batch. Foreign keys are remapped from the backup's ids to the local ones.
+
+IMPORT_BATCH_SIZE = 1000
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+
+def _key(*values):
+    # Backups store datetimes with millisecond precision, compare them at that precision
+    return tuple(
+        v.replace(microsecond=v.microsecond // 1000 * 1000) if isinstance(v, datetime) else v
+        for v in values
+    )
+
+
+def _media_item_key(source, media_type, provider_ids):
+    return (source, media_type, str((provider_ids or {}).get(source)))
+
+
+def _natural_key(obj):
+    """The values that identify a backed up row in any install (None = always insert)."""
+    User = get_user_model()
+    if isinstance(obj, User):
+        return obj.username
+    if isinstance(obj, MediaItem):
+        return _media_item_key(obj.source, obj.media_type, obj.provider_ids)
+    if isinstance(obj, FavoritePerson):
+        return _key(obj.name, obj.type)
+    if isinstance(obj, (APIKey, NavItem)):
+        return obj.name
+    if isinstance(obj, AppSettings):
+        return "settings"  # Single row
+    if isinstance(obj, Collection):
+        return _key(obj.title, obj.date_created)
+    if isinstance(obj, CollectionItem):
+        return _key(obj.collection_id, obj.item_id)
+    if isinstance(obj, MediaItemLog):
+        return _key(obj.item_id, obj.activity_date, obj.title, obj.content)
+    if isinstance(obj, CalendarEvent):
+        return _key(obj.item_id, obj.date, obj.title)
+    if isinstance(obj, (Screenshot, MusicVideo)):
+        return _key(obj.item_id, obj.url)
+    return None
+
+
+def _existing_keys(model):
+    """{natural key: local pk} of the rows already in the database."""
+    User = get_user_model()
+    qs = model.objects.order_by()
+    if model is User:
+        return dict(qs.values_list("username", "pk"))
+    if model is MediaItem:
+        return {
+            _media_item_key(source, media_type, provider_ids): pk
+            for pk, source, media_type, provider_ids in qs.values_list("pk", "source", "media_type", "provider_ids").iterator()
+        }
+    if model is FavoritePerson:
+        return {_key(name, type_): pk for pk, name, type_ in qs.values_list("pk", "name", "type")}
+    if model in (APIKey, NavItem):
+        return {name: pk for pk, name in qs.values_list("pk", "name")}
+    if model is AppSettings:
+        first = AppSettings.objects.order_by("pk").values_list("pk", flat=True).first()
+        return {"settings": first} if first else {}
+    if model is Collection:
+        return {_key(title, created): pk for pk, title, created in qs.values_list("pk", "title", "date_created")}
+    if model is CollectionItem:
+        return {_key(c, i): pk for pk, c, i in qs.values_list("pk", "collection_id", "item_id").iterator()}
+    if model is MediaItemLog:
+        return {
+            _key(item_id, date, title, content): pk
+            for pk, item_id, date, title, content in qs.values_list("pk", "item_id", "activity_date", "title", "content").iterator()
+        }
+    if model is CalendarEvent:
+        return {_key(i, d, t): pk for pk, i, d, t in qs.values_list("pk", "item_id", "date", "title").iterator()}
+    if model in (Screenshot, MusicVideo):
+        return {_key(i, url): pk for pk, i, url in qs.values_list("pk", "item_id", "url").iterator()}
+    return {}
+
+
+# Fields an existing row takes from the backup (default: every field but the id)
+UPDATE_FIELDS = {
+    APIKey: ["key_1", "key_2"],
+    NavItem: ["visible", "position"],
+}
+
+
+class BackupImporter:
+    """
+    Collects deserialized objects (in backup order, parents first) and writes them per
+    model in batches. Call flush() after the last object and finish() once done.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.batch = []
+        self.existing = {}
+        self.pk_maps = {}  # {model: {backup pk: local pk}}
+        self.skipped = 0
+
+    def add(self, obj):
+        if type(obj) is not self.model or len(self.batch) >= IMPORT_BATCH_SIZE:
+            self.flush()
+            self.model = type(obj)
+        self.batch.append(obj)
+
+    def map_parents(self, model, lines):
+        """
+        Maps the backup ids of parent rows to the local rows from an incremental's key
+        file ([pk, *PARENT_KEY_FIELDS] per line), for children whose parent didn't change.
+        """
+        if model not in self.existing:
+            self.existing[model] = _existing_keys(model)
+        existing = self.existing[model]
+        pk_map = self.pk_maps.setdefault(model, {})
+        fields = [model._meta.get_field(name) for name in PARENT_KEY_FIELDS[model]]
+        for line in lines:
+            pk, *values = json.loads(line)
+            obj = model(**{field.attname: field.to_python(value) for field, value in zip(fields, values)})
+            local_pk = existing.get(_natural_key(obj))
+            if local_pk is not None:
+                pk_map[pk] = local_pk
+
+    def flush(self):
+        if not self.batch:
+            return
+        model = self.model
+        if model not in self.existing:
+            self.existing[model] = _existing_keys(model)
+        existing = self.existing[model]
+        pk_map = self.pk_maps.setdefault(model, {})
+
+        creates = {}  # natural key -> obj
+        updates = {}
+        backup_pks = {}  # natural key -> backup pks that end up as that row
+        for obj in self.batch:
+            if not self._remap_foreign_keys(obj):
+                self.skipped += 1
+                continue
+            if isinstance(obj, MediaItem):
+                obj.search_title = obj.build_search_title()  # save() isn't called
+                obj.has_sequel = obj.build_has_sequel()
+
+            key = _natural_key(obj)
+            if key is None:
+                key = ("pk", obj.pk)
+            backup_pks.setdefault(key, []).append(obj.pk)
+            if key in existing:
+                obj.pk = existing[key]
+                updates[key] = obj
+            else:
+                obj.pk = None
+                creates[key] = obj
+        self.batch = []
+
+        fields = UPDATE_FIELDS.get(model) or [f.attname for f in model._meta.concrete_fields if not f.primary_key]
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(list(creates.values()), batch_size=IMPORT_BATCH_SIZE)
+                # One UPDATE per row inside the batch's transaction. bulk_update() builds a CASE
+                # per column, which is several times slower on SQLite for rows this wide.
+                for obj in updates.values():
+                    model.objects.filter(pk=obj.pk).update(**{f: getattr(obj, f) for f in fields})
+        except Exception as e:
+            logger.warning(f"Batch of {model.__name__} failed ({e}), restoring it row by row")
+            self._save_one_by_one(creates, updates, fields)
+
+        for key, obj in {**creates, **updates}.items():
+            if obj.pk is None:
+                continue
+            existing[key] = obj.pk
+            for backup_pk in backup_pks[key]:
+                pk_map[backup_pk] = obj.pk
+
+    def _save_one_by_one(self, creates, updates, fields):
+        for obj in creates.values():
+            try:
+                with transaction.atomic():
+                    obj.pk = None
+                    obj.save(force_insert=True)
+            except Exception as e:
+                obj.pk = None
+                logger.warning(f"Error restoring object {obj.__class__.__name__}: {e}")
+        for obj in updates.values():
+            try:
+                with transaction.atomic():
+                    obj.save(update_fields=fields)
+            except Exception as e:
+                logger.warning(f"Error restoring object {obj.__class__.__name__} {obj.pk}: {e}")
+
+    def _remap_foreign_keys(self, obj):
+        """Points foreign keys at the local rows. False if a parent wasn't restored."""
+        for field in obj._meta.concrete_fields:
+            if not field.is_relation:
+                continue
+            backup_pk = getattr(obj, field.attname)
+            if backup_pk is None:
+                continue
+            pk_map = self.pk_maps.get(field.related_model)
+            if pk_map is None:
+                continue  # Parent model isn't part of the backup, keep the id as is
+            local_pk = pk_map.get(backup_pk)
+            if local_pk is None:
+                return False
+            setattr(obj, field.attname, local_pk)
+        return True
+
+    def finish(self):
+        """Refreshes what the model signals would have kept current on save()."""
+        if self.skipped:
+            logger.warning(f"Skipped {self.skipped} backup rows whose item or collection wasn't restored")
+        invalidate_home_stats()
+        bump_calendar_version()
+        invalidate_app_settings()
+        invalidate_nav_items()
+        rebuild_media_references()
+
+
+# --- Incremental backups ---
+# A downloaded export leaves its state in data/backups/: a hash of every row's JSON line
+# under a key that doesn't depend on local ids, and the size, mtime and sha256 of every
+# media file. An incremental export diffs the library against the latest state and only
+# writes the rows and files that changed, plus the keys of the deleted ones. Changed files
+# are stored once per content (objects/<sha256>). Restoring replays the full backup, then
+# every incremental in the order they were made.
+
+BACKUP_STATE_DIR = os.path.join(settings.BASE_DIR, "data", "backups")
+BACKUP_HISTORY_FILE = "history.json"
+BACKUP_STATES_KEPT = 3
+BACKUP_HISTORY_KEPT = 500
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Fields that identify the rows other rows point to. Incrementals carry them for every
+# parent row, so a new child can be attached to a parent that didn't change.
+PARENT_KEY_FIELDS = {
+    MediaItem: ["source", "media_type", "provider_ids"],
+    Collection: ["title", "date_created"],
+}
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _portable_key(obj, parent_keys):
+    """
+    Digest of a row's natural key with its foreign keys replaced by the portable keys of
+    the parents ({model: {pk: key}}), so a row has the same key in every install.
+    """
+    ids = {}
+    for field in obj._meta.concrete_fields:
+        if field.is_relation and field.related_model in parent_keys:
+            ids[field.attname] = getattr(obj, field.attname)
+            setattr(obj, field.attname, parent_keys[field.related_model].get(ids[field.attname]))
+    key = _natural_key(obj)
+    for attname, value in ids.items():
+        setattr(obj, attname, value)
+    if key is None:
+        key = ("pk", obj.pk)
+    return _digest(json.dumps([obj._meta.label_lower, key], default=str))
+
+
+class RowDiff:
+    """
+    Row filter for JSONLinesSerializer. Records the hash of every row it sees and keeps
+    only the rows that are new or changed since base_rows (all of them without a base).
+    """
+
+    def __init__(self, base_rows, parent_keys):
+        self.base_rows = base_rows
+        self.parent_keys = parent_keys
+        self.rows = {}
+        self.written = 0
+
+    def __call__(self, obj, line):
+        key = _portable_key(obj, self.parent_keys)
+        self.rows[key] = row_hash = _digest(line)
+        if type(obj) in self.parent_keys:
+            self.parent_keys[type(obj)][obj.pk] = key
+        if self.base_rows is not None and self.base_rows.get(key) == row_hash:
+            return False
+        self.written += 1
+        return True
+
+    def deleted(self):
+        return [key for key in self.base_rows or () if key not in self.rows]
+
+
+def _copy_and_hash(src, dst=None):
+    """sha256 of a file object, copied to dst along the way."""
+    sha = hashlib.sha256()
+    while chunk := src.read(HASH_BUFFER_SIZE):
+        sha.update(chunk)
+        if dst is not None:
+            dst.write(chunk)
+    return sha.hexdigest()
+
+
+def _write_file(zipf, abs_path, arcname):
+    """Stores a file in the archive and returns its sha256."""
+    info = zipfile.ZipInfo.from_file(abs_path, arcname)
+    with open(abs_path, "rb") as src, zipf.open(info, "w") as dst:
+        return _copy_and_hash(src, dst)
+
+
+def _state_path(backup_id):
+    return os.path.join(BACKUP_STATE_DIR, f"state_{backup_id}.json")
+
+
+def backup_history():
+    """Ids of the backups created or restored on this install, oldest first."""
+    try:
+        with open(os.path.join(BACKUP_STATE_DIR, BACKUP_HISTORY_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def record_backup(backup_id, state=None):
+    """Adds a backup to the history, with its state if it was created here."""
+    os.makedirs(BACKUP_STATE_DIR, exist_ok=True)
+    if state is not None:
+        with open(_state_path(backup_id), "w") as f:
+            json.dump(state, f)
+
+    history = [b for b in backup_history() if b != backup_id] + [backup_id]
+    history = history[-BACKUP_HISTORY_KEPT:]
+    with open(os.path.join(BACKUP_STATE_DIR, BACKUP_HISTORY_FILE), "w") as f:
+        json.dump(history, f)
+
+    # Only the latest states are used as a base
+    states = [b for b in history if os.path.exists(_state_path(b))]
+    for old_id in states[:-BACKUP_STATES_KEPT]:
+        os.remove(_state_path(old_id))
+
+
+def latest_backup_state():
+    """State of the newest backup created on this install (the base of an incremental), or None."""
+    for backup_id in reversed(backup_history()):
+        try:
+            with open(_state_path(backup_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            continue
+    return None
+
+
+def delete_backup_rows(deleted_rows):
+    """Deletes the rows an incremental lists as deleted ({model name: [portable keys]}). Returns the count."""
+    parent_keys = {}
+    for model, fields in PARENT_KEY_FIELDS.items():
+        parent_keys[model] = {
+            obj.pk: _portable_key(obj, parent_keys)
+            for obj in model.objects.only("pk", *fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        }
+
+    deleted = 0
+    # Children first, a deleted item takes its children with it anyway
+    for name, qs in reversed(backup_querysets()):
+        keys = set(deleted_rows.get(name, ()))
+        if not keys:
+            continue
+        pks = [
+            obj.pk for obj in qs.order_by().iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            if _portable_key(obj, parent_keys) in keys
+        ]
+        for i in range(0, len(pks), IMPORT_BATCH_SIZE):
+            deleted += qs.model.objects.filter(pk__in=pks[i:i + IMPORT_BATCH_SIZE]).delete()[0]
+    return deleted
+
+
 class BackupTask(threading.Thread):
-    def __init__(self, task_id, task_type, upload_path=None):
+    def __init__(self, task_id, task_type, upload_path=None, incremental=False):
         super().__init__()
         self.task_id = task_id
         self.task_type = task_type
         self.upload_path = upload_path
+        self.incremental = incremental
+        self.backup_state = None
         self.progress = 0
         self.status = "pending"  # pending, running, completed, error, cancelled
         self.message = "Initializing..."
@@ -98,84 +561,93 @@ class BackupTask(threading.Thread):
             else:
                 self.details = f"{processed}/{total}"
 
-    def do_export(self):
-        self.message = "Gathering database data"
-
-        User = get_user_model()
-
-        # 1. Serialize Data (Include all relevant models)
-        models_to_backup = [
-            User.objects.all(),
-            MediaItem.objects.all(),
-            FavoritePerson.objects.all(),
-            APIKey.objects.all(),
-            NavItem.objects.all(),
-            AppSettings.objects.all(),
-            Collection.objects.all(),
-            CollectionItem.objects.all(),
-            CalendarEvent.objects.all(),
-            MediaItemLog.objects.all(),
-            Screenshot.objects.all(),
-            MusicVideo.objects.all(),
-        ]
+    def save_state(self):
+        """Records a finished export as the base of the next incremental (once it's downloaded)."""
+        if self.backup_state is not None:
+            record_backup(self.backup_state["backup_id"], self.backup_state)
+            self.backup_state = None
 
-        all_objects = []
-        for qs in models_to_backup:
-            all_objects.extend(list(qs))
-
-        json_data = serialize("json", all_objects)
+    def do_export(self):
+        self.message = "Counting database rows"
+        base = latest_backup_state() if self.incremental else None
+        if base is None:
+            self.incremental = False  # Nothing to build on, make a full backup
+
+        # 1. Count what goes in, so progress covers the database and the files
+        querysets = [(name, qs) for name, qs in backup_querysets()]
+        counts = {name: qs.count() for name, qs in querysets}
+        media_root = settings.MEDIA_ROOT
+        file_count = sum(1 for _ in iter_backup_files(media_root))
 
         if self._cancel_event.is_set():
             return
 
         # 2. Prepare Zip
-        self.message = "Scanning files"
         temp_dir = tempfile.gettempdir()
         zip_filename = f"media_journal_backup_{uuid.uuid4().hex}.zip"
         zip_path = os.path.join(temp_dir, zip_filename)
         self.result_path = zip_path
 
-        media_root = settings.MEDIA_ROOT
-        files_to_zip = []
-
-        # Folders to include
-        include_folders = [
-            "posters",
-            "banners",
-            "cast",
-            "related",
-            "screenshots",
-            "seasons",
-            "episodes",
-            "favorites",
-        ]
+        total_items = sum(counts.values()) + file_count
+        if total_items == 0:
+            total_items = 1  # Avoid division by zero
+        processed = 0
 
-        for folder in include_folders:
-            folder_path = os.path.join(media_root, folder)
-            if os.path.exists(folder_path):
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        abs_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(abs_path, media_root)
-                        files_to_zip.append((abs_path, rel_path))
+        def tracked(rows):
+            # Counts rows as the serializer pulls them and stops early when cancelled
+            nonlocal processed
+            for row in rows:
+                if self._cancel_event.is_set():
+                    return
+                yield row
+                processed += 1
+                if processed % 500 == 0:
+                    self.update_progress(processed, total_items, "Exporting database")
 
-        total_items = len(files_to_zip) + 1  # +1 for json
-        processed = 0
+        state = {"backup_id": uuid.uuid4().hex, "rows": {}, "files": {}}
+        parent_keys = {model: {} for model in PARENT_KEY_FIELDS}
+        diffs = {}
 
         with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zipf:
-            # Write JSON
-            zipf.writestr("backup_data.json", json_data)
-
-            processed += 1
-            self.update_progress(processed, total_items, "Archiving")
+            # One JSON-lines entry per model, streamed from the database in chunks
+            for name, qs in querysets:
+                diffs[name] = RowDiff(base["rows"].get(name, {}) if base else None, parent_keys)
+                info = zipfile.ZipInfo(backup_data_file(name), date_time=time.localtime()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with zipf.open(info, "w", force_zip64=True) as raw:
+                    with io.TextIOWrapper(raw, encoding="utf-8", newline="\n") as stream:
+                        JSONLinesSerializer(diffs[name]).serialize(
+                            tracked(qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)), stream=stream
+                        )
+                if self._cancel_event.is_set():
+                    return
+                state["rows"][name] = diffs[name].rows
 
-            # Write Files directly (efficient)
-            for abs_path, rel_path in files_to_zip:
+            # Files unchanged since the base (same size and mtime) aren't read at all
+            base_files = base["files"] if base else {}
+            changed_files = {}
+            stored = set()
+            for abs_path, rel_path in iter_backup_files(media_root):
                 if self._cancel_event.is_set():
                     return
 
                 try:
-                    zipf.write(abs_path, arcname=rel_path)
+                    stat = os.stat(abs_path)
+                    previous = base_files.get(rel_path)
+                    if previous and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+                        state["files"][rel_path] = previous
+                    elif base is None:
+                        sha = _write_file(zipf, abs_path, rel_path)
+                        state["files"][rel_path] = [stat.st_size, stat.st_mtime_ns, sha]
+                    else:
+                        with open(abs_path, "rb") as src:
+                            sha = _copy_and_hash(src)
+                        state["files"][rel_path] = [stat.st_size, stat.st_mtime_ns, sha]
+                        if previous is None or previous[2] != sha:
+                            changed_files[rel_path] = sha
+                            if sha not in stored:
+                                _write_file(zipf, abs_path, f"objects/{sha}")
+                                stored.add(sha)
                 except Exception as e:
                     logger.warning(f"Could not zip {abs_path}: {e}")
 
@@ -183,6 +655,39 @@ class BackupTask(threading.Thread):
                 if processed % 100 == 0:  # Update progress periodically
                     self.update_progress(processed, total_items, "Archiving")
 
+            manifest = {
+                "format": BACKUP_FORMAT,
+                "backup_id": state["backup_id"],
+                "base_id": base["backup_id"] if base else None,
+                "created": timezone.now().isoformat(),
+                "models": [
+                    {"name": name, "file": backup_data_file(name), "count": diffs[name].written}
+                    for name, _ in querysets
+                ],
+            }
+            if base:
+                # Ids of every parent row, for changed children of unchanged parents
+                manifest["parents"] = []
+                for model, fields in PARENT_KEY_FIELDS.items():
+                    name = model._meta.label_lower
+                    key_file = f"keys/{name}.jsonl"
+                    rows = model.objects.order_by("pk").values_list("pk", *fields)
+                    info = zipfile.ZipInfo(key_file, date_time=time.localtime()[:6])
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with zipf.open(info, "w") as raw:
+                        with io.TextIOWrapper(raw, encoding="utf-8", newline="\n") as stream:
+                            for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                                stream.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                    manifest["parents"].append({"name": name, "file": key_file})
+
+                deleted_rows = {name: diff.deleted() for name, diff in diffs.items()}
+                manifest["deleted_rows"] = {name: keys for name, keys in deleted_rows.items() if keys}
+                manifest["files"] = changed_files
+                manifest["deleted_files"] = [path for path in base_files if path not in state["files"]]
+            zipf.writestr(BACKUP_MANIFEST, json.dumps(manifest, indent=2))
+
+        self.backup_state = state
+
     def do_import(self):
         self.message = "Reading backup file"
         if not self.upload_path or not os.path.exists(self.upload_path):
@@ -192,103 +697,62 @@ class BackupTask(threading.Thread):
             all_files = zipf.namelist()
 
             # 1. Restore DB
-            json_filename = "backup_data.json"
-            if "media_items.json" in all_files and json_filename not in all_files:
-                json_filename = "media_items.json"  # Legacy support
-
-            # Initialize variables to avoid UnboundLocalError
-            files_to_extract = [f for f in all_files if not f.endswith(".json")]
+            manifest = {}
+            if BACKUP_MANIFEST in all_files:
+                manifest = json.loads(zipf.read(BACKUP_MANIFEST))
+                data_files = [(m["file"], m["count"]) for m in manifest["models"] if m["file"] in all_files]
+                if manifest.get("base_id") and manifest["base_id"] not in backup_history():
+                    raise Exception(
+                        "This is an incremental backup and the backup it builds on wasn't restored here. "
+                        "Restore the full backup first, then the incremental ones in the order they were made."
+                    )
+            else:
+                json_filename = "backup_data.json"
+                if "media_items.json" in all_files and json_filename not in all_files:
+                    json_filename = "media_items.json"  # Legacy support
+                data_files = [(json_filename, None)] if json_filename in all_files else []
+
+            if "files" in manifest:
+                # Incremental: changed files are stored once per content hash
+                files_to_extract = [(f"objects/{sha}", path) for path, sha in manifest["files"].items()]
+            else:
+                data_names = {name for name, _ in data_files} | {BACKUP_MANIFEST}
+                files_to_extract = [
+                    (f, f) for f in all_files
+                    if f not in data_names and not f.endswith(".json") and not f.endswith("/")
+                ]
             processed = 0
-            total_items = len(files_to_extract)
+            total_items = len(files_to_extract) + sum(count for _, count in data_files if count)
+            importer = BackupImporter()
 
-            if json_filename in all_files:
-                self.message = "Restoring database"
-                json_data = zipf.read(json_filename)
+            parent_models = {model._meta.label_lower: model for model in PARENT_KEY_FIELDS}
+            for parent in manifest.get("parents", []):
+                importer.map_parents(
+                    parent_models[parent["name"]],
+                    io.TextIOWrapper(zipf.open(parent["file"]), encoding="utf-8"),
+                )
 
-                # Deserialize to list first to get count for progress
-                objects = list(deserialize("json", json_data))
-                del json_data  # Free memory: Raw JSON bytes no longer needed
-                total_items += len(objects)
+            for data_name, count in data_files:
+                self.message = "Restoring database"
+                if count is None:
+                    # Single JSON document, deserialize to list first to get count for progress
+                    json_data = zipf.read(data_name)
+                    objects = list(deserialize("json", json_data))
+                    del json_data  # Free memory: Raw JSON bytes no longer needed
+                    total_items += len(objects)
+                else:
+                    # Streamed line by line, the manifest already gave the count
+                    objects = deserialize("jsonl", io.TextIOWrapper(zipf.open(data_name), encoding="utf-8"))
 
                 if total_items == 0:
                     total_items = 1  # Avoid division by zero
 
                 for deserialized_object in objects:
                     if self._cancel_event.is_set():
+                        importer.flush()
+                        importer.finish()
                         return
-                    obj = deserialized_object.object
-
-                    try:
-                        # Smart Merge Logic
-                        User = get_user_model()
-                        
-                        if isinstance(obj, User):
-                            User.objects.update_or_create(
-                                username=obj.username,
-                                defaults={
-                                    field.name: getattr(obj, field.name)
-                                    for field in User._meta.fields
-                                    if field.name != "id"
-                                },
-                            )
-                        elif isinstance(obj, MediaItem):
-                            lookup_key = f"provider_ids__{obj.source}"
-                            MediaItem.objects.update_or_create(
-                                source=obj.source,
-                                media_type=obj.media_type,
-                                **{lookup_key: str(obj.source_id)},
-                                defaults={
-                                    field.name: getattr(obj, field.name)
-                                    for field in MediaItem._meta.fields
-                                    if field.name != "id"
-                                },
-                            )
-                        elif isinstance(obj, FavoritePerson):
-                            # Try to find existing by name and type to avoid duplicates
-                            existing = FavoritePerson.objects.filter(
-                                name=obj.name, type=obj.type
-                            ).first()
-                            if existing:
-                                for field in FavoritePerson._meta.fields:
-                                    if field.name != "id":
-                                        setattr(
-                                            existing,
-                                            field.name,
-                                            getattr(obj, field.name),
-                                        )
-                                existing.save()
-                            else:
-                                obj.save()
-                        elif isinstance(obj, APIKey):
-                            APIKey.objects.update_or_create(
-                                name=obj.name,
-                                defaults={"key_1": obj.key_1, "key_2": obj.key_2},
-                            )
-                        elif isinstance(obj, NavItem):
-                            NavItem.objects.update_or_create(
-                                name=obj.name,
-                                defaults={
-                                    "visible": obj.visible,
-                                    "position": obj.position,
-                                },
-                            )
-                        elif isinstance(obj, AppSettings):
-                            if not AppSettings.objects.exists():
-                                obj.save()
-                            else:
-                                current = AppSettings.objects.first()
-                                for field in AppSettings._meta.fields:
-                                    if field.name != "id":
-                                        setattr(
-                                            current,
-                                            field.name,
-                                            getattr(obj, field.name),
-                                        )
-                                current.save()
-                        else:
-                            obj.save()
-                    except Exception as e:
-                        logger.warning(f"Error restoring object {obj}: {e}")
+                    importer.add(deserialized_object.object)
 
                     processed += 1
                     if processed % 100 == 0:
@@ -296,6 +760,12 @@ class BackupTask(threading.Thread):
                             processed, total_items, "Restoring database"
                         )
 
+            importer.flush()
+            if manifest.get("deleted_rows"):
+                self.message = "Removing deleted rows"
+                delete_backup_rows(manifest["deleted_rows"])
+            importer.finish()
+
             # 2. Restore Files
             self.message = "Restoring media files"
             media_root = settings.MEDIA_ROOT
@@ -303,7 +773,7 @@ class BackupTask(threading.Thread):
             if total_items == 0:
                 total_items = 1
 
-            for file_name in files_to_extract:
+            for arcname, file_name in files_to_extract:
                 if self._cancel_event.is_set():
                     return
 
@@ -319,8 +789,8 @@ class BackupTask(threading.Thread):
                 target_path = os.path.join(media_root, file_name)
                 os.makedirs(os.path.dirname(target_path), exist_ok=True)
 
-                with open(target_path, "wb") as f:
-                    f.write(zipf.read(file_name))
+                with zipf.open(arcname) as src, open(target_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
 
                 processed += 1
                 if processed % 100 == 0:
@@ -328,6 +798,17 @@ class BackupTask(threading.Thread):
                         processed, total_items, "Restoring media files"
                     )
 
+            for file_name in manifest.get("deleted_files", []):
+                if ".." in file_name or file_name.startswith(("/", "\\")):
+                    continue
+                try:
+                    os.remove(os.path.join(media_root, file_name))
+                except FileNotFoundError:
+                    pass
+
+            if manifest.get("backup_id"):
+                record_backup(manifest["backup_id"])
+
 
 def cleanup_old_tasks():
     """Remove backup tasks older than 1 hour and sweep orphaned temp files"""
@@ -371,396 +852,60 @@ def cleanup_old_tasks():
             except Exception as e:
                 logger.warning(f"Could not remove orphaned temp file {filepath}: {e}")
 
-# --- CUSTOM LIGHTWEIGHT REFRESH HELPERS ---
-
-def refresh_musicbrainz_item(recording_id):
-    import requests
-
-    headers = {"User-Agent": "MediaJournal/1.0 (https://github.com/mihail-pop/media-journal)"}
-    recording_url = f"https://musicbrainz.org/ws/2/recording/{recording_id}"
-    recording_params = {"inc": "artists+releases+release-groups+isrcs+tags", "fmt": "json"}
-
-    response = requests.get(recording_url, params=recording_params, headers=headers, timeout=10)
-    if response.status_code == 429:
-        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
-    response.raise_for_status()
-    recording_data = response.json()
-
-    title = recording_data.get("title", "Untitled")
-    artist_credits = recording_data.get("artist-credit", [])
-    artists = ", ".join([a.get("name", "") for a in artist_credits])
-    artist_label = "Artist" if len(artist_credits) == 1 else "Artists"
-
-    first_release = ""
-    first_release_id = ""
-    first_release_type = ""
-    releases = recording_data.get("releases",[])
-    if releases:
-        sorted_releases = sorted([r for r in releases if r.get("date")], key=lambda x: x.get("date", ""))
-        if sorted_releases:
-            release = sorted_releases[0]
-            first_release = release.get("title", "")
-            first_release_id = release.get("id", "")
-            first_release_type = release.get("release-group", {}).get("primary-type", "")
-
-    isrcs = recording_data.get("isrcs",[])
-    isrc = isrcs[0] if isrcs else ""
-    genres =[tag.get("name", "") for tag in recording_data.get("tags", [])[:10]]
-
-    overview_parts =[]
-    if artists:
-        overview_parts.append(f"{artist_label}: {artists}")
-    if first_release:
-        release_display = f"{first_release} ({first_release_type})" if first_release_type else first_release
-        overview_parts.append(f"First released as: {release_display}")
-    if genres:
-        overview_parts.append(f"Genres: {', '.join(genres)}")
-    overview = "\n".join(overview_parts)
-
-    cast_data = {
-        "artists":[{"name": a.get("name", ""), "id": a.get("artist", {}).get("id", "")} for a in artist_credits],
-        "genres": genres,
-        "album": {"title": first_release, "id": first_release_id, "type": first_release_type} if first_release else None,
-        "isrc": isrc,
-    }
-
-    release_date = None
-    if releases:
-        first_release = releases[0]
-        release_date_str = first_release.get("date", "")
-        if release_date_str:
-            try:
-                if len(release_date_str) >= 10:
-                    parsed_date = datetime.strptime(release_date_str[:10], "%Y-%m-%d")
-                    release_date = parsed_date.strftime("%Y-%m-%d")
-                elif len(release_date_str) >= 4:
-                    release_date = f"{release_date_str[:4]}-01-01"
-            except ValueError:
-                pass
-
-    creators =[a.get("name", "") for a in artist_credits if a.get("name")]
-
-    MediaItem.objects.create(
-        title=title,
-        media_type="music",
-        source="musicbrainz",
-        provider_ids={"musicbrainz": str(recording_id)},
-        cover_url="",      # Preserved later
-        banner_url="",     # Preserved later
-        overview=overview,
-        release_date=release_date,
-        cast=cast_data,
-        seasons=None,
-        related_titles=[],
-        genres=genres,
-        creators=creators,
-    )
-    return True
-
-def refresh_igdb_item(igdb_id):
-    import requests
-
-    from core.services.m_games import get_igdb_token
-
-    token = get_igdb_token()
-    if not token:
-        raise Exception("Failed to get IGDB access token.")
-
-    igdb_keys = APIKey.objects.get(name="igdb")
-    headers = {
-        "Client-ID": igdb_keys.key_1,
-        "Authorization": f"Bearer {token}",
-    }
-
-    query = f"""
-    fields 
-      id, name, summary, storyline, 
-      cover.url, genres.name, platforms.name, 
-      involved_companies.company.name, involved_companies.developer,
-      first_release_date, screenshots.url, artworks.url;
-    where id = {igdb_id};
-    """
-
-    response = requests.post("https://api.igdb.com/v4/games", headers=headers, data=query)
-    if response.status_code == 429:
-        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
-    elif response.status_code != 200:
-        raise Exception(f"Failed to fetch details from IGDB. Status: {response.status_code}")
-
-    data = response.json()
-    if not data:
-        raise Exception("Game not found.")
-
-    game = data[0]
-    title = game.get("name") or "Unknown Title"
-    overview = game.get("summary") or game.get("storyline") or ""
-
-    release_date = None
-    if game.get("first_release_date"):
-        release_date = time.strftime("%Y-%m-%d", time.localtime(game["first_release_date"]))
-
-    genres = [g.get("name") for g in game.get("genres", []) if g.get("name")]
-    creators =[
-        c.get("company", {}).get("name")
-        for c in game.get("involved_companies", [])
-        if c.get("developer") and c.get("company", {}).get("name")
-    ]
-
-    MediaItem.objects.create(
-        title=title,
-        media_type="game",
-        source="igdb",
-        provider_ids={"igdb": str(igdb_id)},
-        cover_url="",
-        banner_url="",
-        overview=overview,
-        release_date=release_date,
-        cast=[],
-        seasons=None,
-        related_titles=[],
-        genres=genres,
-        creators=creators,
-    )
-    return True
-
-def refresh_tmdb_item(media_type, tmdb_id, existing_seasons=None, existing_cast=None):
-    import requests
-
-    from core.services.g_utils import download_image
-
-    api_key = APIKey.objects.get(name="tmdb").key_1
-    url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}"
-    params = {"api_key": api_key, "append_to_response": "aggregate_credits" if media_type == "tv" else "credits"}
-    response = requests.get(url, params=params)
-
-    if response.status_code == 429:
-        raise Exception("HTTP 429 Too Many Requests: Rate Limit Exceeded")
-    elif response.status_code != 200:
-        raise Exception(f"Failed to fetch TMDB details. Status: {response.status_code}")
-
-    data = response.json()
-    cache_bust = int(time.time() * 1000)
-
-    # --- REUSE EXISTING CAST IMAGES ---
-    existing_cast_map = {}
-    for c in (existing_cast or[]):
-        c_id = str(c.get("id", ""))
-        if c_id:
-            existing_cast_map[c_id] = c.get("profile_path", "")
-
-    cast_data =[]
-    cast_list = data.get("aggregate_credits", {}).get("cast", [])[:8] if media_type == "tv" else data.get("credits", {}).get("cast", [])[:8]
-
-    for actor in cast_list:
-        if media_type == "tv":
-            character_name = actor.get("roles", [{}])[0].get("character") if actor.get("roles") else ""
-        else:
-            character_name = actor.get("character")
-
-        actor_id = str(actor.get("id", "unknown"))
-        profile_url = f"https://image.tmdb.org/t/p/w185{actor.get('profile_path')}" if actor.get("profile_path") else ""
-        
-        local_profile = ""
-        # IF WE ALREADY HAVE IT, REUSE IT. OTHERWISE DOWNLOAD.
-        if actor_id in existing_cast_map and existing_cast_map[actor_id]:
-            local_profile = existing_cast_map[actor_id]
-        elif profile_url:
-            filename = f"cast/tmdb_{media_type}_{tmdb_id}_{actor_id}_{cache_bust}.jpg"
-            local_profile = download_image(profile_url, filename)
-
-        cast_data.append({
-            "name": actor.get("name"),
-            "character": character_name,
-            "profile_path": local_profile,
-            "id": actor_id,
-        })
-
-    # --- REUSE EXISTING SEASON IMAGES ---
-    existing_season_map = {}
-    for s in (existing_seasons or[]):
-        s_num = str(s.get("season_number", ""))
-        if s_num:
-            existing_season_map[s_num] = s.get("poster_path", "")
-
-    seasons =[]
-    total_episodes = 0
-    total_seasons = 0
-    has_new_season = False
-
-    if media_type == "tv":
-        today = datetime.now().date()
-        one_year_ahead = datetime(today.year + 1, today.month, today.day).date()
-        existing_numbers = {s.get("season_number") for s in (existing_seasons or[])}
-
-        for i, season in enumerate(data.get("seasons",[])):
-            season_number = season.get("season_number")
-            episode_count = season.get("episode_count", 0)
-
-            if season_number != 0:
-                air_date_str = season.get("air_date")
-                if air_date_str:
-                    try:
-                        air_date = datetime.strptime(air_date_str, "%Y-%m-%d").date()
-                        if air_date <= one_year_ahead:
-                            total_episodes += episode_count
-                            total_seasons += 1
-                    except Exception:
-                        pass
-
-            season_poster_url = f"https://image.tmdb.org/t/p/w300{season.get('poster_path')}" if season.get("poster_path") else ""
-            local_season_poster = ""
-            
-            # IF WE ALREADY HAVE IT, REUSE IT
-            s_num_str = str(season_number)
-            if s_num_str in existing_season_map and existing_season_map[s_num_str]:
-                local_season_poster = existing_season_map[s_num_str]
-            elif season_poster_url:
-                local_season_poster = download_image(season_poster_url, f"seasons/tmdb_tv_{tmdb_id}_s{i}_{cache_bust}.jpg")
-
-            seasons.append({
-                "season_number": season_number,
-                "name": season.get("name"),
-                "episode_count": episode_count,
-                "poster_path": local_season_poster,
-                "air_date": season.get("air_date"),
-            })
-
-            if season_number != 0 and season_number not in existing_numbers:
-                has_new_season = True
-
-    genres =[g.get("name") for g in data.get("genres", []) if g.get("name")]
-    creators =[]
-    if media_type == "tv":
-        creators =[c.get("name") for c in data.get("created_by", []) if c.get("name")]
-    else:
-        crew = data.get("credits", {}).get("crew", [])
-        creators =[c.get("name") for c in crew if c.get("job") == "Director" and c.get("name")]
-
-    MediaItem.objects.create(
-        title=data.get("title") or data.get("name"),
-        media_type=media_type,
-        source="tmdb",
-        provider_ids={"tmdb": str(tmdb_id)},
-        cover_url="",
-        banner_url="",
-        overview=data.get("overview", ""),
-        release_date=data.get("release_date") or data.get("first_air_date") or "",
-        cast=cast_data,
-        seasons=seasons,
-        total_main=total_episodes if media_type == "tv" else data.get("runtime"),
-        total_secondary=total_seasons if media_type == "tv" else None,
-        notification=has_new_season,
-        genres=genres,
-        creators=creators,
-    )
-    return True
-
-def refresh_anilist_item(media_type, anilist_id=None, mal_id=None, existing_related=None, existing_cast=None):
-    from core.services.g_utils import download_image
-    from core.services.m_anime_manga import fetch_anilist_data
-
-    data = fetch_anilist_data(media_type, anilist_id=anilist_id, mal_id=mal_id)
-    canonical_id = data["anilist_id"]
-    cache_bust = int(time.time() * 1000)
-
-    # --- REUSE EXISTING CAST IMAGES ---
-    existing_cast_map = {}
-    for c in (existing_cast or[]):
-        c_id = str(c.get("id", ""))
-        if c_id:
-            existing_cast_map[c_id] = c.get("profile_path", "")
-
-    cast = []
-    for member in data["cast"][:8]:
-        profile_url = member.get("profile_path")
-        character_id = str(member.get("id", "unknown"))
-        local_path = ""
-        
-        # IF WE ALREADY HAVE IT, REUSE IT
-        if character_id in existing_cast_map and existing_cast_map[character_id]:
-            local_path = existing_cast_map[character_id]
-        elif profile_url:
-            local_path = download_image(profile_url, f"cast/anilist_{media_type}_{canonical_id}_{character_id}_{cache_bust}.jpg")
-
-        cast.append({
-            "name": member["name"],
-            "character": member["character"],
-            "profile_path": local_path,
-            "id": character_id,
-        })
-
-    # --- REUSE EXISTING RELATED IMAGES ---
-    existing_related_map = {}
-    existing_anilist = set()
-    existing_mal = set()
-    for r in (existing_related or[]):
-        r_id = str(r.get("anilist_id") or r.get("mal_id") or "")
-        if r_id:
-            existing_related_map[r_id] = r.get("poster_path", "")
-        if r.get("anilist_id"):
-            existing_anilist.add(str(r.get("anilist_id")))
-        if r.get("mal_id"):
-            existing_mal.add(str(r.get("mal_id")))
-
-    related_titles = []
-    has_new_sequel = False
-
-    for related in data["related_titles"]:
-        r_ref_id = str(related.get("anilist_id") or related.get("mal_id") or "")
-        poster_path = related["poster_path"]
-        
-        local_related_poster = ""
-        # IF WE ALREADY HAVE IT, REUSE IT
-        if r_ref_id in existing_related_map and existing_related_map[r_ref_id]:
-            local_related_poster = existing_related_map[r_ref_id]
-        elif poster_path:
-            local_related_poster = download_image(poster_path, f"related/anilist_{media_type}_{r_ref_id}_{cache_bust}.jpg")
-
-        rel_type = related["relation"]
-        r_a = str(related.get("anilist_id")) if related.get("anilist_id") else None
-        r_m = str(related.get("mal_id")) if related.get("mal_id") else None
-
-        if rel_type.lower() == "sequel":
-            if not ((r_a and r_a in existing_anilist) or (r_m and r_m in existing_mal)):
-                has_new_sequel = True
-
-        related_titles.append({
-            "anilist_id": related.get("anilist_id"),
-            "mal_id": related.get("mal_id"),
-            "title": related["title"],
-            "poster_path": local_related_poster,
-            "relation": rel_type,
-            "media_type": related.get("media_type"),
-        })
-
-    new_provider_ids = {"anilist": str(data["anilist_id"])}
-    if data["mal_id"]:
-        new_provider_ids["mal"] = str(data["mal_id"])
-
-    MediaItem.objects.create(
-        title=data["title"],
-        media_type=media_type,
-        source="anilist",
-        provider_ids=new_provider_ids,
-        cover_url="",
-        banner_url="",
-        overview=data["overview"],
-        release_date=data["release_date"],
-        cast=cast,
-        seasons=None,
-        related_titles=related_titles,
-        total_main=data.get("total_main"),
-        total_secondary=data.get("total_secondary"),
-        notification=has_new_sequel,
-        genres=data["genres"],
-        creators=data["creators"],
-    )
-    return True
+# --- REFRESH TASK ---
 
+# One queue per provider, all refreshed at the same time. Every worker still goes through
+# the provider's rate limit in g_http. Queues with a batch_size above 1 fetch that many
+# items in one request.
+REFRESH_QUEUES = {
+    "tmdb": {"sources": ["tmdb"], "workers": 4, "batch_size": 1},
+    "anilist": {"sources": ["anilist", "mal"], "workers": 1, "batch_size": ANILIST_DATA_BATCH_SIZE},
+    "igdb": {"sources": ["igdb"], "workers": 1, "batch_size": IGDB_GAMES_BATCH_SIZE},
+    "openlib": {"sources": ["openlib"], "workers": 1, "batch_size": 1},
+    "musicbrainz": {"sources": ["musicbrainz"], "workers": 1, "batch_size": 1},
+}
+
+REFRESH_TYPE_MAP = {
+    "movies": "movie",
+    "tvshows": "tv",
+    "anime": "anime",
+    "manga": "manga",
+    "games": "game",
+    "books": "book",
+    "music": "music",
+}
+
+# Provider-driven fields a refresh always overwrites, and the editable ones it only
+# overwrites when the user ticks them
+REFRESH_BASE_FIELDS = ["cast", "seasons", "episodes", "related_titles"]
+REFRESH_OPTIONAL_FIELDS = {
+    "title": ["title"],
+    "overview": ["overview"],
+    "release_date": ["release_date"],
+    "genres": ["genres"],
+    "creators": ["creators"],
+    "progress": ["total_main", "total_secondary"],
+}
+
+# What a refresh reads of each item: the provider ids, the fields it may write, the images
+# it compares and what the search title is built from
+REFRESH_LOAD_FIELDS = [
+    "id", "title", "media_type", "source", "provider_ids", "notification", "creators", "overview",
+    "release_date", "genres", "total_main", "total_secondary", "image_sources", *MEDIA_FIELDS,
+]
+
+# Refreshed items are written with bulk_update() this many at a time
+REFRESH_WRITE_BATCH_SIZE = 100
+REFRESH_MAX_CONSECUTIVE_ERRORS = 3
 
-# --- REFRESH TASK ---
 
 class RefreshTask(threading.Thread):
+    """
+    Refreshes the metadata of every item of a media type (or all of them). Each provider
+    queue has its own worker threads that fetch the metadata and download the images that
+    changed, the task's own thread writes the changed fields back in batches.
+    """
+
     def __init__(self, task_id, media_type, selected_fields=None):
         super().__init__()
         self.task_id = task_id
@@ -775,6 +920,12 @@ class RefreshTask(threading.Thread):
         self.daemon = True
         self.created_at = time.time()
         self.start_processing_time = None
+        self.metadata_fields = list(REFRESH_BASE_FIELDS)
+        for option, fields in REFRESH_OPTIONAL_FIELDS.items():
+            if option in self.selected_fields:
+                self.metadata_fields.extend(fields)
+        self._results = queue.Queue()
+        self._stopped_queues = {}  # {queue: reason}
 
     def cancel(self):
         self._cancel_event.set()
@@ -813,186 +964,206 @@ class RefreshTask(threading.Thread):
             else:
                 self.details = f"{processed}/{total}"
 
-    def do_refresh(self):
-        qs = MediaItem.objects.all()
-        
-        type_map = {
-            "movies": "movie",
-            "tvshows": "tv",
-            "anime": "anime",
-            "manga": "manga",
-            "games": "game",
-            "books": "book",
-            "music": "music"
-        }
-        
+    def items_to_refresh(self):
+        """{queue: [item ids]} of the items to refresh. Custom entries have nothing to fetch."""
+        qs = MediaItem.objects.order_by("pk")
         if self.media_type != "all":
-            mapped_type = type_map.get(self.media_type, self.media_type)
-            qs = qs.filter(media_type=mapped_type)
-
-        items_to_refresh =[]
-        for item in qs:
-            source_id = str(item.source_id)
-            if source_id.startswith("custom_"):
-                continue
-            
-            is_custom = False
-            for k, v in item.provider_ids.items():
-                if str(v).startswith("custom_"):
-                    is_custom = True
-                    break
-            
-            if not is_custom:
-                items_to_refresh.append(item.id)
-
-        total_items = len(items_to_refresh)
-        processed = 0
-        consecutive_errors = 0
+            qs = qs.filter(media_type=REFRESH_TYPE_MAP.get(self.media_type, self.media_type))
+        for provider in {source for config in REFRESH_QUEUES.values() for source in config["sources"]}:
+            # has_key first: excluding on a missing JSON key would also drop the rows without it
+            qs = qs.exclude(Q(provider_ids__has_key=provider) & Q(**{f"provider_ids__{provider}__startswith": "custom_"}))
+
+        queues = {name: [] for name in REFRESH_QUEUES}
+        source_queues = {source: name for name, config in REFRESH_QUEUES.items() for source in config["sources"]}
+        for item_id, source in qs.values_list("id", "source").iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            if source in source_queues:
+                queues[source_queues[source]].append(item_id)
+        return queues
 
+    def do_refresh(self):
+        queues = self.items_to_refresh()
+        total_items = sum(len(ids) for ids in queues.values())
         self.update_progress(0, total_items, "Starting refresh")
 
-        for item_id in items_to_refresh:
-            if self._cancel_event.is_set():
-                return
-            
+        workers = []
+        for name, ids in queues.items():
+            if not ids:
+                continue
+            config = REFRESH_QUEUES[name]
+            batches = queue.Queue()
+            for i in range(0, len(ids), config["batch_size"]):
+                batches.put(ids[i:i + config["batch_size"]])
+            errors = {"consecutive": 0}
+            for n in range(min(config["workers"], batches.qsize())):
+                t = threading.Thread(
+                    target=self._worker, args=(name, batches, errors), name=f"refresh-{name}-{n + 1}", daemon=True
+                )
+                t.start()
+                workers.append(t)
+
+        # Workers put (item, changes) per item and None once they're done
+        processed = 0
+        running = len(workers)
+        pending = []
+        while running:
             try:
-                item = MediaItem.objects.get(id=item_id)
-            except MediaItem.DoesNotExist:
-                processed += 1
+                result = self._results.get(timeout=1)
+            except queue.Empty:
+                if self._cancel_event.is_set():
+                    break
+                continue
+            if result is None:
+                running -= 1
                 continue
 
-            source = item.source
-            source_id = str(item.source_id)
-            media_type = item.media_type
+            item, changes = result
+            if changes is not None:
+                pending.append((item, changes))
+                if len(pending) >= REFRESH_WRITE_BATCH_SIZE:
+                    self.write_refreshed(pending)
+                    pending = []
+            processed += 1
+            self.update_progress(processed, total_items, "Refreshing items")
 
-            original_provider_ids = dict(item.provider_ids)
-            existing_seasons = item.seasons if media_type == 'tv' else None
-            existing_related = item.related_titles if media_type in ['anime', 'manga'] else None
-            existing_cast = item.cast
+        # Whatever was fetched before a cancel is still written
+        self.write_refreshed(pending)
 
-            # 1. Safely hide old item so API fetcher doesn't clash
-            item.provider_ids = {source: f"temp_{uuid.uuid4().hex}"}
-            item.save(update_fields=['provider_ids'])
+        if self._stopped_queues and not self._cancel_event.is_set():
+            self.error = " ".join(self._stopped_queues.values())
+            self.status = "error"
 
-            try:
-                # 2. Refetch item via lightweight functions (respectfully against rate limits)
-                if source == "tmdb":
-                    if "_s" in source_id:
-                        tmdb_id, season_number = source_id.split("_s")
-                        save_tmdb_season(tmdb_id, season_number) # Full payload for seasons
-                    else:
-                        refresh_tmdb_item(media_type, source_id, existing_seasons, existing_cast)
-                    time.sleep(0.2)
-                elif source in ["mal", "anilist"]:
-                    anilist_id = original_provider_ids.get("anilist")
-                    mal_id = original_provider_ids.get("mal")
-                    refresh_anilist_item(media_type, anilist_id, mal_id, existing_related, existing_cast)
-                    time.sleep(2.1)
-                elif source == "igdb":
-                    refresh_igdb_item(source_id)
-                    time.sleep(0.3)
-                elif source == "openlib":
-                    save_openlib_item(source_id)
-                    time.sleep(1.0)
-                elif source == "musicbrainz":
-                    refresh_musicbrainz_item(source_id)
-                    time.sleep(1.1)
+    def _worker(self, name, batches, errors):
+        # A refresh exists to pick up changes, never answer it from the response cache.
+        # fresh_responses() is per thread, so every worker enters it itself.
+        try:
+            with fresh_responses():
+                while not self._cancel_event.is_set() and name not in self._stopped_queues:
+                    try:
+                        ids = batches.get_nowait()
+                    except queue.Empty:
+                        break
+                    items = list(MediaItem.objects.filter(pk__in=ids).only(*REFRESH_LOAD_FIELDS).order_by("pk"))
+                    try:
+                        for item, metadata in self.fetch_batch(name, items):
+                            self._results.put((item, self.apply(item, metadata)))
+                        errors["consecutive"] = 0
+                    except Exception as e:
+                        self._batch_failed(name, items, errors, e)
+        finally:
+            connection.close()
+            self._results.put(None)
+
+    def _batch_failed(self, name, items, errors, e):
+        errors["consecutive"] += 1
+        error_msg = str(e).lower()
+        if "429" in error_msg or "rate limit" in error_msg or "too many requests" in error_msg:
+            logger.error(f"Rate limit hit refreshing {name}: {e}")
+            self._stopped_queues[name] = f"API Rate limit reached on {name}. Its refresh stopped."
+        elif errors["consecutive"] >= REFRESH_MAX_CONSECUTIVE_ERRORS:
+            # FAILSAFE: the provider keeps failing, stop its queue (the others go on)
+            logger.error(f"Too many consecutive errors on {name}. Last error: {e}")
+            self._stopped_queues[name] = f"Multiple API failures on {name} (Possible rate limit). Its refresh stopped."
+        else:
+            logger.error(f"Failed to refresh {[item.id for item in items]}, maintaining original: {e}")
+        for item in items:
+            self._results.put((item, None))
+
+    def fetch_batch(self, name, items):
+        """Yields (item, fetched metadata) for a batch of one queue. None = not found."""
+        if name == "anilist" and len(items) > 1:
+            yield from self._fetch_anilist_batch(items)
+            return
+        if name == "igdb" and len(items) > 1:
+            games = fetch_igdb_games([item.source_id for item in items])
+            for item in items:
+                game = games.get(str(item.source_id))
+                if game is None:
+                    logger.error(f"Failed to refresh {item.id}, maintaining original: Game not found.")
+                    yield item, None
                 else:
-                    item.provider_ids = original_provider_ids
-                    item.save(update_fields=['provider_ids'])
-                    processed += 1
-                    continue
-
-                # 3. Pull recently made object to grab fresh metadata
-                lookup_key = f"provider_ids__{source}"
-                new_item = MediaItem.objects.get(media_type=media_type, **{lookup_key: source_id})
-
-                # 4. Clean up orphans and copy metadata
-                def extract_urls(data, paths_set):
-                    if isinstance(data, dict):
-                        for v in data.values():
-                            extract_urls(v, paths_set)
-                    elif isinstance(data, list):
-                        for i in data:
-                            extract_urls(i, paths_set)
-                    elif isinstance(data, str) and data.startswith("/media/"):
-                        paths_set.add(data.replace("/media/", "", 1).strip('/'))
-
-                media_fields =['cast', 'seasons', 'episodes', 'related_titles']
-                old_files = set()
-                new_files = set()
-                
-                for f in media_fields:
-                    extract_urls(getattr(item, f, None), old_files)
-                    extract_urls(getattr(new_item, f, None), new_files)
-
-                # Copy strictly API-driven fields
-                # Base uneditable structural fields that are always safe to overwrite
-                metadata_fields = ['cast', 'seasons', 'episodes', 'related_titles']
-                
-                # Append editable fields only if the user explicitly checked them
-                if 'title' in self.selected_fields: 
-                    metadata_fields.append('title')
-                if 'overview' in self.selected_fields: 
-                    metadata_fields.append('overview')
-                if 'release_date' in self.selected_fields: 
-                    metadata_fields.append('release_date')
-                if 'genres' in self.selected_fields: 
-                    metadata_fields.append('genres')
-                if 'creators' in self.selected_fields: 
-                    metadata_fields.append('creators')
-                if 'progress' in self.selected_fields: 
-                    metadata_fields.extend(['total_main', 'total_secondary'])
-
-                for field in metadata_fields:
-                    setattr(item, field, getattr(new_item, field))
-                
-                # Combine notifications
-                item.notification = item.notification or new_item.notification
-                
-                # Restore original provider IDs
-                item.provider_ids = original_provider_ids
-                item.last_updated = timezone.now()
-                item.save()
-
-                # Delete the temporary new_item container
-                new_item.delete()
-
-                # Delete orphaned local files explicitly replaced by the API
-                for rel_path in old_files - new_files:
-                    abs_path = os.path.join(settings.MEDIA_ROOT, rel_path)
-                    if os.path.exists(abs_path):
-                        try:
-                            os.remove(abs_path)
-                        except Exception:
-                            pass
-
-                consecutive_errors = 0  # <--- RESET on successful fetch
-                processed += 1
-                self.update_progress(processed, total_items, "Refreshing items")
-
-            except Exception as e:
-                consecutive_errors += 1
-                error_msg = str(e).lower()
-                
-                # Restore original provider IDs on failure. Data completely safe.
-                item.provider_ids = original_provider_ids
-                item.save(update_fields=['provider_ids'])
-                    
-                # If it explicitly caught a known 429
-                if "429" in error_msg or "rate limit" in error_msg or "too many requests" in error_msg:
-                    logger.error(f"Rate limit hit on item {item_id}: {e}")
-                    self.error = f"API Rate limit reached on {source}. Process stopped."
-                    self.status = "error"
-                    break # Break the for loop
-                
-                # FAILSAFE: If it failed 3 times in a row with generic errors
-                if consecutive_errors >= 3:
-                    logger.error(f"Too many consecutive errors ({consecutive_errors}). Last error on {item_id}: {e}")
-                    self.error = f"Multiple API failures on {source} (Possible rate limit). Process stopped."
-                    self.status = "error"
-                    break # Break the for loop
-                
-                logger.error(f"Failed to refresh {item_id}, maintaining original: {e}")
-                processed += 1
-                self.update_progress(processed, total_items, "Refreshing items")
\ No newline at end of file
+                    yield item, igdb_metadata(game)
+            return
+        for item in items:
+            yield item, fetch_item_metadata(item)
+
+    def _fetch_anilist_batch(self, items):
+        # Items are looked up by their AniList id, MAL-only ones by their MAL id
+        groups = {}
+        for item in items:
+            anilist_id = str(item.provider_ids.get("anilist") or "")
+            mal_id = str(item.provider_ids.get("mal") or "")
+            if anilist_id.isdigit():
+                groups.setdefault((item.media_type, "id"), []).append((anilist_id, item))
+            elif mal_id.isdigit():
+                groups.setdefault((item.media_type, "idMal"), []).append((mal_id, item))
+            else:
+                yield item, None
+
+        for (media_type, id_field), entries in groups.items():
+            found = fetch_anilist_metadata_batch(media_type, [i for i, _ in entries], id_field=id_field)
+            for lookup_id, item in entries:
+                metadata = found.get(lookup_id)
+                if metadata is None:
+                    logger.error(f"Failed to refresh {item.id}, maintaining original: not found on AniList")
+                yield item, metadata
+
+    def apply(self, item, metadata):
+        """
+        Applies fetched metadata to the item in memory, downloading only the images that
+        changed. Returns (changed fields, replaced files) or None when there's nothing to write.
+        """
+        if metadata is None:
+            return None
+        new_release = has_new_release(item, metadata)
+        changed, replaced = apply_metadata(item, metadata, self.metadata_fields)
+        # Combine notifications
+        if new_release and not item.notification:
+            item.notification = True
+            changed.append("notification")
+        return changed, replaced
+
+    def write_refreshed(self, results):
+        """
+        Writes a batch of (item, (changed fields, replaced files)): bulk_update() with the
+        fields that changed in any of them, one update() of last_updated for the unchanged
+        ones. Then drops the files the new metadata replaced.
+        """
+        if not results:
+            return
+        now = timezone.now()
+        fields = set()
+        changed_items = []
+        unchanged_ids = []
+        replaced = set()
+        for item, (changed, item_replaced) in results:
+            item.last_updated = now
+            if changed:
+                fields.update(changed)
+                changed_items.append((item, changed))
+                replaced |= item_replaced
+            else:
+                unchanged_ids.append(item.pk)
+
+        with transaction.atomic():
+            if changed_items:
+                if "title" in fields or "creators" in fields:
+                    fields.add("search_title")
+                    for item, _ in changed_items:
+                        item.search_title = item.build_search_title()
+                if "related_titles" in fields:
+                    fields.add("has_sequel")
+                    for item, _ in changed_items:
+                        item.has_sequel = item.build_has_sequel()
+                MediaItem.objects.bulk_update(
+                    [item for item, _ in changed_items], sorted(fields) + ["last_updated"], batch_size=REFRESH_WRITE_BATCH_SIZE
+                )
+                # bulk_update() skips the signals that keep the media references current
+                for item, changed in changed_items:
+                    sync_item_media(item, fields=[field for field in MEDIA_FIELDS if field in changed])
+                if fields & CALENDAR_ITEM_FIELDS:
+                    transaction.on_commit(bump_calendar_version)
+            if unchanged_ids:
+                MediaItem.objects.filter(pk__in=unchanged_ids).update(last_updated=now)
+
+        # Delete local files the API replaced, unless another item still uses them
+        delete_unused_media(replaced)
@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import MediaItem, MediaFile, AppSettings, NavItem, Screenshot, CalendarEvent
+from core.services.g_media import MEDIA_FIELDS, media_paths, sync_item_media
+from core.services.g_settings import invalidate_app_settings, invalidate_nav_items
+from core.services.p_home import item_stats_key, update_home_stats, invalidate_home_stats
+from core.services.p_calendar import item_calendar_key, bump_calendar_version
+
+
+# --- Home page stats ---
+# Remember what each loaded item contributed to the stats so a save can move it incrementally.
+
+@receiver(post_init, sender=MediaItem)
+def remember_item_stats(sender, instance, **kwargs):
+    instance._stats_key = item_stats_key(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=MediaItem)
+def update_stats_on_save(sender, instance, created, **kwargs):
+    old_key = None if created else instance._stats_key
+    new_key = item_stats_key(instance)
+    instance._stats_key = new_key
+
+    if (not created and old_key is None) or new_key is None:
+        # Saved from a partially loaded instance, we can't tell what changed
+        transaction.on_commit(invalidate_home_stats)
+    else:
+        transaction.on_commit(lambda: update_home_stats(old_key, new_key))
+
+
+@receiver(post_delete, sender=MediaItem)
+def update_stats_on_delete(sender, instance, **kwargs):
+    old_key = getattr(instance, "_stats_key", None)
+    if old_key is None:
+        transaction.on_commit(invalidate_home_stats)
+    else:
+        transaction.on_commit(lambda: update_home_stats(old_key, None))
+
+
+# --- Media references ---
+# Keep the MediaFile table (what the orphaned media cleanup keeps) in step with the saved fields.
+
+@receiver(post_save, sender=MediaItem)
+def update_media_files_on_save(sender, instance, created, update_fields, **kwargs):
+    fields = MEDIA_FIELDS if update_fields is None else [f for f in MEDIA_FIELDS if f in update_fields]
+    deferred = instance.get_deferred_fields()
+    fields = [f for f in fields if f not in deferred]
+    if fields:
+        sync_item_media(instance, fields, created)
+
+
+@receiver(post_save, sender=Screenshot)
+def add_screenshot_media_file(sender, instance, **kwargs):
+    for path in media_paths(instance.url):
+        MediaFile.objects.get_or_create(item_id=instance.item_id, field="screenshots", path=path)
+
+
+@receiver(post_delete, sender=Screenshot)
+def remove_screenshot_media_file(sender, instance, **kwargs):
+    # Only deletes, as this also runs while the item itself is being deleted
+    if Screenshot.objects.filter(item_id=instance.item_id, url=instance.url).exists():
+        return
+    MediaFile.objects.filter(
+        item_id=instance.item_id, field="screenshots", path__in=media_paths(instance.url)
+    ).delete()
+
+
+# --- Settings cache ---
+# Drop the cached singleton rows after every write so the next read reloads them.
+
+@receiver(post_save, sender=AppSettings)
+@receiver(post_delete, sender=AppSettings)
+def invalidate_settings_cache(sender, **kwargs):
+    transaction.on_commit(invalidate_app_settings)
+
+
+@receiver(post_save, sender=NavItem)
+@receiver(post_delete, sender=NavItem)
+def invalidate_nav_cache(sender, **kwargs):
+    transaction.on_commit(invalidate_nav_items)
+
+
+# --- Calendar version ---
+# Cached calendar months (and the ETags the page revalidates with) are keyed by the version,
+# bump it when an event or the item fields the events show change.
+
+@receiver(post_init, sender=MediaItem)
+def remember_item_calendar_key(sender, instance, **kwargs):
+    instance._calendar_key = item_calendar_key(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=MediaItem)
+def bump_calendar_on_item_save(sender, instance, created, **kwargs):
+    # New items have no events yet
+    new_key = item_calendar_key(instance)
+    if not created and (new_key is None or new_key != instance._calendar_key):
+        transaction.on_commit(bump_calendar_version)
+    instance._calendar_key = new_key
+
+
+@receiver(post_save, sender=CalendarEvent)
+@receiver(post_delete, sender=CalendarEvent)
+def bump_calendar_on_event_write(sender, **kwargs):
+    transaction.on_commit(bump_calendar_version)
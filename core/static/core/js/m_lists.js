@@ -47,6 +47,7 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // === PAGINATION STATE ===
   let currentPage = 1;
+  let nextCursor = "";
   let isLoading = false;
   let hasMore = true;
   let allItems = [];
@@ -165,8 +166,10 @@ const statusLabelsMap = {
     }, 200);
     
     try {
+      // Keyset pagination: the server hands back the cursor for the next page
       const params = new URLSearchParams({
         page: page,
+        cursor: reset ? "" : nextCursor,
         status: currentStatus,
         search: currentSearch,
         sort_by: currentSort,
@@ -181,6 +184,11 @@ const statusLabelsMap = {
         params.append('collections', currentCollections.map(c => c.id).join(','));
       }
       params.append('filter_mode', currentFilterMode);
+
+      // Journal logs are only rendered by the detailed list
+      if (currentView === 'detailed_list') {
+        params.append('logs', '1');
+      }
       
       // Add type filter for TV shows
       if (mediaType === 'tvshows') {
@@ -213,6 +221,7 @@ const statusLabelsMap = {
       }
       
       hasMore = data.has_more;
+      nextCursor = data.next_cursor || "";
       currentPage = data.page;
       
       renderItems();
@@ -390,11 +399,12 @@ const statusLabelsMap = {
 
     const coverSrc = item.cover_url || '/static/core/img/placeholder.png';
     const imgAlt = item.cover_url ? item.title : item.media_type;
+    const srcsetAttr = getSrcsetAttr(item, CARD_IMAGE_SIZES);
 
     card.innerHTML = `
       <a href="${linkUrl}" class="card-link">
         <div class="card-image">
-          <img src="${coverSrc}" alt="${imgAlt}" loading="lazy">
+          <img src="${coverSrc}"${srcsetAttr} alt="${imgAlt}" loading="lazy">
           ${repeatHtml}
         </div>
         <div class="card-title-overlay">
@@ -514,6 +524,7 @@ function createListRowElement(item, isDetailed = false) {
 
     const coverSrc = item.cover_url || '/static/core/img/placeholder.png';
     const imgAlt = item.cover_url ? item.title : item.media_type;
+    const srcsetAttr = getSrcsetAttr(item, ROW_IMAGE_SIZES);
 
     let firstCellHtml = '';
     if (isDetailed) {
@@ -521,7 +532,7 @@ function createListRowElement(item, isDetailed = false) {
         <td class="detailed-title-cell">
           <a href="${linkUrl}">
             <div class="mini-card-image">
-              <img src="${coverSrc}" alt="${imgAlt}" loading="lazy">
+              <img src="${coverSrc}"${srcsetAttr} alt="${imgAlt}" loading="lazy">
             </div>
             <div class="detailed-text-content">
               <span class="detailed-title">${item.title}</span>
@@ -590,6 +601,15 @@ function createListRowElement(item, isDetailed = false) {
     return row;
   }
 
+  // Rendered widths of the covers, so the browser picks the smallest variant that's sharp enough
+  const CARD_IMAGE_SIZES = '(orientation: portrait) 293px, 150px';
+  const ROW_IMAGE_SIZES = '65px';
+
+  function getSrcsetAttr(item, sizes) {
+    if (!item.cover_srcset) return '';
+    return ` srcset="${item.cover_srcset}" sizes="${sizes}"`;
+  }
+
   function getRatingHtml(rating) {
     if (!rating) return '';
 
@@ -1330,13 +1350,35 @@ updateSortButtons();
   }
   applyView(currentView);
 
+  // Items loaded in the card/list views come without logs, fetch them once the detailed list needs them
+  async function ensureLogsLoaded() {
+    const missing = allItems.filter(it => it.logs === undefined);
+    missing.filter(it => !it.log_count).forEach(it => { it.logs = []; });
+    const ids = missing.filter(it => it.log_count > 0).map(it => it.id);
+
+    for (let i = 0; i < ids.length; i += 200) {
+      try {
+        const response = await fetch(`/api/list/logs/?ids=${ids.slice(i, i + 200).join(',')}`);
+        const data = await response.json();
+        allItems.forEach(it => {
+          if (data.logs[String(it.id)]) it.logs = data.logs[String(it.id)];
+        });
+      } catch (error) {
+        console.error('Error loading journal logs:', error);
+      }
+    }
+  }
+
   // Helper for clicking toggle buttons
-  function switchView(newView) {
+  async function switchView(newView) {
     if (currentView === newView) return;
     currentView = newView;
     sessionStorage.setItem(viewKey, currentView);
     applyView(currentView);
     updateStatusContainer();
+    if (currentView === 'detailed_list') {
+      await ensureLogsLoaded();
+    }
     renderItems();
   }
 
@@ -1754,6 +1796,7 @@ updateSortButtons();
   function resetAndLoad() {
     allItems = [];
     currentPage = 1;
+    nextCursor = "";
     hasMore = true;
     loadItems(1, true);
   }
@@ -1916,17 +1959,17 @@ updateSortButtons();
       if (currentGenres.length > 0) params.append('genres', currentGenres.join(','));
       if (currentCollections.length > 0) params.append('collections', currentCollections.map(c => c.id).join(','));
 
-      let page = 1;
+      let cursor = "";
       let hasMore = true;
       let allMusicItems = [];
 
       while (hasMore) {
-          params.set('page', page);
+          params.set('cursor', cursor);
           const res = await fetch(`/api/music/?${params}`);
           const data = await res.json();
           allMusicItems = allMusicItems.concat(data.items || []);
           hasMore = data.has_more;
-          page++;
+          cursor = data.next_cursor || "";
       }
 
       let contextPlaylist = [];
@@ -2144,6 +2187,16 @@ updateSortButtons();
     bannerInterval = setInterval(updateBanner, 30000);
   }
   
+  function setBannerImage(bannerUrl, bannerSrcset) {
+    if (bannerSrcset) {
+      bannerImg.sizes = '100vw';
+      bannerImg.srcset = bannerSrcset;
+    } else {
+      bannerImg.removeAttribute('srcset');
+    }
+    bannerImg.src = bannerUrl;
+  }
+
   function updateBanner() {
     if (bannerPool.length === 0) return;
     
@@ -2157,12 +2210,12 @@ updateSortButtons();
     }
     lastBannerIndex = random;
 
-    const { bannerUrl, notes } = bannerPool[random];
+    const { bannerUrl, bannerSrcset, notes } = bannerPool[random];
 
     const quoteBox = document.querySelector(".banner-quote");
 
     if (firstLoad) {
-      bannerImg.src = bannerUrl;
+      setBannerImage(bannerUrl, bannerSrcset);
       bannerImg.style.opacity = 1;
 
       if (quoteBox) {
@@ -2179,7 +2232,7 @@ updateSortButtons();
     if (quoteBox) quoteBox.style.opacity = 0;
 
     setTimeout(() => {
-      bannerImg.src = bannerUrl;
+      setBannerImage(bannerUrl, bannerSrcset);
       if (quoteBox) {
         quoteBox.innerText = notes ? `“${notes}”\n\n~You` : "";
         quoteBox.style.display = notes ? "block" : "none";
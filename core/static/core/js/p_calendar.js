@@ -79,21 +79,42 @@ document.addEventListener("DOMContentLoaded", function () {
         });
     }
 
+    // Month payloads by 'YYYY-MM', each one grouped by day with the padding weeks around it.
+    // The API sends the adjacent months along, so flipping to them renders without waiting.
+    let monthCache = {};
+    let calendarVersion = null;
+
+    function monthKey(year, month) {
+        // month is 0-indexed and may overflow, Date normalizes it
+        const d = new Date(year, month, 1);
+        return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}`;
+    }
+
+    function showMonth(key) {
+        eventsCache = monthCache[key] || {};
+        populateEvents();
+        if (selectedDateStr) renderDayDetails(selectedDateStr);
+    }
+
     async function fetchEvents(year, month) {
-        // month is 0-indexed in JS, but 1-indexed in Python
+        const key = monthKey(year, month);
+        const cached = key in monthCache;
+        if (cached) showMonth(key);
+
+        // Always revalidated: the browser sends the ETag and the server answers 304 while the
+        // calendar is unchanged. month is 0-indexed in JS, but 1-indexed in Python.
         try {
-            const res = await fetch(`/api/calendar/events/?year=${year}&month=${month + 1}`);
+            const res = await fetch(`/api/calendar/month/?year=${year}&month=${month + 1}&prefetch=1`);
             const data = await res.json();
             if (data.success) {
-                eventsCache = {};
-                data.events.forEach(ev => {
-                    // Extract YYYY-MM-DD from ISO datetime
-                    const dateKey = ev.date.split("T")[0];
-                    if (!eventsCache[dateKey]) eventsCache[dateKey] = [];
-                    eventsCache[dateKey].push(ev);
-                });
-                populateEvents();
-                if (selectedDateStr) renderDayDetails(selectedDateStr);
+                const changed = data.version !== calendarVersion;
+                if (changed) {
+                    monthCache = {};
+                    calendarVersion = data.version;
+                }
+                Object.assign(monthCache, data.months);
+                // Skip if the user flipped on meanwhile, or if the cached month was already current
+                if (key === monthKey(currentYear, currentMonth) && (!cached || changed)) showMonth(key);
             }
         } catch (e) {
             console.error("Failed to fetch events", e);
@@ -307,11 +328,8 @@ function initStepTicker() {
             
             // Format time if available
             let timeString = "";
-            if (ev.date.includes("T")) {
-                const rawTime = ev.date.split("T")[1].substring(0, 5);
-                if (rawTime !== "00:00") {
-                    timeString = rawTime;
-                }
+            if (!ev.all_day && ev.date.includes("T")) {
+                timeString = ev.date.split("T")[1].substring(0, 5);
             }
 
             let titleStr = ev.title;
@@ -338,7 +356,7 @@ function initStepTicker() {
 
             card.innerHTML = `
                 <a href="${targetUrl}" class="event-card-link">
-                    <img src="${ev.cover_url}" alt="Cover">
+                    <img src="${ev.cover_url || '/static/core/img/placeholder.png'}" alt="Cover">
                     <div class="event-card-info">
                         <div class="event-card-title">${titleStr}</div>
                         <div class="event-card-desc">${subtitle}</div>
@@ -645,19 +663,45 @@ function initStepTicker() {
             headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCookie('csrftoken') },
             body: JSON.stringify(payload)
         }).then(res => res.json()).then(data => {
-            syncBtn.classList.remove("is-syncing");
-            if (force) syncBtn.style.pointerEvents = "auto";
-            
-            statusMsg.textContent = "Sync Complete!";
-            setTimeout(() => {
-                statusMsg.classList.remove("visible");
-            }, 2500);
-
-            // Update calendar if forced OR if auto-sync actually found updates
-            if (force || data.synced_count > 0) {
-                fetchEvents(currentYear, currentMonth);
+            // The sync runs in the background, the calendar keeps showing the saved events meanwhile
+            if (data.task_id && data.status !== "completed" && data.status !== "error") {
+                waitForSync(data.task_id, force);
+            } else {
+                finishSync(data, force);
             }
-        });
+        }).catch(() => finishSync({}, force));
+    }
+
+    function waitForSync(taskId, force) {
+        fetch(`/api/calendar/sync/status/${taskId}/`)
+            .then(res => res.json())
+            .then(data => {
+                if (data.status === "pending" || data.status === "running") {
+                    document.getElementById("sync-status-msg").textContent = data.message || "Syncing APIs...";
+                    setTimeout(() => waitForSync(taskId, force), 1000);
+                } else {
+                    finishSync(data, force);
+                }
+            })
+            .catch(() => finishSync({}, force));
+    }
+
+    function finishSync(data, force) {
+        const syncBtn = document.getElementById("auto-sync-btn");
+        const statusMsg = document.getElementById("sync-status-msg");
+
+        syncBtn.classList.remove("is-syncing");
+        if (force) syncBtn.style.pointerEvents = "auto";
+
+        statusMsg.textContent = data.status === "error" ? "Sync Failed" : "Sync Complete!";
+        setTimeout(() => {
+            statusMsg.classList.remove("visible");
+        }, 2500);
+
+        // Update calendar if forced OR if auto-sync actually found updates
+        if (force || data.synced_count > 0) {
+            fetchEvents(currentYear, currentMonth);
+        }
     }
 
     document.getElementById("auto-sync-btn").addEventListener("click", () => triggerSync(true));
@@ -6,6 +6,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
     // Pagination states for the main grid
     let currentPage = 1;
+    let nextCursor = "";
     let hasMore = true;
     let isLoading = false;
 
@@ -182,7 +183,7 @@ document.addEventListener("DOMContentLoaded", () => {
         card.innerHTML = `
             <a href="${item.url || '#'}" class="card-link" ${isAddModal ? 'draggable="false"' : ''}>
                 <div class="card-image">
-                    <img src="${item.cover_url}" alt="${item.title}" loading="lazy" draggable="false">
+                    <img src="${item.cover_url}"${item.cover_srcset ? ` srcset="${item.cover_srcset}" sizes="200px"` : ''} alt="${item.title}" loading="lazy" draggable="false">
                     ${sortValueHtml}
                     ${selectCircleHtml}
                     ${editBtnHtml}
@@ -239,6 +240,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
         if (reset) {
             currentPage = 1;
+            nextCursor = "";
             hasMore = true;
             collectionItems = [];
             grid.innerHTML = "";
@@ -247,10 +249,11 @@ document.addEventListener("DOMContentLoaded", () => {
         }
 
         try {
-            const res = await fetch(`/api/collection/${colId}/items/?page=${currentPage}&sort_by=${currentSort}&sort_order=${currentSortOrder}`);
+            const res = await fetch(`/api/collection/${colId}/items/?page=${currentPage}&cursor=${encodeURIComponent(nextCursor)}&sort_by=${currentSort}&sort_order=${currentSortOrder}`);
             const data = await res.json();
             
             hasMore = data.has_more;
+            nextCursor = data.next_cursor || "";
             const newItems = data.items || [];
             collectionItems = collectionItems.concat(newItems);
             
@@ -747,21 +747,37 @@ document.addEventListener('DOMContentLoaded', () => {
       
       const data = await response.json();
       
-      if (response.ok && (data.success || data.message)) {
-        btn.textContent = '✓';
-        btn.style.background = 'rgba(40, 167, 69, 0.8)';
-        setTimeout(() => {
-          btn.style.display = 'none';
-        }, 1000);
-      } else {
-        btn.textContent = originalText;
-        btn.disabled = false;
-        alert(data.error || 'Failed to add item');
+      if (!response.ok || !data.job_id) {
+        throw new Error(data.error || 'Failed to add item');
+      }
+      
+      // The item is saved in the background, the add only counts once its job completes
+      const job = await waitForAddJob(data.job_id);
+      if (job.status !== 'completed') {
+        throw new Error(job.error || 'Failed to add item');
       }
+      
+      btn.textContent = '✓';
+      btn.style.background = 'rgba(40, 167, 69, 0.8)';
+      setTimeout(() => {
+        btn.style.display = 'none';
+      }, 1000);
     } catch (error) {
       btn.textContent = originalText;
       btn.disabled = false;
-      alert('Network error occurred');
+      alert(error instanceof TypeError ? 'Network error occurred' : error.message);
+    }
+  }
+  
+  // Polls the add job until it's completed or failed (a failed add removes its placeholder item)
+  async function waitForAddJob(jobId) {
+    while (true) {
+      const response = await fetch(`/api/add_job_status/${jobId}/`);
+      const job = await response.json();
+      if (!response.ok || job.status === 'error' || job.status === 'completed') {
+        return job;
+      }
+      await new Promise(resolve => setTimeout(resolve, 1000));
     }
   }
   
@@ -174,7 +174,7 @@ document.addEventListener('DOMContentLoaded', () => {
           
           card.innerHTML = `
             <a href="${item.url}" class="card-link">
-              <div class="card-image"><img src="${item.cover_url}" alt="${item.title}" draggable="false"></div>
+              <div class="card-image"><img src="${item.cover_url}"${item.cover_srcset ? ` srcset="${item.cover_srcset}" sizes="200px"` : ''} alt="${item.title}" draggable="false"></div>
             </a>
             <div class="card-title">${item.title}</div>
             <label class="card-favorite" data-id="${item.id}" data-type="${type}" data-slug="${slug}" data-title="${item.title}" data-img="${item.cover_url}">
@@ -24,6 +24,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
   // === PAGINATION STATE ===
   let currentPage = 1;
+  let nextCursor = "";
   let isLoading = false;
   let hasMore = true;
   let allItems = [];
@@ -588,8 +589,10 @@ document.addEventListener("DOMContentLoaded", () => {
     }, 200);
     
     try {
+      // Keyset pagination: the server hands back the cursor for the next page
       const params = new URLSearchParams({
         page: page,
+        cursor: reset ? "" : nextCursor,
         search: searchQuery,
         sort_by: sortBy,
         sort_order: sortOrder,
@@ -628,6 +631,7 @@ document.addEventListener("DOMContentLoaded", () => {
       }
       
       hasMore = data.has_more;
+      nextCursor = data.next_cursor || "";
       currentPage = data.page;
       
       renderItems();
@@ -871,7 +875,7 @@ document.addEventListener("DOMContentLoaded", () => {
     card.innerHTML = `
       <a href="${item.url}" class="card-link">
         <div class="card-image">
-          <img src="${item.cover_url}" alt="${item.title}" loading="lazy">
+          <img src="${item.cover_url}"${item.cover_srcset ? ` srcset="${item.cover_srcset}" sizes="(orientation: portrait) 293px, 150px"` : ''} alt="${item.title}" loading="lazy">
         </div>
         <div class="card-title-overlay">
           <span class="card-title">${item.title}</span>
@@ -890,6 +894,7 @@ document.addEventListener("DOMContentLoaded", () => {
   function resetAndLoad() {
     allItems = [];
     currentPage = 1;
+    nextCursor = "";
     hasMore = true;
     loadItems(1, true);
   }
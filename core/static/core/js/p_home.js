@@ -18,44 +18,65 @@ document.addEventListener("DOMContentLoaded", function () {
             headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCookie('csrftoken') },
             body: JSON.stringify({}) // Empty body uses backend DB preferences!
         }).then(res => res.json()).then(data => {
-            // ONLY refresh the DOM if the API actually synced/found updates
-            if (data.synced_count > 0) {
-                // Silently fetch the home page again
-                fetch(window.location.href)
-                    .then(response => response.text())
-                    .then(html => {
-                        const parser = new DOMParser();
-                        const doc = parser.parseFromString(html, 'text/html');
-                        
-                        // Swap the Tiles Container
-                        const newTiles = doc.querySelector('.upcoming-tiles-container');
-                        const oldTiles = document.querySelector('.upcoming-tiles-container');
-                        if (newTiles && oldTiles) {
-                            oldTiles.innerHTML = newTiles.innerHTML;
-                        }
+            if (data.task_id && data.status !== "completed" && data.status !== "error") {
+                waitForHomeSync(data.task_id);
+            } else {
+                refreshUpcoming(data);
+            }
+        });
+    }
 
-                        // Swap the List Container
-                        const newList = doc.querySelector('#upcoming-activity-list');
-                        const oldList = document.querySelector('#upcoming-activity-list');
-                        if (newList && oldList) {
-                            oldList.innerHTML = newList.innerHTML;
-                            
-                            // Reset the Show More button state if it exists
-                            const upcToggle = document.getElementById("toggle-upcoming-btn");
-                            if (upcToggle) {
-                                upcToggle.textContent = "Show More";
-                                upcToggle.dataset.state = "more";
-                            }
-                        }
+    // The sync runs in the background, check on it until it's done
+    function waitForHomeSync(taskId) {
+        fetch(`/api/calendar/sync/status/${taskId}/`)
+            .then(res => res.json())
+            .then(data => {
+                if (data.status === "pending" || data.status === "running") {
+                    setTimeout(() => waitForHomeSync(taskId), 2000);
+                } else {
+                    refreshUpcoming(data);
+                }
+            });
+    }
 
-                        // Re-attach the tooltips to the newly injected elements
-                        attachPillTooltips();
+    function refreshUpcoming(data) {
+        // ONLY refresh the DOM if the API actually synced/found updates
+        if (data.synced_count > 0) {
+            // Silently fetch the home page again
+            fetch(window.location.href)
+                .then(response => response.text())
+                .then(html => {
+                    const parser = new DOMParser();
+                    const doc = parser.parseFromString(html, 'text/html');
+                    
+                    // Swap the Tiles Container
+                    const newTiles = doc.querySelector('.upcoming-tiles-container');
+                    const oldTiles = document.querySelector('.upcoming-tiles-container');
+                    if (newTiles && oldTiles) {
+                        oldTiles.innerHTML = newTiles.innerHTML;
+                    }
+
+                    // Swap the List Container
+                    const newList = doc.querySelector('#upcoming-activity-list');
+                    const oldList = document.querySelector('#upcoming-activity-list');
+                    if (newList && oldList) {
+                        oldList.innerHTML = newList.innerHTML;
                         
-                        // Recentering today's tile
-                        centerTodayTile();
-                    });
-            }
-        });
+                        // Reset the Show More button state if it exists
+                        const upcToggle = document.getElementById("toggle-upcoming-btn");
+                        if (upcToggle) {
+                            upcToggle.textContent = "Show More";
+                            upcToggle.dataset.state = "more";
+                        }
+                    }
+
+                    // Re-attach the tooltips to the newly injected elements
+                    attachPillTooltips();
+                    
+                    // Recentering today's tile
+                    centerTodayTile();
+                });
+        }
     }
 
     if (savedActView === "upcoming") {
@@ -934,16 +934,32 @@ swapBtn?.addEventListener("click", function () {
       })
         .then((res) => res.json())
         .then((data) => {
-          if (data.message) {
-            sessionStorage.setItem("openEditModal", "true");
-            sessionStorage.setItem("refreshSuccess", "1");
-            location.reload();
+          if (data.job_id) {
+            waitForAddJob(data.job_id);
           } else if (data.error) {
             alert("Error: " + data.error);
           }
         })
         .catch(() => alert("Failed to add item."));
     });
+
+    // The item is saved in the background, reload once its details are in
+    function waitForAddJob(jobId) {
+      fetch(`/api/add_job_status/${jobId}/`)
+        .then((res) => res.json())
+        .then((job) => {
+          if (job.status === "completed") {
+            sessionStorage.setItem("openEditModal", "true");
+            sessionStorage.setItem("refreshSuccess", "1");
+            location.reload();
+          } else if (job.status === "error" || job.error) {
+            alert("Error: " + job.error);
+          } else {
+            setTimeout(() => waitForAddJob(jobId), 1000);
+          }
+        })
+        .catch(() => alert("Failed to add item."));
+    }
   }
 
   // Auto-open edit modal
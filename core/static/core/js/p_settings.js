@@ -571,25 +571,36 @@ function showProgressModal(title) {
   };
 }
 
+function startBackup(url, title) {
+  const modal = showProgressModal(title);
+  fetch(url)
+    .then(res => res.json())
+    .then(data => {
+      if (data.task_id) {
+        modal.startPolling(data.task_id, true);
+      } else {
+        alert("Failed to start backup.");
+        modal.close();
+      }
+    })
+    .catch(err => {
+      console.error(err);
+      alert("Error starting backup.");
+      modal.close();
+    });
+}
+
 const downloadBtn = document.getElementById("download-backup-btn");
 if (downloadBtn) {
   downloadBtn.addEventListener("click", () => {
-    const modal = showProgressModal("Creating Backup");
-    fetch("/backup/export/")
-      .then(res => res.json())
-      .then(data => {
-        if (data.task_id) {
-          modal.startPolling(data.task_id, true);
-        } else {
-          alert("Failed to start backup.");
-          modal.close();
-        }
-      })
-      .catch(err => {
-        console.error(err);
-        alert("Error starting backup.");
-        modal.close();
-      });
+    startBackup("/backup/export/", "Creating Backup");
+  });
+}
+
+const incrementalBtn = document.getElementById("incremental-backup-btn");
+if (incrementalBtn) {
+  incrementalBtn.addEventListener("click", () => {
+    startBackup("/backup/export/?mode=incremental", "Creating Incremental Backup");
   });
 }
 
@@ -1,3 +1,805 @@
-from django.test import TestCase
+import base64
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from requests import Response
+
+from core.models import (
+    APIKey,
+    CalendarEvent,
+    Collection,
+    CollectionItem,
+    MediaFile,
+    MediaItem,
+    MediaItemLog,
+    ScheduledJob,
+    SchedulerLease,
+    Screenshot,
+)
+from core.services import g_add_queue, g_http, g_http_cache, g_scheduler, p_calendar, p_home, p_settings
+from core.services.g_add_queue import enqueue_add, run_add_job
+from core.services.g_http import fresh_responses, provider_request
+from core.services.g_http_cache import cache_key, cache_rule, lookup, response_cache_stats, store
+from core.services.g_media import clean_orphaned_media
+from core.services.g_pagination import keyset_page, paginate_queryset
+from core.services.g_scheduler import Scheduler, acquire_lease, release_lease, should_autostart
+from core.services.p_calendar import calendar_feed_token
+from core.services.p_home import HOME_STATS_CACHE_KEY, build_home_stats, get_home_stats, run_anilist_updates
+from core.services.p_settings import BACKUP_MANIFEST, BackupImporter, BackupTask, backup_history
+
+
+def make_item(**fields):
+    fields.setdefault("media_type", "anime")
+    fields.setdefault("source", "anilist")
+    fields.setdefault("status", "ongoing")
+    fields.setdefault("provider_ids", {fields["source"]: str(MediaItem.objects.count() + 1)})
+    return MediaItem.objects.create(**fields)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        # Duplicate ratings and NULLs, so the pk tie-breaker and the NULL handling are needed
+        ratings = [80, None, 80, 60, None, 100, 60, 80, None]
+        for i, rating in enumerate(ratings):
+            make_item(title=f"Title {i % 3}", personal_rating=rating)
+
+    def walk(self, order_fields, page_size):
+        queryset = MediaItem.objects.all()
+        seen, cursor = [], ""
+        while True:
+            items, has_more, cursor = keyset_page(queryset, order_fields, cursor, page_size)
+            seen.extend(item.pk for item in items)
+            if not has_more:
+                self.assertIsNone(cursor)
+                return seen
+
+    def expected(self, *ordering):
+        return list(MediaItem.objects.order_by(*ordering, "pk").values_list("pk", flat=True))
+
+    def test_descending_with_nulls_matches_the_full_order(self):
+        self.assertEqual(
+            self.walk(["-personal_rating"], 2),
+            self.expected(F("personal_rating").desc()),
+        )
+
+    def test_ascending_with_nulls_matches_the_full_order(self):
+        self.assertEqual(
+            self.walk(["personal_rating"], 4),
+            self.expected(F("personal_rating").asc()),
+        )
+
+    def test_expression_and_field_keys(self):
+        self.assertEqual(
+            self.walk([Lower("title").desc(), "personal_rating"], 3),
+            self.expected(Lower("title").desc(), "personal_rating"),
+        )
+
+    def test_invalid_cursor_starts_over(self):
+        items, _, _ = keyset_page(MediaItem.objects.all(), ["-personal_rating"], "not a cursor", 3)
+        first, _, _ = keyset_page(MediaItem.objects.all(), ["-personal_rating"], "", 3)
+        self.assertEqual([i.pk for i in items], [i.pk for i in first])
+
+    def test_malformed_cursor_serves_the_first_page(self):
+        params = {"sort_by": "rating", "sort_order": "desc"}
+        first = self.client.get("/api/anime/", {**params, "cursor": ""}).json()
+        # Not a list, the wrong length, values the sort fields can't take
+        for values in [5, {}, [80], ["abc", 1], [{"a": 1}, 1], [80, "abc"]]:
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            response = self.client.get("/api/anime/", {**params, "cursor": cursor})
+            self.assertEqual(response.status_code, 200, values)
+            self.assertEqual(response.json()["items"], first["items"], values)
+
+    def test_page_mode_counts_without_a_cursor(self):
+        request = RequestFactory().get("/", {"page": 2})
+        items, has_more, cursor = paginate_queryset(request, MediaItem.objects.order_by("pk"), ["pk"], 4)
+        self.assertEqual([i.pk for i in items], self.expected()[4:8])
+        self.assertTrue(has_more)
+        self.assertIsNone(cursor)
+
+    def test_list_api_cursor_walk(self):
+        for i in range(55):
+            make_item(title=f"Bulk {i:02d}", personal_rating=50)
+        first = self.client.get("/api/anime/", {"sort_by": "rating", "sort_order": "desc", "cursor": ""}).json()
+        self.assertTrue(first["has_more"])
+        second = self.client.get(
+            "/api/anime/", {"sort_by": "rating", "sort_order": "desc", "cursor": first["next_cursor"]}
+        ).json()
+        self.assertFalse(second["has_more"])
+        ids = [item["id"] for item in first["items"] + second["items"]]
+        self.assertEqual(len(ids), MediaItem.objects.count())
+        self.assertEqual(len(set(ids)), len(ids))
+
+
+class HomeStatsDeltaTests(TestCase):
+    """The signals move each saved item's contribution, the cached stats must stay equal to a rebuild."""
+
+    def setUp(self):
+        cache.clear()
+        self.items = [
+            make_item(title="A", status="ongoing", progress_main=3),
+            make_item(title="B", media_type="movie", source="tmdb", status="completed", favorite=True),
+            make_item(title="C", status="planned"),
+        ]
+        get_home_stats()
+
+    def tearDown(self):
+        cache.clear()
+
+    def assertStatsCurrent(self):
+        def normalize(stats):
+            groups = {key: group for key, group in stats["groups"].items() if group["count"]}
+            return {**stats, "groups": groups}
+
+        cached = cache.get(HOME_STATS_CACHE_KEY)
+        self.assertIsNotNone(cached, "the stats were invalidated instead of updated")
+        self.assertEqual(normalize(cached), normalize(build_home_stats()))
+
+    def test_create(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_item(title="D", status="ongoing", progress_main=7, favorite=True)
+        self.assertStatsCurrent()
+
+    def test_status_progress_and_favorite_changes(self):
+        item = MediaItem.objects.get(pk=self.items[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.status = "completed"
+            item.progress_main = 12
+            item.favorite = True
+            item.save()
+        self.assertStatsCurrent()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item.favorite = False
+            item.save(update_fields=["favorite"])
+        self.assertStatsCurrent()
+
+    def test_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            MediaItem.objects.get(pk=self.items[1].pk).delete()
+        self.assertStatsCurrent()
+
+    def test_unrelated_save_keeps_the_stats(self):
+        item = MediaItem.objects.get(pk=self.items[2].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.overview = "Changed"
+            item.save()
+        self.assertStatsCurrent()
+
+    def test_partially_loaded_save_invalidates(self):
+        item = MediaItem.objects.only("id", "title").get(pk=self.items[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.title = "Renamed"
+            item.save(update_fields=["title"])
+        self.assertIsNone(cache.get(HOME_STATS_CACHE_KEY))
+        self.assertEqual(get_home_stats(), build_home_stats())
+
+
+class ResponseCacheTests(TestCase):
+    """The on-disk provider response cache, on a temporary database and a fake clock."""
+
+    URL = "https://api.themoviedb.org/3/movie/550"
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        self.now = 1_700_000_000.0
+        patchers = [
+            mock.patch.object(g_http_cache, "CACHE_PATH", Path(cache_dir) / "http_cache.sqlite3"),
+            mock.patch.object(g_http_cache, "_connection", None),
+            mock.patch.object(g_http_cache, "_total_bytes", 0),
+            mock.patch.object(g_http_cache, "_stats", {}),
+            mock.patch.object(g_http_cache, "time", mock.Mock(time=lambda: self.now)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: g_http_cache._connection and g_http_cache._connection.close())
+        self.ttl, self.stale = cache_rule("tmdb", "GET", self.URL)
+        self.key = cache_key("tmdb", "GET", self.URL, {})
+
+    def response(self, body, status=200):
+        response = Response()
+        response.status_code = status
+        response.url = self.URL
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json"
+        response._content = body.encode()
+        return response
+
+    def wait_for_revalidation(self):
+        for _ in range(500):
+            if not g_http._revalidating:
+                return
+            time.sleep(0.01)
+        self.fail("the background revalidation didn't finish")
+
+    def test_entry_is_fresh_then_stale_then_gone(self):
+        store("tmdb", self.key, self.response('{"id": 550}'), self.ttl, self.stale)
+
+        cached, state = lookup("tmdb", self.key)
+        self.assertEqual((state, cached.json(), cached.from_cache), ("fresh", {"id": 550}, True))
+
+        self.now += self.ttl + 1
+        cached, state = lookup("tmdb", self.key)
+        self.assertEqual((state, cached.json()), ("stale", {"id": 550}))
+
+        self.now += self.stale
+        self.assertEqual(lookup("tmdb", self.key), (None, None))
+        counters = response_cache_stats()["providers"]["tmdb"]
+        self.assertEqual((counters["hits"], counters["stale_hits"], counters["misses"]), (1, 1, 1))
+
+    def test_only_successful_responses_of_listed_endpoints_are_cached(self):
+        store("tmdb", self.key, self.response("{}", status=500), self.ttl, self.stale)
+        self.assertEqual(lookup("tmdb", self.key), (None, None))
+        self.assertIsNone(cache_rule("images", "GET", "https://image.tmdb.org/t/p/w500/poster.jpg"))
+        self.assertIsNone(cache_rule("tmdb", "DELETE", self.URL))
+
+    def test_stale_response_is_served_and_revalidated_in_the_background(self):
+        with mock.patch.object(g_http, "_send", side_effect=[self.response('{"v": 1}'), self.response('{"v": 2}')]) as send:
+            self.assertEqual(provider_request("tmdb", "GET", self.URL).json(), {"v": 1})
+            self.assertEqual(provider_request("tmdb", "GET", self.URL).json(), {"v": 1})
+            self.assertEqual(send.call_count, 1)
+
+            self.now += self.ttl + 1
+            self.assertEqual(provider_request("tmdb", "GET", self.URL).json(), {"v": 1})
+            self.wait_for_revalidation()
+            self.assertEqual(send.call_count, 2)
+            self.assertEqual(provider_request("tmdb", "GET", self.URL).json(), {"v": 2})
+
+    def test_fresh_responses_skips_the_cached_copy(self):
+        with mock.patch.object(g_http, "_send", side_effect=[self.response('{"v": 1}'), self.response('{"v": 2}')]):
+            provider_request("tmdb", "GET", self.URL)
+            with fresh_responses():
+                self.assertEqual(provider_request("tmdb", "GET", self.URL).json(), {"v": 2})
+            self.assertEqual(provider_request("tmdb", "GET", self.URL).json(), {"v": 2})
+
+
+class AddQueueTests(TestCase):
+    """Runs the queued adds inline, the worker threads are never started."""
+
+    def setUp(self):
+        patcher = mock.patch.object(g_add_queue, "_started_workers", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job = enqueue_add("anilist", 21, "anime", title="One Piece", cover_url="https://example.com/cover.jpg")
+
+    def test_enqueue_creates_the_placeholder(self):
+        item = self.job.item
+        self.assertEqual((item.title, item.provider_ids, item.cover_url), ("One Piece", {"anilist": "21"}, "https://example.com/cover.jpg"))
+        self.assertEqual(self.job.status, "pending")
+
+    def test_completed_job_keeps_the_item(self):
+        with mock.patch.object(g_add_queue, "_save", return_value=JsonResponse({"success": True})):
+            run_add_job(self.job)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "completed")
+        self.assertTrue(MediaItem.objects.filter(pk=self.job.item_id).exists())
+
+    def test_failed_job_deletes_the_placeholder(self):
+        item_pk = self.job.item_id
+        with mock.patch.object(g_add_queue, "_save", return_value=JsonResponse({"error": "Not found"}, status=404)):
+            with self.assertLogs("core.services.g_add_queue", "ERROR"):
+                run_add_job(self.job)
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.error), ("error", "Not found"))
+        self.assertFalse(MediaItem.objects.filter(pk=item_pk).exists())
+
+    def test_exception_deletes_the_placeholder(self):
+        item_pk = self.job.item_id
+        with mock.patch.object(g_add_queue, "_save", side_effect=ConnectionError("offline")):
+            with self.assertLogs("core.services.g_add_queue", "ERROR"):
+                run_add_job(self.job)
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.error), ("error", "offline"))
+        self.assertFalse(MediaItem.objects.filter(pk=item_pk).exists())
+
+    def test_placeholder_deleted_while_queued(self):
+        MediaItem.objects.filter(pk=self.job.item_id).delete()
+        self.job.refresh_from_db()
+        run_add_job(self.job)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "error")
+
+    def test_jobs_are_claimed_once(self):
+        self.assertEqual(g_add_queue._claim_next(["anilist"]).pk, self.job.pk)
+        self.assertIsNone(g_add_queue._claim_next(["anilist"]))
+
+
+class SchedulerLeaseTests(TestCase):
+    """Two schedulers are simulated by swapping the process's lease owner id."""
+
+    def as_process(self, owner):
+        return mock.patch.object(g_scheduler, "_owner", owner)
+
+    def test_one_holder_at_a_time(self):
+        with self.as_process("a"):
+            self.assertTrue(acquire_lease())
+        expires_at = SchedulerLease.objects.get().expires_at
+        with self.as_process("b"):
+            self.assertFalse(acquire_lease())
+        with self.as_process("a"):
+            self.assertTrue(acquire_lease())  # Renewed
+        lease = SchedulerLease.objects.get()
+        self.assertEqual(lease.owner, "a")
+        self.assertGreaterEqual(lease.expires_at, expires_at)
+
+    def test_expired_lease_is_taken_over(self):
+        with self.as_process("a"):
+            acquire_lease()
+        SchedulerLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        with self.as_process("b"):
+            self.assertTrue(acquire_lease())
+        with self.as_process("a"):
+            self.assertFalse(acquire_lease())
+        self.assertEqual(SchedulerLease.objects.get().owner, "b")
+
+    def test_release_lets_another_process_take_over(self):
+        with self.as_process("a"):
+            acquire_lease()
+        with self.as_process("b"):
+            self.assertFalse(release_lease())  # Not its lease
+            self.assertFalse(acquire_lease())
+        with self.as_process("a"):
+            self.assertTrue(release_lease())
+        with self.as_process("b"):
+            self.assertTrue(acquire_lease())
+
+    def test_autostart_only_in_the_server_process(self):
+        cases = [
+            (["manage.py", "runserver"], {"RUN_MAIN": "true"}, True),
+            (["manage.py", "runserver", "0.0.0.0:8000", "--noreload"], {}, True),
+            (["manage.py", "runserver"], {}, False),  # The reloader's parent process
+            (["manage.py", "test", "core"], {}, False),
+            (["manage.py", "migrate"], {}, False),
+            (["/usr/bin/pytest"], {}, False),
+            (["-m", "waitress"], {}, False),  # Started by media_journal/wsgi.py instead
+            (["bench_list_queries.py"], {}, False),
+        ]
+        for argv, env, expected in cases:
+            with self.subTest(argv=argv), mock.patch.object(sys, "argv", argv), mock.patch.dict(os.environ, env):
+                if "RUN_MAIN" not in env:
+                    os.environ.pop("RUN_MAIN", None)
+                self.assertEqual(should_autostart(), expected)
+        with mock.patch.object(sys, "argv", ["manage.py", "runserver", "--noreload"]), self.settings(SCHEDULER_AUTOSTART=False):
+            self.assertFalse(should_autostart())
+
+    def test_tick_without_the_lease_runs_nothing(self):
+        with self.as_process("a"):
+            acquire_lease()
+        job = mock.Mock(return_value="")
+        schedule = {"test": {"label": "Test", "run": job, "interval": timedelta(minutes=5), "first_run": timezone.now}}
+        with self.as_process("b"), mock.patch.object(g_scheduler, "SCHEDULE", schedule):
+            scheduler = Scheduler()
+            scheduler.tick()
+        self.assertFalse(scheduler.has_lease)
+        self.assertFalse(ScheduledJob.objects.exists())
+        job.assert_not_called()
+
+
+class AnilistUpdateSelectionTests(TestCase):
+    def test_has_sequel_follows_related_titles(self):
+        item = make_item(title="A", related_titles=[{"title": "Zero", "relation": "Prequel"}])
+        self.assertFalse(MediaItem.objects.get(pk=item.pk).has_sequel)
+
+        item = MediaItem.objects.only("id", "related_titles").get(pk=item.pk)
+        item.related_titles = item.related_titles + [{"relation": "SEQUEL", "title": "Two"}]
+        item.save(update_fields=["related_titles"])
+        self.assertTrue(MediaItem.objects.get(pk=item.pk).has_sequel)
+
+    def test_items_with_a_sequel_are_not_checked(self):
+        with_sequel = make_item(title="A", related_titles=[{"title": "A 2", "relation": "Sequel"}])
+        prequel_only = make_item(title="B", related_titles=[{"title": "B 0", "relation": "Prequel"}])
+        no_relations = make_item(title="C", media_type="manga")
+        MediaItem.objects.update(last_updated=timezone.now() - timedelta(days=30))
+
+        with mock.patch.object(p_home, "fetch_anilist_relations", return_value={}) as fetch:
+            run_anilist_updates()
+        checked = {item_id for call in fetch.call_args_list for item_id in call.args[1]}
+        self.assertEqual(checked, {prequel_only.provider_ids["anilist"], no_relations.provider_ids["anilist"]})
+        self.assertNotIn(with_sequel.provider_ids["anilist"], checked)
+
+
+class OrphanedMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write(self, rel_path, age=2 * 24 * 60 * 60):
+        path = os.path.join(self.media_root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"image")
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def files(self):
+        return sorted(
+            os.path.relpath(os.path.join(dirpath, name), self.media_root).replace("\\", "/")
+            for dirpath, _, names in os.walk(self.media_root) for name in names
+        )
+
+    def references(self, item):
+        return set(MediaFile.objects.filter(item=item).values_list("field", "path"))
+
+    def test_references_follow_the_saved_fields(self):
+        item = make_item(title="A", cover_url="/media/posters/a.jpg", cast=[{"image": "/media/cast/1.jpg"}])
+        self.assertEqual(self.references(item), {("cover_url", "posters/a.jpg"), ("cast", "cast/1.jpg")})
+
+        item.cover_url = "/media/posters/b.jpg"
+        item.save(update_fields=["cover_url"])
+        Screenshot.objects.create(item=item, url="/media/screenshots/s.jpg")
+        self.assertEqual(
+            self.references(item),
+            {("cover_url", "posters/b.jpg"), ("cast", "cast/1.jpg"), ("screenshots", "screenshots/s.jpg")},
+        )
+
+        item.delete()
+        self.assertFalse(MediaFile.objects.exists())
+
+    def test_cleanup_deletes_only_old_unreferenced_files(self):
+        item = make_item(title="A", cover_url="/media/posters/used.jpg")
+        Screenshot.objects.create(item=item, url="/media/screenshots/shot.jpg")
+        for path in ["posters/used.jpg", "screenshots/shot.jpg", "posters/old.jpg", "posters/ab/old.jpg"]:
+            self.write(path)
+        self.write("posters/new.jpg", age=0)  # Its item may not be saved yet
+
+        report = clean_orphaned_media(dry_run=True)
+        self.assertEqual((report["count"], report["deleted"]), (2, 0))
+        self.assertEqual(len(self.files()), 5)
+
+        report = clean_orphaned_media()
+        self.assertEqual(report["deleted"], 2)
+        self.assertEqual(self.files(), ["posters/new.jpg", "posters/used.jpg", "screenshots/shot.jpg"])
+
+
+class BackupTestCase(TestCase):
+    """Runs backups against temporary media and backup state folders."""
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = self.make_dir()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.use_state_dir(self.make_dir())
+
+    def tearDown(self):
+        cache.clear()
+
+    def make_dir(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        return path
+
+    def use_state_dir(self, path):
+        patcher = mock.patch.object(p_settings, "BACKUP_STATE_DIR", path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def export(self, incremental=False):
+        task = BackupTask("test", "export", incremental=incremental)
+        task.do_export()
+        self.addCleanup(os.remove, task.result_path)
+        return task
+
+    def restore(self, path):
+        BackupTask("test", "import", upload_path=path).do_import()
+
+    def manifest(self, path):
+        with zipfile.ZipFile(path) as zipf:
+            return json.loads(zipf.read(BACKUP_MANIFEST))
+
+    def write_media(self, rel_path, content):
+        path = os.path.join(self.media_root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    def wipe(self):
+        MediaItem.objects.all().delete()
+        Collection.objects.all().delete()
+        shutil.rmtree(self.media_root)
+        os.makedirs(self.media_root)
+
+    def snapshot(self):
+        """The library by natural keys, so it compares across installs."""
+        def item_key(item):
+            return (item.source, item.provider_ids[item.source])
+
+        media = []
+        for dirpath, _, filenames in os.walk(self.media_root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    media.append((os.path.relpath(path, self.media_root), f.read()))
+        return {
+            "items": sorted((*item_key(i), i.title, i.status) for i in MediaItem.objects.all()),
+            "logs": sorted((*item_key(l.item), l.content) for l in MediaItemLog.objects.select_related("item")),
+            "collections": sorted(
+                (ci.collection.title, *item_key(ci.item), ci.position)
+                for ci in CollectionItem.objects.select_related("collection", "item")
+            ),
+            "media": sorted(media),
+        }
+
+
+class BackupImportTests(BackupTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a = make_item(title="A")
+        self.b = make_item(title="B", status="planned")
+        MediaItemLog.objects.create(item=self.a, content="Watched A", activity_date=datetime(2024, 5, 1, 20, 0))
+        MediaItemLog.objects.create(item=self.b, content="Started B", activity_date=datetime(2024, 5, 2, 21, 0))
+        collection = Collection.objects.create(title="Favorites")
+        CollectionItem.objects.create(collection=collection, item=self.b, position=2)
+        self.write_media("posters/a.jpg", b"poster")
+
+    def test_restore_matches_existing_rows_instead_of_duplicating(self):
+        expected = self.snapshot()
+        path = self.export().result_path
+        MediaItem.objects.filter(pk=self.a.pk).update(title="Renamed", status="dropped")
+
+        self.restore(path)
+
+        self.assertEqual(self.snapshot(), expected)
+        self.assertEqual(MediaItem.objects.get(pk=self.a.pk).title, "A")
+
+    def test_restore_into_another_install_remaps_foreign_keys(self):
+        expected = self.snapshot()
+        path = self.export().result_path
+        self.wipe()
+        other = make_item(title="Local only", source="tmdb", media_type="movie")  # Takes different pks
+
+        self.restore(path)
+
+        self.assertEqual(MediaItem.objects.count(), 3)
+        self.assertTrue(MediaItem.objects.filter(pk=other.pk, title="Local only").exists())
+        restored = self.snapshot()
+        restored["items"].remove(("tmdb", other.provider_ids["tmdb"], "Local only", "ongoing"))
+        self.assertEqual(restored, expected)
+
+    def test_children_of_missing_parents_are_skipped(self):
+        importer = BackupImporter()
+        importer.add(MediaItem(pk=50, title="C", media_type="anime", source="anilist", provider_ids={"anilist": "c"}))
+        importer.add(MediaItemLog(pk=1, item_id=50, content="Kept"))
+        importer.add(MediaItemLog(pk=2, item_id=51, content="Orphan"))
+        importer.flush()
+        with self.assertLogs("core.services.p_settings", "WARNING"):
+            importer.finish()
+
+        item = MediaItem.objects.get(provider_ids__anilist="c")
+        self.assertEqual(list(item.logs.values_list("content", flat=True)), ["Kept"])
+        self.assertFalse(MediaItemLog.objects.filter(content="Orphan").exists())
+        self.assertEqual(importer.skipped, 1)
+
+
+class IncrementalBackupTests(BackupTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a = make_item(title="A")
+        self.b = make_item(title="B", status="planned")
+        self.c = make_item(title="C", status="completed")
+        MediaItemLog.objects.create(item=self.b, content="Started B", activity_date=datetime(2024, 5, 2, 21, 0))
+        self.collection = Collection.objects.create(title="Favorites")
+        CollectionItem.objects.create(collection=self.collection, item=self.a, position=1)
+        self.write_media("posters/a.jpg", b"poster a")
+        self.write_media("posters/b.jpg", b"poster b")
+
+        self.full = self.export()
+        self.full.save_state()
+
+    def change_library(self):
+        MediaItem.objects.filter(pk=self.a.pk).update(status="completed")
+        MediaItem.objects.filter(pk=self.b.pk).delete()
+        d = make_item(title="D", provider_ids={"anilist": "d"})
+        MediaItemLog.objects.create(item=self.c, content="Rewatched C", activity_date=datetime(2024, 6, 1, 19, 0))
+        CollectionItem.objects.create(collection=self.collection, item=d, position=2)
+        self.write_media("posters/a.jpg", b"new poster a")
+        os.remove(os.path.join(self.media_root, "posters/b.jpg"))
+        self.write_media("posters/d.jpg", b"poster d")
+
+    def test_without_a_base_the_export_is_full(self):
+        self.use_state_dir(self.make_dir())
+        task = self.export(incremental=True)
+        self.assertFalse(task.incremental)
+        self.assertIsNone(self.manifest(task.result_path)["base_id"])
+
+    def test_manifest_holds_only_the_changes(self):
+        self.change_library()
+        task = self.export(incremental=True)
+        manifest = self.manifest(task.result_path)
+
+        self.assertEqual(manifest["base_id"], self.manifest(self.full.result_path)["backup_id"])
+        counts = {m["name"]: m["count"] for m in manifest["models"]}
+        self.assertEqual(counts["core.mediaitem"], 2)  # A changed, D is new
+        self.assertEqual(counts["core.mediaitemlog"], 1)
+        self.assertEqual(counts["core.collectionitem"], 1)
+        self.assertEqual(counts["core.collection"], 0)
+        self.assertEqual(len(manifest["deleted_rows"]["core.mediaitem"]), 1)
+        self.assertEqual(len(manifest["deleted_rows"]["core.mediaitemlog"]), 1)
+        self.assertEqual(sorted(manifest["files"]), ["posters/a.jpg", "posters/d.jpg"])
+        self.assertEqual(manifest["deleted_files"], ["posters/b.jpg"])
+
+    def test_full_then_incremental_restores_the_library(self):
+        self.change_library()
+        incremental = self.export(incremental=True)
+        incremental.save_state()
+        expected = self.snapshot()
+
+        self.wipe()
+        self.use_state_dir(self.make_dir())  # A fresh install
+        self.restore(self.full.result_path)
+        self.restore(incremental.result_path)
+
+        self.assertEqual(self.snapshot(), expected)
+        self.assertEqual(
+            backup_history(),
+            [self.manifest(self.full.result_path)["backup_id"], self.manifest(incremental.result_path)["backup_id"]],
+        )
+
+    def test_incremental_without_its_base_is_refused(self):
+        self.change_library()
+        incremental = self.export(incremental=True)
+        expected = self.snapshot()
+
+        self.use_state_dir(self.make_dir())
+        with self.assertRaisesMessage(Exception, "incremental backup"):
+            self.restore(incremental.result_path)
+        self.assertEqual(self.snapshot(), expected)
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.show = make_item(title="Show")
+        self.film = make_item(title="Film", media_type="movie", source="tmdb")
+
+    def tearDown(self):
+        cache.clear()
+
+    def add_events(self, item, titles, start, days=7, **fields):
+        group = uuid.uuid4() if len(titles) > 1 else None
+        with self.captureOnCommitCallbacks(execute=True):
+            for i, title in enumerate(titles):
+                CalendarEvent.objects.create(
+                    item=item, title=title, date=start + timedelta(days=days * i), recurring_group=group, **fields
+                )
+
+    def feed(self, **params):
+        response = self.client.get("/calendar.ics", params)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def events(self, body):
+        """The unfolded VEVENT blocks of a feed."""
+        blocks, current = [], None
+        for line in body.replace("\r\n ", "").split("\r\n"):
+            if line == "BEGIN:VEVENT":
+                current = []
+            elif line == "END:VEVENT":
+                blocks.append(current)
+                current = None
+            elif current is not None:
+                current.append(line)
+        return blocks
+
+    def test_group_with_one_title_is_one_recurring_event(self):
+        self.add_events(self.show, ["New episode"] * 3, datetime(2024, 3, 4, 20, 0))
+        self.add_events(self.show, ["Daily"] * 2, datetime(2024, 3, 4, 9, 30), days=2)
+
+        body = self.feed()
+        daily, weekly = self.events(body)  # Ordered by their first date
+        self.assertIn("DTSTART:20240304T200000Z", weekly)
+        self.assertIn("RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=3", weekly)
+        self.assertIn("SUMMARY:Show - New episode", weekly)
+        self.assertIn("RRULE:FREQ=DAILY;INTERVAL=2;COUNT=2", daily)
+        self.assertNotIn("VTIMEZONE", body)  # TIME_ZONE is UTC
+
+    def test_counting_up_titles_stay_separate_events(self):
+        self.add_events(self.show, ["Episode 1", "Episode 2"], datetime(2024, 3, 4, 20, 0))
+
+        events = self.events(self.feed())
+        self.assertEqual(len(events), 2)
+        self.assertFalse(any(line.startswith("RRULE") for event in events for line in event))
+        self.assertIn("DTSTART:20240311T200000Z", events[1])
+
+    def test_all_day_event_is_written_as_a_date(self):
+        self.add_events(self.film, ["Release"], datetime(2024, 3, 10), all_day=True)
+
+        [event] = self.events(self.feed())
+        self.assertIn("DTSTART;VALUE=DATE:20240310", event)
+        self.assertIn("DTEND;VALUE=DATE:20240311", event)
+        self.assertIn("CATEGORIES:Movie", event)
+
+    @override_settings(TIME_ZONE="Europe/Bucharest")
+    def test_local_times_keep_their_time_zone_across_dst(self):
+        # Weekly at 20:00 local time, DST starts on 2024-03-31
+        self.add_events(self.show, ["New episode"] * 3, datetime(2024, 3, 25, 20, 0))
+
+        body = self.feed()
+        [event] = self.events(body)
+        self.assertIn("DTSTART;TZID=Europe/Bucharest:20240325T200000", event)
+        self.assertIn("RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=3", event)
+
+        vtimezone = body[body.index("BEGIN:VTIMEZONE"):body.index("END:VTIMEZONE")].split("\r\n")
+        self.assertIn("TZID:Europe/Bucharest", vtimezone)
+        daylight = vtimezone[vtimezone.index("BEGIN:DAYLIGHT"):]
+        self.assertEqual(daylight[1:4], ["DTSTART:20240331T030000", "TZOFFSETFROM:+0200", "TZOFFSETTO:+0300"])
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_all_day_comes_from_the_provider_date_not_the_time(self):
+        # A date-only TMDB release, and an episode that airs at midnight New York time
+        APIKey.objects.create(name="tmdb", key_1="key")
+        release_day = (timezone.now() + timedelta(days=30)).date()
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"release_date": release_day.isoformat()}
+        with mock.patch.object(p_calendar, "http_get", return_value=response):
+            with self.captureOnCommitCallbacks(execute=True):
+                p_calendar._sync_tmdb_movies([self.film])
+        self.add_events(self.show, ["Episode 1"], datetime.combine(release_day, datetime.min.time()))
+
+        release = CalendarEvent.objects.get(item=self.film)
+        self.assertTrue(release.all_day)
+        self.assertEqual(release.date, datetime.combine(release_day, datetime.min.time()))
+
+        film, episode = self.events(self.feed())  # Same date, by pk
+        self.assertIn(f"DTSTART;VALUE=DATE:{release_day:%Y%m%d}", film)
+        self.assertIn(f"DTSTART;TZID=America/New_York:{release_day:%Y%m%d}T000000", episode)
+
+    def test_long_lines_are_folded_and_text_is_escaped(self):
+        self.add_events(
+            self.show, ["Épisode spécial " * 8], datetime(2024, 3, 4, 20, 0), notes="Recap; part 1, part 2\nSpoilers"
+        )
+
+        body = self.feed()
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split("\r\n")))
+        [event] = self.events(body)
+        self.assertIn(f"SUMMARY:Show - {'Épisode spécial ' * 8}", event)
+        self.assertIn("DESCRIPTION:Recap\\; part 1\\, part 2\\nSpoilers", event)
+
+    def test_media_type_filter(self):
+        self.add_events(self.show, ["Episode 1"], datetime(2024, 3, 4, 20, 0))
+        self.add_events(self.film, ["Release"], datetime(2024, 3, 10), all_day=True)
+
+        self.assertEqual(len(self.events(self.feed())), 2)
+        self.assertEqual(len(self.events(self.feed(type="movie"))), 1)
+        self.assertEqual(len(self.events(self.feed(type="movie,anime"))), 2)
+        self.assertEqual(self.client.get("/calendar.ics", {"type": "podcast"}).status_code, 400)
+
+    def test_etag_changes_with_the_events(self):
+        self.add_events(self.show, ["Episode 1"], datetime(2024, 3, 4, 20, 0))
+        etag = self.client.get("/calendar.ics")["ETag"]
+        self.assertEqual(self.client.get("/calendar.ics", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self.client.get("/calendar.ics", {"type": "movie"})["ETag"], etag)
+
+        self.add_events(self.film, ["Release"], datetime(2024, 3, 10), all_day=True)
+        response = self.client.get("/calendar.ics", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.events(response.content.decode())), 2)
+
+    @override_settings(REQUIRE_LOGIN=True)
+    def test_token_url_works_without_logging_in(self):
+        self.assertEqual(self.client.get("/calendar.ics").status_code, 302)
+        url = reverse("calendar_feed_token", kwargs={"token": calendar_feed_token()})
+        self.assertEqual(self.client.get(url).status_code, 200)
+        bad_url = reverse("calendar_feed_token", kwargs={"token": "0" * 32})
+        self.assertEqual(self.client.get(bad_url).status_code, 404)
@@ -9,6 +9,15 @@ from django.views.decorators.http import require_GET
 
 from core.models import MediaItem, FavoritePerson, Collection, CollectionItem
 from core.services.g_utils import normalize_search_text
+from core.services.g_images import add_srcsets
+from core.services.g_pagination import paginate_queryset
+from core.services.g_lists import (
+    LIST_TYPES,
+    build_list_queryset,
+    serialize_list_item,
+    get_logs_for_items,
+    get_list_banners,
+)
 from core.services.g_api import get_game_screenshots_data
 from core.services.m_games import get_igdb_discover
 from core.services.m_anime_manga import get_anilist_discover
@@ -19,1121 +28,38 @@ from core.services.m_music import get_musicbrainz_discover
 logger = logging.getLogger(__name__)
 
 @require_GET
-def movies_api(request):
-    page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
-    page_size = 50
-
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="movie")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    queryset = queryset.annotate(
-        status_order=status_ordering, 
-        rating_order=rating_ordering,
-        length_order=Case(
-            When(total_main__isnull=True, then=Value(0)),
-            default=F("total_main"),
-            output_field=IntegerField(),
-        )
-    ).prefetch_related('logs')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "length":
-        order_fields.append("-length_order" if sort_order == "desc" else "length_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-
-    queryset = queryset.order_by(*order_fields)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
-
-    has_more = queryset.count() > end
-
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source_id": item.source_id,
-                "get_status_display": item.get_status_display(),
-                "total_main": item.total_main,
-                "repeats": item.repeats,
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
-
-
-@require_GET
-def movies_banners_api(request):
-    """Get all movie banners for the rotator"""
-    movies = MediaItem.objects.filter(media_type="movie").values("banner_url", "notes")
-    banners = []
-    for movie in movies:
-        banner_url = movie["banner_url"]
-        notes = movie["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
-
-@require_GET
-def tvshows_api(request):
-    page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    type_filter = request.GET.get("type", "both")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
-    page_size = 50
-
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="tv")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    # Type filtering for TV shows vs seasons
-    if type_filter == "shows":
-        queryset = queryset.exclude(provider_ids__tmdb__icontains="_s")
-    elif type_filter == "seasons":
-        queryset = queryset.filter(provider_ids__tmdb__icontains="_s")
-    # 'both' shows everything
-
-    queryset = queryset.annotate(
-        status_order=status_ordering,
-        rating_order=rating_ordering,
-        episode_order=Case(
-            When(total_main__isnull=True, then=F("progress_main")),
-            When(total_main=0, then=F("progress_main")),
-            default=F("total_main"),
-            output_field=IntegerField(),
-        ),
-        season_order=Case(
-            When(total_secondary__isnull=True, then=F("progress_secondary")),
-            When(total_secondary=0, then=F("progress_secondary")),
-            default=F("total_secondary"),
-            output_field=IntegerField(),
-        ),
-    ).prefetch_related('logs')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "episodes":
-        order_fields.append("-episode_order" if sort_order == "desc" else "episode_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "seasons":
-        order_fields.append("-season_order" if sort_order == "desc" else "season_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-
-    queryset = queryset.order_by(*order_fields)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
-
-    has_more = queryset.count() > end
-
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source_id": item.source_id,
-                "get_status_display": item.get_status_display(),
-                "progress_main": item.progress_main,
-                "total_main": item.total_main,
-                "progress_secondary": item.progress_secondary,
-                "total_secondary": item.total_secondary,
-                "repeats": item.repeats,
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
-
-
-@require_GET
-def tvshows_banners_api(request):
-    """Get all TV show banners for the rotator"""
-    tvshows = MediaItem.objects.filter(media_type="tv").values("banner_url", "notes")
-    banners = []
-    for tvshow in tvshows:
-        banner_url = tvshow["banner_url"]
-        notes = tvshow["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
-
-@require_GET
-def anime_api(request):
-    page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
-    page_size = 50
-
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="anime")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    queryset = queryset.annotate(
-        status_order=status_ordering,
-        rating_order=rating_ordering,
-        episode_order=Case(
-            When(total_main__isnull=True, then=F("progress_main")),
-            When(total_main=0, then=F("progress_main")),
-            default=F("total_main"),
-            output_field=IntegerField(),
-        ),
-    ).prefetch_related('logs')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "episodes":
-        order_fields.append("-episode_order" if sort_order == "desc" else "episode_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-
-    queryset = queryset.order_by(*order_fields)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
-
-    has_more = queryset.count() > end
-
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source": item.source,
-                "source_id": item.source_id,
-                "provider_ids": item.provider_ids,
-                "get_status_display": item.get_status_display(),
-                "progress_main": item.progress_main,
-                "total_main": item.total_main,
-                "repeats": item.repeats,
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
-
-
-@require_GET
-def anime_banners_api(request):
-    """Get all anime banners for the rotator"""
-    anime = MediaItem.objects.filter(media_type="anime").values("banner_url", "notes")
-    banners = []
-    for item in anime:
-        banner_url = item["banner_url"]
-        notes = item["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
-
-@require_GET
-def manga_api(request):
-    page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
-    page_size = 50
-
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="manga")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    queryset = queryset.annotate(
-        status_order=status_ordering,
-        rating_order=rating_ordering,
-        chapter_order=Case(
-            When(total_main__isnull=True, then=F("progress_main")),
-            When(total_main=0, then=F("progress_main")),
-            default=F("total_main"),
-            output_field=IntegerField(),
-        ),
-        volume_order=Case(
-            When(total_secondary__isnull=True, then=F("progress_secondary")),
-            When(total_secondary=0, then=F("progress_secondary")),
-            default=F("total_secondary"),
-            output_field=IntegerField(),
-        ),
-    ).prefetch_related('logs')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "chapters":
-        order_fields.append("-chapter_order" if sort_order == "desc" else "chapter_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "volumes":
-        order_fields.append("-volume_order" if sort_order == "desc" else "volume_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-
-    queryset = queryset.order_by(*order_fields)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
-
-    has_more = queryset.count() > end
-
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source": item.source,
-                "source_id": item.source_id,
-                "provider_ids": item.provider_ids,
-                "get_status_display": item.get_status_display(),
-                "progress_main": item.progress_main,
-                "total_main": item.total_main,
-                "progress_secondary": item.progress_secondary,
-                "total_secondary": item.total_secondary,
-                "repeats": item.repeats,
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
-
-
-@require_GET
-def manga_banners_api(request):
-    """Get all manga banners for the rotator"""
-    manga = MediaItem.objects.filter(media_type="manga").values("banner_url", "notes")
-    banners = []
-    for item in manga:
-        banner_url = item["banner_url"]
-        notes = item["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
-
-@require_GET
-def games_api(request):
-    page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
-    page_size = 50
-
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="game")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    queryset = queryset.annotate(
-        status_order=status_ordering, rating_order=rating_ordering
-    ).prefetch_related('logs', 'music_videos')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])
-    elif sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])
-    elif sort_by == "hours":
-        order_fields.append("-progress_main" if sort_order == "desc" else "progress_main")
-        order_fields.extend([Lower("title"), "title"])
-
-    queryset = queryset.order_by(*order_fields)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
-
-    has_more = queryset.count() > end
+def media_list_api(request, category):
+    """One endpoint for every list page, configured per media type in LIST_TYPES."""
+    config = LIST_TYPES.get(category)
+    if config is None:
+        return JsonResponse({"error": "Unknown media type"}, status=404)
 
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source_id": item.source_id,
-                "get_status_display": item.get_status_display(),
-                "progress_main": item.progress_main,
-                "total_main": item.total_main,
-                "repeats": item.repeats,
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
-
-
-@require_GET
-def games_banners_api(request):
-    """Get all game banners for the rotator"""
-    games = MediaItem.objects.filter(media_type="game").values("banner_url", "notes")
-    banners = []
-    for game in games:
-        banner_url = game["banner_url"]
-        notes = game["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
-
-@require_GET
-def music_api(request):
     page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
+    include_logs = request.GET.get("logs") == "1"
     page_size = 50
 
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="music")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title', 'creators')
-        matching_ids = []
-        for item_id, title, creators in search_data:
-            target_text = normalize_search_text(title)
-            if creators and isinstance(creators, list):
-                target_text += " " + normalize_search_text(" ".join(creators))
-            elif creators and isinstance(creators, str):
-                target_text += " " + normalize_search_text(creators)
-                
-            if normalized_query in target_text:
-                matching_ids.append(item_id)
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    queryset = queryset.annotate(
-        status_order=status_ordering, rating_order=rating_ordering
-    ).prefetch_related('logs')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "date" or sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])  # Secondary sort
-
-    queryset = queryset.order_by(*order_fields)
+    queryset, order_fields = build_list_queryset(config, request.GET, include_logs)
+    items, has_more, next_cursor = paginate_queryset(request, queryset, order_fields, page_size)
 
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
+    items_data = add_srcsets([serialize_list_item(item, config, include_logs) for item in items])
 
-    has_more = queryset.count() > end
-
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source_id": item.source_id,
-                "get_status_display": item.get_status_display(),
-                "repeats": item.repeats,
-                "provider_ids": item.provider_ids,
-                "is_favorite": item.favorite,
-                "youtube_links": [
-                    {"url": v.url, "position": v.position, "is_favorite": v.is_favorite} 
-                    for v in item.music_videos.all()
-                ],
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
+    return JsonResponse({"items": items_data, "has_more": has_more, "page": page, "next_cursor": next_cursor})
 
 
 @require_GET
-def music_banners_api(request):
-    """Get all music banners for the rotator"""
-    music = MediaItem.objects.filter(media_type="music").values("banner_url", "notes")
-    banners = []
-    for item in music:
-        banner_url = item["banner_url"]
-        notes = item["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
-
-@require_GET
-def books_api(request):
-    page = int(request.GET.get("page", 1))
-    status = request.GET.get("status", "all")
-    search = request.GET.get("search", "").strip()
-    genres_param = request.GET.get("genres", "")
-    sort_by = request.GET.get("sort_by", "rating")
-    sort_order = request.GET.get("sort_order", "desc")
-    page_size = 50
-
-    status_ordering = Case(
-        When(status="ongoing", then=Value(1)),
-        When(status="completed", then=Value(2)),
-        When(status="on_hold", then=Value(3)),
-        When(status="planned", then=Value(4)),
-        When(status="dropped", then=Value(5)),
-        default=Value(6),
-        output_field=IntegerField(),
-    )
-
-    rating_ordering = Case(
-        When(personal_rating=None, then=Value(0)),
-        default=F("personal_rating"),
-        output_field=IntegerField(),
-    )
-
-    queryset = MediaItem.objects.filter(media_type="book")
-
-    if status != "all":
-        queryset = queryset.filter(status=status)
-
-    if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
-
-    filter_mode = request.GET.get("filter_mode", "include")
-    collections_param = request.GET.get("collections", "")
-
-    if genres_param:
-        selected_genres = [g.strip() for g in genres_param.split(",") if g.strip()]
-        for g in selected_genres:
-            if filter_mode == "exclude":
-                queryset = queryset.exclude(genres__icontains=g)
-            else:
-                queryset = queryset.filter(genres__icontains=g)
-
-    if collections_param:
-        selected_collections = [c.strip() for c in collections_param.split(",") if c.strip()]
-        if filter_mode == "exclude":
-            # Exclude items that are in ANY of the selected collections
-            queryset = queryset.exclude(collections__id__in=selected_collections)
-        else:
-            # Include items that are in AT LEAST ONE of the selected collections
-            queryset = queryset.filter(collections__id__in=selected_collections).distinct()
-
-    queryset = queryset.annotate(
-        status_order=status_ordering,
-        rating_order=rating_ordering,
-        page_order=Case(
-            When(total_main__isnull=True, then=F("progress_main")),
-            When(total_main=0, then=F("progress_main")),
-            default=F("total_main"),
-            output_field=IntegerField(),
-        ),
-    ).prefetch_related('logs')
-
-    # Apply sorting
-    order_fields = ["status_order"]
-    if sort_by == "title":
-        if sort_order == "asc":
-            order_fields.extend([Lower("title"), "title"])
-        else:
-            order_fields.extend([Lower("title").desc(), "-title"])
-    elif sort_by == "rating":
-        order_fields.append("-rating_order" if sort_order == "desc" else "rating_order")
-        order_fields.extend([Lower("title"), "title"])
-    elif sort_by == "activity_date":
-        order_fields.append("-date_added" if sort_order == "desc" else "date_added")
-        order_fields.extend([Lower("title"), "title"])
-    elif sort_by == "release_date":
-        order_fields.append("-release_date" if sort_order == "desc" else "release_date")
-        order_fields.extend([Lower("title"), "title"])
-    elif sort_by == "pages":
-        order_fields.append("-page_order" if sort_order == "desc" else "page_order")
-        order_fields.extend([Lower("title"), "title"])
-
-    queryset = queryset.order_by(*order_fields)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
-
-    has_more = queryset.count() > end
-
-    items_data = []
-    for item in items:
-        logs_data = []
-        for log in item.logs.all():
-            logs_data.append({
-                "id": log.id,
-                "title": log.title or "Log",
-                "content": log.content,
-                "activity_date": log.activity_date.strftime("%d %b %Y"),
-                "score": log.score,
-                "is_spoiler": log.is_spoiler,
-                "progress_unit": log.progress_unit,
-                "progress_start": log.progress_start,
-                "progress_end": log.progress_end
-            })
-
-        items_data.append(
-            {
-                "id": item.id,
-                "title": item.title,
-                "logs": logs_data,
-                "media_type": item.media_type,
-                "status": item.status,
-                "personal_rating": item.personal_rating,
-                "cover_url": item.cover_url or "/static/core/img/placeholder.png",
-                "banner_url": item.banner_url,
-                "notes": item.notes or "",
-                "source_id": item.source_id,
-                "get_status_display": item.get_status_display(),
-                "progress_main": item.progress_main,
-                "total_main": item.total_main,
-                "repeats": item.repeats,
-                "date_added": item.date_added.isoformat() if item.date_added else "",
-                "release_date": (
-                  datetime.strptime(item.release_date, "%Y-%m-%d").strftime("%d %b %Y")
-                  if item.release_date else ""
-                ),
-            }
-        )
-
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
+def media_banners_api(request, category):
+    """Get all banners of a media type for the rotator"""
+    config = LIST_TYPES.get(category)
+    if config is None:
+        return JsonResponse({"error": "Unknown media type"}, status=404)
+    return JsonResponse({"banners": add_srcsets(get_list_banners(config), "bannerUrl", "bannerSrcset")})
 
 
 @require_GET
-def books_banners_api(request):
-    """Get all book banners for the rotator"""
-    books = MediaItem.objects.filter(media_type="book").values("banner_url", "notes")
-    banners = []
-    for book in books:
-        banner_url = book["banner_url"]
-        notes = book["notes"] or ""
-        if banner_url and "placeholder" not in banner_url:
-            banners.append(
-                {"bannerUrl": banner_url, "notes": notes if notes != "None" else ""}
-            )
-    return JsonResponse({"banners": banners})
+def list_logs_api(request):
+    """Journal logs for the given item ids, loaded when the detailed list view needs them"""
+    ids = [int(i) for i in request.GET.get("ids", "").split(",") if i.strip().isdigit()]
+    return JsonResponse({"logs": get_logs_for_items(ids)})
 
 @require_GET
 def history_api(request):
@@ -1153,13 +79,7 @@ def history_api(request):
     queryset = MediaItem.objects.all()
 
     if search:
-        normalized_query = normalize_search_text(search)
-        search_data = queryset.values_list('id', 'title')
-        matching_ids = [
-            item_id for item_id, title in search_data 
-            if normalized_query in normalize_search_text(title)
-        ]
-        queryset = queryset.filter(id__in=matching_ids)
+        queryset = queryset.filter(search_title__contains=normalize_search_text(search))
 
     if activity_year and activity_year != "all":
         queryset = queryset.filter(date_added__year=activity_year)
@@ -1222,16 +142,11 @@ def history_api(request):
         else:
             order_fields.extend(["-rating_order", Lower("title"), "title"])
 
-    if order_fields:
-        queryset = queryset.order_by(*order_fields)
-    else:
-        queryset = queryset.order_by("-date_added", Lower("title"), "title")
-
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = queryset[start:end]
+    if not order_fields:
+        order_fields = ["-date_added", Lower("title"), "title"]
+    queryset = queryset.order_by(*order_fields)
 
-    has_more = queryset.count() > end
+    items, has_more, next_cursor = paginate_queryset(request, queryset, order_fields, page_size)
 
     items_data = []
     for item in items:
@@ -1270,7 +185,8 @@ def history_api(request):
             }
         )
 
-    return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
+    add_srcsets(items_data)
+    return JsonResponse({"items": items_data, "has_more": has_more, "page": page, "next_cursor": next_cursor})
 
 @require_GET
 def favorites_api(request):
@@ -1361,6 +277,7 @@ def favorites_api(request):
                 }
             )
 
+    add_srcsets(items_data)
     return JsonResponse({"items": items_data, "has_more": has_more, "page": page})
 
 @require_GET
@@ -1444,11 +361,7 @@ def collection_items_api(request, collection_id):
         
     qs = qs.order_by(*order_fields)
     
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = qs[start:end]
-    
-    has_more = qs.count() > end
+    items, has_more, next_cursor = paginate_queryset(request, qs, order_fields, page_size)
     
     data = []
     for ci in items:
@@ -1484,7 +397,8 @@ def collection_items_api(request, collection_id):
             "url": url
         })
         
-    return JsonResponse({"items": data, "has_more": has_more, "page": page})
+    add_srcsets(data)
+    return JsonResponse({"items": data, "has_more": has_more, "page": page, "next_cursor": next_cursor})
 
 @require_GET
 def collections_api(request):
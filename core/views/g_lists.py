@@ -1,7 +1,7 @@
 from django.http import JsonResponse
 from core.models import APIKey, MediaItem
+from core.services.g_http import http_get, http_post
 import time
-import requests
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +16,6 @@ def check_planned_movie_statuses(request):
 
     planned_movies = MediaItem.objects.filter(media_type="movie", status="planned")
     status_map = {}  # {tmdb_id (str): status}
-    request_count = 0
 
     for item in planned_movies:
         tmdb_id = item.source_id
@@ -27,14 +26,7 @@ def check_planned_movie_statuses(request):
         params = {"api_key": api_key}
 
         try:
-            response = requests.get(url, params=params)
-            request_count += 1
-
-            if request_count >= 300:
-                time.sleep(60)
-                request_count = 0
-            else:
-                time.sleep(0.025)
+            response = http_get("tmdb", url, params=params, use_cache=False)
 
             if response.status_code == 200:
                 data = response.json()
@@ -55,7 +47,6 @@ def check_planned_tvseries_statuses(request):
 
     planned_series = MediaItem.objects.filter(media_type="tv", status="planned")
     status_map = {}  # {tmdb_id: status}
-    request_count = 0
 
     for item in planned_series:
         tmdb_id = item.source_id
@@ -66,14 +57,7 @@ def check_planned_tvseries_statuses(request):
         params = {"api_key": api_key}
 
         try:
-            response = requests.get(url, params=params)
-            request_count += 1
-
-            if request_count >= 300:
-                time.sleep(60)
-                request_count = 0
-            else:
-                time.sleep(0.025)
+            response = http_get("tmdb", url, params=params, use_cache=False)
 
             if response.status_code == 200:
                 data = response.json()
@@ -102,8 +86,6 @@ def check_planned_tvseries_statuses(request):
 
 
 def check_planned_anime_manga_statuses(request):
-    import requests
-    import time
     from django.http import JsonResponse, HttpResponseBadRequest
 
     ANILIST_API_URL = "https://graphql.anilist.co"
@@ -142,16 +124,7 @@ def check_planned_anime_manga_statuses(request):
             
         item_list.append((frontend_id, query_param))
 
-    request_count = 0
-
     for batch in chunks(item_list, 25):
-        request_count += 1
-        if request_count >= 12:
-            time.sleep(60)
-            request_count = 0
-        else:
-            time.sleep(0.1)
-
         aliases =[]
         for i, (frontend_id, query_param) in enumerate(batch):
             aliases.append(
@@ -161,8 +134,8 @@ def check_planned_anime_manga_statuses(request):
         query = f"query {{\n  {'\n  '.join(aliases)}\n}}"
 
         try:
-            response = requests.post(
-                ANILIST_API_URL, json={"query": query}, headers=headers, timeout=10
+            response = http_post("anilist",
+                ANILIST_API_URL, json={"query": query}, headers=headers, timeout=10, use_cache=False
             )
 
             if response.status_code != 200:
@@ -194,10 +167,8 @@ def check_planned_anime_manga_statuses(request):
     return JsonResponse(status_map)
 
 def check_planned_game_statuses(request):
-    import time
     from django.http import JsonResponse
     from core.models import APIKey, MediaItem
-    import requests
 
     try:
         igdb_keys = APIKey.objects.get(name="igdb")
@@ -211,7 +182,7 @@ def check_planned_game_statuses(request):
         "client_secret": igdb_keys.key_2,
         "grant_type": "client_credentials",
     }
-    resp = requests.post(url, params=params)
+    resp = http_post("twitch", url, params=params)
     if resp.status_code != 200:
         return JsonResponse({"error": "Failed to get IGDB token"}, status=500)
     
@@ -253,7 +224,7 @@ def check_planned_game_statuses(request):
         body = f"fields id, status, first_release_date; where id = ({id_list_str}); limit 500;"
         
         try:
-            response = requests.post("https://api.igdb.com/v4/games", headers=headers, data=body)
+            response = http_post("igdb", "https://api.igdb.com/v4/games", headers=headers, data=body, use_cache=False)
             if response.status_code == 200:
                 data = response.json()
                 for game in data:
@@ -276,7 +247,6 @@ def check_planned_game_statuses(request):
         except Exception:
             for gid in batch:
                 status_map[str(gid)] = "Error"
-                
-        time.sleep(0.26) # IGDB rate limit safety (4 requests per second)
+
 
     return JsonResponse(status_map)
\ No newline at end of file
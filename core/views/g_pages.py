@@ -1,26 +1,25 @@
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from collections import defaultdict
 
-from django.apps import apps
 from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Q, Sum
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
 from django.shortcuts import render, get_object_or_404
 from django.utils.text import slugify
 from django.utils.timesince import timesince
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET
 
-from core.models import APIKey, NavItem, MediaItem, Collection, FavoritePerson, CalendarEvent, AppSettings
+from core.models import APIKey, MediaItem, Collection, CollectionItem, FavoritePerson, CalendarEvent
 from django.utils.timesince import timeuntil
-from core.services.p_home import (
-    start_media_cleanup_loop,
-    start_tmdb_background_loop,
-    start_anilist_background_loop,
-)
+from core.services.p_home import get_home_stats
 from core.services.m_people import fetch_actor_data, fetch_character_data
 from core.services.g_utils import get_ordered_types
+from core.services.g_settings import get_app_settings, get_nav_items
+from core.services.g_scheduler import scheduled_jobs_status
+from core.services.p_calendar import calendar_feed_token
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +34,15 @@ SYSTEM_NOTIFICATIONS = [
 
 @ensure_csrf_cookie
 def home(request):
-    start_tmdb_background_loop()
-    start_anilist_background_loop()
-    start_media_cleanup_loop()
-
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
 
     limit = 25
 
     # Single query for favorites with prefetch
-    favorites = list(MediaItem.objects.filter(favorite=True).order_by(
+    favorites = list(MediaItem.objects.filter(favorite=True).only(
+        "id", "title", "media_type", "source", "provider_ids", "cover_url", "banner_url", "notes",
+        "favorite_position", "date_added",
+    ).order_by(
         "favorite_position", "date_added"
     ))
     
@@ -59,26 +57,24 @@ def home(request):
         "Music": [f for f in favorites if f.media_type == "music"][:limit],
     }
 
-    # Single query with Count aggregation by media_type
-    from django.db.models import Case, When, Count, IntegerField
-    counts_result = MediaItem.objects.aggregate(
-        movies=Count(Case(When(media_type="movie", then=1), output_field=IntegerField())),
-        tv=Count(Case(When(media_type="tv", then=1), output_field=IntegerField())),
-        anime=Count(Case(When(media_type="anime", then=1), output_field=IntegerField())),
-        games=Count(Case(When(media_type="game", then=1), output_field=IntegerField())),
-        books=Count(Case(When(media_type="book", then=1), output_field=IntegerField())),
-        manga=Count(Case(When(media_type="manga", then=1), output_field=IntegerField())),
-        music=Count(Case(When(media_type="music", then=1), output_field=IntegerField())),
-    )
-    
+    # Counts, progress sums and heatmap buckets come from the cached stats (kept current by signals)
+    home_stats = get_home_stats()
+
+    type_counts = defaultdict(int)
+    type_progress = defaultdict(int)
+    for key, group in home_stats["groups"].items():
+        media_type = key.split("|")[0]
+        type_counts[media_type] += group["count"]
+        type_progress[media_type] += group["progress"]
+
     media_counts = {
-        "Movies": counts_result["movies"],
-        "TV Shows": counts_result["tv"],
-        "Anime": counts_result["anime"],
-        "Games": counts_result["games"],
-        "Books": counts_result["books"],
-        "Manga": counts_result["manga"],
-        "Music": counts_result["music"],
+        "Movies": type_counts["movie"],
+        "TV Shows": type_counts["tv"],
+        "Anime": type_counts["anime"],
+        "Games": type_counts["game"],
+        "Books": type_counts["book"],
+        "Manga": type_counts["manga"],
+        "Music": type_counts["music"],
     }
 
     total_entries = sum(media_counts.values())
@@ -114,18 +110,18 @@ def home(request):
 
     stats = dict(media_counts)
     stats["Total Entries"] = total_entries
-    stats["Favorites"] = len(favorites)
-
-    # Extra stats - single aggregate query
-    extra_aggregates = MediaItem.objects.aggregate(
-        movie_count=Count(Case(When(media_type="movie", status="completed", then=1), output_field=IntegerField())),
-        tv_episodes=Sum(Case(When(media_type="tv", then="progress_main"), output_field=IntegerField())),
-        anime_episodes=Sum(Case(When(media_type="anime", then="progress_main"), output_field=IntegerField())),
-        game_hours=Sum(Case(When(media_type="game", then="progress_main"), output_field=IntegerField())),
-        chapters_read=Sum(Case(When(media_type="manga", then="progress_main"), output_field=IntegerField())),
-        pages_read=Sum(Case(When(media_type="book", then="progress_main"), output_field=IntegerField())),
-    )
-    
+    stats["Favorites"] = home_stats["favorites"]
+
+    completed_movies = home_stats["groups"].get("movie|completed", {"count": 0})
+    extra_aggregates = {
+        "movie_count": completed_movies["count"],
+        "tv_episodes": type_progress["tv"],
+        "anime_episodes": type_progress["anime"],
+        "game_hours": type_progress["game"],
+        "chapters_read": type_progress["manga"],
+        "pages_read": type_progress["book"],
+    }
+
     movie_count = extra_aggregates["movie_count"] or 0
     tv_episodes = extra_aggregates["tv_episodes"] or 0
     anime_episodes = extra_aggregates["anime_episodes"] or 0
@@ -160,13 +156,7 @@ def home(request):
     start_date = raw_start - timedelta(days=raw_start.weekday()) 
     num_days = (today - start_date).days + 1 
 
-    activity_counts = MediaItem.objects.filter(
-        date_added__date__gte=start_date
-    ).values_list("date_added", flat=True)
-
-    count_by_day = defaultdict(int)
-    for activity_date in activity_counts:
-        count_by_day[activity_date.date()] += 1
+    count_by_day = home_stats["activity"]
 
     activity_data = []
     for i in range(num_days):
@@ -174,7 +164,7 @@ def home(request):
         activity_data.append(
             {
                 "date": day.strftime("%A %d %B %Y"),
-                "count": count_by_day.get(day, 0),
+                "count": count_by_day.get(day.isoformat(), 0),
             }
         )
 
@@ -187,9 +177,11 @@ def home(request):
     cal_end_date = today_date + timedelta(days=7)
 
     calendar_events = CalendarEvent.objects.filter(
-        date__date__gte=cal_start_date, 
-        date__date__lte=cal_end_date
-    ).select_related('item').order_by('date')
+        date__gte=datetime.combine(cal_start_date, time.min),
+        date__lt=datetime.combine(cal_end_date + timedelta(days=1), time.min)
+    ).select_related('item').only(
+        "date", "all_day", "title", "item__title", "item__media_type", "item__cover_url"
+    ).order_by('date')
 
     events_by_date = defaultdict(list)
     for e in calendar_events:
@@ -208,7 +200,7 @@ def home(request):
         day_events = []
         for e in events_by_date.get(d, []):
             time_str = ""
-            if e.date.strftime("%H:%M") != "00:00":
+            if not e.all_day:
                 time_str = e.date.strftime("%H:%M")
             
             day_events.append({
@@ -258,7 +250,7 @@ def home(request):
             action = f"{e.item.title}"
             
         time_str_list = ""
-        if e.date.strftime("%H:%M") != "00:00":
+        if not e.all_day:
             time_str_list = f" ({e.date.strftime('%H:%M')})"
 
         upcoming_list.append({
@@ -410,23 +402,31 @@ def home(request):
             "media_type":random_item.media_type
         }
 
-    top_collections_qs = Collection.objects.order_by("position", "-date_created")[:10]
+    top_collections = list(Collection.objects.order_by("position", "-date_created")[:10])
+
+    # Up to 3 covers per collection (ordered by their position) in one query instead of one per collection
+    covers_by_collection = defaultdict(list)
+    cover_rows = CollectionItem.objects.filter(collection__in=top_collections).annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=F("collection_id"),
+            order_by=[F("position").asc(), F("date_added").desc()],
+        )
+    ).filter(row_number__lte=3).order_by("collection_id", "row_number").values(
+        "collection_id", "item__cover_url", "item__media_type"
+    )
+    for row in cover_rows:
+        covers_by_collection[row["collection_id"]].append({
+            "url": row["item__cover_url"] or "/static/core/img/placeholder.png",
+            "media_type": row["item__media_type"]
+        })
+
     home_collections = []
-    for col in top_collections_qs:
-        # Fetch up to 3 covers ordered by their position in the collection
-        items = col.items.order_by("collectionitem__position", "-collectionitem__date_added")[:3]
-        covers = [
-            {
-                "url": item.cover_url or "/static/core/img/placeholder.png",
-                "media_type": item.media_type
-            } 
-            for item in items
-        ]
-        
+    for col in top_collections:
         home_collections.append({
             "id": col.id,
             "title": col.title,
-            "covers": covers
+            "covers": covers_by_collection[col.id]
         })
 
     # Get theme mode
@@ -458,8 +458,7 @@ def home(request):
 @ensure_csrf_cookie
 def movies(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -514,8 +513,7 @@ def movies(request):
 @ensure_csrf_cookie
 def tvshows(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -570,8 +568,7 @@ def tvshows(request):
 @ensure_csrf_cookie
 def anime(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -626,8 +623,7 @@ def anime(request):
 @ensure_csrf_cookie
 def manga(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -682,8 +678,7 @@ def manga(request):
 @ensure_csrf_cookie
 def games(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -738,8 +733,7 @@ def games(request):
 @ensure_csrf_cookie
 def music(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -794,8 +788,7 @@ def music(request):
 @ensure_csrf_cookie
 def books(request):
     # Get current rating mode and theme from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     rating_mode = settings.rating_mode if settings else "faces"
     theme_mode = settings.theme_mode if settings else "dark"
 
@@ -854,8 +847,7 @@ def history(request):
     previous_year = current_year - 1
 
     # Get theme mode and rating mode from AppSettings
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     rating_mode = settings.rating_mode if settings else "faces"
 
@@ -875,8 +867,7 @@ def history(request):
 
 @ensure_csrf_cookie
 def favorites_page(request):
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
 
     # Fetch favorite media items
@@ -1013,8 +1004,7 @@ def favorites_page(request):
 @ensure_csrf_cookie
 @require_GET
 def person_detail(request, person_type, person_id):
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
 
     if person_type == "actor":
@@ -1045,11 +1035,10 @@ def person_detail(request, person_type, person_id):
 @ensure_csrf_cookie
 def discover_view(request):
     # Get theme mode
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
 
-    ordered_types = get_ordered_types()
+    ordered_types = get_ordered_types(request)
 
     return render(
         request,
@@ -1088,8 +1077,7 @@ def community(request):
     media_types = dict(MediaItem.MEDIA_TYPES)
 
     # Get theme mode
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
 
     return render(
@@ -1105,8 +1093,7 @@ def community(request):
     )
 
 def calendar_page(request):
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     
     return render(
@@ -1116,13 +1103,13 @@ def calendar_page(request):
             "theme_mode": theme_mode,
             "cal_sync_ongoing": settings.cal_sync_ongoing if settings else True,
             "cal_sync_planned": settings.cal_sync_planned if settings else False,
+            "calendar_feed_token": calendar_feed_token(),
         }
     )
 
 @ensure_csrf_cookie
 def collections_page(request):
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     
     return render(
@@ -1134,8 +1121,7 @@ def collections_page(request):
 @require_GET
 def collection_page(request, collection_id):
     collection = get_object_or_404(Collection, id=collection_id)
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     rating_mode = settings.rating_mode if settings else "faces"
     
@@ -1156,14 +1142,11 @@ def settings_page(request):
     existing_names = [key.name for key in keys]
     allowed_names = APIKey.NAME_CHOICES
 
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
-    if not settings:
-        settings = AppSettings.objects.create()  # ensure one exists
+    settings = get_app_settings(request, create=True)
 
     current_rating_mode = settings.rating_mode
 
-    nav_items = NavItem.objects.all().order_by("position")
+    nav_items = get_nav_items(request)
     for item in nav_items:
         item.display_name = item.get_name_display()
 
@@ -1181,5 +1164,6 @@ def settings_page(request):
             "show_repeats_field": settings.show_repeats_field,
             "show_collections_field": settings.show_collections_field,
             "details_sections_order": settings.details_sections_order,
+            "scheduled_jobs": scheduled_jobs_status(),
         },
     )
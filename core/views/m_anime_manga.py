@@ -1,7 +1,5 @@
 import datetime
 
-import requests
-from django.apps import apps
 from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -10,6 +8,8 @@ from django.db.models import Q
 
 from core.models import MediaItem
 from core.services.m_anime_manga import fetch_anilist_data
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_post
 
 
 @ensure_csrf_cookie
@@ -51,7 +51,7 @@ def anilist_search(request):
     }
 
     headers = {"Content-Type": "application/json"}
-    response = requests.post(
+    response = http_post("anilist",
         "https://graphql.anilist.co",
         json={"query": graphql_query, "variables": variables},
         headers=headers,
@@ -250,8 +250,7 @@ def anilist_detail(request, source, media_type, source_id):
                 sequels.append(entry)
 
     # Theme logic
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     details_sections_order = settings.details_sections_order if settings else []
 
@@ -1,14 +1,14 @@
 import re
 import datetime
 
-import requests
-from django.apps import apps
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET
 
 from core.models import MediaItem
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_get
 
 
 @ensure_csrf_cookie
@@ -22,7 +22,7 @@ def openlib_search(request):
     url = "https://openlibrary.org/search.json"
     params = {"q": query}
 
-    response = requests.get(url, params=params)
+    response = http_get("openlibrary", url, params=params)
     if response.status_code != 200:
         return JsonResponse({"error": "Failed to fetch from Open Library."}, status=500)
 
@@ -40,7 +40,7 @@ def openlib_search(request):
         edition_keys = item.get("edition_key", [])
         if edition_keys:
             for key in edition_keys[:3]:  # Check up to 3 editions
-                edition_response = requests.get(
+                edition_response = http_get("openlibrary",
                     f"https://openlibrary.org/books/{key}.json"
                 )
                 if edition_response.status_code == 200:
@@ -88,8 +88,7 @@ def openlib_detail(request, work_id):
             formatted_release_date = raw_date
 
         # Get theme mode
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
+        settings = get_app_settings(request)
         theme_mode = settings.theme_mode if settings else "dark"
         details_sections_order = settings.details_sections_order if settings else []
 
@@ -123,7 +122,7 @@ def openlib_detail(request, work_id):
 
     # Fetch from Open Library API
     detail_url = f"https://openlibrary.org/works/{work_id}.json"
-    detail_response = requests.get(detail_url)
+    detail_response = http_get("openlibrary", detail_url)
 
     if detail_response.status_code != 200:
         return JsonResponse(
@@ -176,7 +175,7 @@ def openlib_detail(request, work_id):
     for a in detail_data.get("authors", []):
         author_key = a.get("author", {}).get("key", "")
         if author_key:
-            author_response = requests.get(f"https://openlibrary.org{author_key}.json")
+            author_response = http_get("openlibrary", f"https://openlibrary.org{author_key}.json")
             if author_response.status_code == 200:
                 author_data = author_response.json()
                 name = author_data.get("name")
@@ -188,7 +187,7 @@ def openlib_detail(request, work_id):
     recommendations = []
     if subjects:
         subject = subjects[0].replace(" ", "+")
-        rec_response = requests.get(
+        rec_response = http_get("openlibrary",
             f"https://openlibrary.org/search.json?subject={subject}"
         )
         if rec_response.status_code == 200:
@@ -214,8 +213,7 @@ def openlib_detail(request, work_id):
                     break
 
     # Get theme mode
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     details_sections_order = settings.details_sections_order if settings else []
 
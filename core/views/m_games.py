@@ -3,8 +3,6 @@ import time
 import datetime
 import unicodedata
 
-import requests
-from django.apps import apps
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -12,6 +10,8 @@ from django.views.decorators.http import require_GET
 
 from core.models import APIKey, MediaItem
 from core.services.m_games import get_igdb_token
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_post
 
 IGDB_ACCESS_TOKEN = None
 IGDB_TOKEN_EXPIRY = 0
@@ -69,7 +69,7 @@ def igdb_search(request):
     found_exact_slug = False
 
     try:
-        response = requests.post(
+        response = http_post("igdb",
             "https://api.igdb.com/v4/games", headers=headers, data=data_search
         )
         if response.status_code == 200:
@@ -98,7 +98,7 @@ def igdb_search(request):
         where slug = "{query_slug}";
         '''
         try:
-            slug_response = requests.post(
+            slug_response = http_post("igdb",
                 "https://api.igdb.com/v4/games", headers=headers, data=data_slug_check
             )
             if slug_response.status_code == 200:
@@ -210,8 +210,7 @@ def igdb_detail(request, igdb_id):
         initial_screenshots = screenshots[:40]
 
         # Get theme mode
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
+        settings = get_app_settings(request)
         theme_mode = settings.theme_mode if settings else "dark"
         details_sections_order = settings.details_sections_order if settings else []
 
@@ -261,7 +260,7 @@ def igdb_detail(request, igdb_id):
     where id = {igdb_id};
     """
 
-    response = requests.post(
+    response = http_post("igdb",
         "https://api.igdb.com/v4/games", headers=headers, data=query
     )
     if response.status_code != 200:
@@ -334,8 +333,7 @@ def igdb_detail(request, igdb_id):
     platforms = [p["name"] for p in game.get("platforms", []) if "name" in p]
 
     # Get theme mode
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     details_sections_order = settings.details_sections_order if settings else []
 
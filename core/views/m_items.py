@@ -5,7 +5,6 @@ import time
 import datetime
 import datetime as dt
 
-from django.apps import apps
 from django.conf import settings
 from django.http import JsonResponse
 from django.utils import timezone
@@ -14,13 +13,13 @@ from django.views.decorators.csrf import ensure_csrf_cookie
 from django.db.models import Max, F
 from django.views.decorators.http import require_GET, require_POST
 
-from core.models import MediaItem, Collection, MediaItemLog, AppSettings
+from core.models import MediaItem, Collection, MediaItemLog, AddJob
 from core.services.g_utils import display_to_rating, rating_to_display, get_sharded_path
-from core.services.m_books import save_openlib_item
-from core.services.m_games import save_igdb_item
-from core.services.m_music import save_musicbrainz_item
-from core.services.m_anime_manga import save_anilist_item
-from core.services.m_movies_tvshows import save_tmdb_item, save_tmdb_season
+from core.services.g_add_queue import enqueue_add, queue_for_source
+from core.services.g_media import MEDIA_FIELDS, delete_unused_media, media_paths
+from core.services.g_refresh import REFRESH_METADATA_FIELDS, apply_metadata, fetch_item_metadata
+from core.services.g_settings import get_app_settings
+from core.services.g_http import fresh_responses
 
 
 @ensure_csrf_cookie
@@ -48,27 +47,24 @@ def add_to_list(request):
     ).exists():
         return JsonResponse({"error": "Item already in list"}, status=400)
 
-    # Route to the correct handler (TMDB, MAL, IGDB, etc.)
-    if source == "tmdb":
-        return save_tmdb_item(media_type, source_id)
-
-    if source in ["anilist", "mal"]:
-        return save_anilist_item(
-            media_type, 
-            anilist_id=source_id if source == "anilist" else None,
-            mal_id=source_id if source == "mal" else None
-        )
-
-    if source == "igdb":
-        return save_igdb_item(source_id)
-
-    if source == "openlib":
-        return save_openlib_item(source_id)
-
-    if source == "musicbrainz":
-        return save_musicbrainz_item(source_id)
-
-    return JsonResponse({"error": "Unsupported source"}, status=400)
+    if queue_for_source(source) is None:
+        return JsonResponse({"error": "Unsupported source"}, status=400)
+
+    # The provider's queue fetches the metadata and images (TMDB, MAL, IGDB, etc.),
+    # the page polls add_job_status until the placeholder item is filled in
+    job = enqueue_add(
+        source,
+        source_id,
+        media_type,
+        title=data.get("title", ""),
+        cover_url=data.get("cover_url", ""),
+    )
+    return JsonResponse({
+        "message": "Adding to your list.",
+        "job_id": str(job.id),
+        "item_id": job.item_id,
+        "status": job.status,
+    })
 
 
 @ensure_csrf_cookie
@@ -84,11 +80,38 @@ def add_season_to_list(request):
                 {"error": "Missing tmdb_id or season_number"}, status=400
             )
 
-        return save_tmdb_season(tmdb_id, season_number)
+        if MediaItem.objects.filter(
+            media_type="tv",
+            provider_ids__tmdb=f"{tmdb_id}_s{season_number}"
+        ).exists():
+            return JsonResponse({"error": "Item already in list"}, status=400)
+
+        job = enqueue_add("tmdb", tmdb_id, "tv", title=data.get("title", ""), season_number=int(season_number))
+        return JsonResponse({
+            "message": "Adding to your list.",
+            "job_id": str(job.id),
+            "item_id": job.item_id,
+            "status": job.status,
+        })
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+
+@require_GET
+def add_job_status(request, job_id):
+    job = AddJob.objects.filter(id=job_id).first()
+    if not job:
+        return JsonResponse({"error": "Job not found"}, status=404)
+
+    return JsonResponse(
+        {
+            "status": job.status,
+            "item_id": job.item_id,
+            "error": job.error,
+        }
+    )
+
 @ensure_csrf_cookie
 @require_POST
 def create_custom_item(request):
@@ -164,9 +187,8 @@ def create_custom_item(request):
         personal_rating_input = request.POST.get("personal_rating")
         rating_val = None
         if personal_rating_input:
-            AppSettings = apps.get_model("core", "AppSettings")
             try:
-                app_settings = AppSettings.objects.first()
+                app_settings = get_app_settings(request)
                 rating_mode = app_settings.rating_mode if app_settings else "faces"
             except Exception:
                 rating_mode = "faces"
@@ -245,7 +267,7 @@ def create_custom_item(request):
 
         # 6. Format Display Rating for frontend
         try:
-            settings_obj = apps.get_model("core", "AppSettings").objects.first()
+            settings_obj = get_app_settings(request)
             rating_mode = settings_obj.rating_mode if settings_obj else "faces"
         except Exception:
             rating_mode = "faces"
@@ -327,11 +349,11 @@ def edit_metadata(request, item_id):
             fs = FileSystemStorage(location=settings.MEDIA_ROOT)
             cache_bust = int(time.time() * 1000)
 
+            # Replaced images are deleted after the save, once nothing uses them
+            old_files = set()
+
             if "cover_image" in request.FILES:
-                if item.cover_url and item.cover_url.startswith("/media/"):
-                    old_path = os.path.join(settings.MEDIA_ROOT, item.cover_url.replace("/media/", ""))
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
+                media_paths(item.cover_url, old_files)
 
                 file_obj = request.FILES["cover_image"]
                 ext = os.path.splitext(file_obj.name)[1] or ".jpg"
@@ -345,10 +367,7 @@ def edit_metadata(request, item_id):
                 item.cover_url = fs.url(saved_name)
 
             if "banner_image" in request.FILES:
-                if item.banner_url and item.banner_url.startswith("/media/"):
-                    old_path = os.path.join(settings.MEDIA_ROOT, item.banner_url.replace("/media/", ""))
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
+                media_paths(item.banner_url, old_files)
 
                 file_obj = request.FILES["banner_image"]
                 ext = os.path.splitext(file_obj.name)[1] or ".jpg"
@@ -362,6 +381,7 @@ def edit_metadata(request, item_id):
                 item.banner_url = fs.url(saved_name)
 
             item.save()
+            delete_unused_media(old_files)
             return JsonResponse({"success": True})
         except Exception as e:
             import traceback
@@ -396,9 +416,8 @@ def edit_item(request, item_id):
             # --- Handle personal_rating FIRST to know if it changed ---
             rating_changed = False
             if "personal_rating" in data:
-                AppSettings = apps.get_model("core", "AppSettings")
                 try:
-                    app_settings = AppSettings.objects.first()
+                    app_settings = get_app_settings(request)
                     rating_mode = app_settings.rating_mode if app_settings else "faces"
                 except Exception:
                     rating_mode = "faces"
@@ -473,9 +492,8 @@ def edit_item(request, item_id):
                     item.progress_secondary = item.total_secondary
 
             if "repeats" in data:
-                AppSettings = apps.get_model("core", "AppSettings")
                 try:
-                    app_settings = AppSettings.objects.first()
+                    app_settings = get_app_settings(request)
                     show_repeats = app_settings.show_repeats_field if app_settings else False
                 except Exception:
                     show_repeats = False
@@ -513,9 +531,8 @@ def edit_item(request, item_id):
                 item.favorite = new_favorite_status
 
             if "collections" in data:
-                AppSettings = apps.get_model("core", "AppSettings")
                 try:
-                    app_settings = AppSettings.objects.first()
+                    app_settings = get_app_settings(request)
                     show_cols = app_settings.show_collections_field if app_settings else False
                 except Exception:
                     show_cols = False
@@ -528,9 +545,8 @@ def edit_item(request, item_id):
             item.save()
 
             # Build a minimal serialized item to return to the client for UI updates
-            AppSettings = apps.get_model("core", "AppSettings")
             try:
-                settings = AppSettings.objects.first()
+                settings = get_app_settings(request)
                 rating_mode = settings.rating_mode if settings else "faces"
             except Exception:
                 rating_mode = "faces"
@@ -578,62 +594,11 @@ def delete_item(request, item_id):
     try:
         item = MediaItem.objects.get(id=item_id)
 
-        # --- Delete associated image files if locally stored
-        media_root = settings.MEDIA_ROOT
-        paths_to_check = []
-
-        if item.cover_url and item.cover_url.startswith("/media/"):
-            paths_to_check.append(
-                os.path.join(media_root, item.cover_url.replace("/media/", ""))
-            )
-        if item.banner_url and item.banner_url.startswith("/media/"):
-            paths_to_check.append(
-                os.path.join(media_root, item.banner_url.replace("/media/", ""))
-            )
-
-        # Skip cast processing for music (different structure)
-        if item.media_type != "music":
-            for i, member in enumerate(item.cast or []):
-                p = member.get("profile_path", "")
-                if p.startswith("/media/"):
-                    paths_to_check.append(
-                        os.path.join(media_root, p.replace("/media/", ""))
-                    )
-
-        for related in item.related_titles or []:
-            p = related.get("poster_path", "")
-            if p.startswith("/media/"):
-                paths_to_check.append(
-                    os.path.join(media_root, p.replace("/media/", ""))
-                )
-
-        for season in item.seasons or []:
-            p = season.get("poster_path", "")
-            if p.startswith("/media/"):
-                paths_to_check.append(
-                    os.path.join(media_root, p.replace("/media/", ""))
-                )
-
-        for shot in item.game_screenshots.all():
-            p = shot.url
-            if p.startswith("/media/"):
-                paths_to_check.append(
-                    os.path.join(media_root, p.replace("/media/", ""))
-                )
-
-        for episode in item.episodes or []:
-            p = episode.get("still_path", "")
-            if p.startswith("/media/"):
-                paths_to_check.append(
-                    os.path.join(media_root, p.replace("/media/", ""))
-                )
-
-        for path in paths_to_check:
-            try:
-                if os.path.exists(path):
-                    os.remove(path)
-            except Exception:
-                pass  # Ignore deletion errors
+        # --- Local image files, deleted with the item unless another item uses them
+        files = set()
+        for field in MEDIA_FIELDS:
+            media_paths(getattr(item, field), files)
+        media_paths(list(item.game_screenshots.values_list("url", flat=True)), files)
 
         # --- Fix the gap if the item was favorited
         if item.favorite and item.favorite_position is not None:
@@ -645,6 +610,7 @@ def delete_item(request, item_id):
 
         # --- Delete the DB entry
         item.delete()
+        delete_unused_media(files)
         return JsonResponse({"success": True})
 
     except MediaItem.DoesNotExist:
@@ -666,135 +632,32 @@ def refresh_item(request):
         if not item_id:
             return JsonResponse({"error": "Missing item ID."}, status=400)
 
-        # Get the item first
         item = MediaItem.objects.get(id=item_id)
-        original_provider_ids = dict(item.provider_ids)
-        
-        source = item.source
-        source_id = item.source_id
-        media_type = item.media_type
 
-        # 1. Temporarily hide the old item by changing its provider_ids 
-        # so the API fetcher doesn't think it's a duplicate and abort.
-        item.provider_ids = {source: f"temp_{uuid.uuid4().hex}"}
-        item.save(update_fields=['provider_ids'])
+        # Purely API-driven metadata, the cover and banner only when asked for.
+        # Screenshots and music videos are the user's and are left alone.
+        fields = []
+        if refresh_type in ["all", "data"]:
+            fields += REFRESH_METADATA_FIELDS
+        if refresh_type in ["all", "cover"]:
+            fields.append("cover_url")
+        if refresh_type in ["all", "banner"]:
+            fields.append("banner_url")
 
         try:
-            # 2. Fetch fresh data by triggering the standard save function
-            res = None
-            if source == "tmdb":
-                if "_s" in source_id:  # It's a season
-                    tmdb_id, season_number = source_id.split("_s")
-                    res = save_tmdb_season(tmdb_id, season_number)
-                else:
-                    res = save_tmdb_item(media_type, source_id)
-            elif source in ["mal", "anilist"]:
-                anilist_id = original_provider_ids.get("anilist")
-                mal_id = original_provider_ids.get("mal")
-                res = save_anilist_item(media_type, anilist_id=anilist_id, mal_id=mal_id)
-            elif source == "igdb":
-                res = save_igdb_item(source_id)
-            elif source == "openlib":
-                res = save_openlib_item(source_id)
-            elif source == "musicbrainz":
-                res = save_musicbrainz_item(source_id)
-            else:
-                raise Exception("Unsupported source.")
-            
-            # Check for API failure
-            if res and res.status_code != 200:
-                error_msg = "Unknown API error"
-                try:
-                    error_msg = json.loads(res.content).get("error", error_msg)
-                except Exception:
-                    pass
-                raise Exception(error_msg)
-
-            # 3. Find the newly created temporary item holding the fresh data
-            lookup_key = f"provider_ids__{source}"
-            new_item = MediaItem.objects.get(media_type=media_type, **{lookup_key: str(source_id)})
-
+            # The user asked for current data, skip the response cache
+            with fresh_responses():
+                metadata = fetch_item_metadata(item, images="cover_url" in fields or "banner_url" in fields)
+                changed, replaced = apply_metadata(item, metadata, fields)
         except Exception as e:
-            # 4a. On API failure, simply revert provider_ids and abort. NO DATA LOST!
-            item.provider_ids = original_provider_ids
-            item.save(update_fields=['provider_ids'])
+            # Nothing was written, the item is untouched
             return JsonResponse({"error": f"Failed to refresh: {str(e)}"}, status=500)
 
-        # 4b. On success, securely copy purely API-driven metadata from new_item to old item
-        metadata_fields =[
-            'title', 'overview', 'release_date', 'cast', 'seasons', 'episodes',
-            'related_titles', 'genres', 'creators', 'total_main', 'total_secondary'
-        ]
-        
-        files_to_delete = []
-        
-        # Determine which item's metadata images to clean up
-        # If updating data: clean the old item's images (they are being replaced)
-        # If NOT updating data: clean the new item's images (they are discarded to prevent orphaned files)
-        item_to_clean = item if refresh_type in ['all', 'data'] else new_item
-
-        if item_to_clean.media_type != "music":
-            for member in (item_to_clean.cast or []):
-                p = member.get("profile_path", "")
-                if p.startswith("/media/"):
-                    files_to_delete.append(os.path.join(settings.MEDIA_ROOT, p.replace("/media/", "")))
-        for related in (item_to_clean.related_titles or []):
-            p = related.get("poster_path", "")
-            if p.startswith("/media/"):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, p.replace("/media/", "")))
-        for season in (item_to_clean.seasons or []):
-            p = season.get("poster_path", "")
-            if p.startswith("/media/"):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, p.replace("/media/", "")))
-        for episode in (item_to_clean.episodes or []):
-            p = episode.get("still_path", "")
-            if p.startswith("/media/"):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, p.replace("/media/", "")))
-
-        # Apply the new text-based metadata only if requested
-        if refresh_type in ['all', 'data']:
-            for field in metadata_fields:
-                setattr(item, field, getattr(new_item, field))
-
-        # Handle Cover based on refresh_type
-        if refresh_type in ['all', 'cover']:
-            if item.cover_url and item.cover_url.startswith('/media/'):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, item.cover_url.replace('/media/', '')))
-            item.cover_url = new_item.cover_url
-        else:
-            if new_item.cover_url and new_item.cover_url.startswith('/media/'):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, new_item.cover_url.replace('/media/', '')))
-
-        # Handle Banner based on refresh_type
-        if refresh_type in ['all', 'banner']:
-            if item.banner_url and item.banner_url.startswith('/media/'):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, item.banner_url.replace('/media/', '')))
-            item.banner_url = new_item.banner_url
-        else:
-            if new_item.banner_url and new_item.banner_url.startswith('/media/'):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, new_item.banner_url.replace('/media/', '')))
-
-        # Screenshots are manual, so we ALWAYS keep old screenshots. Mark new ones for deletion.
-        for shot in new_item.game_screenshots.all():
-            url = shot.url
-            if url.startswith("/media/"):
-                files_to_delete.append(os.path.join(settings.MEDIA_ROOT, url.replace("/media/", "")))
-
-        # Restore original provider ids to put it back in its rightful place
-        item.provider_ids = original_provider_ids
         item.last_updated = timezone.now()
-        item.save()
-
-        # 5. Delete the temporary new_item container from DB
-        new_item.delete()
+        item.save(update_fields=changed + ["last_updated"])
 
-        # 6. Delete orphaned local files
-        for path in files_to_delete:
-            if os.path.exists(path):
-                try:
-                    os.remove(path)
-                except Exception:
-                    pass
+        # Delete the local files the new metadata replaced
+        delete_unused_media(replaced)
 
         return JsonResponse({"message": "Item refreshed successfully."})
 
@@ -813,9 +676,8 @@ def get_item(request, item_id):
     try:
         item = MediaItem.objects.get(id=item_id)
 
-        AppSettings = apps.get_model("core", "AppSettings")
         try:
-            settings = AppSettings.objects.first()
+            settings = get_app_settings(request)
             rating_mode = settings.rating_mode if settings else "faces"
         except Exception:
             rating_mode = "faces"
@@ -973,7 +835,7 @@ def manage_journal_log(request):
             score_str = data.get("score")
             if score_str:
                 try:
-                    app_settings = AppSettings.objects.first()
+                    app_settings = get_app_settings(request)
                     r_mode = app_settings.rating_mode if app_settings else "faces"
                     display_val = int(score_str)
                     log.score = display_to_rating(display_val, r_mode)
@@ -1,13 +1,13 @@
 import datetime
 
-import requests
-from django.apps import apps
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET
 
 from core.models import APIKey, MediaItem
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_get
 
 
 @ensure_csrf_cookie
@@ -38,7 +38,7 @@ def tmdb_search(request):
         url = "https://api.themoviedb.org/3/search/tv"
 
     params = {"api_key": api_key, "query": query}
-    response = requests.get(url, params=params)
+    response = http_get("tmdb", url, params=params)
 
     if response.status_code != 200:
         return JsonResponse({"error": "Failed to fetch from TMDB."}, status=500)
@@ -134,8 +134,7 @@ def tmdb_detail(request, media_type, tmdb_id):
             formatted_release_date = raw_date
 
         # Get theme mode
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
+        settings = get_app_settings(request)
         theme_mode = settings.theme_mode if settings else "dark"
         details_sections_order = settings.details_sections_order if settings else []
 
@@ -181,7 +180,7 @@ def tmdb_detail(request, media_type, tmdb_id):
         }
     else:
         params = {"api_key": api_key, "append_to_response": "credits,recommendations"}
-    response = requests.get(url, params=params)
+    response = http_get("tmdb", url, params=params)
 
     if response.status_code != 200:
         return JsonResponse({"error": "Failed to fetch details from TMDB."}, status=500)
@@ -263,8 +262,7 @@ def tmdb_detail(request, media_type, tmdb_id):
         formatted_release_date = raw_date  # fallback to raw string if parsing fails
 
     # Get theme mode
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     details_sections_order = settings.details_sections_order if settings else []
 
@@ -370,7 +368,7 @@ def tmdb_season_detail(request, tmdb_id, season_number):
                 api_key = APIKey.objects.get(name="tmdb").key_1
                 show_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
                 show_params = {"api_key": api_key}
-                show_response = requests.get(show_url, params=show_params)
+                show_response = http_get("tmdb", show_url, params=show_params)
                 if show_response.status_code == 200:
                     show_data = show_response.json()
                     all_seasons = show_data.get("seasons", [])
@@ -381,8 +379,7 @@ def tmdb_season_detail(request, tmdb_id, season_number):
                 season_nav = {}
 
         # Get theme mode
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
+        settings = get_app_settings(request)
         theme_mode = settings.theme_mode if settings else "dark"
         details_sections_order = settings.details_sections_order if settings else []
 
@@ -423,7 +420,7 @@ def tmdb_season_detail(request, tmdb_id, season_number):
     # Get season details
     season_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/season/{season_number}"
     season_params = {"api_key": api_key, "append_to_response": "aggregate_credits"}
-    season_response = requests.get(season_url, params=season_params)
+    season_response = http_get("tmdb", season_url, params=season_params)
 
     if season_response.status_code != 200:
         return JsonResponse(
@@ -435,7 +432,7 @@ def tmdb_season_detail(request, tmdb_id, season_number):
     # Get main show details for context
     show_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
     show_params = {"api_key": api_key}
-    show_response = requests.get(show_url, params=show_params)
+    show_response = http_get("tmdb", show_url, params=show_params)
     show_data = show_response.json() if show_response.status_code == 200 else {}
 
     # Format data
@@ -513,8 +510,7 @@ def tmdb_season_detail(request, tmdb_id, season_number):
     season_nav = get_season_navigation(all_seasons, int(season_number))
 
     # Get theme mode
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     details_sections_order = settings.details_sections_order if settings else []
 
@@ -2,14 +2,14 @@ import logging
 import datetime
 
 import requests
-from django.apps import apps
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET
 
 from core.models import MediaItem
-from core.services.m_music import wait_for_rate_limit
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_get, http_head
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,6 @@ logger = logging.getLogger(__name__)
 @ensure_csrf_cookie
 @require_GET
 def musicbrainz_search(request):
-    wait_for_rate_limit()
     query = request.GET.get("q", "").strip()
 
     if not query:
@@ -31,7 +30,7 @@ def musicbrainz_search(request):
             "User-Agent": "MediaJournal/1.0 (https://github.com/mihail-pop/media-journal)"
         }
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get("musicbrainz", url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -160,8 +159,7 @@ def musicbrainz_detail(request, recording_id):
             except ValueError:
                 formatted_release_date = item.release_date
 
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
+        settings = get_app_settings(request)
         theme_mode = settings.theme_mode if settings else "dark"
         details_sections_order = settings.details_sections_order if settings else []
 
@@ -205,7 +203,6 @@ def musicbrainz_detail(request, recording_id):
     except MediaItem.DoesNotExist:
         pass
 
-    wait_for_rate_limit()
     # Fetch from MusicBrainz API
     headers = {
         "User-Agent": "MediaJournal/1.0 (https://github.com/mihail-pop/media-journal)"
@@ -219,7 +216,7 @@ def musicbrainz_detail(request, recording_id):
     }
 
     try:
-        recording_response = requests.get(
+        recording_response = http_get("musicbrainz",
             recording_url, params=recording_params, headers=headers, timeout=10
         )
         recording_response.raise_for_status()
@@ -321,7 +318,7 @@ def musicbrainz_detail(request, recording_id):
             "Accept-Language": "en-US,en;q=0.9",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         }
-        yt_response = requests.get(yt_search_url, headers=yt_headers, timeout=10)
+        yt_response = http_get("youtube", yt_search_url, headers=yt_headers, timeout=10)
 
         if yt_response.status_code == 200:
             import re
@@ -377,7 +374,7 @@ def musicbrainz_detail(request, recording_id):
                 # Retry search by title + artist
                 search_query = f"{artists} {title}"
                 yt_search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(search_query)}"
-                yt_response = requests.get(
+                yt_response = http_get("youtube",
                     yt_search_url, headers=yt_headers, timeout=10
                 )
 
@@ -434,7 +431,7 @@ def musicbrainz_detail(request, recording_id):
                     f"https://img.youtube.com/vi/{best_video}/maxresdefault.jpg"
                 )
                 try:
-                    img_check = requests.head(max_res_url, timeout=3)
+                    img_check = http_head("youtube", max_res_url, timeout=3)
                     if (
                         img_check.status_code == 200
                         and int(img_check.headers.get("content-length", 0)) > 5000
@@ -474,8 +471,7 @@ def musicbrainz_detail(request, recording_id):
         except ValueError:
             formatted_release_date = release_date
 
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
+    settings = get_app_settings(request)
     theme_mode = settings.theme_mode if settings else "dark"
     details_sections_order = settings.details_sections_order if settings else []
 
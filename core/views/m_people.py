@@ -3,7 +3,6 @@ import json
 import time
 import uuid
 
-import requests
 from django.conf import settings
 from django.http import JsonResponse
 from django.utils.text import slugify
@@ -12,12 +11,14 @@ from django.views.decorators.http import require_GET, require_POST
 
 from core.models import APIKey, FavoritePerson
 from core.services.g_utils import get_sharded_path
+from core.services.g_media import delete_unused_media, media_paths
 from core.services.m_people import (
     actor_search,
     character_search,
     save_favorite_actor_character,
     delete_favorite_person_and_reorder,
 )
+from core.services.g_http import http_get, http_post
 
 
 @ensure_csrf_cookie
@@ -87,7 +88,7 @@ def load_more_cast(request):
             else:
                 url = f"https://api.themoviedb.org/3/movie/{source_id}/credits"
 
-            response = requests.get(url, params={"api_key": api_key})
+            response = http_get("tmdb", url, params={"api_key": api_key})
             if response.status_code != 200:
                 return JsonResponse({"error": "Failed to fetch cast"}, status=500)
 
@@ -188,7 +189,7 @@ def load_more_cast(request):
                 "page": anilist_page,
             }
 
-            response = requests.post(
+            response = http_post("anilist",
                 "https://graphql.anilist.co",
                 json={"query": query, "variables": variables},
                 headers={"Content-Type": "application/json"},
@@ -320,17 +321,11 @@ def edit_custom_person(request):
         elif person_type == "character":
             person.description = overview
 
+        old_files = set()
         if image_file:
             ext = os.path.splitext(image_file.name)[1].lower()
             if ext in [".jpg", ".jpeg", ".png", ".webp", ".gif"]:
-                if person.image_url and settings.MEDIA_URL in person.image_url:
-                    old_rel_path = person.image_url.split(settings.MEDIA_URL)[-1]
-                    full_old_path = os.path.join(settings.MEDIA_ROOT, old_rel_path)
-                    if os.path.exists(full_old_path):
-                        try:
-                            os.remove(full_old_path)
-                        except OSError:
-                            pass
+                media_paths(person.image_url, old_files)
 
                 timestamp = int(time.time() * 1000)
                 slug_name = slugify(name)
@@ -349,6 +344,7 @@ def edit_custom_person(request):
                 person.image_url = f"{settings.MEDIA_URL}{sharded_relative_path}"
 
         person.save()
+        delete_unused_media(old_files)
         return JsonResponse({"success": True})
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
@@ -3,53 +3,96 @@ import uuid
 import datetime
 from django.conf import settings
 from django.utils import timezone
-from django.http import JsonResponse
-from django.views.decorators.http import require_GET, require_POST
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import etag, require_GET, require_POST
 from django.views.decorators.csrf import ensure_csrf_cookie
 
 from core.models import MediaItem, CalendarEvent
-from core.services.p_calendar import sync_items_with_apis
+from core.services.g_utils import normalize_search_text
+from core.services.p_calendar import (
+    CALENDAR_SYNC_TASKS, calendar_feed_body, calendar_feed_token, calendar_month_days, calendar_version, shift_month,
+    start_calendar_sync,
+)
+from core.services.g_settings import get_app_settings
+
+def _month_params(request):
+    year = int(request.GET.get('year'))
+    month = int(request.GET.get('month'))
+    if not 1 <= month <= 12:
+        raise ValueError("month must be between 1 and 12")
+    return year, month, request.GET.get('prefetch') == '1'
+
+def _calendar_month_etag(request):
+    # The calendar version changes on every event write, the month itself is in the params
+    try:
+        year, month, prefetch = _month_params(request)
+    except (TypeError, ValueError):
+        return None
+    return f"{calendar_version()}-{year}-{month}{'-p' if prefetch else ''}"
 
 @require_GET
-def get_calendar_events(request):
+@etag(_calendar_month_etag)
+def get_calendar_month(request):
+    """
+    Events of a month grouped by day ({"YYYY-MM": {"YYYY-MM-DD": [event]}}), with
+    prefetch=1 also the months before and after it. Unchanged months get a 304.
+    """
     try:
-        # Expected format YYYY-MM
-        year = int(request.GET.get('year'))
-        month = int(request.GET.get('month'))
-        
-        # Determine the date range (include a bit of padding for overlapping weeks)
-        start_date = datetime.date(year, month, 1) - datetime.timedelta(days=7)
-        if month == 12:
-            end_date = datetime.date(year + 1, 1, 1) + datetime.timedelta(days=7)
-        else:
-            end_date = datetime.date(year, month + 1, 1) + datetime.timedelta(days=7)
-            
-        events = CalendarEvent.objects.filter(
-            date__gte=start_date,
-            date__lt=end_date
-        ).select_related('item')
-        
-        events_data = []
-        for e in events:
-            events_data.append({
-                "id": e.id,
-                "item_id": e.item.id,
-                "title": e.item.title,
-                "event_title": e.title,
-                "media_type": e.item.media_type,
-                "date": e.date.isoformat(),
-                "is_custom": e.is_custom,
-                "notify": e.notify,
-                "notes": e.notes,
-                "recurring_group": str(e.recurring_group) if e.recurring_group else None,
-                "cover_url": e.item.cover_url or "/static/core/img/placeholder.png",
-                "source_id": e.item.source_id,
-                "source": e.item.source
-            })
-            
-        return JsonResponse({"success": True, "events": events_data})
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
+        year, month, prefetch = _month_params(request)
+    except (TypeError, ValueError) as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+    version = calendar_version()
+    offsets = (-1, 0, 1) if prefetch else (0,)
+    months = {}
+    for offset in offsets:
+        y, m = shift_month(year, month, offset)
+        months[f"{y}-{m:02d}"] = calendar_month_days(y, m, version)
+
+    response = JsonResponse({"success": True, "version": version, "months": months})
+    # Cached by the browser, but revalidated with the ETag every time
+    response["Cache-Control"] = "no-cache"
+    return response
+
+def _feed_media_types(request):
+    """?type=anime&type=tv or ?type=anime,tv, sorted. Raises ValueError on an unknown type."""
+    types = {t.strip() for value in request.GET.getlist('type') for t in value.split(',') if t.strip()}
+    unknown = types - {value for value, _ in MediaItem.MEDIA_TYPES}
+    if unknown:
+        raise ValueError(f"Unknown media type: {', '.join(sorted(unknown))}")
+    return sorted(types)
+
+def _valid_feed_token(token):
+    return token is None or constant_time_compare(token, calendar_feed_token())
+
+def _calendar_feed_etag(request, token=None):
+    if not _valid_feed_token(token):
+        return None
+    try:
+        return f"{calendar_version()}-{','.join(_feed_media_types(request))}"
+    except ValueError:
+        return None
+
+@require_GET
+@etag(_calendar_feed_etag)
+def calendar_feed(request, token=None):
+    """
+    iCalendar feed of the calendar events, optionally of some media types only. Served
+    at /calendar.ics and at /calendar/<token>.ics, which the login requirement lets
+    through for calendar apps (core/middleware.py).
+    """
+    if not _valid_feed_token(token):
+        raise Http404("Unknown calendar feed")
+    try:
+        media_types = _feed_media_types(request)
+    except ValueError as e:
+        return HttpResponse(str(e), status=400, content_type="text/plain")
+
+    response = HttpResponse(calendar_feed_body(media_types), content_type="text/calendar; charset=utf-8")
+    response["Content-Disposition"] = 'inline; filename="media-journal.ics"'
+    response["Cache-Control"] = "no-cache"
+    return response
 
 @require_GET
 def calendar_search_local_items(request):
@@ -57,7 +100,7 @@ def calendar_search_local_items(request):
     if len(query) < 2:
         return JsonResponse({"items": []})
         
-    items = MediaItem.objects.filter(title__icontains=query)[:10]
+    items = MediaItem.objects.filter(search_title__contains=normalize_search_text(query))[:10]
     results = [{
         "id": i.id,
         "title": i.title,
@@ -76,6 +119,8 @@ def add_custom_event(request):
         
         base_date_str = data['date'] # YYYY-MM-DD
         time_str = data.get('time', '00:00') # HH:MM
+        # Events without a time are all day
+        all_day = not time_str
         if not time_str:
             time_str = '00:00'
         
@@ -103,6 +148,7 @@ def add_custom_event(request):
             event = CalendarEvent.objects.create(
                 item=item,
                 date=current_dt,
+                all_day=all_day,
                 title=title,
                 is_custom=True,
                 notes=data.get('notes', ''),
@@ -143,9 +189,7 @@ def delete_calendar_event(request, event_id):
 def sync_calendar(request):
     try:
         data = json.loads(request.body)
-        from django.apps import apps
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
+        settings = get_app_settings(request)
 
         # Default to database preferences if frontend doesn't send them (e.g. from Home page)
         db_ongoing = settings.cal_sync_ongoing if settings else True
@@ -168,40 +212,20 @@ def sync_calendar(request):
             statuses_to_sync.append("planned")
 
         if not statuses_to_sync:
-            return JsonResponse({"success": True, "synced_count": 0})
-
-        items_query = MediaItem.objects.filter(status__in=statuses_to_sync)
-        items_to_sync = []
+            return JsonResponse({"success": True, "status": "completed", "synced_count": 0})
 
-        now = timezone.now()
-        
-        # Efficiently find all items that currently have a future API event
-        items_with_future_events = set(
-            CalendarEvent.objects.filter(
-                item__in=items_query,
-                date__gt=now,
-                is_custom=False
-            ).exclude(title="__API_SYNC__").values_list('item_id', flat=True)
-        )
-
-        for item in items_query:
-            if force:
-                items_to_sync.append(item)
-            else:
-                # If it has a known future event, skip it to save an API call
-                if item.id in items_with_future_events:
-                    continue
-                    
-                # If never synced, or last synced >= 1 day ago (and no future event), sync it
-                if not item.calendar_last_sync or (now - item.calendar_last_sync).days >= 1:
-                    items_to_sync.append(item)
-
-        if items_to_sync:
-            sync_items_with_apis(items_to_sync)
-
-        return JsonResponse({"success": True, "synced_count": len(items_to_sync)})
+        # Runs in the background, the page polls calendar_sync_status
+        task = start_calendar_sync(statuses_to_sync, force=force)
+        return JsonResponse({"success": True, **task.as_dict()})
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)})
+
+@require_GET
+def calendar_sync_status(request, task_id):
+    task = CALENDAR_SYNC_TASKS.get(task_id)
+    if not task:
+        return JsonResponse({"error": "Task not found"}, status=404)
+    return JsonResponse(task.as_dict())
     
 @ensure_csrf_cookie
 @require_POST
@@ -5,6 +5,7 @@ from django.db.models import Max
 from django.views.decorators.http import require_GET, require_http_methods
 
 from core.models import MediaItem, CollectionItem
+from core.services.g_utils import normalize_search_text
 
 
 @require_GET
@@ -24,7 +25,7 @@ def search_local_items(request, collection_id):
         qs = qs.filter(media_type=media_type)
         
     if query:
-        qs = qs.filter(title__icontains=query)
+        qs = qs.filter(search_title__contains=normalize_search_text(query))
         
     qs = qs.order_by('-date_added')
     total = qs.count()
@@ -1,12 +1,13 @@
 import json
-import requests
 import logging
 
-from django.apps import apps
 from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST, require_GET
 
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_get
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,10 +16,7 @@ def save_username(request):
     data = json.loads(request.body.decode("utf-8"))
     username = data.get("username", "").strip()
 
-    AppSettings = apps.get_model("core", "AppSettings")
-    app_settings = AppSettings.objects.first()
-    if not app_settings:
-        app_settings = AppSettings.objects.create()
+    app_settings = get_app_settings(request, create=True)
 
     app_settings.username = username
     app_settings.save()
@@ -34,7 +32,7 @@ def posts_api(request):
     firebase_url = settings.FIREBASE_URL.rstrip('/')
     
     try:
-        response = requests.get(f"{firebase_url}/posts.json", timeout=10)
+        response = http_get("default", f"{firebase_url}/posts.json", timeout=10)
         if not response.ok:
             return JsonResponse({'items': [], 'has_more': False, 'page': page})
         
@@ -9,6 +9,7 @@ from django.views.decorators.http import require_POST
 
 from core.models import MediaItem
 from core.services.p_home import acquire_media_lock, release_media_lock
+from core.services.g_settings import get_app_settings
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +28,7 @@ def dismiss_notification(request, item_id):
 @ensure_csrf_cookie
 @require_POST
 def dismiss_sys_notification(request, sys_id):
-    from core.models import AppSettings
-    settings_obj = AppSettings.objects.first()
-    
-    if not settings_obj:
-        settings_obj = AppSettings.objects.create()
+    settings_obj = get_app_settings(request, create=True)
         
     if not isinstance(settings_obj.dismissed_system_notifications, list):
         settings_obj.dismissed_system_notifications = []
@@ -2,7 +2,6 @@ import os
 import json
 import time
 
-import requests
 from django.conf import settings
 from django.http import JsonResponse
 from django.core.files.storage import default_storage
@@ -10,11 +9,13 @@ from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_POST
 
 from core.models import MediaItem
-from core.services.g_utils import download_image, get_sharded_path
+from core.services.g_utils import download_images, get_sharded_path
 from core.services.m_games import get_game_extra_info
 from core.services.m_music import get_music_extra_info
 from core.services.m_anime_manga import get_anime_extra_info, get_manga_extra_info
 from core.services.m_movies_tvshows import get_tv_extra_info, get_movie_extra_info
+from core.services.g_http import http_head
+from core.services.g_media import delete_unused_media, media_paths, sync_screenshot_media
 
 
 @ensure_csrf_cookie
@@ -39,11 +40,6 @@ def upload_banner(request):
             item = MediaItem.objects.get(**{lookup_key: str(source_id)}, media_type=media_type)
         else:
             item = MediaItem.objects.get(**{lookup_key: str(source_id)})
-        
-        if item.banner_url:
-            old_file_path = os.path.join(settings.MEDIA_ROOT, item.banner_url.replace("/media/", ""))
-            if os.path.exists(old_file_path):
-                os.remove(old_file_path)
     except MediaItem.DoesNotExist:
         return JsonResponse({"error": "Item not found."}, status=404)
 
@@ -64,8 +60,10 @@ def upload_banner(request):
             destination.write(chunk)
 
     relative_url = f"{settings.MEDIA_URL}{sharded_relative_path}"
+    old_files = media_paths(item.banner_url)
     item.banner_url = relative_url
     item.save(update_fields=["banner_url"])
+    delete_unused_media(old_files)
 
     return JsonResponse({"success": True, "url": relative_url})
 
@@ -92,11 +90,6 @@ def upload_cover(request):
             item = MediaItem.objects.get(**{lookup_key: str(source_id)}, media_type=media_type)
         else:
             item = MediaItem.objects.get(**{lookup_key: str(source_id)})
-        
-        if item.cover_url:
-            old_file_path = os.path.join(settings.MEDIA_ROOT, item.cover_url.replace("/media/", ""))
-            if os.path.exists(old_file_path):
-                os.remove(old_file_path)
     except MediaItem.DoesNotExist:
         return JsonResponse({"error": "Item not found."}, status=404)
 
@@ -117,8 +110,10 @@ def upload_cover(request):
             destination.write(chunk)
 
     relative_url = f"{settings.MEDIA_URL}{sharded_relative_path}"
+    old_files = media_paths(item.cover_url)
     item.cover_url = relative_url
     item.save(update_fields=["cover_url"])
+    delete_unused_media(old_files)
 
     return JsonResponse({"success": True, "url": relative_url})
 
@@ -204,14 +199,10 @@ def upload_game_screenshots(request):
                 {"success": False, "message": "Missing screenshot_url."}, status=400
             )
 
-        # Remove actual file from disk
-        filename = screenshot_url.replace(settings.MEDIA_URL, "")
-        file_path = os.path.join(settings.MEDIA_ROOT, filename)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         from core.models import Screenshot
         Screenshot.objects.filter(item=media_item, url=screenshot_url).delete()
+        # Remove actual file from disk
+        delete_unused_media(media_paths(screenshot_url))
 
         # Return updated list from DB
         return_screenshots = [{"url": s.url, "is_full_url": s.is_full_url} for s in media_item.game_screenshots.all()]
@@ -233,13 +224,9 @@ def upload_game_screenshots(request):
     if action == "replace":
         from core.models import Screenshot
         # Safely remove old files using DB
-        for s in media_item.game_screenshots.all():
-            if s.url:
-                file_path = os.path.join(settings.MEDIA_ROOT, s.url.replace(settings.MEDIA_URL, ""))
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    
+        old_files = media_paths(list(media_item.game_screenshots.values_list("url", flat=True)))
         media_item.game_screenshots.all().delete()
+        delete_unused_media(old_files)
         media_item.screenshots = []
         start_index = 1
         old_screenshots = []
@@ -270,6 +257,7 @@ def upload_game_screenshots(request):
         screenshot_objs.append(Screenshot(item=media_item, url=url, is_full_url=False, position=i))
 
     Screenshot.objects.bulk_create(screenshot_objs)
+    sync_screenshot_media(media_item.id)
     
     return_screenshots = [{"url": s.url, "is_full_url": s.is_full_url} for s in media_item.game_screenshots.all()]
 
@@ -400,7 +388,7 @@ def set_video_as_cover(request):
         max_res_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
 
         try:
-            img_check = requests.head(max_res_url, timeout=3)
+            img_check = http_head("youtube", max_res_url, timeout=3)
             if (
                 img_check.status_code == 200
                 and int(img_check.headers.get("content-length", 0)) > 5000
@@ -411,30 +399,21 @@ def set_video_as_cover(request):
         except Exception:
             thumbnail_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
 
-        # Delete old cover file if it exists
-        if item.cover_url:
-            old_file_path = os.path.join(settings.MEDIA_ROOT, item.cover_url.replace("/media/", ""))
-            if os.path.exists(old_file_path):
-                os.remove(old_file_path)
-
-        # Delete old banner file if it exists
-        if item.banner_url:
-            old_file_path = os.path.join(settings.MEDIA_ROOT, item.banner_url.replace("/media/", ""))
-            if os.path.exists(old_file_path):
-                os.remove(old_file_path)
+        # Old cover and banner files are deleted after the save if nothing else uses them
+        old_files = media_paths([item.cover_url, item.banner_url])
 
         # Download and save
         cache_bust = int(time.time() * 1000)
-        local_poster = download_image(
-            thumbnail_url, f"posters/musicbrainz_{source_id}_{cache_bust}.jpg"
-        )
-        local_banner = download_image(
-            thumbnail_url, f"banners/musicbrainz_{source_id}_{cache_bust}.jpg"
-        )
+        poster_file = f"posters/musicbrainz_{source_id}_{cache_bust}.jpg"
+        banner_file = f"banners/musicbrainz_{source_id}_{cache_bust}.jpg"
+        images = download_images([(thumbnail_url, poster_file), (thumbnail_url, banner_file)])
+        local_poster = images[poster_file]
+        local_banner = images[banner_file]
 
         item.cover_url = local_poster
         item.banner_url = local_banner
         item.save()
+        delete_unused_media(old_files)
 
         return JsonResponse({"success": True})
     except Exception as e:
@@ -17,6 +17,8 @@ from core.services.m_people import (
 )
 from core.services.p_person_details import refresh_favorite_person
 from core.services.g_utils import get_sharded_path
+from core.services.g_media import delete_unused_media, media_paths
+from core.services.g_http import fresh_responses
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +43,9 @@ def refresh_favorite_person_view(request):
     # Find the database record using API ID and type
     try:
         person = FavoritePerson.objects.get(person_id=api_person_id, type=person_type)
-        success = refresh_favorite_person(person.id, refresh_mode)  # Pass database ID and mode
+        # The user asked for current data, skip the response cache
+        with fresh_responses():
+            success = refresh_favorite_person(person.id, refresh_mode)  # Pass database ID and mode
         return JsonResponse({"success": success})
     except FavoritePerson.DoesNotExist:
         return JsonResponse({"error": "Person not found"}, status=404)
@@ -75,22 +79,17 @@ def upload_person_image(request):
         
         os.makedirs(os.path.dirname(new_path), exist_ok=True)
 
-        # Remove old image if it's in favorites directory
-        if person.image_url and person.image_url.startswith(settings.MEDIA_URL):
-            relative_path = person.image_url.replace(settings.MEDIA_URL, "").lstrip("/")
-            if relative_path.startswith("favorites/"):
-                old_path = os.path.join(settings.MEDIA_ROOT, relative_path)
-                if os.path.exists(old_path):
-                    os.remove(old_path)
-
         # Save new file
         with open(new_path, "wb+") as destination:
             for chunk in uploaded_file.chunks():
                 destination.write(chunk)
 
         relative_url = f"{settings.MEDIA_URL}{sharded_relative_path}"
+        old_files = media_paths(person.image_url)
         person.image_url = relative_url
         person.save(update_fields=["image_url"])
+        # Remove the old image unless something else uses it
+        delete_unused_media(old_files)
 
         return JsonResponse({"success": True, "url": relative_url})
 
@@ -5,8 +5,6 @@ import datetime
 import tempfile
 import concurrent.futures
 
-import requests
-from django.apps import apps
 from django.http import FileResponse, JsonResponse, HttpResponseBadRequest
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_POST
@@ -18,6 +16,11 @@ from core.services.p_settings import (
     RefreshTask,
     cleanup_old_tasks,
 )
+from core.services.g_settings import get_app_settings
+from core.services.g_http import http_get, http_post
+from core.services.g_http_cache import response_cache_stats, clear_response_cache
+from core.services.g_media import clean_orphaned_media
+from core.services.p_home import acquire_media_lock, release_media_lock
 
 
 @ensure_csrf_cookie
@@ -31,13 +34,9 @@ def update_rating_mode(request):
         valid_modes = {"faces", "stars_5", "scale_10", "scale_100"}
         if new_mode not in valid_modes:
             return JsonResponse({"success": False, "error": "Invalid rating mode."})
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
-        if not settings:
-            settings = AppSettings.objects.create(rating_mode=new_mode)
-        else:
-            settings.rating_mode = new_mode
-            settings.save()
+        settings = get_app_settings(request, create=True)
+        settings.rating_mode = new_mode
+        settings.save()
         return JsonResponse({"success": True})
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)})
@@ -46,10 +45,7 @@ def update_rating_mode(request):
 @require_POST
 def update_preferences(request):
     data = json.loads(request.body.decode("utf-8"))
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
-    if not settings:
-        settings = AppSettings.objects.create()
+    settings = get_app_settings(request, create=True)
 
     settings.show_date_field = data.get("show_date_field", False)
     settings.show_repeats_field = data.get("show_repeats_field", False)
@@ -67,10 +63,7 @@ def update_theme(request):
     if theme_mode not in ["light", "dark", "brown", "green"]:
         return JsonResponse({"error": "Invalid theme mode"}, status=400)
 
-    AppSettings = apps.get_model("core", "AppSettings")
-    settings = AppSettings.objects.first()
-    if not settings:
-        settings = AppSettings.objects.create()
+    settings = get_app_settings(request, create=True)
 
     settings.theme_mode = theme_mode
     settings.save()
@@ -85,10 +78,7 @@ def update_details_sections(request):
         data = json.loads(request.body)
         sections = data.get("sections", [])
         
-        AppSettings = apps.get_model("core", "AppSettings")
-        settings = AppSettings.objects.first()
-        if not settings:
-            settings = AppSettings.objects.create()
+        settings = get_app_settings(request, create=True)
             
         settings.details_sections_order = sections
         settings.save()
@@ -149,7 +139,7 @@ class AutoDeleteFile:
 def create_backup(request):
     cleanup_old_tasks()
     task_id = uuid.uuid4().hex
-    task = BackupTask(task_id, "export")
+    task = BackupTask(task_id, "export", incremental=request.GET.get("mode") == "incremental")
     BACKUP_TASKS[task_id] = task
     task.start()
     return JsonResponse({"task_id": task_id})
@@ -211,13 +201,17 @@ def backup_download(request, task_id):
     if not task or task.status != "completed" or not task.result_path:
         return HttpResponseBadRequest("Backup not ready or not found")
 
+    # The next incremental backup builds on this one
+    task.save_state()
+
     # Use our new AutoDelete wrapper instead of the standard open()
     wrapped_file = AutoDeleteFile(task.result_path)
+    kind = "_incremental" if task.incremental else ""
 
     return FileResponse(
         wrapped_file,
         as_attachment=True,
-        filename=f"media_journal_backup_{datetime.datetime.now().strftime('%Y%m%d')}.zip",
+        filename=f"media_journal_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}{kind}.zip",
     )
 
 
@@ -278,7 +272,7 @@ def version_info_api(request):
     current_version = version_context(request)["version"]
 
     try:
-        response = requests.get(
+        response = http_get("default",
             "https://api.github.com/repos/mihail-pop/media-journal/releases/latest",
             timeout=5,
         )
@@ -297,7 +291,7 @@ def api_status_check(request):
         if not key or not key.key_1: 
             return "missing_key"
         try:
-            r = requests.get(f"https://api.themoviedb.org/3/configuration?api_key={key.key_1}", timeout=3)
+            r = http_get("tmdb", f"https://api.themoviedb.org/3/configuration?api_key={key.key_1}", timeout=3, retry_rate_limited=False, use_cache=False)
             if r.status_code == 200: 
                 return "ok"
             if r.status_code == 401: 
@@ -310,7 +304,7 @@ def api_status_check(request):
 
     def check_anilist():
         try:
-            r = requests.post("https://graphql.anilist.co", json={"query": "{ Media(id: 1) { id } }"}, timeout=3)
+            r = http_post("anilist", "https://graphql.anilist.co", json={"query": "{ Media(id: 1) { id } }"}, timeout=3, retry_rate_limited=False, use_cache=False)
             if r.status_code in [200, 400]: 
                 return "ok"
             if r.status_code == 429: 
@@ -328,11 +322,12 @@ def api_status_check(request):
             token = get_igdb_token()
             if not token: 
                 return "auth_error"
-            r = requests.post(
+            r = http_post("igdb",
                 "https://api.igdb.com/v4/games",
                 headers={"Client-ID": key.key_1, "Authorization": f"Bearer {token}"},
                 data="fields id; limit 1;",
-                timeout=3
+                timeout=3,
+                retry_rate_limited=False, use_cache=False,
             )
             if r.status_code == 200: 
                 return "ok"
@@ -347,7 +342,7 @@ def api_status_check(request):
     def check_openlib():
         try:
             # Fetch a specific, highly-cached Work instead of doing a heavy DB search
-            r = requests.get("https://openlibrary.org/works/OL45804W.json", timeout=30)
+            r = http_get("openlibrary", "https://openlibrary.org/works/OL45804W.json", timeout=30, retry_rate_limited=False, use_cache=False)
             if r.status_code == 200: 
                 return "ok"
             if r.status_code == 429: 
@@ -359,7 +354,7 @@ def api_status_check(request):
     def check_musicbrainz():
         try:
             headers = {"User-Agent": "MediaJournal/1.0 (https://github.com/mihail-pop/media-journal)"}
-            r = requests.get("https://musicbrainz.org/ws/2/recording?query=test&limit=1&fmt=json", headers=headers, timeout=20)
+            r = http_get("musicbrainz", "https://musicbrainz.org/ws/2/recording?query=test&limit=1&fmt=json", headers=headers, timeout=20, retry_rate_limited=False, use_cache=False)
             if r.status_code == 200: 
                 return "ok"
             if r.status_code == 429: 
@@ -382,6 +377,37 @@ def api_status_check(request):
 
     return JsonResponse({"statuses": statuses})
 
+
+@require_GET
+def http_cache_stats(request):
+    """Hit/miss counters and size of the provider response cache."""
+    return JsonResponse(response_cache_stats())
+
+
+@require_POST
+def clear_http_cache(request):
+    clear_response_cache()
+    return JsonResponse({"success": True})
+
+
+@require_GET
+def media_cleanup_report(request):
+    """Dry run of the orphaned media cleanup: what it would delete, nothing is removed."""
+    return JsonResponse(clean_orphaned_media(dry_run=True))
+
+
+@require_POST
+def run_media_cleanup_now(request):
+    """Runs the orphaned media cleanup right away instead of waiting for its monthly run."""
+    if not acquire_media_lock():
+        return JsonResponse({"error": "Another media operation is in progress, try again later."}, status=409)
+    try:
+        report = clean_orphaned_media()
+    finally:
+        release_media_lock()
+    return JsonResponse(report)
+
+
 @ensure_csrf_cookie
 @require_POST
 def refresh_data(request):
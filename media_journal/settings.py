@@ -101,6 +101,20 @@ DATABASES = {
 }
 
 
+# Cache
+# The app runs as a single process (waitress threads) so an in-memory cache is shared by every request.
+# Only one server process is supported: another process (a second worker, a separate script writing
+# to the database) would keep its own copy and the two would serve stale home stats and settings.
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'media-journal',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -174,4 +188,10 @@ REQUIRE_LOGIN = os.environ.get('REQUIRE_LOGIN', 'False').lower() in ('true', '1'
 
 # Tell Django where to send unauthenticated users
 LOGIN_URL = 'login'
-LOGIN_REDIRECT_URL = 'home' # Sends them to the home page after successful login
\ No newline at end of file
+LOGIN_REDIRECT_URL = 'home' # Sends them to the home page after successful login
+# --- BACKGROUND SCHEDULER ---
+# The web server runs the scheduled jobs (update checks, media cleanup) in-process, they
+# have to: the cache above is per process and their writes invalidate what it holds.
+# Only the server entry points start it (media_journal/wsgi.py and runserver), never
+# tests, scripts or other management commands. SCHEDULER_AUTOSTART=False turns it off.
+SCHEDULER_AUTOSTART = os.environ.get('SCHEDULER_AUTOSTART', 'True').lower() in ('true', '1', 't')
@@ -18,6 +18,7 @@ urlpatterns = [
     path("api/musicbrainz_search/", views.musicbrainz_search, name="musicbrainz_search"),
     path('api/add_to_list/', views.add_to_list, name='add_to_list'),
     path('api/add_season_to_list/', views.add_season_to_list, name='add_season_to_list'),
+    path('api/add_job_status/<uuid:job_id>/', views.add_job_status, name='add_job_status'),
     path("create-custom-item/", views.create_custom_item, name="create_custom_item"),
     path('edit-metadata/<int:item_id>/', views.edit_metadata, name='edit_metadata'),
     path("edit-item/<int:item_id>/", views.edit_item, name="edit_item"),
@@ -29,27 +30,30 @@ urlpatterns = [
     path('musicbrainz/music/<str:recording_id>/', views.musicbrainz_detail, name='musicbrainz_detail'),
     path('', views.home, name='home'),
     path('notifications/dismiss-sys/<str:sys_id>/', views.dismiss_sys_notification, name='dismiss_sys_notification'),
+    path('api/list/logs/', views.list_logs_api, name='list_logs_api'),
+    path('api/list/<str:category>/', views.media_list_api, name='media_list_api'),
+    path('api/list/<str:category>/banners/', views.media_banners_api, name='media_banners_api'),
     path('movies/', views.movies, name='movies'),
-    path('api/movies/', views.movies_api, name='movies_api'),
-    path('api/movies/banners/', views.movies_banners_api, name='movies_banners_api'),
+    path('api/movies/', views.media_list_api, {'category': 'movies'}, name='movies_api'),
+    path('api/movies/banners/', views.media_banners_api, {'category': 'movies'}, name='movies_banners_api'),
     path('tvshows/', views.tvshows, name='tvshows'),
-    path('api/tvshows/', views.tvshows_api, name='tvshows_api'),
-    path('api/tvshows/banners/', views.tvshows_banners_api, name='tvshows_banners_api'),
+    path('api/tvshows/', views.media_list_api, {'category': 'tvshows'}, name='tvshows_api'),
+    path('api/tvshows/banners/', views.media_banners_api, {'category': 'tvshows'}, name='tvshows_banners_api'),
     path('anime/', views.anime, name='anime'),
-    path('api/anime/', views.anime_api, name='anime_api'),
-    path('api/anime/banners/', views.anime_banners_api, name='anime_banners_api'),
+    path('api/anime/', views.media_list_api, {'category': 'anime'}, name='anime_api'),
+    path('api/anime/banners/', views.media_banners_api, {'category': 'anime'}, name='anime_banners_api'),
     path('games/', views.games, name='games'),
-    path('api/games/', views.games_api, name='games_api'),
-    path('api/games/banners/', views.games_banners_api, name='games_banners_api'),
+    path('api/games/', views.media_list_api, {'category': 'games'}, name='games_api'),
+    path('api/games/banners/', views.media_banners_api, {'category': 'games'}, name='games_banners_api'),
     path('books/', views.books, name='books'),
-    path('api/books/', views.books_api, name='books_api'),
-    path('api/books/banners/', views.books_banners_api, name='books_banners_api'),
+    path('api/books/', views.media_list_api, {'category': 'books'}, name='books_api'),
+    path('api/books/banners/', views.media_banners_api, {'category': 'books'}, name='books_banners_api'),
     path('manga/', views.manga, name='manga'),
-    path('api/manga/', views.manga_api, name='manga_api'),
-    path('api/manga/banners/', views.manga_banners_api, name='manga_banners_api'),
+    path('api/manga/', views.media_list_api, {'category': 'manga'}, name='manga_api'),
+    path('api/manga/banners/', views.media_banners_api, {'category': 'manga'}, name='manga_banners_api'),
     path('music/', views.music, name='music'),
-    path('api/music/', views.music_api, name='music_api'),
-    path('api/music/banners/', views.music_banners_api, name='music_banners_api'),
+    path('api/music/', views.media_list_api, {'category': 'music'}, name='music_api'),
+    path('api/music/banners/', views.media_banners_api, {'category': 'music'}, name='music_banners_api'),
     path("discover/", views.discover_view, name="discover"),
     path("favorites/", views.favorites_page, name="favorites"),
     path("api/favorites/", views.favorites_api, name="favorites_api"),
@@ -68,6 +72,10 @@ urlpatterns = [
     path("settings/save_username/", views.save_username, name="save_username"),
     path('api/version_info/', views.version_info_api, name='version_info_api'),
     path('api/status-check/', views.api_status_check, name='api_status_check'),
+    path('api/http-cache/', views.http_cache_stats, name='http_cache_stats'),
+    path('api/http-cache/clear/', views.clear_http_cache, name='clear_http_cache'),
+    path('api/media-cleanup/', views.media_cleanup_report, name='media_cleanup_report'),
+    path('api/media-cleanup/run/', views.run_media_cleanup_now, name='run_media_cleanup_now'),
     path('api/add_key/', views.add_key, name='add_key'),
     path('api/update_key/', views.update_key, name='update_key'),
     path('api/delete_key/', views.delete_key, name='delete_key'),
@@ -111,11 +119,14 @@ urlpatterns = [
     path('api/reorder-music-videos/', views.reorder_music_videos, name='reorder_music_videos'),
     path('api/set-video-as-cover/', views.set_video_as_cover, name='set_video_as_cover'),
     path('calendar/', views.calendar_page, name='calendar'),
-    path('api/calendar/events/', views.get_calendar_events, name='calendar_events_api'),
+    path('calendar.ics', views.calendar_feed, name='calendar_feed'),
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar_feed_token'),
+    path('api/calendar/month/', views.get_calendar_month, name='calendar_month_api'),
     path('api/calendar/search-local/', views.calendar_search_local_items, name='calendar_search_local'),
     path('api/calendar/add/', views.add_custom_event, name='calendar_add_event'),
     path('api/calendar/delete/<int:event_id>/', views.delete_calendar_event, name='calendar_delete_event'),
     path('api/calendar/sync/', views.sync_calendar, name='calendar_sync'),
+    path('api/calendar/sync/status/<str:task_id>/', views.calendar_sync_status, name='calendar_sync_status'),
     path('api/calendar/toggle-notify/<int:event_id>/', views.toggle_calendar_notify, name='calendar_toggle_notify'),
     path('api/calendar/dismiss-notify/<int:event_id>/', views.dismiss_calendar_notify, name='calendar_dismiss_notify'),
     path('collections/', views.collections_page, name='collections_page'),
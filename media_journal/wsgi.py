@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'media_journal.settings')
 
 application = get_wsgi_application()
+
+# The server process runs the background jobs (core/services/g_scheduler.py). Waitress
+# serves every request from this one process, which the per-process cache relies on.
+if settings.SCHEDULER_AUTOSTART:
+    from core.services.g_scheduler import start_scheduler
+
+    start_scheduler()